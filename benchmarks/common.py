@@ -0,0 +1,142 @@
+import math
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def use_service(service: str) -> None:
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    app_dir = ROOT / "services" / service / "app"
+    if str(app_dir) not in sys.path:
+        sys.path.insert(0, str(app_dir))
+
+
+def create_table(
+    dynamodb_client: Any,
+    name: str,
+    partition_key: str = "uuid",
+    gsi_defs: list[dict[str, str]] | None = None,
+) -> None:
+    attr_types = {partition_key: "S"}
+    gsis = []
+    for g in gsi_defs or []:
+        attr_types.setdefault(g["partition"], g.get("partition_type", "S"))
+        key_schema = [{"AttributeName": g["partition"], "KeyType": "HASH"}]
+        if g.get("sort"):
+            attr_types.setdefault(g["sort"], g.get("sort_type", "S"))
+            key_schema.append({"AttributeName": g["sort"], "KeyType": "RANGE"})
+        gsis.append({
+            "IndexName": g["name"],
+            "KeySchema": key_schema,
+            "Projection": {"ProjectionType": "ALL"},
+        })
+    params: dict[str, Any] = {
+        "TableName": name,
+        "KeySchema": [{"AttributeName": partition_key, "KeyType": "HASH"}],
+        "AttributeDefinitions": [{"AttributeName": k, "AttributeType": t} for k, t in attr_types.items()],
+        "BillingMode": "PAY_PER_REQUEST",
+    }
+    if gsis:
+        params["GlobalSecondaryIndexes"] = gsis
+    dynamodb_client.create_table(**params)
+
+
+def load_items(dynamodb_client: Any, table_name: str, items: Iterable[dict[str, Any]]) -> int:
+    count = 0
+    batch: list[dict[str, Any]] = []
+    for item in items:
+        batch.append({"PutRequest": {"Item": item}})
+        if len(batch) == 25:
+            dynamodb_client.batch_write_item(RequestItems={table_name: batch})
+            count += len(batch)
+            batch = []
+    if batch:
+        dynamodb_client.batch_write_item(RequestItems={table_name: batch})
+        count += len(batch)
+    return count
+
+
+def item_size(item: dict[str, Any]) -> int:
+    size = 0
+    for name, value in item.items():
+        size += len(name.encode())
+        size += _value_size(value)
+    return size
+
+
+def _value_size(value: dict[str, Any]) -> int:
+    if "S" in value:
+        return len(value["S"].encode())
+    if "N" in value:
+        return math.ceil(len(value["N"].strip("-").replace(".", "")) / 2) + 1
+    if "BOOL" in value or "NULL" in value:
+        return 1
+    if "L" in value:
+        return 3 + sum(1 + _value_size(v) for v in value["L"])
+    if "M" in value:
+        return 3 + sum(len(k.encode()) + 1 + _value_size(v) for k, v in value["M"].items())
+    return 0
+
+
+# moto does not report realistic ConsumedCapacity, so each Scan/Query page is
+# billed like DynamoDB does for eventually consistent reads. BatchGetItem is
+# billed per returned item.
+class ReadUnitMeter:
+    def __init__(self, client: Any, avg_item_bytes: int, table_item_bytes: dict[str, int] | None = None) -> None:
+        self.client = client
+        self.avg_item_bytes = avg_item_bytes
+        self.table_item_bytes = table_item_bytes or {}
+        self.calls = 0
+        self.scanned = 0
+        self.read_units = 0.0
+        client.meta.events.register("before-parameter-build.dynamodb.*", self._remember_table)
+        for operation in ("Query", "Scan"):
+            client.meta.events.register(f"after-call.dynamodb.{operation}", self._record)
+        client.meta.events.register("after-call.dynamodb.BatchGetItem", self._record_batch_get)
+
+    @staticmethod
+    def _remember_table(params: dict[str, Any], context: dict[str, Any], **_: Any) -> None:
+        context["bench_table"] = params.get("TableName")
+
+    def _record(self, parsed: dict[str, Any], context: dict[str, Any], **_: Any) -> None:
+        scanned = parsed.get("ScannedCount", 0)
+        item_bytes = self.table_item_bytes.get(context.get("bench_table"), self.avg_item_bytes)
+        self.calls += 1
+        self.scanned += scanned
+        self.read_units += max(1, math.ceil(scanned * item_bytes / 4096)) * 0.5
+
+    def _record_batch_get(self, parsed: dict[str, Any], **_: Any) -> None:
+        self.calls += 1
+        for items in parsed.get("Responses", {}).values():
+            self.scanned += len(items)
+            self.read_units += sum(math.ceil(item_size(it) / 4096) * 0.5 for it in items)
+
+    def reset(self) -> None:
+        self.calls = 0
+        self.scanned = 0
+        self.read_units = 0.0
+
+
+@contextmanager
+def timed() -> Iterator[dict[str, float]]:
+    result: dict[str, float] = {}
+    start = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result["ms"] = (time.perf_counter() - start) * 1000
+
+
+def inject_latency(client: Any, latency_ms: float) -> None:
+    if latency_ms <= 0:
+        return
+
+    def _sleep(**_: Any) -> None:
+        time.sleep(latency_ms / 1000)
+
+    client.meta.events.register("before-call.*.*", _sleep)
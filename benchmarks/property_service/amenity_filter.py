@@ -0,0 +1,103 @@
+import argparse
+import random
+import time
+from uuid import uuid4
+
+import boto3
+from moto import mock_aws
+
+from benchmarks.common import ReadUnitMeter, create_table, item_size, load_items, use_service
+
+use_service("property_service")
+
+from db_clients import RoomTableClient  # noqa: E402
+from schemas import Amenity  # noqa: E402
+from utils import to_dynamodb_item  # noqa: E402
+
+TABLE = "room_table_bench"
+AMENITY_TABLE = "room_amenity_table_bench"
+AMENITIES = [
+    "wifi", "air conditioning", "tv", "parking", "minibar", "balcony", "kitchen", "bathtub",
+    "sea view", "safe", "coffee machine", "pet friendly", "washing machine", "jacuzzi", "sauna",
+    "fireplace", "gym access", "workspace", "crib", "wheelchair access",
+]
+
+
+def _room_item(rng: random.Random, property_uuids: list) -> dict:
+    # Popular amenities appear on most rooms, the tail on a few percent.
+    amenities = [name for rank, name in enumerate(AMENITIES) if rng.random() < 0.9 / (rank + 1) ** 0.8]
+    return to_dynamodb_item({
+        "uuid": uuid4(),
+        "property_uuid": rng.choice(property_uuids),
+        "name": "Benchmark Room",
+        "description": "x" * 200,
+        "capacity": rng.randint(1, 6),
+        "room_type": "double",
+        "price_per_night": rng.randint(30, 500),
+        "min_price_per_night": 30,
+        "max_price_per_night": 500,
+        "created_at": "2024-01-01T00:00:00",
+        "amenities": [{"name": name} for name in amenities],
+    })
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare contains() scans with the amenity inverted index")
+    parser.add_argument("--rooms", type=int, default=5_000)
+    parser.add_argument("--amenity-counts", type=int, nargs="+", default=[1, 3, 5])
+    args = parser.parse_args()
+
+    rng = random.Random(13)
+    property_uuids = [uuid4() for _ in range(args.rooms // 20 or 1)]
+    with mock_aws():
+        client = boto3.client("dynamodb", region_name="us-east-1")
+        create_table(client, TABLE, gsi_defs=[{"name": "property_uuid_index", "partition": "property_uuid"}])
+        client.create_table(
+            TableName=AMENITY_TABLE,
+            KeySchema=[
+                {"AttributeName": "amenity", "KeyType": "HASH"},
+                {"AttributeName": "room_uuid", "KeyType": "RANGE"},
+            ],
+            AttributeDefinitions=[
+                {"AttributeName": "amenity", "AttributeType": "S"},
+                {"AttributeName": "room_uuid", "AttributeType": "S"},
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        rooms = [_room_item(rng, property_uuids) for _ in range(args.rooms)]
+        load_items(client, TABLE, rooms)
+
+        scan_client = RoomTableClient(TABLE, scan_segments=4)
+        index_client = RoomTableClient(TABLE, amenity_table_name=AMENITY_TABLE)
+        index_client.backfill_amenity_index()
+
+        table_bytes = sum(item_size(it) for it in rooms)
+        avg_room_bytes = table_bytes // len(rooms)
+        # moto reports TableSizeBytes as 0, so seed the stats DescribeTable returns on DynamoDB.
+        index_client._room_table_stats = (time.monotonic(), table_bytes)
+        posting_bytes = item_size({
+            "amenity": {"S": "air conditioning"},
+            "room_uuid": {"S": str(uuid4())},
+            "property_uuid": {"S": str(uuid4())},
+        })
+        scan_meter = ReadUnitMeter(scan_client.room_db_client, avg_room_bytes)
+        index_meter = ReadUnitMeter(
+            index_client.room_db_client, avg_room_bytes, table_item_bytes={AMENITY_TABLE: posting_bytes},
+        )
+
+        for label, pick in (("rare", lambda n: AMENITIES[-n:]), ("popular", lambda n: AMENITIES[:n])):
+            for count in args.amenity_counts:
+                amenities = [Amenity(name=name) for name in pick(count)]
+                scan_meter.reset()
+                scanned = scan_client.get_filtered_rooms(amenities=amenities)
+                index_meter.reset()
+                indexed = index_client.get_filtered_rooms(amenities=amenities)
+                assert {r.uuid for r in scanned} == {r.uuid for r in indexed}
+                print(
+                    f"{count} {label:<7} amenities | {len(indexed):>6} rooms"
+                    f" | scan: {scan_meter.read_units:>8.1f} RCU {scan_meter.calls:>4} calls"
+                    f" | index: {index_meter.read_units:>8.1f} RCU {index_meter.calls:>4} calls"
+                )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import argparse
+from uuid import uuid4
+
+import boto3
+from moto import mock_aws
+
+from benchmarks.common import create_table, inject_latency, timed, use_service
+
+use_service("property_service")
+
+from db_clients import PropertyTableClient, RoomTableClient  # noqa: E402
+from schemas import Amenity, Property, Room, RoomType  # noqa: E402
+
+PROPERTY_TABLE = "property_table_bench"
+ROOM_TABLE = "room_table_bench"
+AMENITY_TABLE = "room_amenity_table_bench"
+
+
+def _chain(properties: int, rooms_per_property: int) -> list[tuple[Property, list[Room]]]:
+    chain = []
+    for i in range(properties):
+        property = Property(
+            uuid=uuid4(),
+            user_uuid=uuid4(),
+            name=f"Chain Hotel {i}",
+            country="RS",
+            city="Beograd",
+            address=f"Bulevar {i}",
+            latitude=44.8,
+            longitude=20.4,
+        )
+        rooms = [
+            Room(
+                uuid=uuid4(),
+                property_uuid=property.uuid,
+                name=f"Room {r}",
+                description="Double room",
+                capacity=2,
+                room_type=RoomType.DOUBLE,
+                price_per_night=80 + r,
+                min_price_per_night=60,
+                max_price_per_night=200,
+                amenities=[Amenity(name="wifi"), Amenity(name="parking")],
+            )
+            for r in range(rooms_per_property)
+        ]
+        chain.append((property, rooms))
+    return chain
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare per-item puts with the BatchWriteItem bulk import")
+    parser.add_argument("--properties", type=int, default=100)
+    parser.add_argument("--rooms-per-property", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=10.0)
+    args = parser.parse_args()
+
+    with mock_aws():
+        client = boto3.client("dynamodb", region_name="us-east-1")
+        create_table(client, PROPERTY_TABLE)
+        create_table(client, ROOM_TABLE)
+        client.create_table(
+            TableName=AMENITY_TABLE,
+            KeySchema=[
+                {"AttributeName": "amenity", "KeyType": "HASH"},
+                {"AttributeName": "room_uuid", "KeyType": "RANGE"},
+            ],
+            AttributeDefinitions=[
+                {"AttributeName": "amenity", "AttributeType": "S"},
+                {"AttributeName": "room_uuid", "AttributeType": "S"},
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        property_client = PropertyTableClient(PROPERTY_TABLE, write_max_workers=args.workers)
+        room_client = RoomTableClient(ROOM_TABLE, amenity_table_name=AMENITY_TABLE, write_max_workers=args.workers)
+        inject_latency(property_client.property_db_client, args.latency_ms)
+        inject_latency(room_client.room_db_client, args.latency_ms)
+
+        items = args.properties * (1 + args.rooms_per_property)
+        chain = _chain(args.properties, args.rooms_per_property)
+        with timed() as sequential:
+            for property, rooms in chain:
+                property_client.add_property(property)
+                for room in rooms:
+                    room_client.add_room(room)
+
+        chain = _chain(args.properties, args.rooms_per_property)
+        with timed() as bulk:
+            assert not property_client.put_properties([property for property, _ in chain])
+            assert not room_client.put_rooms([room for _, rooms in chain for room in rooms])
+
+        for label, result in (("per-item puts", sequential), ("bulk import", bulk)):
+            rate = items / (result["ms"] / 1000)
+            print(
+                f"{label:<14} | {items} items in {result['ms']:>9.1f} ms | {rate:>8.0f} items/s"
+                f" | 110k items: {110_000 / rate / 60:>6.1f} min"
+            )
+
+
+if __name__ == "__main__":
+    main()
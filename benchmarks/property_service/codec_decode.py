@@ -0,0 +1,93 @@
+import argparse
+import random
+import timeit
+from datetime import datetime
+from decimal import Decimal
+from uuid import uuid4
+
+from benchmarks.common import use_service
+
+use_service("property_service")
+
+from db_clients import PROPERTY_CODEC, ROOM_CODEC  # noqa: E402
+from schemas import Property, Room  # noqa: E402
+from utils import from_dynamodb_item, to_dynamodb_item  # noqa: E402
+
+
+def _property_page(count: int, rng: random.Random) -> list[dict]:
+    return [
+        to_dynamodb_item({
+            "uuid": uuid4(),
+            "user_uuid": uuid4(),
+            "place_id": f"place-{i}",
+            "name": f"Benchmark Hotel {i}",
+            "description": "Quiet rooms close to the old town",
+            "country": "RS",
+            "city": "Beograd",
+            "city_key": "RS##BEOGRAD",
+            "address": "Knez Mihailova 1",
+            "latitude": Decimal(str(round(rng.uniform(44.7, 44.9), 6))),
+            "longitude": Decimal(str(round(rng.uniform(20.3, 20.6), 6))),
+            "created_at": datetime.now(),
+            "updated_at": datetime.now(),
+            "stars": rng.randint(1, 5),
+            "images": [{"key": f"properties/{i}/cover.jpg"}, {"key": f"properties/{i}/lobby.jpg"}],
+            "geohash": "srywc2n4y",
+            "geohash_cell": "sryw",
+        })
+        for i in range(count)
+    ]
+
+
+def _room_page(count: int, rng: random.Random) -> list[dict]:
+    return [
+        to_dynamodb_item({
+            "uuid": uuid4(),
+            "property_uuid": uuid4(),
+            "name": f"Room {i}",
+            "description": "Double room with a view",
+            "capacity": rng.randint(1, 6),
+            "room_type": "double",
+            "price_per_night": float(rng.randint(40, 400)),
+            "min_price_per_night": 40.0,
+            "max_price_per_night": 400.0,
+            "created_at": datetime.now(),
+            "updated_at": datetime.now(),
+            "amenities": [{"name": "wifi"}, {"name": "parking"}, {"name": "air conditioning"}],
+            "images": [{"key": f"rooms/{i}/bed.jpg"}],
+        })
+        for i in range(count)
+    ]
+
+
+def legacy_decode(model: type, items: list[dict]) -> list:
+    return [model(**{k: v for k, v in from_dynamodb_item(it).items() if k in model.model_fields}) for it in items]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare generic and schema-compiled DynamoDB item decoding")
+    parser.add_argument("--page-size", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    pages = [
+        ("property", Property, PROPERTY_CODEC, _property_page(args.page_size, rng)),
+        ("room", Room, ROOM_CODEC, _room_page(args.page_size, rng)),
+    ]
+    for label, model, codec, items in pages:
+        assert [m.model_dump() for m in legacy_decode(model, items[:50])] == [
+            codec.decode_model(it).model_dump() for it in items[:50]
+        ]
+        legacy_ms = min(timeit.repeat(lambda: legacy_decode(model, items), number=1, repeat=args.repeat)) * 1000
+        codec_ms = min(timeit.repeat(
+            lambda: [codec.decode_model(it) for it in items], number=1, repeat=args.repeat,
+        )) * 1000
+        print(
+            f"{label:>8} page of {len(items)} | generic: {legacy_ms:>8.1f} ms | compiled: {codec_ms:>7.1f} ms"
+            f" | {legacy_ms / codec_ms:>4.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import argparse
+import asyncio
+import logging
+import os
+from uuid import uuid4
+
+import boto3
+import httpx
+from moto import mock_aws
+
+from benchmarks.common import create_table, inject_latency, timed, use_service
+
+use_service("property_service")
+
+PROPERTY_TABLE = "property_table_bench"
+ROOM_TABLE = "room_table_bench"
+AMENITY_TABLE = "room_amenity_table_bench"
+BUCKET = "property-assets-bench"
+
+
+def _seed(client, properties: int, rooms_per_property: int) -> list[str]:
+    from db_clients import PropertyTableClient, RoomTableClient
+    from schemas import Property, Room, RoomType
+
+    property_client = PropertyTableClient(PROPERTY_TABLE)
+    room_client = RoomTableClient(ROOM_TABLE)
+    property_list = [
+        Property(
+            uuid=uuid4(),
+            user_uuid=uuid4(),
+            name=f"Hotel {i}",
+            country="RS",
+            city="Beograd",
+            address=f"Bulevar {i}",
+        )
+        for i in range(properties)
+    ]
+    assert not property_client.put_properties(property_list)
+    assert not room_client.put_rooms([
+        Room(
+            uuid=uuid4(),
+            property_uuid=property.uuid,
+            name=f"Room {r}",
+            capacity=2,
+            room_type=RoomType.DOUBLE,
+            price_per_night=80 + r,
+            min_price_per_night=60,
+            max_price_per_night=200,
+        )
+        for property in property_list
+        for r in range(rooms_per_property)
+    ])
+    return [str(property.uuid) for property in property_list]
+
+
+async def _page_views(app, property_uuids: list[str], concurrency: int) -> None:
+    transport = httpx.ASGITransport(app=app)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def view(property_uuid: str) -> None:
+        async with semaphore:
+            property_resp, rooms_resp = await asyncio.gather(
+                client.get(f"/property/{property_uuid}"),
+                client.get(f"/rooms/{property_uuid}"),
+            )
+            assert property_resp.status_code == 200 and rooms_resp.status_code == 200
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await asyncio.gather(*(view(property_uuid) for property_uuid in property_uuids))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare event-loop blocking reads with thread-pool offload")
+    # moto answers in-process under the GIL, so keep tables small enough for the injected latency to dominate.
+    parser.add_argument("--properties", type=int, default=100)
+    parser.add_argument("--rooms-per-property", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    os.environ.update({
+        "PROPERTY_TABLE_NAME": PROPERTY_TABLE,
+        "ROOM_TABLE_NAME": ROOM_TABLE,
+        "ROOM_AMENITY_TABLE_NAME": AMENITY_TABLE,
+        "ASSET_BUCKET_NAME": BUCKET,
+    })
+    with mock_aws():
+        client = boto3.client("dynamodb", region_name="us-east-1")
+        create_table(client, PROPERTY_TABLE)
+        create_table(client, ROOM_TABLE, gsi_defs=[{"name": "property_uuid_index", "partition": "property_uuid"}])
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket=BUCKET)
+        property_uuids = _seed(client, args.properties, args.rooms_per_property)
+
+        from main import create_app
+        from offload import BlockingExecutor
+
+        app = create_app()
+        logging.getLogger().setLevel(logging.WARNING)
+        inject_latency(app.state.property_table_client.property_db_client, args.latency_ms)
+        inject_latency(app.state.room_table_client.room_db_client, args.latency_ms)
+
+        requests = 2 * len(property_uuids)
+        for label, workers in (("blocking", 0), (f"offload x{args.workers}", args.workers)):
+            app.state.blocking_executor = BlockingExecutor(workers)
+            with timed() as result:
+                asyncio.run(_page_views(app, property_uuids, args.concurrency))
+            print(
+                f"{label:<12} | {requests} requests in {result['ms']:>8.1f} ms"
+                f" | {requests / (result['ms'] / 1000):>7.0f} req/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import argparse
+import random
+from decimal import Decimal
+from uuid import uuid4
+
+import boto3
+from moto import mock_aws
+
+from benchmarks.common import ReadUnitMeter, create_table, item_size, load_items, timed, use_service
+
+use_service("property_service")
+
+from db_clients import PropertyTableClient, set_geohash_attributes  # noqa: E402
+from utils import to_dynamodb_item  # noqa: E402
+
+TABLE = "property_table_bench"
+CITIES = [
+    (44.8125, 20.4612),
+    (48.8566, 2.3522),
+    (40.7128, -74.0060),
+    (34.0522, -118.2437),
+    (35.6762, 139.6503),
+]
+
+
+def _property_item(rng: random.Random) -> dict:
+    lat, lon = rng.choice(CITIES)
+    data = {
+        "uuid": uuid4(),
+        "user_uuid": uuid4(),
+        "name": "Benchmark Hotel",
+        "description": "x" * 200,
+        "country": "XX",
+        "city": "Bench",
+        "address": "1 Main St",
+        "city_key": "XX##BENCH",
+        "latitude": Decimal(str(round(lat + rng.gauss(0, 0.5), 6))),
+        "longitude": Decimal(str(round(lon + rng.gauss(0, 0.5), 6))),
+        "created_at": "2024-01-01T00:00:00",
+    }
+    set_geohash_attributes(data)
+    return to_dynamodb_item(data)
+
+
+def run(size: int, radius_km: float, seed: int) -> None:
+    rng = random.Random(seed)
+    with mock_aws():
+        client = boto3.client("dynamodb", region_name="us-east-1")
+        create_table(client, TABLE, gsi_defs=[
+            {"name": "geohash_index", "partition": "geohash_cell", "sort": "geohash"},
+        ])
+        sample = _property_item(rng)
+        load_items(client, TABLE, (_property_item(rng) for _ in range(size)))
+
+        table_client = PropertyTableClient(TABLE)
+        meter = ReadUnitMeter(table_client.property_db_client, item_size(sample))
+        lat, lon = CITIES[0]
+
+        with timed() as scan_time:
+            scanned = table_client.get_properties_in_bbox(Decimal(str(lat)), Decimal(str(lon)), radius_km / 111.0)
+        scan_units, scan_calls = meter.read_units, meter.calls
+        meter.reset()
+
+        with timed() as cell_time:
+            found = table_client.get_properties_within_radius(Decimal(str(lat)), Decimal(str(lon)), radius_km)
+        cell_units, cell_calls = meter.read_units, meter.calls
+
+        print(
+            f"{size:>9} properties | scan: {scan_units:>10.1f} RU {scan_calls:>5} calls {scan_time['ms']:>9.1f} ms "
+            f"({len(scanned)} in bbox) | cells: {cell_units:>8.1f} RU {cell_calls:>3} calls {cell_time['ms']:>8.1f} ms "
+            f"({len(found)} in radius)"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare scan vs geohash cell query read units (moto latency is not representative)",
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--radius-km", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    for size in args.sizes:
+        run(size, args.radius_km, args.seed)
+
+
+if __name__ == "__main__":
+    main()
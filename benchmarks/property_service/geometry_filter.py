@@ -0,0 +1,94 @@
+import argparse
+import math
+import random
+import timeit
+from decimal import Decimal
+from uuid import uuid4
+
+from benchmarks.common import use_service
+
+use_service("property_service")
+
+from db_clients import property_from_item  # noqa: E402
+from geometry import filter_items_within_radius  # noqa: E402
+from schemas import Property  # noqa: E402
+from utils import from_dynamodb_item, to_dynamodb_item  # noqa: E402
+
+CENTER = (44.8125, 20.4612)
+
+
+def _candidate_items(count: int, rng: random.Random) -> list[dict]:
+    items = []
+    for _ in range(count):
+        items.append(to_dynamodb_item({
+            "uuid": uuid4(),
+            "user_uuid": uuid4(),
+            "name": "Benchmark Hotel",
+            "country": "RS",
+            "city": "Beograd",
+            "address": "Knez Mihailova 1",
+            "latitude": Decimal(str(round(CENTER[0] + rng.uniform(-0.1, 0.1), 6))),
+            "longitude": Decimal(str(round(CENTER[1] + rng.uniform(-0.1, 0.1), 6))),
+        }))
+    return items
+
+
+def loop_filter(items: list[dict], radius_km: float) -> list[Property]:
+    lat_f, lon_f = CENTER
+    candidates = [
+        Property(**{k: v for k, v in from_dynamodb_item(it).items() if k in Property.model_fields})
+        for it in items
+    ]
+
+    def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+        R = 6371.0
+        phi1 = math.radians(lat1)
+        phi2 = math.radians(lat2)
+        dphi = math.radians(lat2 - lat1)
+        dlambda = math.radians(lon2 - lon1)
+        a = math.sin(dphi/2)**2 + math.cos(phi1)*math.cos(phi2)*math.sin(dlambda/2)**2
+        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
+        return R * c
+
+    results: list[Property] = []
+    for p in candidates:
+        plat = getattr(p, 'latitude', None)
+        plon = getattr(p, 'longitude', None)
+        if plat is None or plon is None:
+            continue
+        try:
+            d = haversine(lat_f, lon_f, float(plat), float(plon))
+        except Exception:
+            continue
+        if d <= radius_km:
+            results.append(p)
+    return results
+
+
+def vectorized_filter(items: list[dict], radius_km: float) -> list[Property]:
+    results: list[Property] = []
+    for it, distance in filter_items_within_radius(items, CENTER[0], CENTER[1], radius_km):
+        property_obj = property_from_item(it)
+        property_obj.distance_km = round(distance, 3)
+        results.append(property_obj)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the per-item haversine loop with the NumPy filter")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--radius-km", type=float, default=3.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    for size in args.sizes:
+        items = _candidate_items(size, rng)
+        assert len(loop_filter(items, args.radius_km)) == len(vectorized_filter(items, args.radius_km))
+        loop_ms = min(timeit.repeat(lambda: loop_filter(items, args.radius_km), number=1, repeat=args.repeat)) * 1000
+        vector_ms = min(timeit.repeat(lambda: vectorized_filter(items, args.radius_km), number=1, repeat=args.repeat)) * 1000
+        print(f"{size:>7} candidates | loop: {loop_ms:>9.1f} ms | vectorized: {vector_ms:>8.1f} ms | {loop_ms / vector_ms:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
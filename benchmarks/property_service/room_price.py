@@ -0,0 +1,125 @@
+import argparse
+import random
+from uuid import uuid4
+
+import boto3
+from moto import mock_aws
+
+from benchmarks.common import ReadUnitMeter, create_table, item_size, load_items, use_service
+
+use_service("property_service")
+
+from db_clients import RoomTableClient, price_bucket, room_from_item  # noqa: E402
+from utils import to_dynamodb_item  # noqa: E402
+
+TABLE = "room_table_bench"
+GSI_DEFS = [
+    {"name": "property_uuid_index", "partition": "property_uuid"},
+    {"name": "property_price_index", "partition": "property_uuid", "sort": "price_per_night", "sort_type": "N"},
+    {"name": "price_bucket_index", "partition": "price_bucket", "sort": "price_per_night", "sort_type": "N"},
+]
+
+
+def _room_item(rng: random.Random, property_uuids: list) -> dict:
+    price = rng.randint(30, 500)
+    return to_dynamodb_item({
+        "uuid": uuid4(),
+        "property_uuid": rng.choice(property_uuids),
+        "name": "Benchmark Room",
+        "description": "x" * 200,
+        "capacity": rng.randint(1, 6),
+        "room_type": "double",
+        "price_per_night": price,
+        "price_bucket": price_bucket(price),
+        "min_price_per_night": 30,
+        "max_price_per_night": 500,
+        "created_at": "2024-01-01T00:00:00",
+    })
+
+
+def filtered_scan(table_client: RoomTableClient, max_price: float) -> list:
+    params = {
+        "TableName": table_client.room_table_name,
+        "FilterExpression": "price_per_night <= :maxp",
+        "ExpressionAttributeValues": {":maxp": {"N": str(max_price)}},
+    }
+    rooms = []
+    while True:
+        resp = table_client.room_db_client.scan(**params)
+        rooms.extend(room_from_item(it) for it in resp.get("Items", []))
+        if not resp.get("LastEvaluatedKey"):
+            return rooms
+        params["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+
+
+def filtered_property_query(table_client: RoomTableClient, property_uuid: str, max_price: float) -> list:
+    resp = table_client.room_db_client.query(
+        TableName=table_client.room_table_name,
+        IndexName="property_uuid_index",
+        KeyConditionExpression="property_uuid = :p",
+        FilterExpression="price_per_night <= :maxp",
+        ExpressionAttributeValues={":p": {"S": property_uuid}, ":maxp": {"N": str(max_price)}},
+    )
+    return [room_from_item(it) for it in resp.get("Items", [])]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare price FilterExpressions with price-ordered key conditions")
+    parser.add_argument("--rooms", type=int, default=5_000)
+    parser.add_argument("--rooms-per-property", type=int, default=40)
+    parser.add_argument("--max-price", type=float, default=80)
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(17)
+    property_uuids = [str(uuid4()) for _ in range(max(1, args.rooms // args.rooms_per_property))]
+    with mock_aws():
+        client = boto3.client("dynamodb", region_name="us-east-1")
+        create_table(client, TABLE, gsi_defs=GSI_DEFS)
+        sample = _room_item(rng, property_uuids)
+        load_items(client, TABLE, (_room_item(rng, property_uuids) for _ in range(args.rooms)))
+
+        table_client = RoomTableClient(TABLE)
+        meter = ReadUnitMeter(table_client.room_db_client, item_size(sample))
+
+        def report(label: str, legacy, indexed) -> tuple[list, list]:
+            meter.reset()
+            legacy_rooms = legacy()
+            legacy_units, legacy_calls = meter.read_units, meter.calls
+            meter.reset()
+            indexed_rooms = indexed()
+            print(
+                f"{label:<28} | {len(indexed_rooms):>6} rooms"
+                f" | filter: {legacy_units:>8.1f} RCU {legacy_calls:>4} calls"
+                f" | key condition: {meter.read_units:>7.1f} RCU {meter.calls:>4} calls"
+            )
+            return legacy_rooms, indexed_rooms
+
+        legacy, indexed = report(
+            f"price <= {args.max_price:g}",
+            lambda: filtered_scan(table_client, args.max_price),
+            lambda: table_client.get_filtered_rooms(max_price_per_night=args.max_price),
+        )
+        assert {r.uuid for r in legacy} == {r.uuid for r in indexed}
+
+        legacy, indexed = report(
+            f"cheapest {args.top}",
+            lambda: sorted(filtered_scan(table_client, 10**9), key=lambda r: r.price_per_night)[:args.top],
+            lambda: table_client.get_filtered_rooms(cheapest_first=True, limit=args.top),
+        )
+        assert [r.price_per_night for r in legacy] == [r.price_per_night for r in indexed]
+
+        sample_properties = property_uuids[:50]
+        legacy, indexed = report(
+            f"{len(sample_properties)} properties, price <= {args.max_price:g}",
+            lambda: [r for p in sample_properties for r in filtered_property_query(table_client, p, args.max_price)],
+            lambda: [
+                r for p in sample_properties
+                for r in table_client.get_filtered_property_rooms(p, max_price_per_night=args.max_price)
+            ],
+        )
+        assert {r.uuid for r in legacy} == {r.uuid for r in indexed}
+
+
+if __name__ == "__main__":
+    main()
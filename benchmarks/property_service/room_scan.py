@@ -0,0 +1,95 @@
+import argparse
+import random
+from uuid import uuid4
+
+import boto3
+from moto import mock_aws
+
+from benchmarks.common import ReadUnitMeter, create_table, inject_latency, item_size, load_items, timed, use_service
+
+use_service("property_service")
+
+from db_clients import RoomTableClient, room_from_item  # noqa: E402
+from utils import to_dynamodb_item  # noqa: E402
+
+TABLE = "room_table_bench"
+ROOM_TYPES = ["single", "double", "suite", "family", "deluxe", "studio"]
+
+
+def _room_item(rng: random.Random, property_uuids: list) -> dict:
+    return to_dynamodb_item({
+        "uuid": uuid4(),
+        "property_uuid": rng.choice(property_uuids),
+        "name": "Benchmark Room",
+        "description": "x" * 200,
+        "capacity": rng.randint(1, 6),
+        "room_type": rng.choice(ROOM_TYPES),
+        "price_per_night": rng.randint(30, 500),
+        "min_price_per_night": 30,
+        "max_price_per_night": 500,
+        "created_at": "2024-01-01T00:00:00",
+        "amenities": [{"name": "wifi"}, {"name": "parking"}],
+    })
+
+
+def single_scan(table_client: RoomTableClient, capacity: int) -> list:
+    resp = table_client.room_db_client.scan(
+        TableName=table_client.room_table_name,
+        FilterExpression="#capacity >= :cap",
+        ExpressionAttributeNames={"#capacity": "capacity"},
+        ExpressionAttributeValues={":cap": {"N": str(capacity)}},
+    )
+    return [room_from_item(it) for it in resp.get("Items", [])]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the single-call room scan with the segmented scan")
+    parser.add_argument("--rooms", type=int, default=200_000)
+    parser.add_argument("--segments", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--capacity", type=int, default=4)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    property_uuids = [uuid4() for _ in range(args.rooms // 20 or 1)]
+    with mock_aws():
+        client = boto3.client("dynamodb", region_name="us-east-1")
+        create_table(client, TABLE, gsi_defs=[{"name": "property_uuid_index", "partition": "property_uuid"}])
+        sample = _room_item(rng, property_uuids)
+        load_items(client, TABLE, (_room_item(rng, property_uuids) for _ in range(args.rooms)))
+
+        table_client = RoomTableClient(TABLE)
+        inject_latency(table_client.room_db_client, args.latency_ms)
+        meter = ReadUnitMeter(table_client.room_db_client, item_size(sample))
+
+        with timed() as single_time:
+            truncated = single_scan(table_client, args.capacity)
+        print(
+            f"single scan     | {len(truncated):>7} rooms | {meter.calls:>4} calls | {single_time['ms']:>9.1f} ms"
+            " (truncated at the first 1 MB page)"
+        )
+
+        expected = None
+        for segments in args.segments:
+            meter.reset()
+            with timed() as scan_time:
+                rooms = list(table_client.iter_filtered_rooms(capacity=args.capacity, segments=segments))
+            expected = expected if expected is not None else len(rooms)
+            assert len(rooms) == expected
+            print(
+                f"{segments:>2} segment(s)   | {len(rooms):>7} rooms | {meter.calls:>4} calls | {scan_time['ms']:>9.1f} ms"
+                f" | {meter.read_units:>8.1f} RCU"
+            )
+
+        meter.reset()
+        with timed() as limit_time:
+            limited = list(table_client.iter_filtered_rooms(capacity=args.capacity, limit=args.limit))
+        print(
+            f"limit {args.limit:<9} | {len(limited):>7} rooms | {meter.calls:>4} calls | {limit_time['ms']:>9.1f} ms"
+            f" | {meter.read_units:>8.1f} RCU"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import argparse
+import os
+import timeit
+from uuid import uuid4
+
+from benchmarks.common import use_service
+
+use_service("property_service")
+
+from schemas import Image, Property, Room  # noqa: E402
+from storage import S3AssetStorage, SignedUrlCache  # noqa: E402
+from utils import add_image_urls, strip_image_urls  # noqa: E402
+
+BUCKET = "property-assets-bench"
+
+
+def _search_response(properties: int, rooms_per_property: int, images: int) -> tuple[list[Property], list[Room]]:
+    property_models: list[Property] = []
+    room_models: list[Room] = []
+    for p in range(properties):
+        property_uuid = uuid4()
+        property_models.append(Property(
+            uuid=property_uuid,
+            user_uuid=uuid4(),
+            name=f"Benchmark Hotel {p}",
+            country="RS",
+            city="Beograd",
+            address="Knez Mihailova 1",
+            images=[Image(key=f"properties/{property_uuid}/{i}.jpg") for i in range(images)],
+        ))
+        for r in range(rooms_per_property):
+            room_uuid = uuid4()
+            room_models.append(Room(
+                uuid=room_uuid,
+                property_uuid=property_uuid,
+                name=f"Room {r}",
+                capacity=2,
+                room_type="double",
+                price_per_night=100,
+                min_price_per_night=80,
+                max_price_per_night=120,
+                images=[Image(key=f"rooms/{room_uuid}/{i}.jpg") for i in range(images)],
+            ))
+    return property_models, room_models
+
+
+def _sign_response(storage: S3AssetStorage, properties: list[Property], rooms: list[Room]) -> None:
+    for model in (*properties, *rooms):
+        strip_image_urls(model.images)
+    add_image_urls(properties, storage)
+    add_image_urls(rooms, storage)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time image URL signing for a search response with and without the cache")
+    parser.add_argument("--properties", type=int, default=50)
+    parser.add_argument("--rooms-per-property", type=int, default=4)
+    parser.add_argument("--images", type=int, default=3)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "benchmark")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "benchmark")
+
+    properties, rooms = _search_response(args.properties, args.rooms_per_property, args.images)
+    urls = len(properties) * args.images + len(rooms) * args.images
+    uncached = S3AssetStorage(BUCKET, region_name="us-east-1")
+    cached = S3AssetStorage(BUCKET, region_name="us-east-1", url_cache=SignedUrlCache())
+
+    for label, storage in (("no cache", uncached), ("cache", cached)):
+        seconds = timeit.timeit(lambda: _sign_response(storage, properties, rooms), number=args.requests)
+        print(
+            f"{label:>8} | {args.requests} responses x {urls} URLs | {seconds / args.requests * 1000:>7.2f} ms/response"
+        )
+    print(f"cache stats: {cached.url_cache_stats()}")
+
+
+if __name__ == "__main__":
+    main()
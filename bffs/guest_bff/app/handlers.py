@@ -2,16 +2,17 @@ from datetime import datetime, date
 import calendar
 import asyncio
 from decimal import Decimal, ROUND_HALF_UP
-from typing import Any
+from typing import Any, AsyncIterator
 from collections.abc import Mapping
 from uuid import UUID, uuid4
-from fastapi import Depends, HTTPException, Request
+from fastapi import Depends, HTTPException, Query, Request, Response
 from httpx import AsyncClient, HTTPError
 import os
 import boto3
 from jose import jwt
 import httpx
 
+from etag import composite_etag, conditional_headers, not_modified, relay_not_modified, set_etag_headers
 from models.review import Review
 from models.booking import Booking, BookingStatus
 from models.user import UserResponse, UserUpdate
@@ -27,6 +28,10 @@ import logging
 
 logger = logging.getLogger()
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+SERVICE_PAGE_SIZE = 100
+ROOM_LISTING_CHUNK_SIZE = 500
+
 
 class JWTVerifier:
     def __init__(self, jwks_url: str, audience: str, env: str = "local") -> None:
@@ -120,6 +125,46 @@ def _forward_auth_headers(request: Request) -> dict[str, str]:
             headers["X-User-Id"] = xuid
     return headers
 
+
+async def _iter_service_pages(
+    client: AsyncClient,
+    path: str,
+    headers: dict[str, str],
+    params: dict[str, Any] | None = None,
+    page_size: int = SERVICE_PAGE_SIZE,
+) -> AsyncIterator[list[dict[str, Any]]]:
+    cursor: str | None = None
+    while True:
+        page_params = {**(params or {}), "limit": page_size}
+        if cursor:
+            page_params["cursor"] = cursor
+        response = await client.get(path, params=page_params, timeout=10.0, headers=headers or None)
+        if response.status_code != 200:
+            raise HTTPException(status_code=response.status_code, detail=response.text)
+        yield response.json() or []
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            return
+
+
+async def _fetch_batch(
+    client: AsyncClient,
+    path: str,
+    uuids: list[UUID],
+    headers: dict[str, str],
+    fields: list[str] | None = None,
+) -> list[dict[str, Any]]:
+    if not uuids:
+        return []
+    payload: dict[str, Any] = {"uuids": [str(item_uuid) for item_uuid in uuids]}
+    if fields:
+        payload["fields"] = fields
+    response = await client.post(path, json=payload, timeout=10.0, headers=headers or None)
+    if response.status_code != 200:
+        raise HTTPException(status_code=response.status_code, detail=response.text)
+    return response.json() or []
+
+
 def _extract_room_value(room_payload: Any, key: str) -> Any:
     if isinstance(room_payload, Mapping):
         return room_payload.get(key)
@@ -248,31 +293,36 @@ async def search_places(text: str,  index_name: str = Depends(get_place_index))
 async def fetch_property(
     property_uuid: UUID,
     request: Request,
+    response: Response,
     check_in_date: date | None = None,
     check_out_date: date | None = None,
     property_service_client: AsyncClient = Depends(get_property_service_client),
     booking_service_client: AsyncClient = Depends(get_booking_service_client),
 ) -> PropertyDetail:
     headers = _forward_auth_headers(request)
-    resp = await property_service_client.get(
-        f"property/{str(property_uuid)}",
-        timeout=10.0,
-        headers=headers or None,
+    resp, rooms_resp = await asyncio.gather(
+        property_service_client.get(
+            f"property/{str(property_uuid)}",
+            timeout=10.0,
+            headers=headers or None,
+        ),
+        property_service_client.get(
+            "rooms",
+            params={"property_uuid": str(property_uuid)},
+            timeout=10.0,
+            headers=headers or None,
+        ),
     )
     if resp.status_code != 200:
         raise HTTPException(status_code=resp.status_code, detail=resp.text)
     data = resp.json() or {}
 
-    rooms_resp = await property_service_client.get(
-        "rooms",
-        params={"property_uuid": str(property_uuid)},
-        timeout=10.0,
-        headers=headers or None,
-    )
     rooms_payload = rooms_resp.json() if rooms_resp.status_code == 200 else []
 
     normalized_check_in = _normalize_date(check_in_date)
     normalized_check_out = _normalize_date(check_out_date)
+    upstream_etags = [resp.headers.get("etag"), rooms_resp.headers.get("etag") if rooms_resp.status_code == 200 else None]
+    availability_map: dict[str, Any] | None = None
 
     if rooms_payload and normalized_check_in and normalized_check_out:
         room_ids = [str(room.get("uuid") or room.get("id")) for room in rooms_payload if room.get("uuid") or room.get("id")]
@@ -309,11 +359,19 @@ async def fetch_property(
 
     data["rooms"] = rooms_payload
 
+    # Prices for a check-in date are tiered by how far away it is, so they change with today's date.
+    price_date = date.today() if normalized_check_in else None
+    etag = composite_etag(upstream_etags, normalized_check_in, normalized_check_out, availability_map, price_date)
+    unchanged = not_modified(request, etag)
+    if unchanged:
+        return unchanged # type: ignore
+    set_etag_headers(response, etag)
     return PropertyDetail(**data)
 
 async def fetch_room(
     room_uuid: UUID,
     request: Request,
+    response: Response,
     check_in_date: date | None = None,
     property_service_client: AsyncClient = Depends(get_property_service_client),
 ) -> Room:
@@ -325,9 +383,16 @@ async def fetch_room(
     )
     if resp.status_code != 200:
         raise HTTPException(status_code=resp.status_code, detail=resp.text)
-    data = resp.json()
 
     normalized_check_in = _normalize_date(check_in_date)
+    price_date = date.today() if normalized_check_in else None
+    etag = composite_etag([resp.headers.get("etag")], normalized_check_in, price_date)
+    unchanged = not_modified(request, etag)
+    if unchanged:
+        return unchanged # type: ignore
+    set_etag_headers(response, etag)
+    data = resp.json()
+
     if normalized_check_in:
         nightly_decimal = _determine_nightly_price(data, normalized_check_in)
         data['price_per_night'] = float(_quantize_currency(nightly_decimal))
@@ -601,36 +666,27 @@ async def add_booking(
         room_uuid = booking.get("room_uuid") if isinstance(booking, dict) else None
         check_in = booking.get("check_in") if isinstance(booking, dict) else None
         if room_uuid:
-            room_response = await property_service_client.get(
-                f"room/{str(room_uuid)}",
-                timeout=10.0,
-                headers=headers or None,
+            rooms = await _fetch_batch(
+                property_service_client, "rooms/batch", [room_uuid], headers, fields=["property_uuid"],
             )
-            if room_response.status_code == 200:
-                room_body = room_response.json()
-                room_obj = Room(**room_body)
-                prop_uuid =room_obj.property_uuid
-                if prop_uuid:
-                    prop_resp = await property_service_client.get(
-                        f"property/{str(prop_uuid)}",
-                        timeout=10.0,
-                        headers=headers or None,
-                    )
-                    if prop_resp.status_code == 200:
-                        prop_body = prop_resp.json()
-                        prop_obj = Property(**prop_body)
-                        property_name = prop_obj.name
-                        host_uuid = prop_obj.user_uuid
-                        if host_uuid:
-                            user_resp = await user_service_client.get(
-                                f"user/{str(host_uuid)}",
-                                headers=headers or None,
-                                timeout=10.0,
-                            )
-                            if user_resp.status_code == 200:
-                                user_body = user_resp.json()
-                                user_obj = UserResponse(**user_body)
-                                host_email = user_obj.email
+            prop_uuid = rooms[0].get("property_uuid") if rooms else None
+            if prop_uuid:
+                properties = await _fetch_batch(
+                    property_service_client, "properties/batch", [prop_uuid], headers, fields=["name", "user_uuid"],
+                )
+                if properties:
+                    property_name = properties[0].get("name")
+                    host_uuid = properties[0].get("user_uuid")
+                    if host_uuid:
+                        user_resp = await user_service_client.get(
+                            f"user/{str(host_uuid)}",
+                            headers=headers or None,
+                            timeout=10.0,
+                        )
+                        if user_resp.status_code == 200:
+                            user_body = user_resp.json()
+                            user_obj = UserResponse(**user_body)
+                            host_email = user_obj.email
 
         event_bus.put_event(
             detail_type="BookingConfirmed",
@@ -718,14 +774,18 @@ async def update_current_user(
 async def get_property_reviews(
     property_uuid: UUID,
     request: Request,
+    response: Response,
     review_service_client: AsyncClient = Depends(get_review_service_client),
 ) -> list[Review]:
-    headers = _forward_auth_headers(request)
+    headers = conditional_headers(request, _forward_auth_headers(request))
     resp = await review_service_client.get(
         f"reviews/{str(property_uuid)}",
         timeout=10.0,
         headers=headers or None,
     )
+    unchanged = relay_not_modified(resp, response)
+    if unchanged:
+        return unchanged # type: ignore
     if resp.status_code != 200:
         raise HTTPException(status_code=resp.status_code, detail=resp.text)
     reviews_response = resp.json() or []
@@ -735,14 +795,18 @@ async def get_property_reviews(
 async def get_user_reviews(
     user_uuid: UUID,
     request: Request,
+    response: Response,
     review_service_client: AsyncClient = Depends(get_review_service_client),
 ) -> list[Review]:
-    headers = _forward_auth_headers(request)
+    headers = conditional_headers(request, _forward_auth_headers(request))
     resp = await review_service_client.get(
         f"reviews/{str(user_uuid)}",
         timeout=10.0,
         headers=headers or None,
     )
+    unchanged = relay_not_modified(resp, response)
+    if unchanged:
+        return unchanged # type: ignore
     if resp.status_code != 200:
         raise HTTPException(status_code=resp.status_code, detail=resp.text)
     reviews_response = resp.json() or []
@@ -756,6 +820,8 @@ async def get_filtered_rooms(
     amenities: list[Amenity] | None = None,
     capacity: int | None = None,
     max_price: float | None = None,
+    min_price: float | None = None,
+    rooms_per_property: int | None = Query(default=None, ge=1),
     country: str | None = None,
     state: str | None = None,
     city: str | None = None,
@@ -768,7 +834,39 @@ async def get_filtered_rooms(
     property_service_client: AsyncClient = Depends(get_property_service_client),
 ):
     headers = _forward_auth_headers(request)
-    properties = []
+    room_results: list[PropertyDetail]= []
+    room_filter_params: dict[str, Any] = {}
+    if capacity is not None:
+        room_filter_params["capacity"] = capacity
+    if max_price is not None:
+        room_filter_params["max_price_per_night"] = max_price
+    if min_price is not None:
+        room_filter_params["min_price_per_night"] = min_price
+    if rooms_per_property is not None:
+        room_filter_params["limit_per_property"] = rooms_per_property
+    if amenities:
+        room_filter_params["amenities"] = [{"name": a.name} for a in amenities]
+
+    async def load_rooms(properties: list[Property]) -> None:
+        for start in range(0, len(properties), ROOM_LISTING_CHUNK_SIZE):
+            chunk = properties[start:start + ROOM_LISTING_CHUNK_SIZE]
+            rooms_result = await property_service_client.post(
+                "rooms/by-properties",
+                json={"property_uuids": [str(property.uuid) for property in chunk], **room_filter_params},
+                timeout=10.0,
+                headers=headers or None,
+            )
+            if rooms_result.status_code != 200:
+                raise HTTPException(status_code=rooms_result.status_code, detail=rooms_result.text)
+            rooms_by_property = {
+                group["property_uuid"]: group.get("rooms") or []
+                for group in rooms_result.json() or []
+            }
+            for property in chunk:
+                prop_detail = PropertyDetail(**property.model_dump())
+                prop_detail.rooms = [Room(**room) for room in rooms_by_property.get(str(property.uuid), [])]
+                room_results.append(prop_detail)
+
     if latitude is not None and longitude is not None and (radius_km is not None):
         prop_resp = await property_service_client.get(
             "properties/near",
@@ -785,49 +883,16 @@ async def get_filtered_rooms(
         )
         if prop_resp.status_code != 200:
             raise HTTPException(status_code=prop_resp.status_code, detail=prop_resp.text)
-        properties = [Property(**p) for p in (prop_resp.json() or [])]
+        await load_rooms([Property(**p) for p in (prop_resp.json() or [])])
     elif country and city:
         params = {"country": country, "city": city}
         if state:
             params["state"] = state
-        property_response = await property_service_client.get(
-            "properties/city",
-            params=params,
-            timeout=10.0,
-            headers=headers or None,
-        )
-        if property_response.status_code != 200:
-            raise HTTPException(status_code=property_response.status_code, detail=property_response.text)
-        property_response = property_response.json()
-        properties = [Property(**property) for property in property_response]
-
-    room_results: list[PropertyDetail]= []
-    room_filter_params = {}
-    if capacity is not None:
-        room_filter_params["capacity"] = capacity
-    if max_price is not None:
-        room_filter_params["max_price_per_night"] = max_price
-    if amenities:
-        room_filter_params["amenities"] = [a.name for a in amenities]
+        async for page in _iter_service_pages(property_service_client, "properties/city", headers, params):
+            await load_rooms([Property(**property) for property in page])
 
-    if not properties:
+    if not room_results:
         return []
-    for property in properties:
-        params = {"property_uuid": str(property.uuid)}
-        params.update(room_filter_params)
-        rooms_result = await property_service_client.get(
-            "rooms",
-            params=params,
-            timeout=10.0,
-            headers=headers or None,
-        )
-        if rooms_result.status_code != 200:
-            raise HTTPException(status_code=rooms_result.status_code, detail=rooms_result.text)
-        rooms_result = rooms_result.json()
-        prop_detail = PropertyDetail(**property.model_dump())
-        prop_detail.rooms = [Room(**room) for room in rooms_result]
-        room_results.append(prop_detail)
-
 
     available_room_entries: list[PropertyDetail] = []
     date_filtered = bool(check_in_date and check_out_date)
@@ -906,4 +971,9 @@ async def get_filtered_rooms(
     if rating_above:
         available_room_entries = list(filter(lambda x: x.average_rating and x.average_rating>=rating_above, available_room_entries))
 
+    if latitude is not None and longitude is not None and radius_km is not None:
+        available_room_entries.sort(
+            key=lambda x: x.distance_km if x.distance_km is not None else float("inf")
+        )
+
     return available_room_entries
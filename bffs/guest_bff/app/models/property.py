@@ -12,6 +12,8 @@ class Amenity(BaseModel):
 class Image(BaseModel):
     key: str = Field(description="S3 object key")
     url: str | None = Field(default=None, description="Pre-signed URL giving temporary access to the image")
+    original_url: str | None = Field(default=None, description="Pre-signed URL of the original, used until the variant exists")
+    variants: dict[str, str] | None = Field(default=None, description="S3 object keys of resized image variants")
 
 
 class RoomType(str, Enum):
@@ -59,6 +61,7 @@ class Property(BaseModel):
     stars: int | None = Field(description="Number of stard", default=1)
     place_id: str | None = Field(description="AWS location place id", default=None)
     images: list[Image] | None = Field(description="Property images", default=[])
+    distance_km: float | None = Field(description="Distance from the searched point in km", default=None)
 
 
 class PropertyDetail(Property):
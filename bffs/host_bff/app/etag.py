@@ -0,0 +1,53 @@
+import hashlib
+import json
+from typing import Any
+
+import httpx
+from fastapi import Request, Response
+
+ETAG_CACHE_CONTROL = "private, no-cache"
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def composite_etag(upstream_etags: list[str | None], *extra: Any) -> str | None:
+    # The property service's tags change with its image URL signing window, so a 304 built from
+    # them never outlives the signed URLs in the client's cached body.
+    if not upstream_etags or any(etag is None for etag in upstream_etags):
+        return None
+    body = json.dumps([upstream_etags, *extra], sort_keys=True, default=str)
+    return f'"{hashlib.sha256(body.encode()).hexdigest()[:32]}"'
+
+
+def set_etag_headers(response: Response, etag: str | None) -> None:
+    if etag:
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = ETAG_CACHE_CONTROL
+
+
+def not_modified(request: Request, etag: str | None) -> Response | None:
+    if not etag or not etag_matches(request.headers.get("if-none-match"), etag):
+        return None
+    response = Response(status_code=304)
+    set_etag_headers(response, etag)
+    return response
+
+
+def conditional_headers(request: Request, headers: dict[str, str]) -> dict[str, str]:
+    if_none_match = request.headers.get("if-none-match")
+    return {**headers, "If-None-Match": if_none_match} if if_none_match else headers
+
+
+def relay_not_modified(upstream: httpx.Response, response: Response) -> Response | None:
+    etag = upstream.headers.get("etag")
+    if upstream.status_code == 304:
+        unchanged = Response(status_code=304)
+        set_etag_headers(unchanged, etag)
+        return unchanged
+    set_etag_headers(response, etag)
+    return None
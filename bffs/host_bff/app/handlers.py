@@ -1,20 +1,46 @@
 from datetime import datetime
 import asyncio
-from typing import Any
+import json
+from typing import Any, AsyncIterator
 from uuid import UUID
-from fastapi import Depends, HTTPException, Request
+from fastapi import Depends, HTTPException, Query, Request, Response
 from httpx import AsyncClient, HTTPError
 from jose import jwt
 import httpx
 
+from etag import composite_etag, conditional_headers, not_modified, relay_not_modified, set_etag_headers
 from models.review import Review
 from models.booking import Booking, BookingStatus
 from models.user import UserResponse, UserUpdate
-from models.property import Availability, Property, PropertyDetail, Room
-from models.asset import AssetUploadRequest, AssetUploadResponse
+from models.property import (
+    Availability,
+    ImportItemResult,
+    ImportReport,
+    ImportStatus,
+    Property,
+    PropertyDetail,
+    Room,
+)
+from models.asset import (
+    AssetUploadRequest,
+    AssetUploadResponse,
+    BatchAssetUploadRequest,
+    MultipartAbortRequest,
+    MultipartCompleteRequest,
+    MultipartPartUrl,
+    MultipartPartUrlsRequest,
+    MultipartUploadRequest,
+    MultipartUploadResponse,
+)
 import os
 import boto3
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+SERVICE_PAGE_SIZE = 100
+ROOM_LISTING_CHUNK_SIZE = 500
+IMPORT_CHUNK_SIZE = 200
+IMPORT_MAX_CONCURRENCY = 4
+
 
 class JWTVerifier:
     def __init__(self, jwks_url: str | None = None, audience: str | None = None, env: str = "local") -> None:
@@ -114,6 +140,27 @@ def _forward_auth_headers(request: Request) -> dict[str, str]:
     return headers
 
 
+async def _iter_service_pages(
+    client: AsyncClient,
+    path: str,
+    headers: dict[str, str],
+    params: dict[str, Any] | None = None,
+    page_size: int = SERVICE_PAGE_SIZE,
+) -> AsyncIterator[list[dict[str, Any]]]:
+    cursor: str | None = None
+    while True:
+        page_params = {**(params or {}), "limit": page_size}
+        if cursor:
+            page_params["cursor"] = cursor
+        response = await client.get(path, params=page_params, headers=headers or None)
+        if response.status_code != 200:
+            raise HTTPException(status_code=response.status_code, detail=response.text)
+        yield response.json() or []
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            return
+
+
 def _extract_image_key(image: Any) -> str | None:
     if isinstance(image, dict):
         return image.get("key")
@@ -165,55 +212,80 @@ async def search_places(
     return results
 
 
-async def get_user_properties(
-    request: Request,
-    current_user_uuid: UUID = Depends(get_current_user_uuid),
-    property_service_client: AsyncClient = Depends(get_property_service_client)
-) -> list[PropertyDetail]:
-    headers = _forward_auth_headers(request)
-
-    response = await property_service_client.get(
-        f"user/{str(current_user_uuid)}/properties",
-        headers=headers or None,
-    )
-    if response.status_code != 200:
-        raise HTTPException(status_code=response.status_code, detail=response.text)
-
-    response_body = response.json()
-    property_details = [PropertyDetail(**prop) for prop in response_body]
-
-    for property_detail in property_details:
-        rooms_response = await property_service_client.get(
-            f"rooms/{str(property_detail.uuid)}",
+async def _attach_rooms(
+    property_details: list[PropertyDetail],
+    headers: dict[str, str],
+    property_service_client: AsyncClient,
+) -> None:
+    for start in range(0, len(property_details), ROOM_LISTING_CHUNK_SIZE):
+        chunk = property_details[start:start + ROOM_LISTING_CHUNK_SIZE]
+        rooms_response = await property_service_client.post(
+            "rooms/by-properties",
+            json={"property_uuids": [str(property_detail.uuid) for property_detail in chunk]},
             headers=headers or None,
         )
         if rooms_response.status_code != 200:
             raise HTTPException(status_code=rooms_response.status_code, detail=rooms_response.text)
+        rooms_by_property = {
+            group["property_uuid"]: group.get("rooms") or []
+            for group in rooms_response.json() or []
+        }
+        for property_detail in chunk:
+            property_detail.rooms = [Room(**room) for room in rooms_by_property.get(str(property_detail.uuid), [])]
 
-        rooms_response_body = rooms_response.json()
-        property_detail.rooms = [Room(**room) for room in rooms_response_body]
 
+async def get_user_properties(
+    request: Request,
+    response: Response,
+    limit: int | None = Query(default=None, ge=1, le=SERVICE_PAGE_SIZE),
+    cursor: str | None = None,
+    current_user_uuid: UUID = Depends(get_current_user_uuid),
+    property_service_client: AsyncClient = Depends(get_property_service_client)
+) -> list[PropertyDetail]:
+    headers = _forward_auth_headers(request)
+    path = f"user/{str(current_user_uuid)}/properties"
+
+    if limit is not None:
+        params: dict[str, Any] = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        page_response = await property_service_client.get(path, params=params, headers=headers or None)
+        if page_response.status_code != 200:
+            raise HTTPException(status_code=page_response.status_code, detail=page_response.text)
+        property_details = [PropertyDetail(**prop) for prop in page_response.json() or []]
+        await _attach_rooms(property_details, headers, property_service_client)
+        next_cursor = page_response.headers.get(NEXT_CURSOR_HEADER)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        return property_details
+
+    property_details = []
+    async for page in _iter_service_pages(property_service_client, path, headers):
+        page_details = [PropertyDetail(**prop) for prop in page]
+        await _attach_rooms(page_details, headers, property_service_client)
+        property_details.extend(page_details)
     return property_details
 
 
 async def get_property_detail(
     property_uuid: UUID,
     request: Request,
+    response: Response,
     current_user_uuid: UUID = Depends(get_current_user_uuid),
     property_service_client: AsyncClient = Depends(get_property_service_client),
 ) -> PropertyDetail:
     headers = _forward_auth_headers(request)
 
-    response = await property_service_client.get(
+    property_response = await property_service_client.get(
         f"property/{str(property_uuid)}",
         headers=headers or None,
     )
-    if response.status_code == 404:
+    if property_response.status_code == 404:
         raise HTTPException(status_code=404, detail="Property not found")
-    if response.status_code != 200:
-        raise HTTPException(status_code=response.status_code, detail=response.text)
+    if property_response.status_code != 200:
+        raise HTTPException(status_code=property_response.status_code, detail=property_response.text)
 
-    detail_payload = response.json() or {}
+    detail_payload = property_response.json() or {}
     detail = PropertyDetail(**detail_payload)
 
     if detail.user_uuid != current_user_uuid:
@@ -229,6 +301,11 @@ async def get_property_detail(
     if rooms_response.status_code != 200:
         raise HTTPException(status_code=rooms_response.status_code, detail=rooms_response.text)
 
+    etag = composite_etag([property_response.headers.get("etag"), rooms_response.headers.get("etag")])
+    unchanged = not_modified(request, etag)
+    if unchanged:
+        return unchanged # type: ignore
+    set_etag_headers(response, etag)
     rooms_payload = rooms_response.json() or []
     detail.rooms = [Room(**room) for room in rooms_payload]
 
@@ -268,6 +345,74 @@ async def add_property(
 
     return prop_uuid
 
+def _owned_import_lines(body: bytes, content_type: str, user_uuid: UUID) -> list[str]:
+    if "ndjson" in content_type or "jsonl" in content_type:
+        raw_lines = [line for line in body.decode().splitlines() if line.strip()]
+    else:
+        try:
+            payload = json.loads(body or b"[]")
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=f"Invalid JSON: {exc}") from exc
+        if not isinstance(payload, list):
+            raise HTTPException(status_code=400, detail="Expected a JSON array or NDJSON of properties")
+        raw_lines = [json.dumps(record) for record in payload]
+
+    lines: list[str] = []
+    for line in raw_lines:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            # Left as is so the property service reports it in place.
+            lines.append(line)
+            continue
+        if isinstance(record, dict):
+            record["user_uuid"] = str(user_uuid)
+        lines.append(json.dumps(record))
+    return lines
+
+
+async def import_properties(
+    request: Request,
+    current_user_uuid: UUID = Depends(get_current_user_uuid),
+    property_service_client: AsyncClient = Depends(get_property_service_client),
+) -> ImportReport:
+    headers = _forward_auth_headers(request)
+    lines = _owned_import_lines(
+        await request.body(), request.headers.get("content-type", ""), current_user_uuid,
+    )
+    semaphore = asyncio.Semaphore(IMPORT_MAX_CONCURRENCY)
+
+    async def import_chunk(offset: int) -> list[ImportItemResult]:
+        chunk = lines[offset:offset + IMPORT_CHUNK_SIZE]
+        async with semaphore:
+            response = await property_service_client.post(
+                "properties/import",
+                content="\n".join(chunk),
+                headers={**headers, "content-type": "application/x-ndjson"},
+                timeout=30.0,
+            )
+        if response.status_code != 200:
+            return [
+                ImportItemResult(index=offset + i, status=ImportStatus.FAILED, error=response.text)
+                for i in range(len(chunk))
+            ]
+        results = ImportReport(**response.json()).results
+        for result in results:
+            result.index += offset
+        return results
+
+    chunk_results = await asyncio.gather(*(
+        import_chunk(offset) for offset in range(0, len(lines), IMPORT_CHUNK_SIZE)
+    ))
+    results = [result for chunk in chunk_results for result in chunk]
+    return ImportReport(
+        imported_properties=sum(1 for result in results if result.status != ImportStatus.FAILED),
+        imported_rooms=sum(len(result.room_uuids) for result in results),
+        failed=sum(1 for result in results if result.status == ImportStatus.FAILED),
+        results=results,
+    )
+
+
 async def update_property(
     property_uuid: UUID,
     property: PropertyDetail,
@@ -277,42 +422,30 @@ async def update_property(
 ) -> PropertyDetail:
     headers = _forward_auth_headers(request)
 
-    existing_response = await property_service_client.get(
-        f"property/{str(property_uuid)}",
-        headers=headers or None,
-    )
-    if existing_response.status_code == 404:
-        raise HTTPException(status_code=404, detail="Property not found")
-    if existing_response.status_code != 200:
-        raise HTTPException(status_code=existing_response.status_code, detail=existing_response.text)
-
-    existing_payload = existing_response.json() or {}
-    existing = PropertyDetail(**existing_payload)
-    if existing.user_uuid != current_user_uuid:
-        raise HTTPException(status_code=403, detail="Forbidden")
-
+    # The property service only applies the update when current_user_uuid owns the property.
     property.uuid = property_uuid
     property.user_uuid = current_user_uuid
 
-    prop = Property(**property.model_dump())
-    prop_payload = prop.model_dump(mode="json", exclude_none=True)
+    prop = Property(**property.model_dump(exclude_unset=True))
+    prop_payload = prop.model_dump(mode="json", exclude_unset=True)
     _normalize_images_field(prop_payload)
 
-    response = await property_service_client.put(
-        f"property/{str(property_uuid)}",
-        json=prop_payload,
-        headers=headers or None,
+    response, rooms_response = await asyncio.gather(
+        property_service_client.put(
+            f"property/{str(property_uuid)}",
+            json=prop_payload,
+            headers=headers or None,
+        ),
+        property_service_client.get(
+            f"rooms/{str(property_uuid)}",
+            headers=headers or None,
+        ),
     )
     if response.status_code != 200:
         raise HTTPException(status_code=response.status_code, detail=response.text)
 
     detail_payload = response.json() or {}
     detail = PropertyDetail(**detail_payload)
-
-    rooms_response = await property_service_client.get(
-        f"rooms/{str(property_uuid)}",
-        headers=headers or None,
-    )
     if rooms_response.status_code == 200:
         rooms_payload = rooms_response.json() or []
         detail.rooms = [Room(**room) for room in rooms_payload]
@@ -345,37 +478,30 @@ async def update_room(
     property_service_client: AsyncClient = Depends(get_property_service_client),
 ) -> Room:
     headers = _forward_auth_headers(request)
-    room_payload = room.model_dump(mode="json", exclude_none=True)
+    room_payload = room.model_dump(mode="json", exclude_unset=True)
     room_payload["uuid"] = str(room_uuid)
     _normalize_images_field(room_payload)
 
     response = await property_service_client.put(
-        "room",
+        f"room/{str(room_uuid)}",
         json=room_payload,
         headers=headers or None,
     )
     if response.status_code != 200:
         raise HTTPException(status_code=response.status_code, detail=response.text)
+    return Room(**response.json())
 
-    fetch_response = await property_service_client.get(
-        f"room/{str(room_uuid)}",
-        headers=headers or None,
-    )
-    if fetch_response.status_code != 200:
-        raise HTTPException(status_code=fetch_response.status_code, detail=fetch_response.text)
-
-    return Room(**fetch_response.json())
 
-
-async def create_asset_upload_url(
-    payload: AssetUploadRequest,
+async def _post_asset_request(
+    property_service_client: AsyncClient,
+    path: str,
+    payload: Any,
     request: Request,
-    property_service_client: AsyncClient = Depends(get_property_service_client),
-) -> AssetUploadResponse:
+) -> Any:
     headers = _forward_auth_headers(request)
     try:
         response = await property_service_client.post(
-            "assets/upload-url",
+            path,
             json=payload.model_dump(mode="json", exclude_none=True),
             headers=headers or None,
         )
@@ -383,7 +509,59 @@ async def create_asset_upload_url(
         raise HTTPException(status_code=502, detail=str(exc)) from exc
     if response.status_code != 200:
         raise HTTPException(status_code=response.status_code, detail=response.text)
-    return AssetUploadResponse(**response.json())
+    return response.json()
+
+
+async def create_asset_upload_url(
+    payload: AssetUploadRequest,
+    request: Request,
+    property_service_client: AsyncClient = Depends(get_property_service_client),
+) -> AssetUploadResponse:
+    data = await _post_asset_request(property_service_client, "assets/upload-url", payload, request)
+    return AssetUploadResponse(**data)
+
+
+async def create_asset_upload_urls(
+    payload: BatchAssetUploadRequest,
+    request: Request,
+    property_service_client: AsyncClient = Depends(get_property_service_client),
+) -> list[AssetUploadResponse]:
+    data = await _post_asset_request(property_service_client, "assets/upload-urls", payload, request)
+    return [AssetUploadResponse(**upload) for upload in data]
+
+
+async def create_multipart_upload(
+    payload: MultipartUploadRequest,
+    request: Request,
+    property_service_client: AsyncClient = Depends(get_property_service_client),
+) -> MultipartUploadResponse:
+    data = await _post_asset_request(property_service_client, "assets/multipart-upload", payload, request)
+    return MultipartUploadResponse(**data)
+
+
+async def create_multipart_part_urls(
+    payload: MultipartPartUrlsRequest,
+    request: Request,
+    property_service_client: AsyncClient = Depends(get_property_service_client),
+) -> list[MultipartPartUrl]:
+    data = await _post_asset_request(property_service_client, "assets/multipart-upload/part-urls", payload, request)
+    return [MultipartPartUrl(**part) for part in data]
+
+
+async def complete_multipart_upload(
+    payload: MultipartCompleteRequest,
+    request: Request,
+    property_service_client: AsyncClient = Depends(get_property_service_client),
+) -> str:
+    return await _post_asset_request(property_service_client, "assets/multipart-upload/complete", payload, request)
+
+
+async def abort_multipart_upload(
+    payload: MultipartAbortRequest,
+    request: Request,
+    property_service_client: AsyncClient = Depends(get_property_service_client),
+) -> str:
+    return await _post_asset_request(property_service_client, "assets/multipart-upload/abort", payload, request)
 
 async def delete_room(
     room_uuid: UUID,
@@ -560,14 +738,18 @@ async def update_current_user(
 async def get_property_reviews(
     property_uuid: UUID,
     request: Request,
+    response: Response,
     review_service_client: AsyncClient = Depends(get_review_service_client),
 ) -> list[Review]:
-    headers = _forward_auth_headers(request)
+    headers = conditional_headers(request, _forward_auth_headers(request))
     resp = await review_service_client.get(
         f"reviews/{str(property_uuid)}",
         timeout=10.0,
         headers=headers or None,
     )
+    unchanged = relay_not_modified(resp, response)
+    if unchanged:
+        return unchanged # type: ignore
     if resp.status_code != 200:
         raise HTTPException(status_code=resp.status_code, detail=resp.text)
     reviews_response = resp.json() or []
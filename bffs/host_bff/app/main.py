@@ -44,7 +44,8 @@ def create_app() -> FastAPI:
         allow_origins=["*"],
         allow_credentials=True,
         allow_methods=["*"],
-        allow_headers=["*"]
+        allow_headers=["*"],
+        expose_headers=["X-Next-Cursor"],
     )
 
     app.include_router(router)
@@ -11,3 +11,51 @@ class AssetUploadResponse(BaseModel):
     key: str = Field(description="Generated S3 object key")
     upload_url: str = Field(description="Pre-signed URL to upload the asset")
     fields: dict[str, str] = Field(default_factory=dict, description="Form fields for the POST upload")
+
+
+class BatchAssetUploadRequest(BaseModel):
+    uploads: list[AssetUploadRequest] = Field(
+        description="Assets to upload, responses keep this order", min_length=1, max_length=50
+    )
+
+
+class MultipartUploadRequest(BaseModel):
+    prefix: str = Field(description="Folder prefix where the asset will be stored")
+    content_type: str = Field(description="Content type of the asset to upload")
+    size_bytes: int = Field(description="Size of the asset in bytes", gt=0)
+    extension: str | None = Field(default=None, description="Optional file extension to append to the key")
+
+
+class MultipartPartUrl(BaseModel):
+    part_number: int = Field(description="Number of the part, starting at 1")
+    url: str = Field(description="Pre-signed URL to PUT the part to")
+
+
+class MultipartUploadResponse(BaseModel):
+    key: str = Field(description="Generated S3 object key")
+    upload_id: str = Field(description="Multipart upload id")
+    part_size: int = Field(description="Size in bytes of every part but the last")
+    part_count: int = Field(description="Number of parts the asset must be split into")
+    parts: list[MultipartPartUrl] = Field(description="Upload URLs of the first parts")
+
+
+class MultipartPartUrlsRequest(BaseModel):
+    key: str = Field(description="S3 object key of the multipart upload")
+    upload_id: str = Field(description="Multipart upload id")
+    part_numbers: list[int] = Field(description="Numbers of the parts to sign", min_length=1, max_length=100)
+
+
+class MultipartPart(BaseModel):
+    part_number: int = Field(description="Number of the uploaded part")
+    etag: str = Field(description="ETag returned by S3 for the part")
+
+
+class MultipartCompleteRequest(BaseModel):
+    key: str = Field(description="S3 object key of the multipart upload")
+    upload_id: str = Field(description="Multipart upload id")
+    parts: list[MultipartPart] = Field(description="All uploaded parts", min_length=1)
+
+
+class MultipartAbortRequest(BaseModel):
+    key: str = Field(description="S3 object key of the multipart upload")
+    upload_id: str = Field(description="Multipart upload id")
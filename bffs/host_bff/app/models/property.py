@@ -14,6 +14,8 @@ class Amenity(BaseModel):
 class Image(BaseModel):
     key: str = Field(description="S3 object key")
     url: str | None = Field(default=None, description="Pre-signed URL to access the asset")
+    original_url: str | None = Field(default=None, description="Pre-signed URL of the original, used until the variant exists")
+    variants: dict[str, str] | None = Field(default=None, description="S3 object keys of resized image variants")
 
 
 class RoomType(str, Enum):
@@ -72,3 +74,25 @@ class Availability(Room):
 class PropertyDetail(Property):
     rooms: list[Room] | None = Field(description="Property rooms", default=[])
     average_rating: float | None = Field(description="Property average rating", default=None)
+
+
+class ImportStatus(str, Enum):
+    IMPORTED = "imported"
+    PARTIAL = "partial"
+    FAILED = "failed"
+
+
+class ImportItemResult(BaseModel):
+    index: int = Field(description="Position of the property in the import payload")
+    property_uuid: UUID | None = Field(default=None, description="UUID of the imported property")
+    status: ImportStatus = Field(description="Outcome for the property and its rooms")
+    error: str | None = Field(default=None, description="Why the property was not imported")
+    room_uuids: list[UUID] = Field(default=[], description="UUIDs of the imported rooms")
+    room_errors: dict[int, str] = Field(default={}, description="Errors of rooms that were not imported, by position")
+
+
+class ImportReport(BaseModel):
+    imported_properties: int = Field(description="Number of imported properties")
+    imported_rooms: int = Field(description="Number of imported rooms")
+    failed: int = Field(description="Number of properties that were not imported")
+    results: list[ImportItemResult] = Field(description="Per-property results in payload order")
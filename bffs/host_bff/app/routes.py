@@ -9,6 +9,11 @@ from handlers import (
     update_room,
     change_booking_status,
     create_asset_upload_url,
+    create_asset_upload_urls,
+    create_multipart_upload,
+    create_multipart_part_urls,
+    complete_multipart_upload,
+    abort_multipart_upload,
     delete_property,
     delete_room,
     get_bookings,
@@ -16,12 +21,13 @@ from handlers import (
     get_property_reviews,
     get_property_detail,
     get_user_properties,
+    import_properties,
     search_places,
     update_current_user,
 )
-from models.asset import AssetUploadResponse
+from models.asset import AssetUploadResponse, MultipartPartUrl, MultipartUploadResponse
 from models.booking import Booking
-from models.property import Availability, Property, PropertyDetail, Room
+from models.property import Availability, ImportReport, Property, PropertyDetail, Room
 from models.review import Review
 from models.user import UserResponse
 
@@ -36,6 +42,46 @@ router.add_api_route(
     description="Request a pre-signed S3 upload URL for property or room assets",
 )
 
+router.add_api_route(
+    path="/assets/upload-urls",
+    methods=["POST"],
+    response_model=list[AssetUploadResponse],
+    endpoint=create_asset_upload_urls,
+    description="Request up to 50 pre-signed S3 upload URLs in one call, e.g. for a photo gallery",
+)
+
+router.add_api_route(
+    path="/assets/multipart-upload",
+    methods=["POST"],
+    response_model=MultipartUploadResponse,
+    endpoint=create_multipart_upload,
+    description="Start a multipart upload for video tours and other large assets",
+)
+
+router.add_api_route(
+    path="/assets/multipart-upload/part-urls",
+    methods=["POST"],
+    response_model=list[MultipartPartUrl],
+    endpoint=create_multipart_part_urls,
+    description="Request upload URLs for further parts of a multipart upload",
+)
+
+router.add_api_route(
+    path="/assets/multipart-upload/complete",
+    methods=["POST"],
+    response_model=str,
+    endpoint=complete_multipart_upload,
+    description="Complete a multipart upload and return the asset key",
+)
+
+router.add_api_route(
+    path="/assets/multipart-upload/abort",
+    methods=["POST"],
+    response_model=str,
+    endpoint=abort_multipart_upload,
+    description="Abort a multipart upload",
+)
+
 router.add_api_route(
     path="/properties",
     methods=["GET"],
@@ -60,6 +106,14 @@ router.add_api_route(
     description="Add a new property",
 )
 
+router.add_api_route(
+    path="/properties/import",
+    methods=["POST"],
+    response_model=ImportReport,
+    endpoint=import_properties,
+    description="Bulk import properties with nested rooms from a JSON array or NDJSON body",
+)
+
 router.add_api_route(
     path="/property/{property_uuid}",
     methods=["PATCH"],
@@ -72,6 +72,12 @@ class HostBffStack(Stack):
         assets = self.gateway.root.add_resource("assets")
         assets_url = assets.add_resource("upload-url")
         assets_url.add_method("POST", integration)
+        assets_urls = assets.add_resource("upload-urls")
+        assets_urls.add_method("POST", integration)
+        assets_multipart = assets.add_resource("multipart-upload")
+        assets_multipart.add_method("POST", integration)
+        for action in ("part-urls", "complete", "abort"):
+            assets_multipart.add_resource(action).add_method("POST", integration)
 
         places = self.gateway.root.add_resource("places")
         places_search = places.add_resource("search-text")
@@ -79,6 +85,8 @@ class HostBffStack(Stack):
 
         properties = self.gateway.root.add_resource("properties")
         properties.add_method("GET", integration)
+        properties_import = properties.add_resource("import")
+        properties_import.add_method("POST", integration)
 
         property_res = self.gateway.root.add_resource("property")
         property_res.add_method("POST", integration)
@@ -11,16 +11,31 @@ class AppConfiguration(BaseSettings):
     booking_table_name: str | None = None
     hotel_management_database_secret_name: str | None = None
     db_proxy_endpoint: str | None = None
+    hotel_management_database_url: str | None = None
+    db_pool_strategy: str | None = None
+    db_pool_size: int = 1
+    secret_ttl_seconds: int = 300
+    warm_database_connection: bool = False
     region: str = "us-east-1"
 
 booking_service_prod_configuration = AppConfiguration(
     booking_table_name=os.environ.get("BOOKING_SERVICE_ENV", None),
     hotel_management_database_secret_name=os.environ.get("HOTEL_MANAGEMENT_DATABASE_SECRET_NAME", None),
-    db_proxy_endpoint=os.environ.get("DB_PROXY_ENDPOINT", None)
+    db_proxy_endpoint=os.environ.get("DB_PROXY_ENDPOINT", None),
+    hotel_management_database_url=os.environ.get("HOTEL_MANAGEMENT_DATABASE_URL", None),
+    db_pool_strategy=os.environ.get("DB_POOL_STRATEGY", None),
+    db_pool_size=int(os.environ.get("DB_POOL_SIZE", 1)),
+    secret_ttl_seconds=int(os.environ.get("SECRET_TTL_SECONDS", 300)),
+    warm_database_connection="AWS_LAMBDA_FUNCTION_NAME" in os.environ
 )
 
 booking_service_int_configuration = AppConfiguration(
     booking_table_name=os.environ.get("BOOKING_SERVICE_ENV", None),
     hotel_management_database_secret_name=os.environ.get("HOTEL_MANAGEMENT_DATABASE_SECRET_NAME", None),
-    db_proxy_endpoint=os.environ.get("DB_PROXY_ENDPOINT", None)
+    db_proxy_endpoint=os.environ.get("DB_PROXY_ENDPOINT", None),
+    hotel_management_database_url=os.environ.get("HOTEL_MANAGEMENT_DATABASE_URL", None),
+    db_pool_strategy=os.environ.get("DB_POOL_STRATEGY", None),
+    db_pool_size=int(os.environ.get("DB_POOL_SIZE", 1)),
+    secret_ttl_seconds=int(os.environ.get("SECRET_TTL_SECONDS", 300)),
+    warm_database_connection="AWS_LAMBDA_FUNCTION_NAME" in os.environ
 )
\ No newline at end of file
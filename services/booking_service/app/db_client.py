@@ -1,156 +1,267 @@
-﻿import os
-import json
-from datetime import datetime
+﻿import asyncio
+from datetime import datetime, time, timedelta
 from uuid import UUID
-import boto3
-from sqlalchemy import and_, create_engine
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy import CompoundSelect, Select, and_, func, literal, or_, select, union, union_all
+from sqlalchemy.dialects.postgresql import TSRANGE
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from db_lifecycle import DEFAULT_POOL_SIZE, DEFAULT_SECRET_TTL_SECONDS, DatabaseLifecycle, PoolStrategy
 from schemas import Booking, BookingStatus, BookingUpdateRequest
-from models import BookingDB
+from models import BOOKING_NO_OVERLAP_CONSTRAINT_NAME, BookingDB
+from occupancy import add_nights_statement, occupied_rooms_query, remove_nights_statements
 import logging
 
 logger = logging.getLogger()
 
+
+# asyncpg sends at most 32767 bind parameters with a statement.
+MAX_BIND_PARAMETERS = 32000
+
+
+class BookingConflictError(ValueError):
+    pass
+
+
+def stay_range(check_in: datetime, check_out: datetime):
+    return func.tsrange(check_in, check_out, "[)", type_=TSRANGE)
+
+
+def filtered_bookings_query(user_uuid: UUID | None = None,
+                            room_uuid: UUID | None = None,
+                            status: str | None = None,
+                            check_in: datetime | None = None,
+                            check_out: datetime | None = None) -> Select:
+    query = select(BookingDB)
+    if user_uuid:
+        query = query.where(BookingDB.user_uuid == user_uuid)
+    if room_uuid:
+        query = query.where(BookingDB.room_uuid == room_uuid)
+    if status:
+        query = query.where(BookingDB.status == status)
+    if check_in and check_out:
+        query = query.where(
+            and_(BookingDB.check_in <= check_out, BookingDB.check_out >= check_in)
+        )
+    return query.order_by(BookingDB.check_in.desc())
+
+
+def overlapping_rooms_query(room_uuids: list[UUID], check_in: datetime, check_out: datetime) -> Select:
+    # Inlined so prepared statements can still prove the partial exclusion index predicate.
+    not_cancelled = BookingDB.status != literal(BookingStatus.CANCELLED, BookingDB.status.type, literal_execute=True)
+    return select(BookingDB.room_uuid).where(
+        BookingDB.room_uuid.in_(room_uuids),
+        not_cancelled,
+        BookingDB.stay.overlaps(stay_range(check_in, check_out)),
+    ).distinct()
+
+
+def boundary_rooms_query(room_uuids: list[UUID], check_in: datetime, check_out: datetime) -> Select:
+    # Overlaps that share no night with the stay: bookings leaving on its first day, arriving on its
+    # last day or taking no night at all. The night calendar cannot see them.
+    first_midnight = datetime.combine(check_in.date() + timedelta(days=1), time())
+    last_midnight = datetime.combine(check_out.date(), time())
+    return overlapping_rooms_query(room_uuids, check_in, check_out).where(or_(
+        BookingDB.check_out < first_midnight,
+        BookingDB.check_in >= last_midnight,
+        func.date(BookingDB.check_in) == func.date(BookingDB.check_out),
+    ))
+
+
+def unavailable_rooms_query(
+    room_uuids: list[UUID], check_in: datetime, check_out: datetime
+) -> Select | CompoundSelect:
+    occupied = occupied_rooms_query(room_uuids, check_in, check_out)
+    if occupied is None:
+        return overlapping_rooms_query(room_uuids, check_in, check_out)
+    return union(occupied, boundary_rooms_query(room_uuids, check_in, check_out))
+
+
+def ranges_unavailable_rooms_query(room_uuids: list[UUID], ranges: list[tuple[datetime, datetime]]) -> CompoundSelect:
+    # Rows are (range index, room uuid) for every room taken during that range.
+    tagged = []
+    for index, (check_in, check_out) in enumerate(ranges):
+        unavailable = unavailable_rooms_query(room_uuids, check_in, check_out).subquery()
+        tagged.append(select(literal(index).label("range_index"), unavailable.c.room_uuid))
+    return union_all(*tagged)
+
+
+def _naive(value: datetime | None) -> datetime | None:
+    # timestamp columns keep the wall time, asyncpg refuses aware datetimes for them.
+    return value.replace(tzinfo=None) if value and value.tzinfo else value
+
+
+def _takes_nights(booking: BookingDB) -> bool:
+    return booking.status != BookingStatus.CANCELLED and booking.check_in is not None and booking.check_out is not None
+
+
+def _raise_if_conflict(exc: IntegrityError) -> None:
+    if BOOKING_NO_OVERLAP_CONSTRAINT_NAME in str(exc.orig):
+        raise BookingConflictError("Room is already booked for the requested dates") from exc
+
+
 class HotelManagementDBClient:
-    def __init__(self, hotel_management_database_secret_name: str | None, region: str, proxy_endpoint: str | None) -> None:
-        if not hotel_management_database_secret_name:
-            raise ValueError("Secret name must be provided or set in environment variables.")
-        
-        self.secret_name = hotel_management_database_secret_name
-        self.region = region
-        self._engine = None
-        self._SessionLocal = None
-        self.proxy_endpoint = proxy_endpoint
-
-
-    def _get_secret(self) -> dict:
-        client = boto3.client("secretsmanager", region_name=self.region)
-        response = client.get_secret_value(SecretId=self.secret_name)
-        return json.loads(response["SecretString"])
-
-    def _build_db_url(self) -> str:
-        secret = self._get_secret()
-        username = secret["username"].strip()
-        password = secret["password"].strip()
-        port = str(secret["port"]).strip()
-        dbname = secret["dbname"].strip()
-
-        host = self.proxy_endpoint if self.proxy_endpoint else secret["host"].strip()
-
-        return f"postgresql+psycopg2://{username}:{password}@{host}:{port}/{dbname}"
-
-    def _init_engine(self):
+    def __init__(
+        self,
+        hotel_management_database_secret_name: str | None,
+        region: str,
+        proxy_endpoint: str | None,
+        database_url: str | None = None,
+        pool_strategy: PoolStrategy | str | None = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        secret_ttl_seconds: int = DEFAULT_SECRET_TTL_SECONDS,
+    ) -> None:
+        self.lifecycle = DatabaseLifecycle(
+            drivername="postgresql+asyncpg",
+            region=region,
+            secret_name=hotel_management_database_secret_name,
+            proxy_endpoint=proxy_endpoint,
+            database_url=database_url,
+            pool_strategy=pool_strategy,
+            pool_size=pool_size,
+            secret_ttl_seconds=secret_ttl_seconds,
+        )
+        self._engine: AsyncEngine | None = None
+        self._SessionLocal: async_sessionmaker[AsyncSession] | None = None
+        self._engine_lock = asyncio.Lock()
+
+    async def _init_engine(self) -> None:
+        async with self._engine_lock:
+            if not self._engine:
+                # Secrets Manager is called with blocking boto3, keep it off the event loop.
+                self._engine = await asyncio.to_thread(self.lifecycle.create_async_engine)
+                self._SessionLocal = async_sessionmaker(self._engine, autoflush=False, expire_on_commit=False)
+
+    async def warm(self) -> None:
         if not self._engine:
-            self._engine = create_engine(self._build_db_url())
-            self._SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self._engine)
+            await self._init_engine()
+        await self.lifecycle.warm_async(self._engine)  # type: ignore[arg-type]
+
+    async def get_session(self) -> AsyncSession:
+        if not self._engine:
+            await self._init_engine()
+        return self._SessionLocal()  # type: ignore
+
+    async def dispose(self) -> None:
+        if self._engine:
+            await self._engine.dispose()
 
-    def get_session(self) -> Session:
-        self._init_engine()
-        return self._SessionLocal() # type: ignore
+    async def _locked_booking(self, session: AsyncSession, booking_uuid: UUID) -> BookingDB:
+        booking = (await session.scalars(
+            select(BookingDB).where(BookingDB.uuid == booking_uuid).with_for_update()
+        )).first()
+        if not booking:
+            raise ValueError("Booking not found")
+        return booking
 
-    def add_booking(self, booking: Booking) -> UUID:
-        session = self.get_session()
+    async def _add_nights(self, session: AsyncSession, booking: BookingDB) -> None:
+        statement = add_nights_statement(booking.room_uuid, booking.check_in, booking.check_out)
+        if statement is not None:
+            await session.execute(statement)
+
+    async def _remove_nights(self, session: AsyncSession, room_uuid: UUID, check_in: datetime, check_out: datetime) -> None:
+        for statement in remove_nights_statements(room_uuid, check_in, check_out):
+            await session.execute(statement)
+
+    async def _commit(self, session: AsyncSession) -> None:
         try:
+            await session.commit()
+        except IntegrityError as exc:
+            await session.rollback()
+            _raise_if_conflict(exc)
+            raise
+
+    async def add_booking(self, booking: Booking) -> UUID:
+        async with await self.get_session() as session:
             booking_obj = BookingDB(
                 user_uuid=booking.user_uuid,
                 room_uuid=booking.room_uuid,
-                check_in=booking.check_in,
-                check_out=booking.check_out,
+                check_in=_naive(booking.check_in),
+                check_out=_naive(booking.check_out),
                 total_price=booking.total_price,
                 status=booking.status,
             )
             session.add(booking_obj)
-            session.commit()
-            session.refresh(booking_obj)
-            return Booking.model_validate(booking_obj).uuid
-        finally:
-            session.close()
-
-    def get_booking(self, booking_uuid: UUID) -> Booking | None:
-        session = self.get_session()
-        try:
-            booking = session.query(BookingDB).filter(BookingDB.uuid == booking_uuid).first()
+            try:
+                await session.flush()
+            except IntegrityError as exc:
+                await session.rollback()
+                _raise_if_conflict(exc)
+                raise
+            if _takes_nights(booking_obj):
+                await self._add_nights(session, booking_obj)
+            await self._commit(session)
+            return booking_obj.uuid
+
+    async def get_booking(self, booking_uuid: UUID) -> Booking | None:
+        async with await self.get_session() as session:
+            booking = await session.get(BookingDB, booking_uuid)
             return Booking.model_validate(booking) if booking else None
-        finally:
-            session.close()
-
-    def get_filtered_bookings(self, user_uuid: UUID | None = None,
-                              room_uuid: UUID | None = None,
-                              status: str | None = None,
-                              check_in: datetime | None = None,
-                              check_out: datetime | None = None) -> list[Booking]:
-        session = self.get_session()
-        try:
-            query = session.query(BookingDB)
-            if user_uuid:
-                query = query.filter(BookingDB.user_uuid == user_uuid)
-            if room_uuid:
-                query = query.filter(BookingDB.room_uuid == room_uuid)
-            if status:
-                query = query.filter(BookingDB.status == status)
-            if check_in and check_out:
-                query = query.filter(
-                    and_(BookingDB.check_in <= check_out, BookingDB.check_out >= check_in)
-                )
-            return [Booking.model_validate(b) for b in query.all()]
-        finally:
-            session.close()
 
-    def update_booking(self, update_request: BookingUpdateRequest) -> Booking:
-        session = self.get_session()
-        try:
-            booking = session.query(BookingDB).filter(BookingDB.uuid == update_request.booking_uuid).first()
-            if not booking:
-                raise ValueError("Booking not found")
+    async def get_filtered_bookings(self, user_uuid: UUID | None = None,
+                                    room_uuid: UUID | None = None,
+                                    status: str | None = None,
+                                    check_in: datetime | None = None,
+                                    check_out: datetime | None = None) -> list[Booking]:
+        async with await self.get_session() as session:
+            query = filtered_bookings_query(user_uuid, room_uuid, status, _naive(check_in), _naive(check_out))
+            return [Booking.model_validate(b) for b in await session.scalars(query)]
 
+    async def update_booking(self, update_request: BookingUpdateRequest) -> Booking:
+        async with await self.get_session() as session:
+            booking = await self._locked_booking(session, update_request.booking_uuid)
+
+            previous = (booking.room_uuid, booking.check_in, booking.check_out) if _takes_nights(booking) else None
             for field, value in update_request.model_dump(exclude_none=True).items():
-                setattr(booking, field, value)
+                setattr(booking, field, _naive(value) if isinstance(value, datetime) else value)
 
-            session.commit()
-            session.refresh(booking)
+            try:
+                await session.flush()
+            except IntegrityError as exc:
+                await session.rollback()
+                _raise_if_conflict(exc)
+                raise
+            if previous:
+                await self._remove_nights(session, *previous)
+            if _takes_nights(booking):
+                await self._add_nights(session, booking)
+            await self._commit(session)
             return Booking.model_validate(booking)
-        finally:
-            session.close()
-
-    def cancel_booking(self, booking_uuid: UUID) -> Booking:
-        session = self.get_session()
-        try:
-            booking = session.query(BookingDB).filter(BookingDB.uuid == booking_uuid).first()
-            if not booking:
-                raise ValueError("Booking not found")
 
+    async def cancel_booking(self, booking_uuid: UUID) -> Booking:
+        async with await self.get_session() as session:
+            booking = await self._locked_booking(session, booking_uuid)
+            if _takes_nights(booking):
+                await self._remove_nights(session, booking.room_uuid, booking.check_in, booking.check_out)
             booking.status = BookingStatus.CANCELLED  # type: ignore
-            session.commit()
-            session.refresh(booking)
+            await self._commit(session)
             return Booking.model_validate(booking)
-        finally:
-            session.close()
 
-    def check_availability(self, room_uuid: UUID, check_in: datetime, check_out: datetime) -> bool:
-        session = self.get_session()
-        try:
-            overlapping = session.query(BookingDB).filter(
-                BookingDB.room_uuid == room_uuid,
-                BookingDB.status != BookingStatus.CANCELLED.value,
-                BookingDB.check_in < check_out,
-                BookingDB.check_out > check_in,
-            ).first()
-            return overlapping is None
-        finally:
-            session.close()
-    def check_availability_bulk(self, room_uuids: list[UUID], check_in: datetime, check_out: datetime) -> dict[UUID, bool]:
+    async def check_availability(self, room_uuid: UUID, check_in: datetime, check_out: datetime) -> bool:
+        return (await self.check_availability_bulk([room_uuid], check_in, check_out))[room_uuid]
+
+    async def check_availability_bulk(self, room_uuids: list[UUID], check_in: datetime, check_out: datetime) -> dict[UUID, bool]:
         if not room_uuids:
             return {}
-        session = self.get_session()
-        try:
-            overlapping = session.query(BookingDB.room_uuid).filter(
-                BookingDB.room_uuid.in_(room_uuids),
-                BookingDB.status != BookingStatus.CANCELLED.value,
-                BookingDB.check_in < check_out,
-                BookingDB.check_out > check_in,
-            ).all()
-            occupied = {getattr(row, "room_uuid", row[0]) for row in overlapping}
+        check_in, check_out = _naive(check_in), _naive(check_out)
+        async with await self.get_session() as session:
+            occupied = set(await session.scalars(unavailable_rooms_query(room_uuids, check_in, check_out)))
             return {room_uuid: room_uuid not in occupied for room_uuid in room_uuids}
-        finally:
-            session.close()
 
+    async def check_availability_ranges(
+        self, room_uuids: list[UUID], ranges: list[tuple[datetime, datetime]]
+    ) -> list[dict[UUID, bool]]:
+        results = [{room_uuid: True for room_uuid in room_uuids} for _ in ranges]
+        if not room_uuids:
+            return results
+        naive_ranges = [(_naive(check_in), _naive(check_out)) for check_in, check_out in ranges]
+        # One session and one statement for all ranges, so the SMALL pool's single connection is enough.
+        # Only lists of rooms too long for the bind parameter limit split the ranges over more statements.
+        per_statement = max(1, MAX_BIND_PARAMETERS // (2 * len(room_uuids) + 8))
+        async with await self.get_session() as session:
+            for start in range(0, len(naive_ranges), per_statement):
+                query = ranges_unavailable_rooms_query(
+                    room_uuids, naive_ranges[start:start + per_statement],  # type: ignore[arg-type]
+                )
+                for index, room_uuid in await session.execute(query):
+                    results[start + index][room_uuid] = False
+        return results
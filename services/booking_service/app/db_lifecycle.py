@@ -0,0 +1,242 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from enum import Enum
+from typing import Any, Coroutine, Iterator
+
+import boto3
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlalchemy.util import await_only
+
+logger = logging.getLogger()
+
+DEFAULT_SECRET_TTL_SECONDS = 300
+DEFAULT_POOL_SIZE = 1
+POOL_RECYCLE_SECONDS = 600
+AUTHENTICATION_SQLSTATES = {"28000", "28P01"}
+
+
+class PoolStrategy(str, Enum):
+    # RDS Proxy already pools connections, every checkout opens a cheap proxy connection.
+    NULL = "null"
+    # A few connections kept for the life of the execution environment, for direct database access.
+    SMALL = "small"
+    # SQLAlchemy's default queue pool, for long running processes such as local servers and benchmarks.
+    DEFAULT = "default"
+
+
+def default_pool_strategy(proxy_endpoint: str | None, database_url: str | None) -> PoolStrategy:
+    if database_url:
+        return PoolStrategy.DEFAULT
+    return PoolStrategy.NULL if proxy_endpoint else PoolStrategy.SMALL
+
+
+class ColdStartTimings:
+    def __init__(self) -> None:
+        self.phases: dict[str, float] = {}
+        self.reported = False
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.setdefault(name, round((time.perf_counter() - start) * 1000, 1))
+
+    def report(self, service: str) -> None:
+        if self.reported or not self.phases:
+            return
+        self.reported = True
+        logger.info(json.dumps({"cold_start": True, "service": service, "phases_ms": self.phases}))
+
+
+COLD_START = ColdStartTimings()
+
+
+class SecretCache:
+    def __init__(self, region: str, ttl_seconds: int = DEFAULT_SECRET_TTL_SECONDS) -> None:
+        self.region = region
+        self.ttl_seconds = ttl_seconds
+        self._client: Any = None
+        self._values: dict[str, tuple[float, dict]] = {}
+        self._lock = threading.Lock()
+        self._refreshing: set[str] = set()
+        self._refreshing_lock = threading.Lock()
+
+    def cached(self, secret_name: str) -> dict | None:
+        # Never calls Secrets Manager and never waits for a fetch in progress.
+        cached = self._values.get(secret_name)
+        return cached[1] if cached else None
+
+    def is_fresh(self, secret_name: str) -> bool:
+        cached = self._values.get(secret_name)
+        return cached is not None and time.monotonic() - cached[0] < self.ttl_seconds
+
+    def get(self, secret_name: str, refresh: bool = False) -> dict:
+        with self._lock:
+            if not refresh and self.is_fresh(secret_name):
+                return self._values[secret_name][1]
+            with COLD_START.phase("secret"):
+                if self._client is None:
+                    self._client = boto3.client("secretsmanager", region_name=self.region)
+                response = self._client.get_secret_value(SecretId=secret_name)
+            value = json.loads(response["SecretString"])
+            self._values[secret_name] = (time.monotonic(), value)
+            return value
+
+    def refresh_in_background(self, secret_name: str) -> None:
+        with self._refreshing_lock:
+            if secret_name in self._refreshing:
+                return
+            self._refreshing.add(secret_name)
+
+        def refresh() -> None:
+            try:
+                self.get(secret_name, refresh=True)
+            except Exception:
+                logger.exception("Could not refresh the database secret, the cached one is kept")
+            finally:
+                with self._refreshing_lock:
+                    self._refreshing.discard(secret_name)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+
+def is_authentication_error(exc: BaseException) -> bool:
+    sqlstate = getattr(exc, "sqlstate", None) or getattr(exc, "pgcode", None)
+    return sqlstate in AUTHENTICATION_SQLSTATES or "password authentication failed" in str(exc)
+
+
+class DatabaseLifecycle:
+    def __init__(
+        self,
+        drivername: str,
+        region: str,
+        secret_name: str | None = None,
+        proxy_endpoint: str | None = None,
+        database_url: str | None = None,
+        pool_strategy: PoolStrategy | str | None = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        secret_ttl_seconds: int = DEFAULT_SECRET_TTL_SECONDS,
+        connect_args: dict[str, Any] | None = None,
+    ) -> None:
+        if not secret_name and not database_url:
+            raise ValueError("Secret name must be provided or set in environment variables.")
+        self.drivername = drivername
+        self.secret_name = secret_name
+        self.proxy_endpoint = proxy_endpoint
+        self.database_url = database_url
+        if not pool_strategy:
+            pool_strategy = default_pool_strategy(proxy_endpoint, database_url)
+        self.pool_strategy = PoolStrategy(pool_strategy)
+        self.pool_size = max(1, pool_size)
+        self.connect_args = connect_args or {}
+        self.secrets = SecretCache(region, ttl_seconds=secret_ttl_seconds)
+
+    def url(self) -> URL:
+        if self.database_url:
+            return make_url(self.database_url).set(drivername=self.drivername)
+        secret = self.secrets.get(self.secret_name)  # type: ignore[arg-type]
+        return URL.create(
+            drivername=self.drivername,
+            username=secret["username"].strip(),
+            password=secret["password"].strip(),
+            host=(self.proxy_endpoint or secret["host"]).strip(),
+            port=int(str(secret.get("port", 5432)).strip()),
+            database=secret["dbname"].strip(),
+        )
+
+    def engine_options(self) -> dict[str, Any]:
+        options: dict[str, Any] = {"connect_args": self.connect_args}
+        if self.pool_strategy == PoolStrategy.NULL:
+            options["poolclass"] = NullPool
+        elif self.pool_strategy == PoolStrategy.SMALL:
+            options.update(
+                pool_size=self.pool_size,
+                max_overflow=0,
+                pool_recycle=POOL_RECYCLE_SECONDS,
+                pool_pre_ping=True,
+            )
+        return options
+
+    def _current_secret(self, dialect: Any, refresh: bool = False) -> dict:
+        # The hook runs inside the driver's connect, on the event loop for asyncpg. The secret is fetched
+        # in a worker thread there, sync engines keep using the cached one while a thread refreshes it.
+        if not refresh and self.secrets.is_fresh(self.secret_name):  # type: ignore[arg-type]
+            return self.secrets.cached(self.secret_name)  # type: ignore[arg-type,return-value]
+        if dialect.is_async:
+            return await_only(asyncio.to_thread(self.secrets.get, self.secret_name, refresh))
+        cached = self.secrets.cached(self.secret_name)  # type: ignore[arg-type]
+        if refresh or cached is None:
+            return self.secrets.get(self.secret_name, refresh=refresh)  # type: ignore[arg-type]
+        self.secrets.refresh_in_background(self.secret_name)  # type: ignore[arg-type]
+        return cached
+
+    def _use_current_credentials(self, engine: Engine) -> None:
+        # New connections read the cached secret, so a rotated password is picked up once the cache
+        # expires, or right away when the database rejects the old one.
+        @event.listens_for(engine, "do_connect")
+        def connect(dialect, conn_rec, cargs, cparams):
+            secret = self._current_secret(dialect)
+            cparams.update(user=secret["username"].strip(), password=secret["password"].strip())
+            try:
+                return dialect.connect(*cargs, **cparams)
+            except Exception as exc:
+                if not is_authentication_error(exc):
+                    raise
+                logger.warning("Database rejected the cached credentials, refreshing the secret")
+                secret = self._current_secret(dialect, refresh=True)
+                cparams.update(user=secret["username"].strip(), password=secret["password"].strip())
+                return dialect.connect(*cargs, **cparams)
+
+    def create_engine(self) -> Engine:
+        url = self.url()
+        with COLD_START.phase("engine"):
+            engine = create_engine(url, **self.engine_options())
+            if self.secret_name and not self.database_url:
+                self._use_current_credentials(engine)
+        return engine
+
+    def create_async_engine(self) -> AsyncEngine:
+        url = self.url()
+        with COLD_START.phase("engine"):
+            engine = create_async_engine(url, **self.engine_options())
+            if self.secret_name and not self.database_url:
+                self._use_current_credentials(engine.sync_engine)
+        return engine
+
+    def warm(self, engine: Engine) -> None:
+        # Creating the engine already fetched the secret. A NullPool would close the warm-up
+        # connection right away, so only a pool that keeps it is worth connecting now.
+        if self.pool_strategy == PoolStrategy.NULL:
+            return
+        with COLD_START.phase("connect"):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+
+    async def warm_async(self, engine: AsyncEngine) -> None:
+        if self.pool_strategy == PoolStrategy.NULL:
+            return
+        with COLD_START.phase("connect"):
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+
+
+def run_on_handler_loop(coroutine: Coroutine[Any, Any, Any]) -> Any:
+    # Mangum serves every invocation on the thread's current event loop, asyncpg connections
+    # opened during init must belong to that same loop to be reused.
+    try:
+        loop = asyncio.get_event_loop_policy().get_event_loop()
+    except RuntimeError:
+        loop = asyncio.new_event_loop()
+    if loop.is_closed():
+        loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    return loop.run_until_complete(coroutine)
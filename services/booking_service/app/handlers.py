@@ -1,18 +1,21 @@
 
 from datetime import datetime
 from uuid import UUID
-from fastapi import Depends, Request
-from db_client import HotelManagementDBClient
-from schemas import Booking, BookingUpdateRequest, AvailabilityBulkRequest
+from fastapi import Depends, HTTPException, Request
+from db_client import BookingConflictError, HotelManagementDBClient
+from schemas import AvailabilityRange, AvailabilityRangesRequest, Booking, BookingUpdateRequest, AvailabilityBulkRequest
 
 def get_hotel_management_db_client(request: Request) -> HotelManagementDBClient:
     return request.app.state.hotel_management_db_client
 
 async def add_booking(booking: Booking, hotel_management_db_client: HotelManagementDBClient = Depends(get_hotel_management_db_client)) -> UUID:
-    return hotel_management_db_client.add_booking(booking)
+    try:
+        return await hotel_management_db_client.add_booking(booking)
+    except BookingConflictError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
 
 async def get_booking(booking_uuid: UUID, hotel_management_db_client: HotelManagementDBClient = Depends(get_hotel_management_db_client)) -> Booking | None:
-    return hotel_management_db_client.get_booking(booking_uuid)
+    return await hotel_management_db_client.get_booking(booking_uuid)
 
 async def get_filtered_bookings(
         hotel_management_db_client: HotelManagementDBClient = Depends(get_hotel_management_db_client),
@@ -21,20 +24,39 @@ async def get_filtered_bookings(
         status: str | None = None,
         check_in: datetime | None = None,
         check_out: datetime | None = None) -> list[Booking]:
-    return hotel_management_db_client.get_filtered_bookings(user_uuid=user_uuid, room_uuid=room_uuid, status=status, check_in=check_in, check_out=check_out)
+    return await hotel_management_db_client.get_filtered_bookings(user_uuid=user_uuid, room_uuid=room_uuid, status=status, check_in=check_in, check_out=check_out)
 
 async def update_booking(update_request: BookingUpdateRequest, hotel_management_db_client: HotelManagementDBClient = Depends(get_hotel_management_db_client)) -> Booking:
-    return hotel_management_db_client.update_booking(update_request)
+    try:
+        return await hotel_management_db_client.update_booking(update_request)
+    except BookingConflictError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
 
 async def cancel_booking(booking_uuid: UUID, hotel_management_db_client: HotelManagementDBClient = Depends(get_hotel_management_db_client)) -> Booking:
-    return hotel_management_db_client.cancel_booking(booking_uuid)
+    return await hotel_management_db_client.cancel_booking(booking_uuid)
 
 async def check_availability(room_uuid: UUID, check_in: datetime, check_out: datetime, hotel_management_db_client: HotelManagementDBClient = Depends(get_hotel_management_db_client)) -> bool:
-    return hotel_management_db_client.check_availability(room_uuid, check_in, check_out)
+    return await hotel_management_db_client.check_availability(room_uuid, check_in, check_out)
 
 async def check_availability_batch(
     request: AvailabilityBulkRequest,
     hotel_management_db_client: HotelManagementDBClient = Depends(get_hotel_management_db_client),
 ) -> dict[str, bool]:
-    result = hotel_management_db_client.check_availability_bulk(request.room_uuids, request.check_in, request.check_out)
+    result = await hotel_management_db_client.check_availability_bulk(request.room_uuids, request.check_in, request.check_out)
     return {str(room_uuid): available for room_uuid, available in result.items()}
+
+
+async def check_availability_ranges(
+    request: AvailabilityRangesRequest,
+    hotel_management_db_client: HotelManagementDBClient = Depends(get_hotel_management_db_client),
+) -> list[AvailabilityRange]:
+    ranges = [(stay.check_in, stay.check_out) for stay in request.ranges]
+    results = await hotel_management_db_client.check_availability_ranges(request.room_uuids, ranges)
+    return [
+        AvailabilityRange(
+            check_in=stay.check_in,
+            check_out=stay.check_out,
+            availability={str(room_uuid): available for room_uuid, available in result.items()},
+        )
+        for stay, result in zip(request.ranges, results)
+    ]
@@ -5,6 +5,7 @@ import sys
 from fastapi import FastAPI
 from routes import router
 from db_client import HotelManagementDBClient
+from db_lifecycle import COLD_START, run_on_handler_loop
 from config import AppMetadata, booking_service_int_configuration, booking_service_prod_configuration
 from mangum import Mangum
 
@@ -25,7 +26,16 @@ def create_app() -> FastAPI:
         description=app_metadata.app_description
     )
     app.state.app_metadata = app_metadata
-    app.state.hotel_management_db_client = HotelManagementDBClient(hotel_management_database_secret_name=app_config.hotel_management_database_secret_name, region=app_config.region, proxy_endpoint=app_config.db_proxy_endpoint)
+    app.state.hotel_management_db_client = HotelManagementDBClient(hotel_management_database_secret_name=app_config.hotel_management_database_secret_name, region=app_config.region, proxy_endpoint=app_config.db_proxy_endpoint, database_url=app_config.hotel_management_database_url, pool_strategy=app_config.db_pool_strategy, pool_size=app_config.db_pool_size, secret_ttl_seconds=app_config.secret_ttl_seconds)
+
+    if app_config.warm_database_connection:
+        # Fetches the secret before the first request. With a sized pool it also opens the connection
+        # warm invocations reuse, under NullPool every checkout opens its own so none is opened here.
+        try:
+            run_on_handler_loop(app.state.hotel_management_db_client.warm())
+        except Exception:
+            logger.exception("Could not warm the database connection, it will be opened on first use")
+        COLD_START.report("booking_service")
 
     app.include_router(router)
 
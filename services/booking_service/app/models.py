@@ -1,5 +1,6 @@
 from uuid import uuid4
-from sqlalchemy import Column, Numeric, UUID, DateTime
+from sqlalchemy import Column, Computed, Date, Index, Integer, Numeric, UUID, DateTime, text
+from sqlalchemy.dialects.postgresql import TSRANGE, ExcludeConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 from sqlalchemy import Enum as SqlEnum
@@ -7,6 +8,8 @@ from schemas import BookingStatus
 
 Base = declarative_base()
 
+BOOKING_NO_OVERLAP_CONSTRAINT_NAME = "bookings_room_uuid_stay_excl"
+
 
 class BookingDB(Base):
     __tablename__ = "bookings"
@@ -20,3 +23,36 @@ class BookingDB(Base):
     status = Column(SqlEnum(BookingStatus), default=BookingStatus.PENDING)
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+    stay = Column(
+        TSRANGE,
+        Computed(
+            "CASE WHEN check_in IS NOT NULL AND check_out IS NOT NULL "
+            "THEN tsrange(check_in, check_out, '[)') END",
+            persisted=True,
+        ),
+    )
+
+    # The constraint is backed by a GiST index on (room_uuid, stay) which also serves availability
+    # queries. btree_gist provides the uuid equality operator class.
+    __table_args__ = (
+        ExcludeConstraint(
+            ("room_uuid", "="),
+            ("stay", "&&"),
+            name=BOOKING_NO_OVERLAP_CONSTRAINT_NAME,
+            using="gist",
+            where=text("status <> 'CANCELLED'"),
+        ),
+    )
+
+
+Index("ix_bookings_user_uuid_check_in", BookingDB.user_uuid, BookingDB.check_in.desc())
+Index("ix_bookings_room_uuid_status_check_in", BookingDB.room_uuid, BookingDB.status, BookingDB.check_in)
+
+
+class RoomNightsDB(Base):
+    __tablename__ = "room_nights"
+
+    room_uuid = Column(UUID(as_uuid=True), primary_key=True)
+    month = Column(Date, primary_key=True)
+    # Bit n is set when the night starting on day n + 1 of the month is booked.
+    nights = Column(Integer, nullable=False, default=0, server_default="0")
@@ -0,0 +1,101 @@
+from datetime import date, datetime, timedelta
+from typing import NamedTuple
+from uuid import UUID
+
+from sqlalchemy import Insert, Select, Update, and_, or_, select, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from models import RoomNightsDB
+
+# A night is taken when a stay covers the instant before the following midnight, so stays that
+# do not overlap never share a night and the bitmaps of active bookings are disjoint. Bookings
+# are added with OR and removed with AND NOT without reading the calendar first.
+EXPECTED_ROOM_NIGHTS_SQL = """
+SELECT room_uuid,
+       date_trunc('month', night)::date AS month,
+       bit_or(1 << (extract(day FROM night)::int - 1)) AS nights
+FROM bookings,
+     generate_series(check_in::date, check_out::date - 1, interval '1 day') AS night
+WHERE status <> 'CANCELLED' AND check_in IS NOT NULL AND check_out IS NOT NULL
+GROUP BY room_uuid, month
+"""
+
+CALENDAR_DIFF_SQL = f"""
+WITH expected AS ({EXPECTED_ROOM_NIGHTS_SQL})
+SELECT coalesce(e.room_uuid, r.room_uuid) AS room_uuid,
+       coalesce(e.month, r.month) AS month,
+       coalesce(e.nights, 0) AS expected,
+       coalesce(r.nights, 0) AS actual
+FROM expected e
+FULL OUTER JOIN room_nights r ON r.room_uuid = e.room_uuid AND r.month = e.month
+WHERE coalesce(e.nights, 0) <> coalesce(r.nights, 0)
+ORDER BY 1, 2
+"""
+
+
+class CalendarMismatch(NamedTuple):
+    room_uuid: UUID
+    month: date
+    expected: int
+    actual: int
+
+
+def stay_nights(check_in: datetime, check_out: datetime) -> dict[date, int]:
+    masks: dict[date, int] = {}
+    night = check_in.date()
+    while night < check_out.date():
+        month = night.replace(day=1)
+        masks[month] = masks.get(month, 0) | 1 << (night.day - 1)
+        night += timedelta(days=1)
+    return masks
+
+
+def add_nights_statement(room_uuid: UUID, check_in: datetime, check_out: datetime) -> Insert | None:
+    masks = stay_nights(check_in, check_out)
+    if not masks:
+        return None
+    statement = insert(RoomNightsDB).values(
+        [{"room_uuid": room_uuid, "month": month, "nights": mask} for month, mask in masks.items()]
+    )
+    return statement.on_conflict_do_update(
+        index_elements=[RoomNightsDB.room_uuid, RoomNightsDB.month],
+        set_={"nights": RoomNightsDB.nights.op("|")(statement.excluded.nights)},
+    )
+
+
+def remove_nights_statements(room_uuid: UUID, check_in: datetime, check_out: datetime) -> list[Update]:
+    return [
+        update(RoomNightsDB)
+        .where(RoomNightsDB.room_uuid == room_uuid, RoomNightsDB.month == month)
+        .values(nights=RoomNightsDB.nights.op("&")(~mask))
+        for month, mask in stay_nights(check_in, check_out).items()
+    ]
+
+
+def occupied_rooms_query(room_uuids: list[UUID], check_in: datetime, check_out: datetime) -> Select | None:
+    masks = stay_nights(check_in, check_out)
+    if not masks:
+        # Stays within a single day take no night, the caller falls back to the range query.
+        return None
+    return select(RoomNightsDB.room_uuid).where(
+        RoomNightsDB.room_uuid.in_(room_uuids),
+        or_(*(
+            and_(RoomNightsDB.month == month, RoomNightsDB.nights.op("&")(mask) != 0)
+            for month, mask in masks.items()
+        )),
+    ).distinct()
+
+
+def diff_calendar(session: Session) -> list[CalendarMismatch]:
+    return [CalendarMismatch(*row) for row in session.execute(text(CALENDAR_DIFF_SQL))]
+
+
+def rebuild_calendar(session: Session) -> int:
+    # Booking writes wait on the lock, their nights are applied on top of the rebuilt calendar.
+    session.execute(text("LOCK TABLE room_nights IN SHARE ROW EXCLUSIVE MODE"))
+    session.execute(text("DELETE FROM room_nights"))
+    result = session.execute(text(
+        f"INSERT INTO room_nights (room_uuid, month, nights) {EXPECTED_ROOM_NIGHTS_SQL}"
+    ))
+    return result.rowcount
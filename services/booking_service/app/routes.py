@@ -1,8 +1,8 @@
 from uuid import UUID
 from fastapi import APIRouter
 
-from handlers import add_booking, cancel_booking, check_availability, check_availability_batch, get_booking, get_filtered_bookings, update_booking
-from schemas import Booking
+from handlers import add_booking, cancel_booking, check_availability, check_availability_batch, check_availability_ranges, get_booking, get_filtered_bookings, update_booking
+from schemas import AvailabilityRange, Booking
 
 router = APIRouter()
 
@@ -61,3 +61,10 @@ router.add_api_route(
     endpoint=check_availability_batch,
     description="Check availability for multiple rooms"
 )
+router.add_api_route(
+    path="/availability/ranges",
+    methods=["POST"],
+    response_model=list[AvailabilityRange],
+    endpoint=check_availability_ranges,
+    description="Check availability of rooms for several stays at once"
+)
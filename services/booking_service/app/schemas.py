@@ -38,3 +38,17 @@ class AvailabilityBulkRequest(BaseModel):
     room_uuids: list[UUID] = Field(default_factory=list)
     check_in: datetime = Field(description="Check in time")
     check_out: datetime = Field(description="Check out time")
+
+
+class StayRange(BaseModel):
+    check_in: datetime = Field(description="Check in time")
+    check_out: datetime = Field(description="Check out time")
+
+
+class AvailabilityRangesRequest(BaseModel):
+    room_uuids: list[UUID] = Field(default_factory=list)
+    ranges: list[StayRange] = Field(description="Stays to check, results keep this order", min_length=1, max_length=20)
+
+
+class AvailabilityRange(StayRange):
+    availability: dict[str, bool] = Field(description="Whether each room is free for the stay, by room uuid")
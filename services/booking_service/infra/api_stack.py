@@ -63,6 +63,7 @@ class BookingServiceStack(Stack):
                 "BOOKING_SERVICE_ENV": self.env_name,
                 "HOTEL_MANAGEMENT_DATABASE_SECRET_NAME": db_name,
                 "DB_PROXY_ENDPOINT": proxy_endpoint,
+                "DB_POOL_STRATEGY": "null",
             },
             vpc=vpc,
             security_groups=[db_sg],
@@ -101,4 +102,7 @@ class BookingServiceStack(Stack):
         resource_availability_batch = resource_availability.add_resource("batch")
         resource_availability_batch.add_method("POST", integration)
 
+        resource_availability_ranges = resource_availability.add_resource("ranges")
+        resource_availability_ranges.add_method("POST", integration)
+
         CfnOutput(self, "DbProxyEndpoint", value=proxy_endpoint)
@@ -0,0 +1,45 @@
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "app"))
+
+from occupancy import diff_calendar, rebuild_calendar  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the room night calendar with the bookings it is built from")
+    parser.add_argument(
+        "--database-url",
+        default=os.environ.get("HOTEL_MANAGEMENT_DATABASE_URL"),
+        help="SQLAlchemy URL of the booking database",
+    )
+    parser.add_argument("--repair", action="store_true", help="Rebuild the calendar when it differs")
+    parser.add_argument("--show", type=int, default=20, help="Number of mismatches to print")
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("--database-url or HOTEL_MANAGEMENT_DATABASE_URL is required")
+
+    engine = create_engine(args.database_url)
+    with Session(engine) as session:
+        mismatches = diff_calendar(session)
+        for mismatch in mismatches[:args.show]:
+            print(
+                f"{mismatch.room_uuid} {mismatch.month:%Y-%m}: "
+                f"expected {mismatch.expected:031b} actual {mismatch.actual:031b}"
+            )
+        print(f"{len(mismatches)} room months differ")
+        if mismatches and args.repair:
+            rows = rebuild_calendar(session)
+            session.commit()
+            print(f"Calendar rebuilt with {rows} room months")
+        elif mismatches:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
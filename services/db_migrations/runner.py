@@ -0,0 +1,56 @@
+import importlib
+import json
+import sys
+from pathlib import Path
+
+import boto3
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import MetaData
+from sqlalchemy.engine import URL
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent
+SERVICES_DIR = MIGRATIONS_DIR.parent
+MIGRATED_SERVICES = ("booking_service", "user_service")
+
+
+def database_url_from_secret(secret_name: str, region: str, host: str | None = None) -> str:
+    client = boto3.client("secretsmanager", region_name=region)
+    secret = json.loads(client.get_secret_value(SecretId=secret_name)["SecretString"])
+    return URL.create(
+        drivername="postgresql+psycopg2",
+        username=secret["username"].strip(),
+        password=secret["password"].strip(),
+        host=(host or secret["host"]).strip(),
+        port=int(secret.get("port", 5432)),
+        database=secret["dbname"].strip(),
+    ).render_as_string(hide_password=False)
+
+
+def service_metadata(service: str) -> MetaData:
+    # Every service imports its modules by bare name, so each one is loaded in isolation.
+    app_dir = str(SERVICES_DIR / service / "app")
+    shadowed = {name: sys.modules.pop(name) for name in ("models", "schemas") if name in sys.modules}
+    sys.path.insert(0, app_dir)
+    try:
+        return importlib.import_module("models").Base.metadata
+    finally:
+        sys.path.remove(app_dir)
+        for name in ("models", "schemas"):
+            sys.modules.pop(name, None)
+        sys.modules.update(shadowed)
+
+
+def alembic_config(database_url: str) -> Config:
+    config = Config(str(MIGRATIONS_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(MIGRATIONS_DIR))
+    config.set_main_option("sqlalchemy.url", database_url.replace("%", "%%"))
+    return config
+
+
+def upgrade(database_url: str, revision: str = "head") -> None:
+    command.upgrade(alembic_config(database_url), revision)
+
+
+def downgrade(database_url: str, revision: str) -> None:
+    command.downgrade(alembic_config(database_url), revision)
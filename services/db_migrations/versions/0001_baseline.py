@@ -0,0 +1,54 @@
+"""Bookings and users tables
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _has_table(name: str) -> bool:
+    if op.get_context().as_sql:
+        return False
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+# Databases created before migrations already have these tables, the revision only fills the gaps.
+def upgrade() -> None:
+    if not _has_table("bookings"):
+        op.create_table(
+            "bookings",
+            sa.Column("uuid", sa.UUID(), primary_key=True),
+            sa.Column("user_uuid", sa.UUID(), nullable=False),
+            sa.Column("room_uuid", sa.UUID(), nullable=False),
+            sa.Column("check_in", sa.DateTime()),
+            sa.Column("check_out", sa.DateTime()),
+            sa.Column("total_price", sa.Numeric()),
+            sa.Column("status", sa.Enum("PENDING", "CONFIRMED", "CANCELLED", "COMPLETED", name="bookingstatus")),
+            sa.Column("created_at", sa.DateTime()),
+            sa.Column("updated_at", sa.DateTime()),
+        )
+
+    if not _has_table("users"):
+        op.create_table(
+            "users",
+            sa.Column("uuid", sa.UUID(), primary_key=True),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("last_name", sa.String(), nullable=False),
+            sa.Column("email", sa.String(), nullable=False, unique=True),
+            sa.Column("hashed_password", sa.String(), nullable=False),
+            sa.Column("user_type", sa.Enum("STAFF", "GUEST", name="usertype"), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("users")
+    op.drop_table("bookings")
+    op.execute("DROP TYPE IF EXISTS usertype")
+    op.execute("DROP TYPE IF EXISTS bookingstatus")
@@ -0,0 +1,67 @@
+"""Booking stay ranges with a no-overlap exclusion constraint
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+# Adding the stored generated column rewrites the bookings table under an exclusive lock,
+# run it in a maintenance window on large tables.
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.execute(
+        """
+        ALTER TABLE bookings
+            ADD COLUMN IF NOT EXISTS stay tsrange
+            GENERATED ALWAYS AS (
+                CASE WHEN check_in IS NOT NULL AND check_out IS NOT NULL
+                THEN tsrange(check_in, check_out, '[)') END
+            ) STORED
+        """
+    )
+    # Exclusion constraints cannot be added NOT VALID, so existing double bookings must be resolved first.
+    op.execute(
+        """
+        DO $$
+        DECLARE
+            conflicts integer;
+        BEGIN
+            SELECT count(*) INTO conflicts
+            FROM bookings a
+            JOIN bookings b
+                ON a.room_uuid = b.room_uuid
+                AND a.uuid < b.uuid
+                AND a.stay && b.stay
+            WHERE a.status <> 'CANCELLED' AND b.status <> 'CANCELLED';
+            IF conflicts > 0 THEN
+                RAISE EXCEPTION '% overlapping booking pairs must be cancelled before the constraint can be added', conflicts;
+            END IF;
+        END $$
+        """
+    )
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'bookings_room_uuid_stay_excl') THEN
+                ALTER TABLE bookings
+                    ADD CONSTRAINT bookings_room_uuid_stay_excl
+                    EXCLUDE USING gist (room_uuid WITH =, stay WITH &&)
+                    WHERE (status <> 'CANCELLED');
+            END IF;
+        END $$
+        """
+    )
+    op.execute("ANALYZE bookings")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE bookings DROP CONSTRAINT IF EXISTS bookings_room_uuid_stay_excl")
+    op.execute("ALTER TABLE bookings DROP COLUMN IF EXISTS stay")
@@ -0,0 +1,39 @@
+"""Booking indexes for the filtered booking queries
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+# Guests list their own bookings newest first, hosts list the bookings of a room in a date window.
+# Built concurrently so bookings keep being written while the indexes build.
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_bookings_user_uuid_check_in",
+            "bookings",
+            ["user_uuid", sa.text("check_in DESC")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_bookings_room_uuid_status_check_in",
+            "bookings",
+            ["room_uuid", "status", "check_in"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_bookings_room_uuid_status_check_in", "bookings", postgresql_concurrently=True, if_exists=True)
+        op.drop_index("ix_bookings_user_uuid_check_in", "bookings", postgresql_concurrently=True, if_exists=True)
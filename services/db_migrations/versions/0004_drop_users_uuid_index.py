@@ -0,0 +1,21 @@
+"""Drop the users uuid index duplicating the primary key
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+# Tables created by SQLAlchemy's create_all got an index on the primary key column, it only costs writes.
+def upgrade() -> None:
+    op.drop_index("ix_users_uuid", "users", if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index("ix_users_uuid", "users", ["uuid"], if_not_exists=True)
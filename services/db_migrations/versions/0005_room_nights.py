@@ -0,0 +1,39 @@
+"""Room night occupancy calendar
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "room_nights",
+        sa.Column("room_uuid", sa.UUID(), primary_key=True),
+        sa.Column("month", sa.Date(), primary_key=True),
+        sa.Column("nights", sa.Integer(), nullable=False, server_default="0"),
+    )
+    # Bit n of a month is the night starting on day n + 1, taken by every booking that is not cancelled.
+    op.execute(
+        """
+        INSERT INTO room_nights (room_uuid, month, nights)
+        SELECT room_uuid,
+               date_trunc('month', night)::date AS month,
+               bit_or(1 << (extract(day FROM night)::int - 1)) AS nights
+        FROM bookings,
+             generate_series(check_in::date, check_out::date - 1, interval '1 day') AS night
+        WHERE status <> 'CANCELLED' AND check_in IS NOT NULL AND check_out IS NOT NULL
+        GROUP BY room_uuid, month
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("room_nights")
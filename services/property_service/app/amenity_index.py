@@ -0,0 +1,131 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable
+
+from batch_write import write_batches
+
+
+def normalize_amenity(name: str) -> str:
+    return " ".join(name.split()).lower()
+
+
+def amenity_names(raw_amenities: Any) -> set[str]:
+    names: set[str] = set()
+    for amenity in raw_amenities or []:
+        if isinstance(amenity, dict):
+            name = amenity.get("name")
+        else:
+            name = getattr(amenity, "name", None)
+        if name and normalize_amenity(name):
+            names.add(normalize_amenity(name))
+    return names
+
+
+def item_amenity_names(item: dict[str, Any] | None) -> set[str]:
+    if not item:
+        return set()
+    names: set[str] = set()
+    for value in item.get("amenities", {}).get("L", []):
+        name = value.get("M", {}).get("name", {}).get("S")
+        if name and normalize_amenity(name):
+            names.add(normalize_amenity(name))
+    return names
+
+
+class AmenityIndex:
+    def __init__(self, amenity_table_name: str, db_client: Any, max_workers: int = 8) -> None:
+        self.amenity_table_name = amenity_table_name
+        self.db_client = db_client
+        self.max_workers = max(1, max_workers)
+
+    def _write(self, requests: list[dict[str, Any]]) -> None:
+        failures = write_batches(self.db_client, self.amenity_table_name, requests, self.max_workers)
+        if failures:
+            raise RuntimeError(f"Failed to write {len(failures)} amenity postings: {failures[0][1]}")
+
+    def update_room(
+        self,
+        room_uuid: str,
+        property_uuid: str,
+        amenities: Iterable[str],
+        previous_amenities: Iterable[str] = (),
+        previous_property_uuid: str | None = None,
+    ) -> None:
+        current = set(amenities)
+        previous = set(previous_amenities)
+        moved = previous_property_uuid is not None and previous_property_uuid != property_uuid
+
+        requests: list[dict[str, Any]] = []
+        for amenity in sorted(previous - current):
+            requests.append({"DeleteRequest": {"Key": {
+                "amenity": {"S": amenity},
+                "room_uuid": {"S": room_uuid},
+            }}})
+        for amenity in sorted(current if moved else current - previous):
+            requests.append({"PutRequest": {"Item": {
+                "amenity": {"S": amenity},
+                "room_uuid": {"S": room_uuid},
+                "property_uuid": {"S": property_uuid},
+            }}})
+        self._write(requests)
+
+    def index_rooms(self, rooms: Iterable[tuple[str, str, set[str]]]) -> None:
+        self._write([
+            {"PutRequest": {"Item": {
+                "amenity": {"S": amenity},
+                "room_uuid": {"S": room_uuid},
+                "property_uuid": {"S": property_uuid},
+            }}}
+            for room_uuid, property_uuid, amenities in rooms
+            for amenity in sorted(amenities)
+        ])
+
+    def remove_room(self, room_uuid: str, property_uuid: str, amenities: Iterable[str]) -> None:
+        self.update_room(room_uuid, property_uuid, (), previous_amenities=amenities)
+
+    def remove_rooms(self, rooms: Iterable[tuple[str, set[str]]]) -> None:
+        self._write([
+            {"DeleteRequest": {"Key": {
+                "amenity": {"S": amenity},
+                "room_uuid": {"S": room_uuid},
+            }}}
+            for room_uuid, amenities in rooms
+            for amenity in sorted(amenities)
+        ])
+
+    def posting_list(self, amenity: str, max_size: int | None = None) -> set[str] | None:
+        params: dict[str, Any] = {
+            "TableName": self.amenity_table_name,
+            "KeyConditionExpression": "amenity = :a",
+            "ExpressionAttributeValues": {":a": {"S": normalize_amenity(amenity)}},
+            "ProjectionExpression": "room_uuid",
+        }
+        room_uuids: set[str] = set()
+        while True:
+            if max_size is not None:
+                params["Limit"] = max_size + 1 - len(room_uuids)
+            resp = self.db_client.query(**params)
+            room_uuids.update(it["room_uuid"]["S"] for it in resp.get("Items", []))
+            if max_size is not None and len(room_uuids) > max_size:
+                return None
+            lek = resp.get("LastEvaluatedKey")
+            if not lek:
+                return room_uuids
+            params["ExclusiveStartKey"] = lek
+
+    def matching_rooms(self, amenities: Iterable[str], max_candidates: int | None = None) -> set[str] | None:
+        names = sorted({normalize_amenity(amenity) for amenity in amenities if normalize_amenity(amenity)})
+        if not names:
+            return None
+        workers = min(len(names), self.max_workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            postings = list(executor.map(lambda name: self.posting_list(name, max_candidates), names))
+        # Lists longer than max_candidates are abandoned early; the caller rechecks candidates.
+        postings = sorted((posting for posting in postings if posting is not None), key=len)
+        if not postings:
+            return None
+        result = set(postings[0])
+        for posting in postings[1:]:
+            if not result:
+                break
+            result &= posting
+        return result
@@ -0,0 +1,51 @@
+from concurrent.futures import ThreadPoolExecutor
+import random
+import time
+from typing import Any
+
+from botocore.exceptions import ClientError
+
+WRITE_CHUNK_SIZE = 25
+WRITE_MAX_ATTEMPTS = 8
+WRITE_BASE_DELAY_SECONDS = 0.05
+WRITE_MAX_DELAY_SECONDS = 2.0
+
+
+def _write_chunk(db_client: Any, table_name: str, requests: list[dict[str, Any]]) -> list[tuple[dict[str, Any], str]]:
+    pending = requests
+    attempt = 0
+    while True:
+        try:
+            resp = db_client.batch_write_item(RequestItems={table_name: pending})
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") != "ValidationException":
+                raise
+            # One invalid item rejects the whole batch, so isolate it by retrying item by item.
+            if len(pending) == 1:
+                return [(pending[0], exc.response["Error"].get("Message", str(exc)))]
+            return [failure for request in pending for failure in _write_chunk(db_client, table_name, [request])]
+        pending = resp.get("UnprocessedItems", {}).get(table_name, [])
+        if not pending:
+            return []
+        attempt += 1
+        if attempt >= WRITE_MAX_ATTEMPTS:
+            return [(request, f"Unprocessed after {attempt} attempts") for request in pending]
+        delay = min(WRITE_MAX_DELAY_SECONDS, WRITE_BASE_DELAY_SECONDS * 2 ** attempt)
+        time.sleep(random.uniform(0, delay))
+
+
+def write_batches(
+    db_client: Any,
+    table_name: str,
+    requests: list[dict[str, Any]],
+    max_workers: int = 8,
+) -> list[tuple[dict[str, Any], str]]:
+    chunks = [requests[start:start + WRITE_CHUNK_SIZE] for start in range(0, len(requests), WRITE_CHUNK_SIZE)]
+    if not chunks:
+        return []
+    workers = max(1, min(max_workers, len(chunks)))
+    if workers == 1:
+        return [failure for chunk in chunks for failure in _write_chunk(db_client, table_name, chunk)]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(lambda chunk: _write_chunk(db_client, table_name, chunk), chunks)
+        return [failure for result in results for failure in result]
@@ -0,0 +1,254 @@
+from datetime import datetime, timedelta, timezone
+import json
+import logging
+import time
+from typing import Any
+from uuid import UUID
+
+import boto3
+
+from codec import codec_for
+from config import AppMetadata, property_service_int_configuration, property_service_prod_configuration
+from db_clients import PropertyTableClient, RoomTableClient, item_image_keys
+from schemas import CleanupJob, CleanupKind, CleanupStatus
+from storage import S3AssetStorage
+
+logger = logging.getLogger()
+
+CLEANUP_JOB_CODEC = codec_for(CleanupJob)
+CLEANUP_JOB_TTL_SECONDS = 30 * 24 * 3600
+ORPHAN_ASSET_GRACE_SECONDS = 24 * 3600
+# Must match the worker function timeout and the queue's maxReceiveCount in infra.
+CLEANUP_WORKER_TIMEOUT_SECONDS = 900
+CLEANUP_MAX_ATTEMPTS = 3
+
+
+class CleanupJobTable:
+    def __init__(self, cleanup_job_table_name: str | None) -> None:
+        if not cleanup_job_table_name:
+            raise ValueError("Cleanup job table name must be provided.")
+        self.cleanup_job_table_name = cleanup_job_table_name
+        self.db_client = boto3.client("dynamodb")
+
+    def start(self, job_uuid: UUID, kind: CleanupKind, property_uuid: UUID | None = None) -> CleanupJob:
+        now = datetime.now()
+        job = CleanupJob(job_uuid=job_uuid, kind=kind, property_uuid=property_uuid, created_at=now, updated_at=now)
+        item = CLEANUP_JOB_CODEC.encode(job.model_dump())
+        item["expires_at"] = {"N": str(int(time.time()) + CLEANUP_JOB_TTL_SECONDS)}
+        self.db_client.put_item(TableName=self.cleanup_job_table_name, Item=item)
+        return job
+
+    def record_progress(self, job_uuid: UUID, rooms: int = 0, assets: int = 0) -> None:
+        self.db_client.update_item(
+            TableName=self.cleanup_job_table_name,
+            Key={"job_uuid": {"S": str(job_uuid)}},
+            UpdateExpression="ADD rooms_deleted :rooms, assets_deleted :assets SET updated_at = :now",
+            ExpressionAttributeValues={
+                ":rooms": {"N": str(rooms)},
+                ":assets": {"N": str(assets)},
+                ":now": {"S": datetime.now().isoformat()},
+            },
+        )
+
+    def finish(self, job_uuid: UUID, error: str | None = None) -> None:
+        values: dict[str, Any] = {
+            ":status": {"S": (CleanupStatus.FAILED if error else CleanupStatus.COMPLETED).value},
+            ":now": {"S": datetime.now().isoformat()},
+        }
+        expression = "SET #status = :status, updated_at = :now"
+        if error:
+            expression += ", #error = :error"
+            values[":error"] = {"S": error}
+        self.db_client.update_item(
+            TableName=self.cleanup_job_table_name,
+            Key={"job_uuid": {"S": str(job_uuid)}},
+            UpdateExpression=expression,
+            ExpressionAttributeNames={"#status": "status", **({"#error": "error"} if error else {})},
+            ExpressionAttributeValues=values,
+        )
+
+    def record_attempt(self, job_uuid: UUID, attempt: int) -> None:
+        self.db_client.update_item(
+            TableName=self.cleanup_job_table_name,
+            Key={"job_uuid": {"S": str(job_uuid)}},
+            UpdateExpression="SET #status = :status, attempts = :attempt, updated_at = :now REMOVE #error",
+            ExpressionAttributeNames={"#status": "status", "#error": "error"},
+            ExpressionAttributeValues={
+                ":status": {"S": CleanupStatus.RUNNING.value},
+                ":attempt": {"N": str(attempt)},
+                ":now": {"S": datetime.now().isoformat()},
+            },
+        )
+
+    def get(self, job_uuid: UUID) -> CleanupJob | None:
+        resp = self.db_client.get_item(
+            TableName=self.cleanup_job_table_name,
+            Key={"job_uuid": {"S": str(job_uuid)}},
+        )
+        item = resp.get("Item")
+        if not item:
+            return None
+        job = CLEANUP_JOB_CODEC.decode_model(item)
+        # A worker that hits its timeout never calls finish(), once no attempt is left the job is reported failed.
+        stale_before = datetime.now() - timedelta(seconds=CLEANUP_WORKER_TIMEOUT_SECONDS)
+        if (
+            job.status == CleanupStatus.RUNNING
+            and job.attempts >= CLEANUP_MAX_ATTEMPTS
+            and job.updated_at is not None
+            and job.updated_at < stale_before
+        ):
+            job.status = CleanupStatus.FAILED
+            job.error = "Cleanup worker timed out, redrive the cleanup dead-letter queue to retry"
+        return job
+
+
+class CleanupQueue:
+    def __init__(self, cleanup_queue_url: str | None) -> None:
+        if not cleanup_queue_url:
+            raise ValueError("Cleanup queue URL must be provided.")
+        self.cleanup_queue_url = cleanup_queue_url
+        self.sqs_client = boto3.client("sqs")
+
+    def send(self, job: CleanupJob, image_keys: list[str] | None = None) -> None:
+        body = {
+            "job_uuid": str(job.job_uuid),
+            "kind": job.kind.value,
+            "property_uuid": str(job.property_uuid) if job.property_uuid else None,
+            "image_keys": image_keys or [],
+        }
+        self.sqs_client.send_message(QueueUrl=self.cleanup_queue_url, MessageBody=json.dumps(body))
+
+
+def run_property_cleanup(
+    jobs: CleanupJobTable,
+    room_table_client: RoomTableClient,
+    asset_storage: S3AssetStorage | None,
+    property_uuid: UUID,
+    property_image_keys: list[str],
+) -> None:
+    try:
+        room_image_keys = room_table_client.delete_property_rooms(
+            property_uuid,
+            on_progress=lambda count: jobs.record_progress(property_uuid, rooms=count),
+        )
+        if asset_storage:
+            asset_storage.delete_objects(
+                property_image_keys + room_image_keys,
+                on_progress=lambda count: jobs.record_progress(property_uuid, assets=count),
+            )
+    except Exception as exc:
+        logger.exception("Cleanup of property %s failed", property_uuid)
+        jobs.finish(property_uuid, error=str(exc))
+        return
+    jobs.finish(property_uuid)
+
+
+def sweep_orphans(
+    jobs: CleanupJobTable,
+    job_uuid: UUID,
+    property_table_client: PropertyTableClient,
+    room_table_client: RoomTableClient,
+    asset_storage: S3AssetStorage | None,
+    asset_grace_seconds: int = ORPHAN_ASSET_GRACE_SECONDS,
+) -> None:
+    try:
+        # Listing first means anything referenced while the tables are scanned is still kept.
+        candidate_keys: set[str] = set()
+        if asset_storage:
+            modified_before = datetime.now(timezone.utc) - timedelta(seconds=asset_grace_seconds)
+            candidate_keys = set(asset_storage.iter_keys(modified_before=modified_before))
+
+        referenced_keys: set[str] = set()
+        property_uuids: set[str] = set()
+        for property_uuid, image_keys in property_table_client.iter_property_references():
+            property_uuids.add(property_uuid)
+            referenced_keys.update(image_keys)
+
+        for items in room_table_client.iter_room_reference_pages():
+            unknown = {it["property_uuid"]["S"] for it in items} - property_uuids
+            if unknown:
+                # Properties created after the scan started are not orphans.
+                property_uuids |= property_table_client.existing_property_uuids(sorted(unknown))
+            orphans = [it for it in items if it["property_uuid"]["S"] not in property_uuids]
+            for it in items:
+                if it["property_uuid"]["S"] in property_uuids:
+                    referenced_keys.update(item_image_keys(it))
+            if orphans:
+                errors = room_table_client.delete_rooms(orphans)
+                if errors:
+                    raise RuntimeError(f"Failed to delete {len(errors)} rooms: {next(iter(errors.values()))}")
+                jobs.record_progress(job_uuid, rooms=len(orphans))
+
+        if asset_storage:
+            asset_storage.delete_objects(
+                sorted(candidate_keys - referenced_keys),
+                on_progress=lambda count: jobs.record_progress(job_uuid, assets=count),
+            )
+    except Exception as exc:
+        logger.exception("Orphan sweep %s failed", job_uuid)
+        jobs.finish(job_uuid, error=str(exc))
+        return
+    jobs.finish(job_uuid)
+
+
+def run_cleanup_message(
+    body: dict[str, Any],
+    jobs: CleanupJobTable,
+    property_table_client: PropertyTableClient,
+    room_table_client: RoomTableClient,
+    asset_storage: S3AssetStorage | None,
+    attempt: int = 1,
+) -> bool:
+    job_uuid = UUID(body["job_uuid"])
+    jobs.record_attempt(job_uuid, attempt)
+    if body["kind"] == CleanupKind.PROPERTY_DELETE.value:
+        run_property_cleanup(jobs, room_table_client, asset_storage, UUID(body["property_uuid"]), body["image_keys"])
+    else:
+        sweep_orphans(jobs, job_uuid, property_table_client, room_table_client, asset_storage)
+    job = jobs.get(job_uuid)
+    return job is not None and job.status == CleanupStatus.COMPLETED
+
+
+_worker_clients: tuple[CleanupJobTable, PropertyTableClient, RoomTableClient, S3AssetStorage | None] | None = None
+
+
+def worker_clients() -> tuple[CleanupJobTable, PropertyTableClient, RoomTableClient, S3AssetStorage | None]:
+    global _worker_clients
+    if _worker_clients is None:
+        app_config = (
+            property_service_prod_configuration
+            if AppMetadata().property_service_env == "prod"
+            else property_service_int_configuration
+        )
+        _worker_clients = (
+            CleanupJobTable(app_config.cleanup_job_table_name),
+            PropertyTableClient(app_config.property_table_name),
+            RoomTableClient(
+                app_config.room_table_name,
+                amenity_table_name=app_config.room_amenity_table_name,
+                write_max_workers=app_config.batch_write_max_workers,
+            ),
+            S3AssetStorage(app_config.asset_bucket_name, region_name=app_config.region)
+            if app_config.asset_bucket_name
+            else None,
+        )
+    return _worker_clients
+
+
+def handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
+    jobs, property_table_client, room_table_client, asset_storage = worker_clients()
+    failures: list[dict[str, str]] = []
+    for record in event.get("Records", []):
+        attempt = int(record.get("attributes", {}).get("ApproximateReceiveCount", 1))
+        completed = run_cleanup_message(
+            json.loads(record["body"]),
+            jobs,
+            property_table_client,
+            room_table_client,
+            asset_storage,
+            attempt=attempt,
+        )
+        if not completed:
+            # Redelivered after the visibility timeout, the dead-letter queue keeps it after the last attempt.
+            failures.append({"itemIdentifier": record["messageId"]})
+    return {"batchItemFailures": failures}
@@ -0,0 +1,154 @@
+import copy
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+import types
+from typing import Any, Callable, Union, get_args, get_origin
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from utils import from_dynamodb_item, to_dynamodb_item
+
+Decoder = Callable[[dict[str, Any]], Any]
+Encoder = Callable[[Any], dict[str, Any]]
+
+
+def _generic_decoder(value: dict[str, Any]) -> Any:
+    return from_dynamodb_item({"value": value})["value"]
+
+
+def _generic_encoder(value: Any) -> dict[str, Any]:
+    return to_dynamodb_item({"value": value})["value"]
+
+
+def _number_to_string(value: Any) -> str:
+    if isinstance(value, float):
+        return str(Decimal(str(value)))
+    return str(value)
+
+
+def _unwrap_optional(annotation: Any) -> tuple[Any, bool]:
+    if get_origin(annotation) in (Union, types.UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0], True
+    return annotation, False
+
+
+def _compile_decoder(annotation: Any) -> Decoder:
+    inner, optional = _unwrap_optional(annotation)
+    decoder = _compile_required_decoder(inner)
+    if not optional:
+        return decoder
+    return lambda value: None if "NULL" in value else decoder(value)
+
+
+def _compile_required_decoder(annotation: Any) -> Decoder:
+    if annotation is str:
+        return lambda value: value["S"]
+    if annotation is UUID:
+        return lambda value: UUID(value["S"])
+    if annotation is datetime:
+        return lambda value: datetime.fromisoformat(value["S"])
+    if annotation is bool:
+        return lambda value: value["BOOL"]
+    if annotation is int:
+        return lambda value: int(value["N"])
+    if annotation is float:
+        return lambda value: float(value["N"])
+    if annotation is Decimal:
+        return lambda value: Decimal(value["N"])
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return lambda value: annotation(value["S"])
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        nested = codec_for(annotation)
+        return lambda value: nested.decode_model(value["M"])
+    if get_origin(annotation) is list:
+        (item_annotation,) = get_args(annotation) or (Any,)
+        item_decoder = _compile_decoder(item_annotation)
+        return lambda value: [item_decoder(item) for item in value["L"]]
+    return _generic_decoder
+
+
+def _compile_encoder(annotation: Any) -> Encoder:
+    inner, _ = _unwrap_optional(annotation)
+    if inner is str:
+        return lambda value: {"S": value}
+    if inner is UUID:
+        return lambda value: {"S": str(value)}
+    if inner is datetime:
+        return lambda value: {"S": value.isoformat()}
+    if inner is bool:
+        return lambda value: {"BOOL": value}
+    if inner in (int, float, Decimal):
+        return lambda value: {"N": _number_to_string(value)}
+    if isinstance(inner, type) and issubclass(inner, Enum):
+        return lambda value: {"S": value.value if isinstance(value, Enum) else value}
+    if isinstance(inner, type) and issubclass(inner, BaseModel):
+        nested = codec_for(inner)
+        return lambda value: {"M": nested.encode(value if isinstance(value, dict) else value.model_dump())}
+    if get_origin(inner) is list:
+        (item_annotation,) = get_args(inner) or (Any,)
+        item_encoder = _compile_encoder(item_annotation)
+        return lambda value: {"L": [item_encoder(item) for item in value]}
+    return _generic_encoder
+
+
+class ModelCodec:
+    def __init__(self, model: type[BaseModel]) -> None:
+        self.model = model
+        self._decoders: dict[str, Decoder] = {}
+        self._encoders: dict[str, Encoder] = {}
+        self._defaults: dict[str, Any] = {}
+        self._default_factories: dict[str, Callable[[], Any]] = {}
+        for name, field in model.model_fields.items():
+            self._decoders[name] = _compile_decoder(field.annotation)
+            self._encoders[name] = _compile_encoder(field.annotation)
+            if field.default_factory is not None:
+                self._default_factories[name] = field.default_factory
+            else:
+                self._defaults[name] = None if field.is_required() else field.default
+
+    def decode(self, item: dict[str, dict[str, Any]]) -> dict[str, Any]:
+        decoders = self._decoders
+        return {name: decoders[name](value) for name, value in item.items() if name in decoders}
+
+    def decode_model(self, item: dict[str, dict[str, Any]]) -> Any:
+        # Decoded values already have the field types, so this skips validation the way
+        # model_construct does without re-resolving every default per item.
+        values = self.decode(item)
+        fields_set = set(values)
+        for name, default in self._defaults.items():
+            if name not in values:
+                values[name] = copy.copy(default)
+        for name, factory in self._default_factories.items():
+            if name not in values:
+                values[name] = factory()
+        instance = self.model.__new__(self.model)
+        object.__setattr__(instance, "__dict__", values)
+        object.__setattr__(instance, "__pydantic_fields_set__", fields_set)
+        object.__setattr__(instance, "__pydantic_extra__", None)
+        object.__setattr__(instance, "__pydantic_private__", None)
+        return instance
+
+    def encode(self, data: dict[str, Any]) -> dict[str, dict[str, Any]]:
+        encoders = self._encoders
+        item: dict[str, dict[str, Any]] = {}
+        for name, value in data.items():
+            if value is None:
+                continue
+            encoder = encoders.get(name, _generic_encoder)
+            item[name] = encoder(value)
+        return item
+
+
+_CODECS: dict[type[BaseModel], ModelCodec] = {}
+
+
+def codec_for(model: type[BaseModel]) -> ModelCodec:
+    codec = _CODECS.get(model)
+    if codec is None:
+        codec = ModelCodec(model)
+        _CODECS[model] = codec
+    return codec
@@ -23,18 +23,67 @@ class AppConfiguration(BaseSettings):
     region: str = "us-east-1"
     property_table_name: str | None = None
     room_table_name: str | None = None
+    room_amenity_table_name: str | None = None
+    search_table_name: str | None = None
+    cleanup_job_table_name: str | None = None
+    cleanup_queue_url: str | None = None
+    location_change_table_name: str | None = None
     asset_bucket_name: str | None = None
     asset_url_ttl_seconds: int = 3600
+    asset_url_cache_size: int = 10000
+    asset_url_cache_window_seconds: int = 300
+    geo_query_max_cells: int = 16
+    geo_query_max_workers: int = 8
+    geo_search_backend: str = "dynamodb"
+    geo_index_cell_degrees: float = 0.05
+    geo_index_refresh_seconds: int = 60
+    geo_index_full_refresh_seconds: int = 3600
+    room_scan_segments: int = 4
+    room_query_max_workers: int = 8
+    batch_write_max_workers: int = 8
+    data_access_max_workers: int = 16
 
 
 property_service_prod_configuration = AppConfiguration(
     property_table_name=os.environ.get("PROPERTY_TABLE_NAME", None),
     room_table_name=os.environ.get("ROOM_TABLE_NAME", None),
+    room_amenity_table_name=os.environ.get("ROOM_AMENITY_TABLE_NAME", None),
+    search_table_name=os.environ.get("SEARCH_TABLE_NAME", None),
+    cleanup_job_table_name=os.environ.get("CLEANUP_JOB_TABLE_NAME", None),
+    cleanup_queue_url=os.environ.get("CLEANUP_QUEUE_URL", None),
+    location_change_table_name=os.environ.get("LOCATION_CHANGE_TABLE_NAME", None),
     asset_bucket_name=os.environ.get("ASSET_BUCKET_NAME", None),
+    geo_query_max_cells=_get_int_env("GEO_QUERY_MAX_CELLS", 16),
+    geo_query_max_workers=_get_int_env("GEO_QUERY_MAX_WORKERS", 8),
+    geo_search_backend=os.environ.get("GEO_SEARCH_BACKEND", "dynamodb"),
+    geo_index_refresh_seconds=_get_int_env("GEO_INDEX_REFRESH_SECONDS", 60),
+    geo_index_full_refresh_seconds=_get_int_env("GEO_INDEX_FULL_REFRESH_SECONDS", 3600),
+    room_scan_segments=_get_int_env("ROOM_SCAN_SEGMENTS", 4),
+    room_query_max_workers=_get_int_env("ROOM_QUERY_MAX_WORKERS", 8),
+    batch_write_max_workers=_get_int_env("BATCH_WRITE_MAX_WORKERS", 8),
+    data_access_max_workers=_get_int_env("DATA_ACCESS_MAX_WORKERS", 16),
+    asset_url_cache_size=_get_int_env("ASSET_URL_CACHE_SIZE", 10000),
+    asset_url_cache_window_seconds=_get_int_env("ASSET_URL_CACHE_WINDOW_SECONDS", 300),
 )
 
 property_service_int_configuration = AppConfiguration(
     property_table_name=os.environ.get("PROPERTY_TABLE_NAME", "property_table_int"),
     room_table_name=os.environ.get("ROOM_TABLE_NAME", "room_table_int"),
+    room_amenity_table_name=os.environ.get("ROOM_AMENITY_TABLE_NAME", "room_amenity_table_int"),
+    search_table_name=os.environ.get("SEARCH_TABLE_NAME", "property_search_table_int"),
+    cleanup_job_table_name=os.environ.get("CLEANUP_JOB_TABLE_NAME", "cleanup_job_table_int"),
+    cleanup_queue_url=os.environ.get("CLEANUP_QUEUE_URL", None),
+    location_change_table_name=os.environ.get("LOCATION_CHANGE_TABLE_NAME", None),
     asset_bucket_name=os.environ.get("ASSET_BUCKET_NAME", "property-assets-int"),
+    geo_query_max_cells=_get_int_env("GEO_QUERY_MAX_CELLS", 16),
+    geo_query_max_workers=_get_int_env("GEO_QUERY_MAX_WORKERS", 8),
+    geo_search_backend=os.environ.get("GEO_SEARCH_BACKEND", "dynamodb"),
+    geo_index_refresh_seconds=_get_int_env("GEO_INDEX_REFRESH_SECONDS", 60),
+    geo_index_full_refresh_seconds=_get_int_env("GEO_INDEX_FULL_REFRESH_SECONDS", 3600),
+    room_scan_segments=_get_int_env("ROOM_SCAN_SEGMENTS", 4),
+    room_query_max_workers=_get_int_env("ROOM_QUERY_MAX_WORKERS", 8),
+    batch_write_max_workers=_get_int_env("BATCH_WRITE_MAX_WORKERS", 8),
+    data_access_max_workers=_get_int_env("DATA_ACCESS_MAX_WORKERS", 16),
+    asset_url_cache_size=_get_int_env("ASSET_URL_CACHE_SIZE", 10000),
+    asset_url_cache_window_seconds=_get_int_env("ASSET_URL_CACHE_WINDOW_SECONDS", 300),
 )
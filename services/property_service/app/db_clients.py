@@ -1,49 +1,359 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import islice
 import logging
-from typing import Any
+import queue
+import random
+import threading
+import time
+from typing import Any, Callable, Iterator
 from decimal import Decimal
 from uuid import UUID, uuid4
 
 import boto3
+from amenity_index import AmenityIndex, amenity_names, item_amenity_names
+from batch_write import write_batches
+from codec import codec_for
+from derivatives import variant_keys, with_variant_keys
+from geohash import GEOHASH_CELL_PRECISION, choose_query_precision, covering_cells, encode
+from geometry import bbox_deltas, filter_items_within_radius
+from pagination import decode_cursor, encode_cursor
 from schemas import Amenity, Property, Room
-from utils import from_dynamodb_item, to_dynamodb_item
+from search_documents import ROOM_SUMMARY_NAMES, ROOM_SUMMARY_PROJECTION, SearchDocumentTable
 
 logger = logging.getLogger()
 
+GEOHASH_INDEX_NAME = "geohash_index"
+
+ROOM_TABLE_STATS_TTL_SECONDS = 3600
+PROPERTY_PRICE_INDEX_NAME = "property_price_index"
+PRICE_BUCKET_INDEX_NAME = "price_bucket_index"
+PRICE_BUCKET_WIDTH = 50
+PRICE_BUCKET_COUNT = 40
+ROOM_DELETE_PAGE_SIZE = 100
+ROOM_REFERENCE_PROJECTION = "#uuid, property_uuid, amenities, images"
+
+PROPERTY_CODEC = codec_for(Property)
+ROOM_CODEC = codec_for(Room)
+
+ADDRESS_SOURCE_FIELDS = ("address", "county", "city", "state", "country")
+ADDRESS_DERIVED_FIELDS = ("full_address", "city_key")
+
+
+def build_city_key(country: str, state: str | None, city: str) -> str:
+    parts = [country.strip().upper()]
+    parts.append(state.strip().upper() if state else "")
+    parts.append(city.strip().upper())
+    return "#".join(parts)
+
+
+def set_property_full_address(property: Property) -> None:
+    full_address = f"{property.address}"
+    if property.county:
+        full_address += f",{property.county}"
+    full_address += f",{property.city}"
+    if property.state:
+        full_address += f",{property.state}"
+    full_address += f",{property.country}"
+    property.full_address = full_address
+    property.city_key = build_city_key(property.country, property.state, property.city)
+
+
+def price_bucket(price_per_night: float) -> str:
+    index = min(max(int(price_per_night // PRICE_BUCKET_WIDTH), 0), PRICE_BUCKET_COUNT - 1)
+    return f"{index:03d}"
+
+
+def price_key_condition(
+    min_price_per_night: float | None,
+    max_price_per_night: float | None,
+) -> tuple[str | None, dict[str, Any]]:
+    if min_price_per_night is not None and max_price_per_night is not None:
+        return "price_per_night BETWEEN :minp AND :maxp", {
+            ":minp": {"N": str(min_price_per_night)},
+            ":maxp": {"N": str(max_price_per_night)},
+        }
+    if min_price_per_night is not None:
+        return "price_per_night >= :minp", {":minp": {"N": str(min_price_per_night)}}
+    if max_price_per_night is not None:
+        return "price_per_night <= :maxp", {":maxp": {"N": str(max_price_per_night)}}
+    return None, {}
+
+
+def set_geohash_attributes(data: dict[str, Any]) -> None:
+    latitude = data.get("latitude")
+    longitude = data.get("longitude")
+    if latitude is None or longitude is None:
+        data.pop("geohash", None)
+        data.pop("geohash_cell", None)
+        return
+    geohash = encode(float(latitude), float(longitude))
+    data["geohash"] = geohash
+    data["geohash_cell"] = geohash[:GEOHASH_CELL_PRECISION]
+
+
+def normalize_images(raw_images: list[Any]) -> list[dict[str, Any]]:
+    normalized_images: list[dict[str, Any]] = []
+    for raw_image in raw_images:
+        key = None
+        if isinstance(raw_image, dict):
+            key = raw_image.get("key")
+        else:
+            key = getattr(raw_image, "key", None)
+        if key:
+            variants = variant_keys(key)
+            normalized_images.append({"key": key, "variants": variants} if variants else {"key": key})
+    return normalized_images
+
+
+def build_update(codec: Any, changes: dict[str, Any]) -> tuple[str, dict[str, str], dict[str, Any]]:
+    encoded = codec.encode({name: value for name, value in changes.items() if value is not None})
+    removed = [name for name, value in changes.items() if value is None]
+    names: dict[str, str] = {}
+    values: dict[str, Any] = {}
+    set_clauses: list[str] = []
+    for i, (name, value) in enumerate(encoded.items()):
+        names[f"#s{i}"] = name
+        values[f":s{i}"] = value
+        set_clauses.append(f"#s{i} = :s{i}")
+    for i, name in enumerate(removed):
+        names[f"#r{i}"] = name
+    expression = "SET " + ", ".join(set_clauses)
+    if removed:
+        expression += " REMOVE " + ", ".join(f"#r{i}" for i in range(len(removed)))
+    return expression, names, values
+
+
+def apply_update(codec: Any, item: dict[str, Any], changes: dict[str, Any]) -> dict[str, Any]:
+    updated = {name: value for name, value in item.items() if name not in changes}
+    updated.update(codec.encode({name: value for name, value in changes.items() if value is not None}))
+    return updated
+
+
+def item_image_keys(item: dict[str, Any]) -> list[str]:
+    keys: list[str] = []
+    for value in item.get("images", {}).get("L", []):
+        key = value.get("M", {}).get("key", {}).get("S")
+        if key:
+            keys.append(key)
+    return with_variant_keys(keys)
+
+
+def property_from_item(item: dict[str, Any]) -> Property:
+    return PROPERTY_CODEC.decode_model(item)
+
+
+def room_from_item(item: dict[str, Any]) -> Room:
+    return ROOM_CODEC.decode_model(item)
+
+
+def query_page(
+    db_client: Any,
+    params: dict[str, Any],
+    limit: int | None = None,
+    cursor: str | None = None,
+) -> tuple[list[dict[str, Any]], str | None]:
+    params = dict(params)
+    start_key = decode_cursor(cursor)
+    if start_key:
+        params["ExclusiveStartKey"] = start_key
+    if limit is not None:
+        params["Limit"] = limit
+        resp = db_client.query(**params)
+        return resp.get("Items", []), encode_cursor(resp.get("LastEvaluatedKey"))
+
+    items: list[dict[str, Any]] = []
+    while True:
+        resp = db_client.query(**params)
+        items.extend(resp.get("Items", []))
+        lek = resp.get("LastEvaluatedKey")
+        if not lek:
+            return items, None
+        params["ExclusiveStartKey"] = lek
+
+
+BATCH_GET_CHUNK_SIZE = 100
+BATCH_GET_MAX_ATTEMPTS = 8
+BATCH_GET_BASE_DELAY_SECONDS = 0.05
+BATCH_GET_MAX_DELAY_SECONDS = 2.0
+
+
+def build_projection(fields: list[str] | None, allowed: Any) -> tuple[str, dict[str, str]] | None:
+    if not fields:
+        return None
+    unknown = [field for field in fields if field not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    names = {f"#f{i}": field for i, field in enumerate(dict.fromkeys(["uuid", *fields]))}
+    return ", ".join(names), names
+
+
+def apply_projection(params: dict[str, Any], projection: tuple[str, dict[str, str]] | None) -> dict[str, Any]:
+    if projection:
+        expression, names = projection
+        params["ProjectionExpression"] = expression
+        params.setdefault("ExpressionAttributeNames", {}).update(names)
+    return params
+
+
+def batch_get_items(
+    db_client: Any,
+    table_name: str,
+    uuids: list[UUID] | list[str],
+    projection: tuple[str, dict[str, str]] | None = None,
+) -> list[dict[str, Any]]:
+    unique_keys = list(dict.fromkeys(str(item_uuid) for item_uuid in uuids))
+    items: dict[str, dict[str, Any]] = {}
+    for start in range(0, len(unique_keys), BATCH_GET_CHUNK_SIZE):
+        table_request: dict[str, Any] = {
+            "Keys": [{"uuid": {"S": key}} for key in unique_keys[start:start + BATCH_GET_CHUNK_SIZE]],
+        }
+        if projection:
+            table_request["ProjectionExpression"] = projection[0]
+            table_request["ExpressionAttributeNames"] = projection[1]
+        request_items: dict[str, Any] = {table_name: table_request}
+        attempt = 0
+        while request_items:
+            resp = db_client.batch_get_item(RequestItems=request_items)
+            for it in resp.get("Responses", {}).get(table_name, []):
+                items[it["uuid"]["S"]] = it
+            request_items = resp.get("UnprocessedKeys") or {}
+            if not request_items:
+                break
+            attempt += 1
+            if attempt >= BATCH_GET_MAX_ATTEMPTS:
+                raise RuntimeError(f"BatchGetItem on {table_name} left keys unprocessed after {attempt} attempts")
+            delay = min(BATCH_GET_MAX_DELAY_SECONDS, BATCH_GET_BASE_DELAY_SECONDS * 2 ** attempt)
+            time.sleep(random.uniform(0, delay))
+    return [items[key] for key in unique_keys if key in items]
+
+
 class PropertyTableClient:
-    def __init__(self, property_table_name: str | None) -> None:
+    def __init__(
+        self,
+        property_table_name: str | None,
+        geo_query_max_cells: int = 16,
+        geo_query_max_workers: int = 8,
+        write_max_workers: int = 8,
+        search_documents: SearchDocumentTable | None = None,
+    ) -> None:
 
         if not property_table_name:
             raise ValueError("Property table name must be provided.")
 
         self.property_table_name = property_table_name
         self.property_db_client = boto3.client("dynamodb")
+        self.geo_query_max_cells = geo_query_max_cells
+        self.geo_query_max_workers = geo_query_max_workers
+        self.write_max_workers = write_max_workers
+        self.search_documents = search_documents
 
-    def add_property(self, property: Property) -> UUID:
+    def _property_data(self, property: Property) -> dict[str, Any]:
         data = property.model_dump(exclude_none=True)
         if data.get("images"):
-            normalized_images: list[dict[str, str]] = []
-            for raw_image in data["images"]:
-                key = None
-                if isinstance(raw_image, dict):
-                    key = raw_image.get("key")
-                else:
-                    key = getattr(raw_image, "key", None)
-                if key:
-                    normalized_images.append({"key": key})
-            data["images"] = normalized_images
+            data["images"] = normalize_images(data["images"])
         if not data.get("uuid"):
             data["uuid"] = uuid4()
         if not data.get("created_at"):
             data["created_at"] = datetime.now()
         data["updated_at"] = datetime.now()
+        data.pop("distance_km", None)
+        set_geohash_attributes(data)
+        return data
 
+    def add_property(self, property: Property) -> UUID:
+        item = PROPERTY_CODEC.encode(self._property_data(property))
         self.property_db_client.put_item(
             TableName=self.property_table_name,
-            Item=to_dynamodb_item(data),
+            Item=item,
         )
-        return data["uuid"]
+        if self.search_documents:
+            self.search_documents.put_property(property_from_item(item))
+        return UUID(item["uuid"]["S"])
+
+    def put_properties(self, properties: list[Property]) -> dict[str, str]:
+        # Unconditional puts, only for properties with freshly generated UUIDs.
+        requests = [
+            {"PutRequest": {"Item": PROPERTY_CODEC.encode(self._property_data(property))}}
+            for property in properties
+        ]
+        failures = write_batches(self.property_db_client, self.property_table_name, requests, self.write_max_workers)
+        errors = {request["PutRequest"]["Item"]["uuid"]["S"]: error for request, error in failures}
+        if self.search_documents:
+            self.search_documents.put_properties([
+                property_from_item(request["PutRequest"]["Item"])
+                for request in requests
+                if request["PutRequest"]["Item"]["uuid"]["S"] not in errors
+            ])
+        return errors
     
+    def update_property(self, property_uuid: UUID, user_uuid: UUID, changes: dict[str, Any]) -> Property:
+        data = {k: v for k, v in changes.items() if k not in ("uuid", "user_uuid", "created_at", "distance_km")}
+        if data.get("images"):
+            data["images"] = normalize_images(data["images"])
+        if "latitude" in data or "longitude" in data:
+            set_geohash_attributes(data)
+            data.setdefault("geohash", None)
+            data.setdefault("geohash_cell", None)
+        data["updated_at"] = datetime.now()
+
+        expression, names, values = build_update(PROPERTY_CODEC, data)
+        names["#uuid"] = "uuid"
+        names["#owner"] = "user_uuid"
+        values[":owner"] = {"S": str(user_uuid)}
+        try:
+            resp = self.property_db_client.update_item(
+                TableName=self.property_table_name,
+                Key={"uuid": {"S": str(property_uuid)}},
+                UpdateExpression=expression,
+                ConditionExpression="attribute_exists(#uuid) AND #owner = :owner",
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=values,
+                ReturnValues="ALL_NEW",
+                ReturnValuesOnConditionCheckFailure="ALL_OLD",
+            )
+        except self.property_db_client.exceptions.ConditionalCheckFailedException as exc:
+            if exc.response.get("Item"):
+                raise PermissionError("Property belongs to another user") from exc
+            raise ValueError("Property not found") from exc
+        updated = self._update_derived_address(property_uuid, property_from_item(resp["Attributes"]))
+        if self.search_documents:
+            self.search_documents.put_property(updated)
+        return updated
+
+    def _update_derived_address(self, property_uuid: UUID, updated: Property) -> Property:
+        derived = updated.model_copy()
+        set_property_full_address(derived)
+        if (derived.full_address, derived.city_key) == (updated.full_address, updated.city_key):
+            return updated
+
+        names = {f"#a{i}": name for i, name in enumerate(ADDRESS_SOURCE_FIELDS)}
+        names.update({"#full_address": "full_address", "#city_key": "city_key"})
+        values = PROPERTY_CODEC.encode({"full_address": derived.full_address, "city_key": derived.city_key})
+        values = {":full_address": values["full_address"], ":city_key": values["city_key"]}
+        conditions = []
+        source = PROPERTY_CODEC.encode(updated.model_dump(include=set(ADDRESS_SOURCE_FIELDS), exclude_none=True))
+        for i, name in enumerate(ADDRESS_SOURCE_FIELDS):
+            if name in source:
+                conditions.append(f"#a{i} = :a{i}")
+                values[f":a{i}"] = source[name]
+            else:
+                conditions.append(f"attribute_not_exists(#a{i})")
+        try:
+            resp = self.property_db_client.update_item(
+                TableName=self.property_table_name,
+                Key={"uuid": {"S": str(property_uuid)}},
+                UpdateExpression="SET #full_address = :full_address, #city_key = :city_key",
+                # A concurrent address change wins, its own update derives the keys from the newer values.
+                ConditionExpression=" AND ".join(conditions),
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=values,
+                ReturnValues="ALL_NEW",
+            )
+        except self.property_db_client.exceptions.ConditionalCheckFailedException:
+            return self.get_property(property_uuid)
+        return property_from_item(resp["Attributes"])
+
     def get_property(self, property_uuid: UUID) -> Property:
         response = self.property_db_client.get_item(
             TableName=self.property_table_name,
@@ -52,38 +362,100 @@ class PropertyTableClient:
         item = response.get("Item")
         if not item:
             raise ValueError("Property not found")
-        data = from_dynamodb_item(item)
-        return Property(**{k: v for k, v in data.items() if k in Property.model_fields})
+        return property_from_item(item)
 
 
-    def delete_property(self, property_uuid: UUID) -> UUID:
-        _ = self.property_db_client.delete_item(
-            TableName=self.property_table_name,
-            Key={"uuid": {"S": str(property_uuid)}}
+    def get_properties(self, property_uuids: list[UUID], fields: list[str] | None = None) -> list[Property]:
+        items = batch_get_items(
+            self.property_db_client,
+            self.property_table_name,
+            property_uuids,
+            projection=build_projection(fields, Property.model_fields),
         )
-        return property_uuid
+        return [property_from_item(it) for it in items]
 
-    def get_user_properties(self, user_uuid: UUID) -> list[Property]:
-        response = self.property_db_client.query(
+    def delete_property(self, property_uuid: UUID) -> Property | None:
+        resp = self.property_db_client.delete_item(
             TableName=self.property_table_name,
-            IndexName="user_index",
-            KeyConditionExpression="user_uuid = :user_uuid",
-            ExpressionAttributeValues={":user_uuid": {"S": str(user_uuid)}},
+            Key={"uuid": {"S": str(property_uuid)}},
+            ReturnValues="ALL_OLD",
         )
+        if self.search_documents:
+            self.search_documents.delete_property(property_uuid)
+        previous = resp.get("Attributes")
+        return property_from_item(previous) if previous else None
 
-        items = response.get("Items", [])
-        return [Property(**from_dynamodb_item(item)) for item in items]
+    def existing_property_uuids(self, property_uuids: list[str]) -> set[str]:
+        items = batch_get_items(
+            self.property_db_client,
+            self.property_table_name,
+            property_uuids,
+            projection=build_projection(["uuid"], Property.model_fields),
+        )
+        return {it["uuid"]["S"] for it in items}
 
+    def iter_property_references(self) -> Iterator[tuple[str, list[str]]]:
+        params: dict[str, Any] = {
+            "TableName": self.property_table_name,
+            "ProjectionExpression": "#uuid, images",
+            "ExpressionAttributeNames": {"#uuid": "uuid"},
+        }
+        while True:
+            resp = self.property_db_client.scan(**params)
+            for it in resp.get("Items", []):
+                yield it["uuid"]["S"], item_image_keys(it)
+            lek = resp.get("LastEvaluatedKey")
+            if not lek:
+                return
+            params["ExclusiveStartKey"] = lek
 
-    def get_properties_by_city_key(self, city_key: str) -> list[Property]:
-        response = self.property_db_client.query(
-            TableName=self.property_table_name,
-            IndexName="city_index",
-            KeyConditionExpression="city_key = :ck",
-            ExpressionAttributeValues={":ck": {"S": city_key}},
+    def get_user_properties_page(
+        self,
+        user_uuid: UUID,
+        limit: int | None = None,
+        cursor: str | None = None,
+        fields: list[str] | None = None,
+    ) -> tuple[list[Property], str | None]:
+        items, next_cursor = query_page(
+            self.property_db_client,
+            apply_projection({
+                "TableName": self.property_table_name,
+                "IndexName": "user_index",
+                "KeyConditionExpression": "user_uuid = :user_uuid",
+                "ExpressionAttributeValues": {":user_uuid": {"S": str(user_uuid)}},
+            }, build_projection(fields, Property.model_fields)),
+            limit=limit,
+            cursor=cursor,
         )
-        items = response.get("Items", [])
-        return [Property(**from_dynamodb_item(item)) for item in items]
+        return [property_from_item(item) for item in items], next_cursor
+
+    def get_user_properties(self, user_uuid: UUID) -> list[Property]:
+        properties, _ = self.get_user_properties_page(user_uuid)
+        return properties
+
+    def get_properties_by_city_key_page(
+        self,
+        city_key: str,
+        limit: int | None = None,
+        cursor: str | None = None,
+        fields: list[str] | None = None,
+    ) -> tuple[list[Property], str | None]:
+        items, next_cursor = query_page(
+            self.property_db_client,
+            apply_projection({
+                "TableName": self.property_table_name,
+                "IndexName": "city_index",
+                "KeyConditionExpression": "city_key = :ck",
+                "ExpressionAttributeValues": {":ck": {"S": city_key}},
+            }, build_projection(fields, Property.model_fields)),
+            limit=limit,
+            cursor=cursor,
+        )
+        return [property_from_item(item) for item in items], next_cursor
+
+    def get_properties_by_city_key(self, city_key: str) -> list[Property]:
+        properties, _ = self.get_properties_by_city_key_page(city_key)
+        return properties
 
 
     def get_properties_in_bbox(
@@ -95,6 +467,19 @@ class PropertyTableClient:
         state: str | None = None,
         city: str | None = None,
     ) -> list[Property]:
+        items = self._scan_bbox_items(latitude, longitude, delta, country=country, state=state, city=city)
+        return [property_from_item(it) for it in items]
+
+    def _scan_bbox_items(
+        self,
+        latitude: Decimal,
+        longitude: Decimal,
+        delta: float,
+        country: str | None = None,
+        state: str | None = None,
+        city: str | None = None,
+        projection: tuple[str, dict[str, str]] | None = None,
+    ) -> list[dict[str, Any]]:
         min_lat = Decimal(str(float(latitude) - float(delta)))
         max_lat = Decimal(str(float(latitude) + float(delta)))
         min_lon = Decimal(str(float(longitude) - float(delta)))
@@ -127,20 +512,116 @@ class PropertyTableClient:
         }
         if state:
             params.setdefault("ExpressionAttributeNames", {})["#state"] = "state"
+        apply_projection(params, projection)
 
-        results: list[Property] = []
+        items: list[dict[str, Any]] = []
         while True:
             resp = self.property_db_client.scan(**params)
-            items = resp.get("Items", [])
-            for it in items:
-                data = from_dynamodb_item(it)
-                results.append(Property(**{k: v for k, v in data.items() if k in Property.model_fields}))
+            items.extend(resp.get("Items", []))
             lek = resp.get("LastEvaluatedKey")
             if not lek:
                 break
             params["ExclusiveStartKey"] = lek
 
-        return results
+        return items
+
+    def _build_location_filter(
+        self,
+        country: str | None,
+        state: str | None,
+        city: str | None,
+    ) -> tuple[list[str], dict[str, Any], dict[str, str]]:
+        filter_expr_parts: list[str] = []
+        eav: dict[str, Any] = {}
+        ean: dict[str, str] = {}
+        if country:
+            filter_expr_parts.append("country = :country")
+            eav[":country"] = {"S": country}
+        if state:
+            filter_expr_parts.append("#state = :state")
+            eav[":state"] = {"S": state}
+            ean["#state"] = "state"
+        if city:
+            filter_expr_parts.append("city = :city")
+            eav[":city"] = {"S": city}
+        return filter_expr_parts, eav, ean
+
+    def _query_geohash_cell(
+        self,
+        cell: str,
+        country: str | None = None,
+        state: str | None = None,
+        city: str | None = None,
+        projection: tuple[str, dict[str, str]] | None = None,
+    ) -> list[dict[str, Any]]:
+        filter_expr_parts, eav, ean = self._build_location_filter(country, state, city)
+        key_condition = "geohash_cell = :cell"
+        eav[":cell"] = {"S": cell[:GEOHASH_CELL_PRECISION]}
+        if len(cell) > GEOHASH_CELL_PRECISION:
+            key_condition += " AND begins_with(geohash, :prefix)"
+            eav[":prefix"] = {"S": cell}
+
+        params: dict[str, Any] = {
+            "TableName": self.property_table_name,
+            "IndexName": GEOHASH_INDEX_NAME,
+            "KeyConditionExpression": key_condition,
+            "ExpressionAttributeValues": eav,
+        }
+        if filter_expr_parts:
+            params["FilterExpression"] = " AND ".join(filter_expr_parts)
+        if ean:
+            params["ExpressionAttributeNames"] = ean
+        apply_projection(params, projection)
+
+        items: list[dict[str, Any]] = []
+        while True:
+            resp = self.property_db_client.query(**params)
+            items.extend(resp.get("Items", []))
+            lek = resp.get("LastEvaluatedKey")
+            if not lek:
+                break
+            params["ExclusiveStartKey"] = lek
+        return items
+
+    def _query_geohash_cells_items(
+        self,
+        cells: set[str],
+        country: str | None = None,
+        state: str | None = None,
+        city: str | None = None,
+        projection: tuple[str, dict[str, str]] | None = None,
+    ) -> list[dict[str, Any]]:
+        if not cells:
+            return []
+        workers = max(1, min(len(cells), self.geo_query_max_workers))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pages = list(executor.map(
+                lambda cell: self._query_geohash_cell(
+                    cell, country=country, state=state, city=city, projection=projection,
+                ),
+                sorted(cells),
+            ))
+
+        items: list[dict[str, Any]] = []
+        seen: set[str] = set()
+        for page in pages:
+            for it in page:
+                item_uuid = it["uuid"]["S"]
+                if item_uuid in seen:
+                    continue
+                seen.add(item_uuid)
+                items.append(it)
+        return items
+
+    def get_properties_in_geohash_cells(
+        self,
+        cells: set[str],
+        country: str | None = None,
+        state: str | None = None,
+        city: str | None = None,
+    ) -> list[Property]:
+        items = self._query_geohash_cells_items(cells, country=country, state=state, city=city)
+        return [property_from_item(it) for it in items]
 
     def get_properties_within_radius(
         self,
@@ -150,83 +631,264 @@ class PropertyTableClient:
         country: str | None = None,
         state: str | None = None,
         city: str | None = None,
+        fields: list[str] | None = None,
     ) -> list[Property]:
-        import math
         lat_f = float(latitude)
         lon_f = float(longitude)
-        delta_lat = radius_km / 111.0
-        delta_lon = radius_km / (111.0 * max(math.cos(math.radians(lat_f)), 1e-6))
-
-        candidates = self.get_properties_in_bbox(
-            latitude=latitude,
-            longitude=longitude,
-            delta=max(delta_lat, delta_lon),
-            country=country,
-            state=state,
-            city=city,
-        )
+        delta_lat, delta_lon = bbox_deltas(lat_f, radius_km)
+        # The radius check needs coordinates even when the caller did not ask for them.
+        projection = build_projection(fields and [*fields, "latitude", "longitude"], Property.model_fields)
 
-        def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-            R = 6371.0
-            phi1 = math.radians(lat1)
-            phi2 = math.radians(lat2)
-            dphi = math.radians(lat2 - lat1)
-            dlambda = math.radians(lon2 - lon1)
-            a = math.sin(dphi/2)**2 + math.cos(phi1)*math.cos(phi2)*math.sin(dlambda/2)**2
-            c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-            return R * c
+        min_lat, max_lat = lat_f - delta_lat, lat_f + delta_lat
+        min_lon, max_lon = lon_f - delta_lon, lon_f + delta_lon
+        precision = choose_query_precision(
+            min_lat, min_lon, max_lat, max_lon, max_cells=self.geo_query_max_cells,
+        )
+        if precision is None:
+            logger.info("Radius %s km too wide for geohash cells, falling back to scan", radius_km)
+            candidates = self._scan_bbox_items(
+                latitude=latitude,
+                longitude=longitude,
+                delta=max(delta_lat, delta_lon),
+                country=country,
+                state=state,
+                city=city,
+                projection=projection,
+            )
+        else:
+            candidates = self._query_geohash_cells_items(
+                covering_cells(min_lat, min_lon, max_lat, max_lon, precision),
+                country=country,
+                state=state,
+                city=city,
+                projection=projection,
+            )
 
         results: list[Property] = []
-        for p in candidates:
-            plat = getattr(p, 'latitude', None)
-            plon = getattr(p, 'longitude', None)
-            if plat is None or plon is None:
-                continue
-            try:
-                d = haversine(lat_f, lon_f, float(plat), float(plon))
-            except Exception:
-                continue
-            if d <= radius_km:
-                results.append(p)
+        for it, distance in filter_items_within_radius(candidates, lat_f, lon_f, radius_km):
+            property_obj = property_from_item(it)
+            property_obj.distance_km = round(distance, 3)
+            results.append(property_obj)
         return results
 
+    def backfill_geohash(self) -> int:
+        params: dict[str, Any] = {
+            "TableName": self.property_table_name,
+            "ProjectionExpression": "#uuid, latitude, longitude",
+            "FilterExpression": (
+                "attribute_not_exists(geohash) AND attribute_exists(latitude) AND attribute_exists(longitude)"
+            ),
+            "ExpressionAttributeNames": {"#uuid": "uuid"},
+        }
+        updated = 0
+        while True:
+            resp = self.property_db_client.scan(**params)
+            for it in resp.get("Items", []):
+                data = PROPERTY_CODEC.decode(it)
+                set_geohash_attributes(data)
+                if "geohash" not in data:
+                    continue
+                try:
+                    self.property_db_client.update_item(
+                        TableName=self.property_table_name,
+                        Key={"uuid": it["uuid"]},
+                        UpdateExpression="SET geohash = :geohash, geohash_cell = :cell",
+                        ConditionExpression="attribute_exists(#uuid)",
+                        ExpressionAttributeNames={"#uuid": "uuid"},
+                        ExpressionAttributeValues={
+                            ":geohash": {"S": data["geohash"]},
+                            ":cell": {"S": data["geohash_cell"]},
+                        },
+                    )
+                except self.property_db_client.exceptions.ConditionalCheckFailedException:
+                    continue
+                updated += 1
+            lek = resp.get("LastEvaluatedKey")
+            if not lek:
+                break
+            params["ExclusiveStartKey"] = lek
+        logger.info("Backfilled geohash on %s properties", updated)
+        return updated
+
+    def backfill_search_documents(self) -> int:
+        if not self.search_documents:
+            raise ValueError("Search table name must be configured.")
+        params: dict[str, Any] = {"TableName": self.property_table_name}
+        written = 0
+        while True:
+            resp = self.property_db_client.scan(**params)
+            properties = [property_from_item(it) for it in resp.get("Items", [])]
+            self.search_documents.put_properties(properties)
+            written += len(properties)
+            lek = resp.get("LastEvaluatedKey")
+            if not lek:
+                break
+            params["ExclusiveStartKey"] = lek
+        logger.info("Backfilled search documents for %s properties", written)
+        return written
+
 
 
 class RoomTableClient:
-    def __init__(self, room_table_name: str | None) -> None:
+    def __init__(
+        self,
+        room_table_name: str | None,
+        scan_segments: int = 4,
+        query_max_workers: int = 8,
+        amenity_table_name: str | None = None,
+        write_max_workers: int = 8,
+        search_documents: SearchDocumentTable | None = None,
+    ) -> None:
 
         if not room_table_name:
             raise ValueError("Room table name must be provided.")
 
         self.room_table_name = room_table_name
         self.room_db_client = boto3.client("dynamodb")
+        self.scan_segments = max(1, scan_segments)
+        self.query_max_workers = max(1, query_max_workers)
+        self.write_max_workers = max(1, write_max_workers)
+        self._room_table_stats: tuple[float, int] | None = None
+        self.amenity_index = (
+            AmenityIndex(amenity_table_name, self.room_db_client, max_workers=query_max_workers)
+            if amenity_table_name
+            else None
+        )
+        self.search_documents = search_documents
 
-    def add_room(self, room: Room) -> UUID:
+    def _refresh_search_document(self, property_uuid: str, known_rooms: dict[str, dict[str, Any] | None]) -> None:
+        if not self.search_documents:
+            return
+        params: dict[str, Any] = {
+            "TableName": self.room_table_name,
+            "IndexName": "property_uuid_index",
+            "KeyConditionExpression": "property_uuid = :p",
+            "ProjectionExpression": ROOM_SUMMARY_PROJECTION,
+            "ExpressionAttributeNames": dict(ROOM_SUMMARY_NAMES),
+            "ExpressionAttributeValues": {":p": {"S": property_uuid}},
+        }
+        rooms: dict[str, dict[str, Any]] = {}
+        while True:
+            resp = self.room_db_client.query(**params)
+            for item in resp.get("Items", []):
+                rooms[item["uuid"]["S"]] = item
+            lek = resp.get("LastEvaluatedKey")
+            if not lek:
+                break
+            params["ExclusiveStartKey"] = lek
+        # The index is eventually consistent, so the rooms this request wrote override what it returned.
+        for room_uuid, item in known_rooms.items():
+            if item is None:
+                rooms.pop(room_uuid, None)
+            else:
+                rooms[room_uuid] = item
+        self.search_documents.update_rooms(property_uuid, rooms.values())
+
+    def _room_data(self, room: Room) -> dict[str, Any]:
         data = room.model_dump(exclude_none=True)
         if data.get("images"):
-            normalized_images: list[dict[str, str]] = []
-            for raw_image in data["images"]:
-                key = None
-                if isinstance(raw_image, dict):
-                    key = raw_image.get("key")
-                else:
-                    key = getattr(raw_image, "key", None)
-                if key:
-                    normalized_images.append({"key": key})
-            data["images"] = normalized_images
+            data["images"] = normalize_images(data["images"])
         if not data.get("uuid"):
             data["uuid"] = uuid4()
         if not data.get("created_at"):
             data["created_at"] = datetime.now()
-        
         data["updated_at"] = datetime.now()
-    
-        self.room_db_client.put_item(
+        data["price_bucket"] = price_bucket(data["price_per_night"])
+        return data
+
+    def add_room(self, room: Room) -> UUID:
+        data = self._room_data(room)
+        item = ROOM_CODEC.encode(data)
+        resp = self.room_db_client.put_item(
             TableName=self.room_table_name,
-            Item=to_dynamodb_item(data),
+            Item=item,
+            ReturnValues="ALL_OLD",
         )
+        previous = resp.get("Attributes")
+        room_uuid = item["uuid"]["S"]
+        self._refresh_search_document(item["property_uuid"]["S"], {room_uuid: item})
+        if previous and previous["property_uuid"] != item["property_uuid"]:
+            self._refresh_search_document(previous["property_uuid"]["S"], {room_uuid: None})
+        if self.amenity_index:
+            self.amenity_index.update_room(
+                str(data["uuid"]),
+                str(data["property_uuid"]),
+                amenity_names(data.get("amenities")),
+                previous_amenities=item_amenity_names(previous),
+                previous_property_uuid=previous["property_uuid"]["S"] if previous else None,
+            )
         return data["uuid"]
     
+    def put_rooms(self, rooms: list[Room]) -> dict[str, str]:
+        # Unconditional puts, only for rooms with freshly generated UUIDs.
+        items = [ROOM_CODEC.encode(self._room_data(room)) for room in rooms]
+        failures = write_batches(
+            self.room_db_client,
+            self.room_table_name,
+            [{"PutRequest": {"Item": item}} for item in items],
+            self.write_max_workers,
+        )
+        errors = {request["PutRequest"]["Item"]["uuid"]["S"]: error for request, error in failures}
+        if self.amenity_index:
+            self.amenity_index.index_rooms(
+                (item["uuid"]["S"], item["property_uuid"]["S"], item_amenity_names(item))
+                for item in items
+                if item["uuid"]["S"] not in errors
+            )
+        if self.search_documents:
+            rooms_by_property: dict[str, dict[str, dict[str, Any] | None]] = {}
+            for item in items:
+                if item["uuid"]["S"] not in errors:
+                    rooms_by_property.setdefault(item["property_uuid"]["S"], {})[item["uuid"]["S"]] = item
+            if rooms_by_property:
+                with ThreadPoolExecutor(max_workers=min(len(rooms_by_property), self.query_max_workers)) as executor:
+                    list(executor.map(lambda entry: self._refresh_search_document(*entry), rooms_by_property.items()))
+        return errors
+
+    def update_room(self, room_uuid: UUID, property_uuid: UUID, changes: dict[str, Any]) -> Room:
+        data = {k: v for k, v in changes.items() if k not in ("uuid", "property_uuid", "created_at")}
+        if data.get("images"):
+            data["images"] = normalize_images(data["images"])
+        if data.get("price_per_night") is not None:
+            data["price_bucket"] = price_bucket(data["price_per_night"])
+        data["updated_at"] = datetime.now()
+        # The amenity index needs the old amenities, so that case returns ALL_OLD and applies the update locally.
+        reindex = self.amenity_index is not None and "amenities" in data
+
+        expression, names, values = build_update(ROOM_CODEC, data)
+        names["#uuid"] = "uuid"
+        names["#owner"] = "property_uuid"
+        values[":owner"] = {"S": str(property_uuid)}
+        try:
+            resp = self.room_db_client.update_item(
+                TableName=self.room_table_name,
+                Key={"uuid": {"S": str(room_uuid)}},
+                UpdateExpression=expression,
+                ConditionExpression="attribute_exists(#uuid) AND #owner = :owner",
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=values,
+                ReturnValues="ALL_OLD" if reindex else "ALL_NEW",
+                ReturnValuesOnConditionCheckFailure="ALL_OLD",
+            )
+        except self.room_db_client.exceptions.ConditionalCheckFailedException as exc:
+            if exc.response.get("Item"):
+                raise PermissionError("Room belongs to another property") from exc
+            raise ValueError("Room not found") from exc
+
+        if reindex:
+            item = apply_update(ROOM_CODEC, resp["Attributes"], data)
+            self.amenity_index.update_room(
+                str(room_uuid),
+                str(property_uuid),
+                item_amenity_names(item),
+                previous_amenities=item_amenity_names(resp["Attributes"]),
+            )
+        else:
+            item = resp["Attributes"]
+        if any(name in data for name in ("price_per_night", "capacity", "amenities", "room_type")):
+            self._refresh_search_document(str(property_uuid), {str(room_uuid): item})
+        return room_from_item(item)
+
     def get_room(self, room_uuid: UUID) -> Room:
         response = self.room_db_client.get_item(
             TableName=self.room_table_name,
@@ -235,70 +897,397 @@ class RoomTableClient:
         item = response.get("Item")
         if not item:
             raise ValueError("Room not found")
-        return Room(**from_dynamodb_item(item))
+        return room_from_item(item)
     
+    def get_rooms(self, room_uuids: list[UUID], fields: list[str] | None = None) -> list[Room]:
+        items = batch_get_items(
+            self.room_db_client,
+            self.room_table_name,
+            room_uuids,
+            projection=build_projection(fields, Room.model_fields),
+        )
+        return [room_from_item(it) for it in items]
+
     def delete_rooom(self, room_uuid: UUID) -> UUID:
-        _ = self.room_db_client.delete_item(
+        resp = self.room_db_client.delete_item(
             TableName=self.room_table_name,
-            Key={"uuid": {"S": str(room_uuid)}}
+            Key={"uuid": {"S": str(room_uuid)}},
+            ReturnValues="ALL_OLD",
         )
+        previous = resp.get("Attributes")
+        if self.amenity_index and previous:
+            self.amenity_index.remove_room(
+                str(room_uuid),
+                previous["property_uuid"]["S"],
+                item_amenity_names(previous),
+            )
+        if previous:
+            self._refresh_search_document(previous["property_uuid"]["S"], {str(room_uuid): None})
         return room_uuid
 
-    def get_property_rooms(self, property_uuid: UUID) -> list[Room]:
+    def delete_rooms(self, items: list[dict[str, Any]]) -> dict[str, str]:
+        failures = write_batches(
+            self.room_db_client,
+            self.room_table_name,
+            [{"DeleteRequest": {"Key": {"uuid": item["uuid"]}}} for item in items],
+            self.write_max_workers,
+        )
+        errors = {request["DeleteRequest"]["Key"]["uuid"]["S"]: error for request, error in failures}
+        if self.amenity_index:
+            self.amenity_index.remove_rooms(
+                (item["uuid"]["S"], item_amenity_names(item))
+                for item in items
+                if item["uuid"]["S"] not in errors
+            )
+        return errors
 
-        response = self.room_db_client.query(
-            TableName=self.room_table_name,
-            IndexName="property_uuid_index",
-            KeyConditionExpression="property_uuid = :p",
-            ExpressionAttributeValues={":p": {"S": str(property_uuid)}},
+    def delete_property_rooms(
+        self,
+        property_uuid: UUID,
+        on_progress: Callable[[int], None] | None = None,
+    ) -> list[str]:
+        params: dict[str, Any] = {
+            "TableName": self.room_table_name,
+            "IndexName": "property_uuid_index",
+            "KeyConditionExpression": "property_uuid = :p",
+            "ProjectionExpression": ROOM_REFERENCE_PROJECTION,
+            "ExpressionAttributeNames": {"#uuid": "uuid"},
+            "ExpressionAttributeValues": {":p": {"S": str(property_uuid)}},
+            "Limit": ROOM_DELETE_PAGE_SIZE,
+        }
+        image_keys: list[str] = []
+        while True:
+            resp = self.room_db_client.query(**params)
+            items = resp.get("Items", [])
+            errors = self.delete_rooms(items)
+            if errors:
+                raise RuntimeError(f"Failed to delete {len(errors)} rooms: {next(iter(errors.values()))}")
+            for item in items:
+                image_keys.extend(item_image_keys(item))
+            if on_progress and items:
+                on_progress(len(items))
+            lek = resp.get("LastEvaluatedKey")
+            if not lek:
+                return image_keys
+            params["ExclusiveStartKey"] = lek
+
+    def iter_room_reference_pages(self) -> Iterator[list[dict[str, Any]]]:
+        params: dict[str, Any] = {
+            "TableName": self.room_table_name,
+            "ProjectionExpression": ROOM_REFERENCE_PROJECTION,
+            "ExpressionAttributeNames": {"#uuid": "uuid"},
+        }
+        while True:
+            resp = self.room_db_client.scan(**params)
+            yield resp.get("Items", [])
+            lek = resp.get("LastEvaluatedKey")
+            if not lek:
+                return
+            params["ExclusiveStartKey"] = lek
+
+    def get_property_rooms_page(
+        self,
+        property_uuid: UUID,
+        limit: int | None = None,
+        cursor: str | None = None,
+        fields: list[str] | None = None,
+    ) -> tuple[list[Room], str | None]:
+        items, next_cursor = query_page(
+            self.room_db_client,
+            apply_projection({
+                "TableName": self.room_table_name,
+                "IndexName": "property_uuid_index",
+                "KeyConditionExpression": "property_uuid = :p",
+                "ExpressionAttributeValues": {":p": {"S": str(property_uuid)}},
+            }, build_projection(fields, Room.model_fields)),
+            limit=limit,
+            cursor=cursor,
         )
-        
-        items = response.get("Items", [])
+        return [room_from_item(item) for item in items], next_cursor
 
-        return [Room(**from_dynamodb_item(item)) for item in items]
+    def get_property_rooms(self, property_uuid: UUID) -> list[Room]:
+        rooms, _ = self.get_property_rooms_page(property_uuid)
+        return rooms
 
     
-    def get_filtered_rooms(
-            self,
-            capacity: int | None = None, 
-            max_price_per_night: float | None = None, 
-            amenities: list[Amenity] | None = None
-        ) -> list[Room]:
-
-        filters = []
-        attribute_values= {}
-        attribute_names = {}
+    def _build_room_filter(
+        self,
+        capacity: int | None,
+        max_price_per_night: float | None,
+        min_price_per_night: float | None = None,
+    ) -> tuple[list[str], dict[str, Any], dict[str, str]]:
+        filters: list[str] = []
+        eav: dict[str, Any] = {}
+        ean: dict[str, str] = {}
         if capacity is not None:
             filters.append("#capacity >= :cap")
-            attribute_values[":cap"] = {"N": str(capacity)}
-            attribute_names["#capacity"] = "capacity"
-
+            eav[":cap"] = {"N": str(capacity)}
+            ean["#capacity"] = "capacity"
         if max_price_per_night is not None:
             filters.append("#price_per_night <= :maxp")
-            attribute_values[":maxp"] = {"N": str(max_price_per_night)}
-            attribute_names["#price_per_night"] = "price_per_night"
-
-        if amenities:
-            for i, amenity in enumerate(amenities):
-                key = f":a{i}"
-                filters.append(f"contains(amenities, {key})")
-                attribute_values[key] = {"S": str(amenity)}
+            eav[":maxp"] = {"N": str(max_price_per_night)}
+            ean["#price_per_night"] = "price_per_night"
+        if min_price_per_night is not None:
+            filters.append("#price_per_night >= :minp")
+            eav[":minp"] = {"N": str(min_price_per_night)}
+            ean["#price_per_night"] = "price_per_night"
+        return filters, eav, ean
 
-        params = {
+    def _price_index_params(
+        self,
+        index_name: str,
+        partition_key: str,
+        partition_value: str,
+        capacity: int | None,
+        min_price_per_night: float | None,
+        max_price_per_night: float | None,
+        projection: tuple[str, dict[str, str]] | None = None,
+    ) -> dict[str, Any]:
+        filters, eav, ean = self._build_room_filter(capacity, None)
+        key_condition = f"{partition_key} = :pk"
+        eav[":pk"] = {"S": partition_value}
+        price_condition, price_values = price_key_condition(min_price_per_night, max_price_per_night)
+        if price_condition:
+            key_condition = f"{key_condition} AND {price_condition}"
+            eav.update(price_values)
+        params: dict[str, Any] = {
             "TableName": self.room_table_name,
+            "IndexName": index_name,
+            "KeyConditionExpression": key_condition,
+            "ExpressionAttributeValues": eav,
+            "ScanIndexForward": True,
         }
         if filters:
             params["FilterExpression"] = " AND ".join(filters)
-            if attribute_values:
-                params["ExpressionAttributeValues"] = attribute_values  # type: ignore
-            if attribute_names:
-                params["ExpressionAttributeNames"] = attribute_names
+        if ean:
+            params["ExpressionAttributeNames"] = ean
+        return apply_projection(params, projection)
+
+    def _query_rooms(
+        self,
+        params: dict[str, Any],
+        amenities: set[str],
+        limit: int | None = None,
+    ) -> Iterator[Room]:
+        returned = 0
+        while True:
+            if limit is not None:
+                params["Limit"] = limit - returned
+            resp = self.room_db_client.query(**params)
+            for item in resp.get("Items", []):
+                if amenities and not amenities <= item_amenity_names(item):
+                    continue
+                yield room_from_item(item)
+                returned += 1
+                if limit is not None and returned >= limit:
+                    return
+            lek = resp.get("LastEvaluatedKey")
+            if not lek:
+                return
+            params["ExclusiveStartKey"] = lek
+
+    def _iter_price_bucket_rooms(
+        self,
+        capacity: int | None,
+        min_price_per_night: float | None,
+        max_price_per_night: float | None,
+        amenities: set[str],
+        limit: int | None = None,
+        projection: tuple[str, dict[str, str]] | None = None,
+    ) -> Iterator[Room]:
+        first = int(price_bucket(min_price_per_night or 0))
+        last = int(price_bucket(max_price_per_night)) if max_price_per_night is not None else PRICE_BUCKET_COUNT - 1
+
+        def bucket_params(bucket: int) -> dict[str, Any]:
+            return self._price_index_params(
+                PRICE_BUCKET_INDEX_NAME,
+                "price_bucket",
+                f"{bucket:03d}",
+                capacity,
+                min_price_per_night,
+                max_price_per_night,
+                projection,
+            )
+
+        buckets = range(first, last + 1)
+        if not buckets:
+            return
+        if limit is None:
+            # Buckets are disjoint price ranges, so map() keeps the cheapest-first order.
+            with ThreadPoolExecutor(max_workers=min(len(buckets), self.query_max_workers)) as executor:
+                for rooms in executor.map(lambda b: list(self._query_rooms(bucket_params(b), amenities)), buckets):
+                    yield from rooms
+            return
+        returned = 0
+        for bucket in buckets:
+            for room in self._query_rooms(bucket_params(bucket), amenities, limit - returned):
+                yield room
+                returned += 1
+            if returned >= limit:
+                return
+
+    def _scan_segment(
+        self,
+        params: dict[str, Any],
+        segment: int,
+        total_segments: int,
+        pages: queue.Queue,
+        stop: threading.Event,
+    ) -> None:
+        def put(message: tuple[str, Any]) -> None:
+            while not stop.is_set():
+                try:
+                    pages.put(message, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        segment_params = {**params, "Segment": segment, "TotalSegments": total_segments}
+        try:
+            while not stop.is_set():
+                resp = self.room_db_client.scan(**segment_params)
+                put(("items", resp.get("Items", [])))
+                lek = resp.get("LastEvaluatedKey")
+                if not lek:
+                    break
+                segment_params["ExclusiveStartKey"] = lek
+        except Exception as exc:
+            put(("error", exc))
+        finally:
+            put(("done", segment))
+
+    def _room_table_bytes(self) -> int:
+        now = time.monotonic()
+        if self._room_table_stats is None or now - self._room_table_stats[0] > ROOM_TABLE_STATS_TTL_SECONDS:
+            table = self.room_db_client.describe_table(TableName=self.room_table_name)["Table"]
+            self._room_table_stats = (now, table.get("TableSizeBytes", 0))
+        return self._room_table_stats[1]
+
+    def _iter_indexed_rooms(
+        self,
+        room_uuids: list[str],
+        amenities: set[str],
+        capacity: int | None,
+        max_price_per_night: float | None,
+        min_price_per_night: float | None = None,
+        projection: tuple[str, dict[str, str]] | None = None,
+    ) -> Iterator[Room]:
+        for start in range(0, len(room_uuids), BATCH_GET_CHUNK_SIZE):
+            items = batch_get_items(
+                self.room_db_client,
+                self.room_table_name,
+                room_uuids[start:start + BATCH_GET_CHUNK_SIZE],
+                projection=projection,
+            )
+            for item in items:
+                if not amenities <= item_amenity_names(item):
+                    continue
+                room = room_from_item(item)
+                if capacity is not None and room.capacity < capacity:
+                    continue
+                if max_price_per_night is not None and room.price_per_night > max_price_per_night:
+                    continue
+                if min_price_per_night is not None and room.price_per_night < min_price_per_night:
+                    continue
+                yield room
+
+    def iter_filtered_rooms(
+        self,
+        capacity: int | None = None,
+        max_price_per_night: float | None = None,
+        amenities: list[Amenity] | None = None,
+        limit: int | None = None,
+        segments: int | None = None,
+        min_price_per_night: float | None = None,
+        cheapest_first: bool = False,
+        fields: list[str] | None = None,
+    ) -> Iterator[Room]:
+        if limit is not None and limit <= 0:
+            return
+        wanted = amenity_names(amenities)
+        if fields and wanted:
+            fields = [*fields, "amenities"]
+        projection = build_projection(fields, Room.model_fields)
+        if wanted and self.amenity_index:
+            # BatchGetItem bills every room as a full read unit, so stop at the point a scan gets cheaper.
+            max_candidates = int(self._room_table_bytes() / 4096) or None
+            candidates = self.amenity_index.matching_rooms(wanted, max_candidates=max_candidates)
+            if candidates is not None:
+                rooms = self._iter_indexed_rooms(
+                    sorted(candidates),
+                    wanted,
+                    capacity,
+                    max_price_per_night,
+                    min_price_per_night,
+                    build_projection(fields and [*fields, "capacity", "price_per_night"], Room.model_fields),
+                )
+                if cheapest_first:
+                    rooms = iter(sorted(rooms, key=lambda room: room.price_per_night))
+                yield from (rooms if limit is None else islice(rooms, limit))
+                return
+
+        if cheapest_first or min_price_per_night is not None or max_price_per_night is not None:
+            yield from self._iter_price_bucket_rooms(
+                capacity, min_price_per_night, max_price_per_night, wanted, limit, projection,
+            )
+            return
+
+        filters, eav, ean = self._build_room_filter(capacity, max_price_per_night)
+        params: dict[str, Any] = {"TableName": self.room_table_name}
+        if filters:
+            params["FilterExpression"] = " AND ".join(filters)
+            params["ExpressionAttributeValues"] = eav
+        if ean:
+            params["ExpressionAttributeNames"] = ean
+        apply_projection(params, projection)
 
-        response = self.room_db_client.scan(**params)
+        total_segments = max(1, segments or self.scan_segments)
+        pages: queue.Queue = queue.Queue(maxsize=total_segments * 2)
+        stop = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=total_segments)
+        for segment in range(total_segments):
+            executor.submit(self._scan_segment, params, segment, total_segments, pages, stop)
 
-        items = response.get("Items", [])
+        remaining = total_segments
+        returned = 0
+        try:
+            while remaining:
+                kind, payload = pages.get()
+                if kind == "done":
+                    remaining -= 1
+                elif kind == "error":
+                    raise payload
+                else:
+                    for item in payload:
+                        if wanted and not wanted <= item_amenity_names(item):
+                            continue
+                        yield room_from_item(item)
+                        returned += 1
+                        if limit is not None and returned >= limit:
+                            return
+        finally:
+            stop.set()
+            executor.shutdown(wait=True)
 
-        return [Room(**from_dynamodb_item(item)) for item in items]
+    def get_filtered_rooms(
+            self,
+            capacity: int | None = None,
+            max_price_per_night: float | None = None,
+            amenities: list[Amenity] | None = None,
+            limit: int | None = None,
+            min_price_per_night: float | None = None,
+            cheapest_first: bool = False,
+            fields: list[str] | None = None,
+        ) -> list[Room]:
+        return list(self.iter_filtered_rooms(
+            capacity,
+            max_price_per_night,
+            amenities,
+            limit=limit,
+            min_price_per_night=min_price_per_night,
+            cheapest_first=cheapest_first,
+            fields=fields,
+        ))
 
     def get_filtered_property_rooms(
         self,
@@ -306,35 +1295,123 @@ class RoomTableClient:
         capacity: int | None = None,
         max_price_per_night: float | None = None,
         amenities: list[Amenity] | None = None,
+        min_price_per_night: float | None = None,
+        limit: int | None = None,
+        fields: list[str] | None = None,
     ) -> list[Room]:
-        eav = {":p": {"S": str(property_uuid)}}
-        filters = []
-        ean = {}
-        if capacity is not None:
-            filters.append("#capacity >= :cap")
-            eav[":cap"] = {"N": str(capacity)}
-            ean["#capacity"] = "capacity"
-        if max_price_per_night is not None:
-            filters.append("#price_per_night <= :maxp")
-            eav[":maxp"] = {"N": str(max_price_per_night)}
-            ean["#price_per_night"] = "price_per_night"
-        if amenities:
-            for i, a in enumerate(amenities):
-                key = f":a{i}"
-                filters.append(f"contains(amenities, {key})")
-                eav[key] = {"S": str(a)}
+        wanted = amenity_names(amenities)
+        if fields and wanted:
+            fields = [*fields, "amenities"]
+        params = self._price_index_params(
+            PROPERTY_PRICE_INDEX_NAME,
+            "property_uuid",
+            str(property_uuid),
+            capacity,
+            min_price_per_night,
+            max_price_per_night,
+            build_projection(fields, Room.model_fields),
+        )
+        return list(self._query_rooms(params, wanted, limit))
 
+    def backfill_price_buckets(self) -> int:
         params: dict[str, Any] = {
             "TableName": self.room_table_name,
-            "IndexName": "property_uuid_index",
-            "KeyConditionExpression": "property_uuid = :p",
-            "ExpressionAttributeValues": eav,
+            "ProjectionExpression": "#uuid, price_per_night",
+            "FilterExpression": "attribute_not_exists(price_bucket) AND attribute_exists(price_per_night)",
+            "ExpressionAttributeNames": {"#uuid": "uuid"},
         }
-        if filters:
-            params["FilterExpression"] = " AND ".join(filters)
-        if ean:
-            params["ExpressionAttributeNames"] = ean
-        response = self.room_db_client.query(**params)
-        items = response.get("Items", [])
-        return [Room(**from_dynamodb_item(it)) for it in items]
+        updated = 0
+        while True:
+            resp = self.room_db_client.scan(**params)
+            for it in resp.get("Items", []):
+                try:
+                    self.room_db_client.update_item(
+                        TableName=self.room_table_name,
+                        Key={"uuid": it["uuid"]},
+                        UpdateExpression="SET price_bucket = :bucket",
+                        ConditionExpression="price_per_night = :price",
+                        ExpressionAttributeValues={
+                            ":bucket": {"S": price_bucket(float(it["price_per_night"]["N"]))},
+                            ":price": it["price_per_night"],
+                        },
+                    )
+                except self.room_db_client.exceptions.ConditionalCheckFailedException:
+                    continue
+                updated += 1
+            lek = resp.get("LastEvaluatedKey")
+            if not lek:
+                break
+            params["ExclusiveStartKey"] = lek
+        logger.info("Backfilled price bucket on %s rooms", updated)
+        return updated
+
+    def backfill_amenity_index(self) -> int:
+        if not self.amenity_index:
+            raise ValueError("Amenity table name must be configured.")
+        params: dict[str, Any] = {
+            "TableName": self.room_table_name,
+            "ProjectionExpression": "#uuid, property_uuid, amenities",
+            "FilterExpression": "size(amenities) > :zero",
+            "ExpressionAttributeNames": {"#uuid": "uuid"},
+            "ExpressionAttributeValues": {":zero": {"N": "0"}},
+        }
+        indexed = 0
+        while True:
+            resp = self.room_db_client.scan(**params)
+            for it in resp.get("Items", []):
+                self.amenity_index.update_room(
+                    it["uuid"]["S"],
+                    it["property_uuid"]["S"],
+                    item_amenity_names(it),
+                )
+                indexed += 1
+            lek = resp.get("LastEvaluatedKey")
+            if not lek:
+                break
+            params["ExclusiveStartKey"] = lek
+        logger.info("Backfilled amenity index for %s rooms", indexed)
+        return indexed
+
+    def backfill_search_documents(self) -> int:
+        if not self.search_documents:
+            raise ValueError("Search table name must be configured.")
+        params: dict[str, Any] = {
+            "TableName": self.room_table_name,
+            "ProjectionExpression": ROOM_SUMMARY_PROJECTION,
+            "ExpressionAttributeNames": dict(ROOM_SUMMARY_NAMES),
+        }
+        rooms_by_property: dict[str, list[dict[str, Any]]] = {}
+        while True:
+            resp = self.room_db_client.scan(**params)
+            for it in resp.get("Items", []):
+                rooms_by_property.setdefault(it["property_uuid"]["S"], []).append(it)
+            lek = resp.get("LastEvaluatedKey")
+            if not lek:
+                break
+            params["ExclusiveStartKey"] = lek
+        for property_uuid, items in rooms_by_property.items():
+            self.search_documents.update_rooms(property_uuid, items)
+        logger.info("Backfilled room summaries for %s properties", len(rooms_by_property))
+        return len(rooms_by_property)
 
+    def get_rooms_for_properties(
+        self,
+        property_uuids: list[UUID],
+        capacity: int | None = None,
+        max_price_per_night: float | None = None,
+        amenities: list[Amenity] | None = None,
+        min_price_per_night: float | None = None,
+        limit_per_property: int | None = None,
+    ) -> dict[UUID, list[Room]]:
+        unique_uuids = list(dict.fromkeys(property_uuids))
+        if not unique_uuids:
+            return {}
+        workers = min(len(unique_uuids), self.query_max_workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                lambda property_uuid: self.get_filtered_property_rooms(
+                    property_uuid, capacity, max_price_per_night, amenities, min_price_per_night, limit_per_property,
+                ),
+                unique_uuids,
+            )
+            return dict(zip(unique_uuids, results))
@@ -0,0 +1,147 @@
+from io import BytesIO
+import logging
+from typing import Any, NamedTuple
+from urllib.parse import unquote_plus
+
+from PIL import Image as PILImage, ImageOps, features
+
+from storage import S3AssetStorage
+
+logger = logging.getLogger()
+
+DERIVATIVE_PREFIX = "derived"
+# Uploads are stored under these prefixes, the bucket only notifies the derivatives Lambda for them.
+DERIVATIVE_SOURCE_PREFIXES = ("properties/", "rooms/")
+ORIGINAL_VARIANT = "original"
+THUMBNAIL_VARIANT = "thumbnail"
+DERIVABLE_EXTENSIONS = {"jpg", "jpeg", "png", "webp", "gif", "bmp", "tif", "tiff"}
+DERIVATIVE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class Derivative(NamedTuple):
+    name: str
+    width: int
+    format: str
+    extension: str
+    content_type: str
+    quality: int
+
+
+DERIVATIVES = [
+    Derivative(THUMBNAIL_VARIANT, 320, "JPEG", "jpg", "image/jpeg", 80),
+    Derivative("thumbnail_webp", 320, "WEBP", "webp", "image/webp", 75),
+    Derivative("large_webp", 1280, "WEBP", "webp", "image/webp", 80),
+]
+if features.check("avif"):
+    DERIVATIVES += [
+        Derivative("thumbnail_avif", 320, "AVIF", "avif", "image/avif", 60),
+        Derivative("large_avif", 1280, "AVIF", "avif", "image/avif", 60),
+    ]
+
+
+def _split_extension(key: str) -> tuple[str, str | None]:
+    name = key.rsplit("/", 1)[-1]
+    if "." not in name:
+        return key, None
+    stem, extension = key.rsplit(".", 1)
+    return stem, extension.lower()
+
+
+def is_derivable(key: str) -> bool:
+    if not key.startswith(DERIVATIVE_SOURCE_PREFIXES):
+        return False
+    return _split_extension(key)[1] in DERIVABLE_EXTENSIONS
+
+
+def derivative_key(key: str, derivative: Derivative) -> str:
+    stem, _ = _split_extension(key)
+    return f"{DERIVATIVE_PREFIX}/{stem}/{derivative.name}.{derivative.extension}"
+
+
+def variant_keys(key: str) -> dict[str, str]:
+    if not is_derivable(key):
+        return {}
+    return {derivative.name: derivative_key(key, derivative) for derivative in DERIVATIVES}
+
+
+def with_variant_keys(keys: list[str]) -> list[str]:
+    expanded: list[str] = []
+    for key in keys:
+        expanded.append(key)
+        expanded.extend(variant_keys(key).values())
+    return expanded
+
+
+def _resize(image: PILImage.Image, width: int) -> PILImage.Image:
+    if image.width <= width:
+        return image
+    height = max(1, round(image.height * width / image.width))
+    return image.resize((width, height), PILImage.Resampling.LANCZOS)
+
+
+def _encode(image: PILImage.Image, derivative: Derivative) -> bytes:
+    options: dict[str, Any] = {"quality": derivative.quality}
+    if derivative.format == "JPEG":
+        options.update(optimize=True, progressive=True)
+        if image.mode == "RGBA":
+            background = PILImage.new("RGB", image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel("A"))
+            image = background
+    output = BytesIO()
+    image.save(output, format=derivative.format, **options)
+    return output.getvalue()
+
+
+def render_derivatives(data: bytes) -> dict[str, bytes]:
+    widths = sorted({derivative.width for derivative in DERIVATIVES}, reverse=True)
+    rendered: dict[str, bytes] = {}
+    with PILImage.open(BytesIO(data)) as source:
+        # JPEG sources are decoded at a reduced scale when no derivative needs the full resolution.
+        source.draft("RGB", (widths[0], max(1, source.height * widths[0] // max(1, source.width))))
+        image = ImageOps.exif_transpose(source)
+        if image.mode not in ("RGB", "RGBA"):
+            has_alpha = "A" in image.getbands() or "transparency" in image.info
+            image = image.convert("RGBA" if has_alpha else "RGB")
+        # Each smaller width is resampled from the previous, already reduced image.
+        for width in widths:
+            image = _resize(image, width)
+            for derivative in DERIVATIVES:
+                if derivative.width == width:
+                    rendered[derivative.name] = _encode(image, derivative)
+    return rendered
+
+
+def generate_derivatives(storage: S3AssetStorage, key: str) -> dict[str, str]:
+    if not is_derivable(key):
+        return {}
+    rendered = render_derivatives(storage.get_object_bytes(key))
+    by_name = {derivative.name: derivative for derivative in DERIVATIVES}
+    variants: dict[str, str] = {}
+    for name, body in rendered.items():
+        derivative = by_name[name]
+        target = derivative_key(key, derivative)
+        storage.put_object_bytes(target, body, derivative.content_type, cache_control=DERIVATIVE_CACHE_CONTROL)
+        variants[name] = target
+    return variants
+
+
+_storages: dict[str, S3AssetStorage] = {}
+
+
+def handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
+    processed: list[str] = []
+    for record in event.get("Records", []):
+        bucket = record["s3"]["bucket"]["name"]
+        key = unquote_plus(record["s3"]["object"]["key"])
+        if not is_derivable(key):
+            continue
+        storage = _storages.get(bucket)
+        if storage is None:
+            storage = _storages[bucket] = S3AssetStorage(bucket)
+        try:
+            generate_derivatives(storage, key)
+        except PILImage.UnidentifiedImageError:
+            logger.warning("Skipping derivatives of %s, not a readable image", key)
+            continue
+        processed.append(key)
+    return {"processed": processed}
@@ -0,0 +1,116 @@
+import math
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+GEOHASH_PRECISION = 9
+GEOHASH_CELL_PRECISION = 4
+
+
+def encode(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars: list[str] = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        if even:
+            mid = (lon_range[0] + lon_range[1]) / 2
+            if longitude >= mid:
+                bits = (bits << 1) | 1
+                lon_range[0] = mid
+            else:
+                bits <<= 1
+                lon_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if latitude >= mid:
+                bits = (bits << 1) | 1
+                lat_range[0] = mid
+            else:
+                bits <<= 1
+                lat_range[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(chars)
+
+
+def cell_size(precision: int) -> tuple[float, float]:
+    lat_bits = (5 * precision) // 2
+    lon_bits = 5 * precision - lat_bits
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lon_bits)
+
+
+def _split_longitude(min_lon: float, max_lon: float) -> list[tuple[float, float]]:
+    if max_lon - min_lon >= 360.0:
+        return [(-180.0, 180.0)]
+    if min_lon < -180.0:
+        return [(min_lon + 360.0, 180.0), (-180.0, max_lon)]
+    if max_lon > 180.0:
+        return [(min_lon, 180.0), (-180.0, max_lon - 360.0)]
+    return [(min_lon, max_lon)]
+
+
+def count_covering_cells(
+    min_lat: float,
+    min_lon: float,
+    max_lat: float,
+    max_lon: float,
+    precision: int,
+) -> int:
+    height, width = cell_size(precision)
+    min_lat = max(min_lat, -90.0)
+    max_lat = min(max_lat, 90.0)
+    rows = math.floor((max_lat + 90.0) / height) - math.floor((min_lat + 90.0) / height) + 1
+    cols = 0
+    for lo, hi in _split_longitude(min_lon, max_lon):
+        cols += math.floor((hi + 180.0) / width) - math.floor((lo + 180.0) / width) + 1
+    return rows * cols
+
+
+def covering_cells(
+    min_lat: float,
+    min_lon: float,
+    max_lat: float,
+    max_lon: float,
+    precision: int,
+) -> set[str]:
+    height, width = cell_size(precision)
+    min_lat = max(min_lat, -90.0)
+    max_lat = min(max_lat, 90.0)
+    cells: set[str] = set()
+    for lo, hi in _split_longitude(min_lon, max_lon):
+        lat = min_lat
+        while True:
+            sample_lat = min(lat, max_lat)
+            lon = lo
+            while True:
+                cells.add(encode(sample_lat, min(lon, hi), precision))
+                if lon >= hi:
+                    break
+                lon += width
+            if lat >= max_lat:
+                break
+            lat += height
+    return cells
+
+
+def choose_query_precision(
+    min_lat: float,
+    min_lon: float,
+    max_lat: float,
+    max_lon: float,
+    max_cells: int,
+    min_precision: int = GEOHASH_CELL_PRECISION,
+    max_precision: int = GEOHASH_PRECISION,
+) -> int | None:
+    best: int | None = None
+    for precision in range(min_precision, max_precision + 1):
+        if count_covering_cells(min_lat, min_lon, max_lat, max_lon, precision) > max_cells:
+            break
+        best = precision
+    return best
@@ -0,0 +1,74 @@
+import math
+from typing import Any
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def bbox_deltas(latitude: float, radius_km: float) -> tuple[float, float]:
+    delta_lat = radius_km / 111.0
+    delta_lon = radius_km / (111.0 * max(math.cos(math.radians(latitude)), 1e-6))
+    return delta_lat, delta_lon
+
+
+def haversine_km(latitudes: np.ndarray, longitudes: np.ndarray, latitude: float, longitude: float) -> np.ndarray:
+    phi1 = math.radians(latitude)
+    phi2 = np.radians(latitudes)
+    dphi = phi2 - phi1
+    dlambda = np.radians(longitudes - longitude)
+    a = np.sin(dphi / 2) ** 2 + math.cos(phi1) * np.cos(phi2) * np.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def bbox_mask(
+    latitudes: np.ndarray,
+    longitudes: np.ndarray,
+    min_lat: float,
+    min_lon: float,
+    max_lat: float,
+    max_lon: float,
+) -> np.ndarray:
+    return (latitudes >= min_lat) & (latitudes <= max_lat) & (longitudes >= min_lon) & (longitudes <= max_lon)
+
+
+def radius_filter(
+    latitudes: np.ndarray,
+    longitudes: np.ndarray,
+    latitude: float,
+    longitude: float,
+    radius_km: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    delta_lat, delta_lon = bbox_deltas(latitude, radius_km)
+    candidates = np.flatnonzero(bbox_mask(
+        latitudes,
+        longitudes,
+        latitude - delta_lat,
+        longitude - delta_lon,
+        latitude + delta_lat,
+        longitude + delta_lon,
+    ))
+    distances = haversine_km(latitudes[candidates], longitudes[candidates], latitude, longitude)
+    within = distances <= radius_km
+    return candidates[within], distances[within]
+
+
+def _number_attribute(item: dict[str, Any], name: str) -> float:
+    value = item.get(name)
+    if not value or "N" not in value:
+        return math.nan
+    return float(value["N"])
+
+
+def filter_items_within_radius(
+    items: list[dict[str, Any]],
+    latitude: float,
+    longitude: float,
+    radius_km: float,
+) -> list[tuple[dict[str, Any], float]]:
+    if not items:
+        return []
+    latitudes = np.fromiter((_number_attribute(it, "latitude") for it in items), dtype=np.float64, count=len(items))
+    longitudes = np.fromiter((_number_attribute(it, "longitude") for it in items), dtype=np.float64, count=len(items))
+    positions, distances = radius_filter(latitudes, longitudes, latitude, longitude, radius_km)
+    return [(items[position], float(distance)) for position, distance in zip(positions, distances)]
@@ -1,19 +1,61 @@
 from decimal import Decimal
-from uuid import UUID
-
-from fastapi import Depends, HTTPException, Request
-
-from db_clients import PropertyTableClient, RoomTableClient
+import json
+import logging
+from typing import Any
+from uuid import UUID, uuid4
+
+from botocore.exceptions import ClientError
+from fastapi import Depends, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
+from pydantic import ValidationError
+
+from cleanup import CleanupJobTable, CleanupQueue, run_property_cleanup
+from db_clients import (
+    ADDRESS_DERIVED_FIELDS,
+    PropertyTableClient,
+    RoomTableClient,
+    build_city_key,
+    set_property_full_address,
+)
+from derivatives import ORIGINAL_VARIANT, THUMBNAIL_VARIANT, with_variant_keys
+from etag import compute_etag, latest_updated_at, not_modified, set_etag_headers
 from schemas import (
     Amenity,
+    BatchGetRequest,
+    BatchPresignedUploadRequest,
+    CleanupJob,
+    CleanupKind,
+    ImportItemResult,
+    ImportReport,
+    ImportStatus,
+    MultipartAbortRequest,
+    MultipartCompleteRequest,
+    MultipartPartUrl,
+    MultipartPartUrlsRequest,
+    MultipartUploadRequest,
+    MultipartUploadResponse,
+    PropertyImport,
     PresignedUploadRequest,
     PresignedUploadResponse,
     Property,
+    PropertyRooms,
+    PropertyRoomsRequest,
     Room,
+    RoomType,
+    SearchDocument,
+    SearchSort,
 )
-from utils import add_image_url, add_image_urls, strip_image_urls
+from offload import BlockingExecutor
+from pagination import MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
+from search_documents import SearchDocumentTable
+from spatial_index import PropertyLocation, SpatialIndex
+from utils import add_image_url, add_image_urls, resolved_image_keys, strip_image_urls
 from storage import S3AssetStorage
 
+logger = logging.getLogger()
+
+MAX_IMPORT_PROPERTIES = 1000
+
 
 def get_property_table_client(request: Request) -> PropertyTableClient:
     return request.app.state.property_table_client
@@ -27,32 +69,194 @@ def get_asset_storage(request: Request) -> S3AssetStorage | None:
     return getattr(request.app.state, "asset_storage", None)
 
 
-def build_city_key(country: str, state: str | None, city: str) -> str:
-    parts = [country.strip().upper()]
-    parts.append(state.strip().upper() if state else "")
-    parts.append(city.strip().upper())
-    return "#".join(parts)
+def get_spatial_index(request: Request) -> SpatialIndex | None:
+    return getattr(request.app.state, "spatial_index", None)
+
+
+def get_blocking_executor(request: Request) -> BlockingExecutor:
+    return request.app.state.blocking_executor
+
+
+def get_search_documents(request: Request) -> SearchDocumentTable | None:
+    return getattr(request.app.state, "search_documents", None)
+
+
+def get_cleanup_jobs(request: Request) -> CleanupJobTable | None:
+    return getattr(request.app.state, "cleanup_jobs", None)
+
+
+def get_cleanup_queue(request: Request) -> CleanupQueue | None:
+    return getattr(request.app.state, "cleanup_queue", None)
+
+
+def update_spatial_index(spatial_index: SpatialIndex | None, property: Property) -> None:
+    if not spatial_index or not property.uuid:
+        return
+    spatial_index.upsert(PropertyLocation(
+        uuid=str(property.uuid),
+        latitude=float(property.latitude) if property.latitude is not None else None,
+        longitude=float(property.longitude) if property.longitude is not None else None,
+        city_key=property.city_key,
+    ))
+
+
+def variant_key_name(image_variant: str) -> str | None:
+    return None if image_variant == ORIGINAL_VARIANT else image_variant
+
 
+def set_next_cursor(response: Response, next_cursor: str | None) -> None:
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
 
-def set_property_full_address(property: Property) -> None:
-    full_address = f"{property.address}"
-    if property.county:
-        full_address += f",{property.county}"
-    full_address += f",{property.city}"
-    if property.state:
-        full_address += f",{property.state}"
-    full_address += f",{property.country}"
-    property.full_address = full_address
-    property.city_key = build_city_key(property.country, property.state, property.city)
+
+def dump_models(models: list[Any], fields: list[str] | None) -> list[dict[str, Any]]:
+    if not fields:
+        return [model.model_dump(mode="json") for model in models]
+    include = {"uuid", *fields}
+    return [model.model_dump(mode="json", include=include) for model in models]
+
+
+def parse_fields(fields: list[str] | None) -> list[str] | None:
+    if not fields:
+        return None
+    return [field.strip() for value in fields for field in value.split(",") if field.strip()] or None
+
+
+def slim_response(
+    models: list[Any], fields: list[str], next_cursor: str | None = None, etag: str | None = None,
+) -> JSONResponse:
+    response = JSONResponse(dump_models(models, fields))
+    set_next_cursor(response, next_cursor)
+    if etag:
+        set_etag_headers(response, etag)
+    return response
+
+
+def signing_window(asset_storage: S3AssetStorage | None) -> int | None:
+    return asset_storage.signing_window() if asset_storage else None
+
+
+def list_etag(
+    models: list[Any],
+    fields: list[str] | None,
+    asset_storage: S3AssetStorage | None,
+    next_cursor: str | None = None,
+    variant: str | None = None,
+) -> str:
+    # Hashed before image URLs are signed, the signing window and the keys they are signed for stand in for them.
+    return compute_etag(
+        [dump_models(models, fields), next_cursor, signing_window(asset_storage), resolved_image_keys(models, variant)],
+        latest_updated_at(models),
+    )
 
 
 async def add_property(
     property: Property,
     property_table_client: PropertyTableClient = Depends(get_property_table_client),
+    spatial_index: SpatialIndex | None = Depends(get_spatial_index),
+    blocking: BlockingExecutor = Depends(get_blocking_executor),
 ) -> UUID:
     set_property_full_address(property)
     strip_image_urls(property.images)
-    return property_table_client.add_property(property)
+    property.uuid = await blocking.run(property_table_client.add_property, property)
+    update_spatial_index(spatial_index, property)
+    return property.uuid
+
+
+def parse_import_records(body: bytes, content_type: str) -> list[tuple[Any, str | None]]:
+    if "ndjson" in content_type or "jsonl" in content_type:
+        records: list[tuple[Any, str | None]] = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                records.append((json.loads(line), None))
+            except ValueError as exc:
+                records.append((None, f"Invalid JSON: {exc}"))
+        return records
+    try:
+        payload = json.loads(body or b"[]")
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON: {exc}") from exc
+    if not isinstance(payload, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array or NDJSON of properties")
+    return [(record, None) for record in payload]
+
+
+async def import_properties(
+    request: Request,
+    property_table_client: PropertyTableClient = Depends(get_property_table_client),
+    room_table_client: RoomTableClient = Depends(get_room_table_client),
+    spatial_index: SpatialIndex | None = Depends(get_spatial_index),
+    blocking: BlockingExecutor = Depends(get_blocking_executor),
+) -> ImportReport:
+    records = parse_import_records(await request.body(), request.headers.get("content-type", ""))
+    if len(records) > MAX_IMPORT_PROPERTIES:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_IMPORT_PROPERTIES} properties per import")
+
+    results: list[ImportItemResult] = []
+    properties: list[Property] = []
+    rooms_by_property: dict[str, list[Room]] = {}
+    for index, (record, error) in enumerate(records):
+        if error is None:
+            try:
+                imported = PropertyImport.model_validate(record)
+            except ValidationError as exc:
+                error = str(exc)
+        if error is not None:
+            results.append(ImportItemResult(index=index, status=ImportStatus.FAILED, error=error))
+            continue
+        # Imports only create, a client supplied UUID could otherwise replace another host's property or room.
+        property = Property(**imported.model_dump(exclude={"uuid", "rooms"}, exclude_unset=True), uuid=uuid4())
+        set_property_full_address(property)
+        strip_image_urls(property.images)
+        rooms: list[Room] = []
+        for room_import in imported.rooms:
+            room = Room(
+                **room_import.model_dump(exclude={"uuid", "property_uuid"}, exclude_unset=True),
+                uuid=uuid4(),
+                property_uuid=property.uuid,
+            )
+            strip_image_urls(room.images)
+            rooms.append(room)
+        properties.append(property)
+        rooms_by_property[str(property.uuid)] = rooms
+        results.append(ImportItemResult(index=index, property_uuid=property.uuid, status=ImportStatus.IMPORTED))
+
+    property_errors = await blocking.run(property_table_client.put_properties, properties)
+    # Rooms are only written for properties that made it in.
+    rooms = [
+        room for property_uuid, property_rooms in rooms_by_property.items()
+        if property_uuid not in property_errors
+        for room in property_rooms
+    ]
+    room_errors = await blocking.run(room_table_client.put_rooms, rooms)
+
+    for property in properties:
+        if str(property.uuid) not in property_errors:
+            update_spatial_index(spatial_index, property)
+    for result in results:
+        if result.property_uuid is None:
+            continue
+        property_uuid = str(result.property_uuid)
+        if property_uuid in property_errors:
+            result.status = ImportStatus.FAILED
+            result.error = property_errors[property_uuid]
+            continue
+        for room_index, room in enumerate(rooms_by_property[property_uuid]):
+            if str(room.uuid) in room_errors:
+                result.room_errors[room_index] = room_errors[str(room.uuid)]
+            else:
+                result.room_uuids.append(room.uuid)  # type: ignore
+        if result.room_errors:
+            result.status = ImportStatus.PARTIAL
+
+    return ImportReport(
+        imported_properties=len(properties) - len(property_errors),
+        imported_rooms=len(rooms) - len(room_errors),
+        failed=sum(1 for result in results if result.status == ImportStatus.FAILED),
+        results=results,
+    )
 
 
 async def update_property(
@@ -60,66 +264,173 @@ async def update_property(
     property: Property,
     property_table_client: PropertyTableClient = Depends(get_property_table_client),
     asset_storage: S3AssetStorage | None = Depends(get_asset_storage),
+    spatial_index: SpatialIndex | None = Depends(get_spatial_index),
+    blocking: BlockingExecutor = Depends(get_blocking_executor),
 ) -> Property:
+    strip_image_urls(property.images)
+    # Derived from the merged item by the table client, the body may only carry some address fields.
+    changes = property.model_dump(exclude_unset=True, exclude=set(ADDRESS_DERIVED_FIELDS))
+    if ("latitude" in changes) != ("longitude" in changes):
+        raise HTTPException(status_code=400, detail="latitude and longitude must be updated together")
+
     try:
-        existing = property_table_client.get_property(property_uuid)
+        updated = await blocking.run(property_table_client.update_property, property_uuid, property.user_uuid, changes)
+    except PermissionError as exc:
+        raise HTTPException(status_code=403, detail=str(exc)) from exc
     except ValueError as exc:
         raise HTTPException(status_code=404, detail="Property not found") from exc
 
-    property.uuid = property_uuid
-    if property.user_uuid is None:
-        property.user_uuid = existing.user_uuid
-    if property.created_at is None and getattr(existing, "created_at", None) is not None:
-        property.created_at = existing.created_at
-    if property.images is None and getattr(existing, "images", None) is not None:
-        property.images = existing.images
-
-    set_property_full_address(property)
-    strip_image_urls(property.images)
-    property_table_client.add_property(property)
-
-    updated = property_table_client.get_property(property_uuid)
+    update_spatial_index(spatial_index, updated)
     return add_image_url(updated, asset_storage)  # type: ignore
 
 
 async def get_property(
     property_uuid: UUID,
+    request: Request,
+    response: Response,
     property_table_client: PropertyTableClient = Depends(get_property_table_client),
     asset_storage: S3AssetStorage | None = Depends(get_asset_storage),
+    blocking: BlockingExecutor = Depends(get_blocking_executor),
 ) -> Property:
     try:
-        property_obj = property_table_client.get_property(property_uuid)
+        property_obj = await blocking.run(property_table_client.get_property, property_uuid)
     except ValueError as exc:
         raise HTTPException(status_code=404, detail="Property not found") from exc
+    etag = compute_etag(
+        [property_obj, signing_window(asset_storage), resolved_image_keys([property_obj])], property_obj.updated_at,
+    )
+    unchanged = not_modified(request, etag)
+    if unchanged:
+        return unchanged # type: ignore
+    set_etag_headers(response, etag)
     return add_image_url(property_obj, asset_storage) # type: ignore
 
 
+async def get_properties_batch(
+    payload: BatchGetRequest,
+    property_table_client: PropertyTableClient = Depends(get_property_table_client),
+    asset_storage: S3AssetStorage | None = Depends(get_asset_storage),
+    blocking: BlockingExecutor = Depends(get_blocking_executor),
+) -> list[dict[str, Any]]:
+    try:
+        properties = await blocking.run(property_table_client.get_properties, payload.uuids, payload.fields)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    add_image_urls(properties, asset_storage)
+    return dump_models(properties, payload.fields)
+
+
 async def get_user_properties(
     user_uuid: UUID,
+    response: Response,
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    fields: list[str] | None = Query(default=None),
+    image_variant: str = Query(default=THUMBNAIL_VARIANT),
     property_table_client: PropertyTableClient = Depends(get_property_table_client),
     asset_storage: S3AssetStorage | None = Depends(get_asset_storage),
+    blocking: BlockingExecutor = Depends(get_blocking_executor),
 ) -> list[Property]:
-    properties = property_table_client.get_user_properties(user_uuid)
-    return add_image_urls(properties, asset_storage) # type: ignore
+    fields = parse_fields(fields)
+    try:
+        properties, next_cursor = await blocking.run(
+            property_table_client.get_user_properties_page, user_uuid, limit, cursor, fields,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    add_image_urls(properties, asset_storage, variant_key_name(image_variant))
+    if fields:
+        return slim_response(properties, fields, next_cursor) # type: ignore
+    set_next_cursor(response, next_cursor)
+    return properties
 
 
 async def delete_property(
     property_uuid: UUID,
     property_table_client: PropertyTableClient = Depends(get_property_table_client),
+    room_table_client: RoomTableClient = Depends(get_room_table_client),
+    asset_storage: S3AssetStorage | None = Depends(get_asset_storage),
+    spatial_index: SpatialIndex | None = Depends(get_spatial_index),
+    cleanup_jobs: CleanupJobTable | None = Depends(get_cleanup_jobs),
+    cleanup_queue: CleanupQueue | None = Depends(get_cleanup_queue),
+    blocking: BlockingExecutor = Depends(get_blocking_executor),
 ) -> UUID:
-    return property_table_client.delete_property(property_uuid)
+    if not cleanup_jobs:
+        raise HTTPException(status_code=503, detail="Cleanup jobs are not configured")
+    deleted = await blocking.run(property_table_client.delete_property, property_uuid)
+    if spatial_index:
+        spatial_index.remove(property_uuid)
+    if not deleted:
+        return property_uuid
+
+    job = await blocking.run(cleanup_jobs.start, property_uuid, CleanupKind.PROPERTY_DELETE, property_uuid)
+    image_keys = with_variant_keys([image.key for image in deleted.images or []])
+    if not cleanup_queue:
+        # Local runs without a worker queue clean up before responding.
+        await blocking.run(run_property_cleanup, cleanup_jobs, room_table_client, asset_storage, property_uuid, image_keys)
+        return property_uuid
+    try:
+        await blocking.run(cleanup_queue.send, job, image_keys)
+    except Exception as exc:
+        await blocking.run(cleanup_jobs.finish, property_uuid, f"Could not queue the cleanup: {exc}")
+        raise HTTPException(
+            status_code=503,
+            detail="Property deleted but its cleanup could not be queued, the orphan sweep will remove its rooms and assets",
+        ) from exc
+    return property_uuid
+
+
+async def start_orphan_sweep(
+    cleanup_jobs: CleanupJobTable | None = Depends(get_cleanup_jobs),
+    cleanup_queue: CleanupQueue | None = Depends(get_cleanup_queue),
+    blocking: BlockingExecutor = Depends(get_blocking_executor),
+) -> CleanupJob:
+    if not cleanup_jobs or not cleanup_queue:
+        raise HTTPException(status_code=503, detail="Cleanup jobs are not configured")
+    job = await blocking.run(cleanup_jobs.start, uuid4(), CleanupKind.ORPHAN_SWEEP)
+    await blocking.run(cleanup_queue.send, job)
+    return job
+
+
+async def get_cleanup_job(
+    job_uuid: UUID,
+    cleanup_jobs: CleanupJobTable | None = Depends(get_cleanup_jobs),
+    blocking: BlockingExecutor = Depends(get_blocking_executor),
+) -> CleanupJob:
+    if not cleanup_jobs:
+        raise HTTPException(status_code=503, detail="Cleanup jobs are not configured")
+    job = await blocking.run(cleanup_jobs.get, job_uuid)
+    if not job:
+        raise HTTPException(status_code=404, detail="Cleanup job not found")
+    return job
 
 
 async def get_properties_by_city(
     country: str,
     city: str,
+    response: Response,
     state: str | None = None,
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    fields: list[str] | None = Query(default=None),
+    image_variant: str = Query(default=THUMBNAIL_VARIANT),
     property_table_client: PropertyTableClient = Depends(get_property_table_client),
     asset_storage: S3AssetStorage | None = Depends(get_asset_storage),
+    blocking: BlockingExecutor = Depends(get_blocking_executor),
 ) -> list[Property]:
     city_key = build_city_key(country, state, city)
-    properties = property_table_client.get_properties_by_city_key(city_key)
-    return add_image_urls(properties, asset_storage) # type: ignore
+    fields = parse_fields(fields)
+    try:
+        properties, next_cursor = await blocking.run(
+            property_table_client.get_properties_by_city_key_page, city_key, limit, cursor, fields,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    add_image_urls(properties, asset_storage, variant_key_name(image_variant))
+    if fields:
+        return slim_response(properties, fields, next_cursor) # type: ignore
+    set_next_cursor(response, next_cursor)
+    return properties
 
 
 async def get_properties_near(
@@ -129,75 +440,289 @@ async def get_properties_near(
     country: str | None = None,
     state: str | None = None,
     city: str | None = None,
+    fields: list[str] | None = Query(default=None),
+    image_variant: str = Query(default=THUMBNAIL_VARIANT),
     property_table_client: PropertyTableClient = Depends(get_property_table_client),
     asset_storage: S3AssetStorage | None = Depends(get_asset_storage),
+    spatial_index: SpatialIndex | None = Depends(get_spatial_index),
+    blocking: BlockingExecutor = Depends(get_blocking_executor),
 ) -> list[Property]:
-    properties = property_table_client.get_properties_within_radius(
+    fields = parse_fields(fields)
+    try:
+        properties = await blocking.run(
+            find_properties_near,
+            latitude, longitude, radius_km, country, state, city, fields, property_table_client, spatial_index,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    add_image_urls(properties, asset_storage, variant_key_name(image_variant))
+    if fields:
+        return slim_response(properties, fields) # type: ignore
+    return properties
+
+
+def find_properties_near(
+    latitude: float,
+    longitude: float,
+    radius_km: float,
+    country: str | None,
+    state: str | None,
+    city: str | None,
+    fields: list[str] | None,
+    property_table_client: PropertyTableClient,
+    spatial_index: SpatialIndex | None,
+) -> list[Property]:
+    if spatial_index:
+        spatial_index.ensure_fresh()
+        matches = spatial_index.query_radius(
+            latitude,
+            longitude,
+            radius_km,
+            country=country,
+            state=state,
+            city=city,
+        )
+        matches.sort(key=lambda match: match[1])
+        distances = {property_uuid: distance for property_uuid, distance in matches}
+        properties = property_table_client.get_properties(list(distances), fields)
+        for property_obj in properties:
+            property_obj.distance_km = round(distances[property_obj.uuid], 3)
+        stats = spatial_index.stats()
+        logger.info(
+            "Spatial index query: %s matches, %s entries, %.1fs stale, %s bytes",
+            len(matches),
+            stats["entries"],
+            stats["staleness_seconds"] or 0.0,
+            stats["memory_bytes"],
+        )
+        return properties
+    return property_table_client.get_properties_within_radius(
         Decimal(str(latitude)),
         Decimal(str(longitude)),
         radius_km,
         country=country,
         state=state,
         city=city,
+        fields=fields,
     )
-    return add_image_urls(properties, asset_storage) # type: ignore
+
+
+async def search_properties(
+    country: str,
+    city: str,
+    response: Response,
+    state: str | None = None,
+    min_price_per_night: float | None = None,
+    max_price_per_night: float | None = None,
+    capacity: int | None = None,
+    amenities: list[str] | None = Query(default=None),
+    room_types: list[RoomType] | None = Query(default=None),
+    min_stars: int | None = None,
+    min_rating: float | None = None,
+    sort: SearchSort = SearchSort.PRICE,
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    search_documents: SearchDocumentTable | None = Depends(get_search_documents),
+    blocking: BlockingExecutor = Depends(get_blocking_executor),
+) -> list[SearchDocument]:
+    if not search_documents:
+        raise HTTPException(status_code=503, detail="Search documents are not configured.")
+    try:
+        documents, next_cursor = await blocking.run(
+            search_documents.search,
+            build_city_key(country, state, city),
+            min_price_per_night=min_price_per_night,
+            max_price_per_night=max_price_per_night,
+            capacity=capacity,
+            amenities=amenities,
+            room_types=[room_type.value for room_type in room_types or []],
+            min_stars=min_stars,
+            min_rating=min_rating,
+            sort=sort,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    set_next_cursor(response, next_cursor)
+    return documents
 
 
 async def add_room(
     room: Room,
     room_table_client: RoomTableClient = Depends(get_room_table_client),
+    blocking: BlockingExecutor = Depends(get_blocking_executor),
 ) -> UUID:
     strip_image_urls(room.images)
-    return room_table_client.add_room(room)
+    return await blocking.run(room_table_client.add_room, room)
+
+
+async def update_room(
+    room_uuid: UUID,
+    room: Room,
+    room_table_client: RoomTableClient = Depends(get_room_table_client),
+    asset_storage: S3AssetStorage | None = Depends(get_asset_storage),
+    blocking: BlockingExecutor = Depends(get_blocking_executor),
+) -> Room:
+    strip_image_urls(room.images)
+    try:
+        updated = await blocking.run(
+            room_table_client.update_room, room_uuid, room.property_uuid, room.model_dump(exclude_unset=True),
+        )
+    except PermissionError as exc:
+        raise HTTPException(status_code=403, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail="Room not found") from exc
+    return add_image_url(updated, asset_storage) # type: ignore
 
 
 async def get_room(
     room_uuid: UUID,
+    request: Request,
+    response: Response,
     room_table_client: RoomTableClient = Depends(get_room_table_client),
     asset_storage: S3AssetStorage | None = Depends(get_asset_storage),
+    blocking: BlockingExecutor = Depends(get_blocking_executor),
 ) -> Room:
-    room_obj = room_table_client.get_room(room_uuid)
+    try:
+        room_obj = await blocking.run(room_table_client.get_room, room_uuid)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail="Room not found") from exc
+    etag = compute_etag([room_obj, signing_window(asset_storage), resolved_image_keys([room_obj])], room_obj.updated_at)
+    unchanged = not_modified(request, etag)
+    if unchanged:
+        return unchanged # type: ignore
+    set_etag_headers(response, etag)
     return add_image_url(room_obj, asset_storage) # type: ignore
 
 
+async def get_rooms_batch(
+    payload: BatchGetRequest,
+    room_table_client: RoomTableClient = Depends(get_room_table_client),
+    asset_storage: S3AssetStorage | None = Depends(get_asset_storage),
+    blocking: BlockingExecutor = Depends(get_blocking_executor),
+) -> list[dict[str, Any]]:
+    try:
+        rooms = await blocking.run(room_table_client.get_rooms, payload.uuids, payload.fields)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    add_image_urls(rooms, asset_storage)
+    return dump_models(rooms, payload.fields)
+
+
 async def delete_room(
     room_uuid: UUID,
     room_table_client: RoomTableClient = Depends(get_room_table_client),
+    blocking: BlockingExecutor = Depends(get_blocking_executor),
 ) -> UUID:
-    return room_table_client.delete_rooom(room_uuid)
+    return await blocking.run(room_table_client.delete_rooom, room_uuid)
 
 
 async def get_property_rooms(
     property_uuid: UUID,
+    request: Request,
+    response: Response,
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    fields: list[str] | None = Query(default=None),
+    image_variant: str = Query(default=THUMBNAIL_VARIANT),
     room_table_client: RoomTableClient = Depends(get_room_table_client),
     asset_storage: S3AssetStorage | None = Depends(get_asset_storage),
+    blocking: BlockingExecutor = Depends(get_blocking_executor),
 ) -> list[Room]:
-    rooms = room_table_client.get_property_rooms(property_uuid)
-    return add_image_urls(rooms, asset_storage) # type: ignore
+    fields = parse_fields(fields)
+    try:
+        rooms, next_cursor = await blocking.run(
+            room_table_client.get_property_rooms_page, property_uuid, limit, cursor, fields,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    etag = list_etag(rooms, fields, asset_storage, next_cursor, variant_key_name(image_variant))
+    unchanged = not_modified(request, etag)
+    if unchanged:
+        return unchanged # type: ignore
+    add_image_urls(rooms, asset_storage, variant_key_name(image_variant))
+    if fields:
+        return slim_response(rooms, fields, next_cursor, etag) # type: ignore
+    set_next_cursor(response, next_cursor)
+    set_etag_headers(response, etag)
+    return rooms
+
+
+async def get_rooms_for_properties(
+    payload: PropertyRoomsRequest,
+    image_variant: str = Query(default=THUMBNAIL_VARIANT),
+    room_table_client: RoomTableClient = Depends(get_room_table_client),
+    asset_storage: S3AssetStorage | None = Depends(get_asset_storage),
+    blocking: BlockingExecutor = Depends(get_blocking_executor),
+) -> list[PropertyRooms]:
+    grouped = await blocking.run(
+        room_table_client.get_rooms_for_properties,
+        payload.property_uuids,
+        payload.capacity,
+        payload.max_price_per_night,
+        payload.amenities,
+        min_price_per_night=payload.min_price_per_night,
+        limit_per_property=payload.limit_per_property,
+    )
+    results: list[PropertyRooms] = []
+    for property_uuid, rooms in grouped.items():
+        add_image_urls(rooms, asset_storage, variant_key_name(image_variant))
+        results.append(PropertyRooms(property_uuid=property_uuid, rooms=rooms))
+    return results
 
 
 async def get_filtered_rooms(
+    request: Request,
+    response: Response,
     property_uuid: UUID | None = None,
     capacity: int | None = None,
     max_price_per_night: float | None = None,
     amenities: list[Amenity] | None = None,
+    limit: int | None = Query(default=None, ge=1),
+    min_price_per_night: float | None = None,
+    cheapest_first: bool = False,
+    fields: list[str] | None = Query(default=None),
+    image_variant: str = Query(default=THUMBNAIL_VARIANT),
     room_table_client: RoomTableClient = Depends(get_room_table_client),
     asset_storage: S3AssetStorage | None = Depends(get_asset_storage),
+    blocking: BlockingExecutor = Depends(get_blocking_executor),
 ) -> list[Room]:
-    if property_uuid:
-        rooms = room_table_client.get_filtered_property_rooms(
-            property_uuid,
-            capacity,
-            max_price_per_night,
-            amenities,
-        )
-    else:
-        rooms = room_table_client.get_filtered_rooms(
-            capacity,
-            max_price_per_night,
-            amenities,
-        )
-    return add_image_urls(rooms, asset_storage) # type: ignore
+    fields = parse_fields(fields)
+    try:
+        if property_uuid:
+            rooms = await blocking.run(
+                room_table_client.get_filtered_property_rooms,
+                property_uuid,
+                capacity,
+                max_price_per_night,
+                amenities,
+                min_price_per_night=min_price_per_night,
+                limit=limit,
+                fields=fields,
+            )
+        else:
+            rooms = await blocking.run(
+                room_table_client.get_filtered_rooms,
+                capacity,
+                max_price_per_night,
+                amenities,
+                limit=limit,
+                min_price_per_night=min_price_per_night,
+                cheapest_first=cheapest_first,
+                fields=fields,
+            )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    etag = list_etag(rooms, fields, asset_storage, variant=variant_key_name(image_variant))
+    unchanged = not_modified(request, etag)
+    if unchanged:
+        return unchanged # type: ignore
+    add_image_urls(rooms, asset_storage, variant_key_name(image_variant))
+    if fields:
+        return slim_response(rooms, fields, etag=etag) # type: ignore
+    set_etag_headers(response, etag)
+    return rooms
 
 
 async def create_asset_upload_url(
@@ -216,3 +741,90 @@ async def create_asset_upload_url(
         upload_url=upload_payload["url"],
         fields=upload_payload["fields"],
     )
+
+
+def require_asset_storage(asset_storage: S3AssetStorage | None) -> S3AssetStorage:
+    if not asset_storage:
+        raise HTTPException(status_code=503, detail="Asset storage is not configured.")
+    return asset_storage
+
+
+async def create_asset_upload_urls(
+    payload: BatchPresignedUploadRequest,
+    asset_storage: S3AssetStorage | None = Depends(get_asset_storage),
+) -> list[PresignedUploadResponse]:
+    storage = require_asset_storage(asset_storage)
+    try:
+        uploads = storage.create_uploads([
+            (upload.prefix, upload.content_type, upload.extension) for upload in payload.uploads
+        ])
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return [
+        PresignedUploadResponse(key=upload["key"], upload_url=upload["url"], fields=upload["fields"])
+        for upload in uploads
+    ]
+
+
+async def create_multipart_upload(
+    payload: MultipartUploadRequest,
+    asset_storage: S3AssetStorage | None = Depends(get_asset_storage),
+    blocking: BlockingExecutor = Depends(get_blocking_executor),
+) -> MultipartUploadResponse:
+    storage = require_asset_storage(asset_storage)
+    try:
+        upload = await blocking.run(
+            storage.create_multipart_upload,
+            payload.prefix,
+            payload.content_type,
+            payload.size_bytes,
+            payload.extension,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return MultipartUploadResponse(**upload)
+
+
+async def create_multipart_part_urls(
+    payload: MultipartPartUrlsRequest,
+    asset_storage: S3AssetStorage | None = Depends(get_asset_storage),
+) -> list[MultipartPartUrl]:
+    storage = require_asset_storage(asset_storage)
+    try:
+        parts = storage.create_part_urls(payload.key, payload.upload_id, payload.part_numbers)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return [MultipartPartUrl(**part) for part in parts]
+
+
+async def complete_multipart_upload(
+    payload: MultipartCompleteRequest,
+    asset_storage: S3AssetStorage | None = Depends(get_asset_storage),
+    blocking: BlockingExecutor = Depends(get_blocking_executor),
+) -> str:
+    storage = require_asset_storage(asset_storage)
+    try:
+        await blocking.run(
+            storage.complete_multipart_upload,
+            payload.key,
+            payload.upload_id,
+            [(part.part_number, part.etag) for part in payload.parts],
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except ClientError as exc:
+        raise HTTPException(status_code=400, detail=exc.response["Error"].get("Message", str(exc))) from exc
+    return payload.key
+
+
+async def abort_multipart_upload(
+    payload: MultipartAbortRequest,
+    asset_storage: S3AssetStorage | None = Depends(get_asset_storage),
+    blocking: BlockingExecutor = Depends(get_blocking_executor),
+) -> str:
+    storage = require_asset_storage(asset_storage)
+    try:
+        await blocking.run(storage.abort_multipart_upload, payload.key, payload.upload_id)
+    except ClientError as exc:
+        raise HTTPException(status_code=400, detail=exc.response["Error"].get("Message", str(exc))) from exc
+    return payload.key
@@ -0,0 +1,139 @@
+import logging
+import time
+from typing import Any
+
+import boto3
+
+from batch_write import write_batches
+from config import AppMetadata, property_service_int_configuration, property_service_prod_configuration
+from spatial_index import PropertyLocation
+
+logger = logging.getLogger()
+
+LOCATION_ATTRIBUTES = ("latitude", "longitude", "city_key")
+CHANGE_BUCKET_MILLISECONDS = 60 * 1000
+CHANGE_RETENTION_SECONDS = 24 * 3600
+# Changes are read again from this far back, stream shards are written concurrently so an entry can land
+# after later ones were already read. Re-applying a suffix of the log in order is harmless.
+CHANGE_READ_OVERLAP_MILLISECONDS = 30 * 1000
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _bucket(written_ms: int) -> str:
+    return str(written_ms // CHANGE_BUCKET_MILLISECONDS)
+
+
+def location_from_item(item: dict[str, Any]) -> PropertyLocation:
+    return PropertyLocation(
+        uuid=item["uuid"]["S"],
+        latitude=float(item["latitude"]["N"]) if "latitude" in item else None,
+        longitude=float(item["longitude"]["N"]) if "longitude" in item else None,
+        city_key=item.get("city_key", {}).get("S"),
+        updated_at=item.get("updated_at", {}).get("S"),
+        deleted=item.get("deleted", {}).get("BOOL", False),
+    )
+
+
+def location_change(record: dict[str, Any]) -> dict[str, Any] | None:
+    images = record.get("dynamodb", {})
+    old, new = images.get("OldImage"), images.get("NewImage")
+    if record.get("eventName") == "REMOVE":
+        if not old:
+            return None
+        return {"uuid": old["uuid"], "deleted": {"BOOL": True}}
+    if not new:
+        return None
+    if old and all(old.get(name) == new.get(name) for name in LOCATION_ATTRIBUTES):
+        return None
+    change = {name: new[name] for name in ("uuid", *LOCATION_ATTRIBUTES, "updated_at") if name in new}
+    change["deleted"] = {"BOOL": False}
+    return change
+
+
+class LocationChangeTable:
+    def __init__(self, change_table_name: str | None, property_table_name: str | None = None) -> None:
+        if not change_table_name:
+            raise ValueError("Location change table name must be provided.")
+        self.change_table_name = change_table_name
+        self.property_table_name = property_table_name
+        self.db_client = boto3.client("dynamodb")
+
+    def record(self, records: list[dict[str, Any]]) -> int:
+        written_ms = _now_ms()
+        expires_at = written_ms // 1000 + CHANGE_RETENTION_SECONDS
+        requests = []
+        for record in records:
+            change = location_change(record)
+            if change is None:
+                continue
+            sequence = record.get("dynamodb", {}).get("SequenceNumber", "0")
+            requests.append({"PutRequest": {"Item": {
+                **change,
+                "bucket": {"S": _bucket(written_ms)},
+                "change_key": {"S": f"{written_ms:015d}#{int(sequence):040d}"},
+                "expires_at": {"N": str(expires_at)},
+            }}})
+        failures = write_batches(self.db_client, self.change_table_name, requests)
+        if failures:
+            # Raising makes the stream retry the batch, writes of the same changes are idempotent.
+            raise RuntimeError(f"Failed to record {len(failures)} location changes: {failures[0][1]}")
+        return len(requests)
+
+    def _snapshot(self) -> list[PropertyLocation]:
+        if not self.property_table_name:
+            raise ValueError("Property table name must be provided.")
+        params: dict[str, Any] = {
+            "TableName": self.property_table_name,
+            "ProjectionExpression": "#uuid, latitude, longitude, city_key, updated_at",
+            "ExpressionAttributeNames": {"#uuid": "uuid"},
+        }
+        locations: list[PropertyLocation] = []
+        while True:
+            resp = self.db_client.scan(**params)
+            locations.extend(location_from_item(it) for it in resp.get("Items", []))
+            lek = resp.get("LastEvaluatedKey")
+            if not lek:
+                return locations
+            params["ExclusiveStartKey"] = lek
+
+    def changes_since(self, cursor: int | None) -> tuple[list[PropertyLocation], int]:
+        now = _now_ms()
+        if cursor is None:
+            # Changes logged while the snapshot is read are applied again by the next refresh.
+            return self._snapshot(), now
+
+        since = cursor - CHANGE_READ_OVERLAP_MILLISECONDS
+        changes: list[PropertyLocation] = []
+        for bucket in range(since // CHANGE_BUCKET_MILLISECONDS, now // CHANGE_BUCKET_MILLISECONDS + 1):
+            params: dict[str, Any] = {
+                "TableName": self.change_table_name,
+                "KeyConditionExpression": "#bucket = :bucket AND change_key > :since",
+                "ExpressionAttributeNames": {"#bucket": "bucket"},
+                "ExpressionAttributeValues": {":bucket": {"S": str(bucket)}, ":since": {"S": f"{since:015d}"}},
+            }
+            while True:
+                resp = self.db_client.query(**params)
+                changes.extend(location_from_item(it) for it in resp.get("Items", []))
+                lek = resp.get("LastEvaluatedKey")
+                if not lek:
+                    break
+                params["ExclusiveStartKey"] = lek
+        return changes, now
+
+
+_change_table: LocationChangeTable | None = None
+
+
+def handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
+    global _change_table
+    if _change_table is None:
+        app_config = (
+            property_service_prod_configuration
+            if AppMetadata().property_service_env == "prod"
+            else property_service_int_configuration
+        )
+        _change_table = LocationChangeTable(app_config.location_change_table_name)
+    return {"recorded": _change_table.record(event.get("Records", []))}
@@ -4,14 +4,19 @@ import os
 from fastapi import FastAPI
 from mangum import Mangum
 
+from cleanup import CleanupJobTable, CleanupQueue
 from config import (
     AppMetadata,
     property_service_int_configuration,
     property_service_prod_configuration,
 )
 from db_clients import PropertyTableClient, RoomTableClient
+from location_changes import LocationChangeTable
+from offload import BlockingExecutor
 from routes import router
-from storage import S3AssetStorage
+from search_documents import SearchDocumentTable
+from spatial_index import SpatialIndex
+from storage import S3AssetStorage, SignedUrlCache
 
 logger = logging.getLogger()
 
@@ -33,19 +38,57 @@ def create_app() -> FastAPI:
         description=app_metadata.app_description,
     )
     app.state.app_metadata = app_metadata
+    app.state.blocking_executor = BlockingExecutor(app_config.data_access_max_workers)
+    search_documents = (
+        SearchDocumentTable(app_config.search_table_name, max_workers=app_config.batch_write_max_workers)
+        if app_config.search_table_name
+        else None
+    )
+    app.state.search_documents = search_documents
+    app.state.cleanup_jobs = (
+        CleanupJobTable(app_config.cleanup_job_table_name) if app_config.cleanup_job_table_name else None
+    )
+    app.state.cleanup_queue = (
+        CleanupQueue(app_config.cleanup_queue_url) if app_config.cleanup_queue_url else None
+    )
     app.state.property_table_client = PropertyTableClient(
         app_config.property_table_name,
+        geo_query_max_cells=app_config.geo_query_max_cells,
+        geo_query_max_workers=app_config.geo_query_max_workers,
+        write_max_workers=app_config.batch_write_max_workers,
+        search_documents=search_documents,
     )
     app.state.room_table_client = RoomTableClient(
         app_config.room_table_name,
+        scan_segments=app_config.room_scan_segments,
+        query_max_workers=app_config.room_query_max_workers,
+        amenity_table_name=app_config.room_amenity_table_name,
+        write_max_workers=app_config.batch_write_max_workers,
+        search_documents=search_documents,
     )
 
+    if app_config.geo_search_backend == "memory":
+        app.state.spatial_index = SpatialIndex(
+            LocationChangeTable(app_config.location_change_table_name, app_config.property_table_name),
+            cell_degrees=app_config.geo_index_cell_degrees,
+            refresh_seconds=app_config.geo_index_refresh_seconds,
+            full_refresh_seconds=app_config.geo_index_full_refresh_seconds,
+        )
+
     asset_bucket = app_config.asset_bucket_name
 
+    url_cache = None
+    if app_config.asset_url_cache_size > 0:
+        url_cache = SignedUrlCache(
+            max_entries=app_config.asset_url_cache_size,
+            window_seconds=app_config.asset_url_cache_window_seconds,
+        )
+
     app.state.asset_storage = S3AssetStorage(
         bucket_name=asset_bucket,
         presign_ttl_seconds=app_config.asset_url_ttl_seconds,
         region_name=app_config.region,
+        url_cache=url_cache,
     )
 
 
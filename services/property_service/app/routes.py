@@ -1,25 +1,45 @@
+from typing import Any
 from uuid import UUID
 from fastapi import APIRouter
 
 from handlers import (
     add_property,
     update_property,
+    update_room,
     delete_property,
     delete_room,
+    get_cleanup_job,
     get_filtered_rooms,
+    import_properties,
     get_property,
+    get_properties_batch,
     get_properties_by_city,
     get_properties_near,
     get_property_rooms,
     get_room,
+    get_rooms_batch,
+    get_rooms_for_properties,
     add_room,
     get_user_properties,
     create_asset_upload_url,
+    create_asset_upload_urls,
+    create_multipart_upload,
+    create_multipart_part_urls,
+    complete_multipart_upload,
+    abort_multipart_upload,
+    search_properties,
+    start_orphan_sweep,
 )
 from schemas import (
+    CleanupJob,
+    ImportReport,
+    MultipartPartUrl,
+    MultipartUploadResponse,
     PresignedUploadResponse,
     Property,
+    PropertyRooms,
     Room,
+    SearchDocument,
 )
 
 router = APIRouter()
@@ -32,6 +52,46 @@ router.add_api_route(
     description="Generate a pre-signed S3 upload URL for property or room assets",
 )
 
+router.add_api_route(
+    path="/assets/upload-urls",
+    methods=["POST"],
+    response_model=list[PresignedUploadResponse],
+    endpoint=create_asset_upload_urls,
+    description="Generate up to 50 pre-signed S3 upload URLs in one call, in request order",
+)
+
+router.add_api_route(
+    path="/assets/multipart-upload",
+    methods=["POST"],
+    response_model=MultipartUploadResponse,
+    endpoint=create_multipart_upload,
+    description="Start a multipart upload for a large asset and sign its first parts",
+)
+
+router.add_api_route(
+    path="/assets/multipart-upload/part-urls",
+    methods=["POST"],
+    response_model=list[MultipartPartUrl],
+    endpoint=create_multipart_part_urls,
+    description="Sign upload URLs for up to 100 further parts of a multipart upload",
+)
+
+router.add_api_route(
+    path="/assets/multipart-upload/complete",
+    methods=["POST"],
+    response_model=str,
+    endpoint=complete_multipart_upload,
+    description="Complete a multipart upload from its uploaded parts and return the asset key",
+)
+
+router.add_api_route(
+    path="/assets/multipart-upload/abort",
+    methods=["POST"],
+    response_model=str,
+    endpoint=abort_multipart_upload,
+    description="Abort a multipart upload and discard its uploaded parts",
+)
+
 router.add_api_route(
     path="/property",
     methods=["POST"],
@@ -45,7 +105,23 @@ router.add_api_route(
     methods=["DELETE"],
     response_model=UUID,
     endpoint=delete_property,
-    description="Delete property"
+    description="Delete property, its rooms and assets are removed by the cleanup worker"
+)
+
+router.add_api_route(
+    path="/cleanup-jobs/orphan-sweep",
+    methods=["POST"],
+    response_model=CleanupJob,
+    endpoint=start_orphan_sweep,
+    description="Queue a cleanup worker job removing rooms of deleted properties and unreferenced assets"
+)
+
+router.add_api_route(
+    path="/cleanup-jobs/{job_uuid}",
+    methods=["GET"],
+    response_model=CleanupJob,
+    endpoint=get_cleanup_job,
+    description="Get progress of a cleanup job, property deletes use the property UUID as job UUID"
 )
 
 router.add_api_route(
@@ -69,7 +145,7 @@ router.add_api_route(
     methods=["GET"],
     response_model=list[Property],
     endpoint=get_user_properties,
-    description="Get user properties"
+    description="Get user properties, optionally limited to the given fields"
 )
 
 router.add_api_route(
@@ -77,7 +153,23 @@ router.add_api_route(
     methods=["GET"],
     response_model=list[Property],
     endpoint=get_properties_by_city,
-    description="List properties by city/country/state"
+    description="List properties by city/country/state, optionally limited to the given fields"
+)
+
+router.add_api_route(
+    path="/properties/batch",
+    methods=["POST"],
+    response_model=list[dict[str, Any]],
+    endpoint=get_properties_batch,
+    description="Get properties by UUID in request order, optionally limited to the given fields"
+)
+
+router.add_api_route(
+    path="/properties/import",
+    methods=["POST"],
+    response_model=ImportReport,
+    endpoint=import_properties,
+    description="Bulk import properties with nested rooms from a JSON array or NDJSON body"
 )
 
 router.add_api_route(
@@ -85,7 +177,15 @@ router.add_api_route(
     methods=["GET"],
     response_model=list[Property],
     endpoint=get_properties_near,
-    description="List properties within approx bbox delta of given lat/lon, optionally filtered by country/state/city"
+    description="List properties within approx bbox delta of given lat/lon, optionally filtered by country/state/city and limited to the given fields"
+)
+
+router.add_api_route(
+    path="/properties/search",
+    methods=["GET"],
+    response_model=list[SearchDocument],
+    endpoint=search_properties,
+    description="Search property summaries of a city, filtered and sorted in one query"
 )
 
 router.add_api_route(
@@ -104,6 +204,14 @@ router.add_api_route(
     description="Get room"
 )
 
+router.add_api_route(
+    path="/room/{room_uuid}",
+    methods=["PUT"],
+    response_model=Room,
+    endpoint=update_room,
+    description="Update the given fields of a room"
+)
+
 router.add_api_route(
     path="/room/{room_uuid}",
     methods=["DELETE"],
@@ -112,12 +220,28 @@ router.add_api_route(
     description="Delete room"
 )
 
+router.add_api_route(
+    path="/rooms/batch",
+    methods=["POST"],
+    response_model=list[dict[str, Any]],
+    endpoint=get_rooms_batch,
+    description="Get rooms by UUID in request order, optionally limited to the given fields"
+)
+
+router.add_api_route(
+    path="/rooms/by-properties",
+    methods=["POST"],
+    response_model=list[PropertyRooms],
+    endpoint=get_rooms_for_properties,
+    description="List filtered rooms of several properties, grouped by property in request order"
+)
+
 router.add_api_route(
     path="/rooms/{property_uuid}",
     methods=["GET"],
     response_model=list[Room],
     endpoint=get_property_rooms,
-    description="Get rooms od a property"
+    description="Get rooms od a property, optionally limited to the given fields"
 )
 
 router.add_api_route(
@@ -125,5 +249,5 @@ router.add_api_route(
     methods=["GET"],
     response_model=list[Room],
     endpoint=get_filtered_rooms,
-    description="Get filtered rooms"
+    description="Get filtered rooms, optionally limited to the given fields"
 )
@@ -12,7 +12,11 @@ class Amenity(BaseModel):
 
 class Image(BaseModel):
     key: str = Field(description="S3 object key for the image")
-    url: str | None = Field(default=None, description="Temporary URL exposing the image")
+    url: str | None = Field(default=None, description="Temporary URL exposing the image or the requested variant")
+    original_url: str | None = Field(default=None, description="Temporary URL of the original, used until the variant exists")
+    variants: dict[str, str] | None = Field(
+        default=None, description="S3 object keys of resized and re-encoded variants, by variant name"
+    )
 
 
 class RoomType(str, Enum):
@@ -62,6 +66,7 @@ class Property(BaseModel):
     stars: int | None = Field(description="Number of stard", default=1)
     place_id: str | None = Field(description="AWS location place id", default=None)
     images: list[Image] | None = Field(description="List of property images stored in S3", default=[])
+    distance_km: float | None = Field(description="Distance from the searched point in km", default=None)
 
 
 class PresignedUploadRequest(BaseModel):
@@ -74,3 +79,155 @@ class PresignedUploadResponse(BaseModel):
     key: str = Field(description="Generated S3 object key")
     upload_url: str = Field(description="Pre-signed URL to upload the asset")
     fields: dict[str, str] = Field(description="Form fields required when performing the upload")
+
+
+class BatchPresignedUploadRequest(BaseModel):
+    uploads: list[PresignedUploadRequest] = Field(
+        description="Assets to upload, responses keep this order", min_length=1, max_length=50
+    )
+
+
+class MultipartUploadRequest(BaseModel):
+    prefix: str = Field(description="Folder prefix under which the asset will be stored")
+    content_type: str = Field(description="Content type of the asset being uploaded")
+    size_bytes: int = Field(description="Size of the asset, used to plan the parts", gt=0)
+    extension: str | None = Field(default=None, description="Optional file extension to append to the generated key")
+
+
+class MultipartPartUrl(BaseModel):
+    part_number: int = Field(description="Number of the part, starting at 1")
+    url: str = Field(description="Pre-signed URL to PUT the part to")
+
+
+class MultipartUploadResponse(BaseModel):
+    key: str = Field(description="Generated S3 object key")
+    upload_id: str = Field(description="Multipart upload id")
+    part_size: int = Field(description="Size in bytes of every part but the last")
+    part_count: int = Field(description="Number of parts the asset must be split into")
+    parts: list[MultipartPartUrl] = Field(description="Upload URLs of the first parts, request the rest in batches")
+
+
+class MultipartPartUrlsRequest(BaseModel):
+    key: str = Field(description="S3 object key of the multipart upload")
+    upload_id: str = Field(description="Multipart upload id")
+    part_numbers: list[int] = Field(description="Numbers of the parts to sign", min_length=1, max_length=100)
+
+
+class MultipartPart(BaseModel):
+    part_number: int = Field(description="Number of the uploaded part")
+    etag: str = Field(description="ETag returned by S3 for the part")
+
+
+class MultipartCompleteRequest(BaseModel):
+    key: str = Field(description="S3 object key of the multipart upload")
+    upload_id: str = Field(description="Multipart upload id")
+    parts: list[MultipartPart] = Field(description="All uploaded parts", min_length=1, max_length=10000)
+
+
+class MultipartAbortRequest(BaseModel):
+    key: str = Field(description="S3 object key of the multipart upload")
+    upload_id: str = Field(description="Multipart upload id")
+
+
+class BatchGetRequest(BaseModel):
+    uuids: list[UUID] = Field(description="UUIDs to fetch, results keep this order", max_length=1000)
+    fields: list[str] | None = Field(default=None, description="Optional attribute names to return")
+
+
+class PropertyRoomsRequest(BaseModel):
+    property_uuids: list[UUID] = Field(description="UUIDs of properties whose rooms are listed", max_length=500)
+    capacity: int | None = Field(default=None, description="Minimum room capacity")
+    max_price_per_night: float | None = Field(default=None, description="Maximum price per night")
+    min_price_per_night: float | None = Field(default=None, description="Minimum price per night")
+    amenities: list[Amenity] | None = Field(default=None, description="Amenities every room must have")
+    limit_per_property: int | None = Field(
+        default=None, ge=1, description="Return at most this many of the cheapest matching rooms per property"
+    )
+
+
+class PropertyRooms(BaseModel):
+    property_uuid: UUID = Field(description="UUID of a property")
+    rooms: list[Room] = Field(description="Rooms of the property matching the filters, cheapest first")
+
+
+class SearchSort(str, Enum):
+    PRICE = "price"
+    PRICE_DESC = "price_desc"
+    RATING = "rating"
+    STARS = "stars"
+
+
+class SearchDocument(BaseModel):
+    property_uuid: UUID = Field(description="UUID of a property")
+    name: str | None = Field(default=None, description="Property name")
+    city_key: str | None = Field(default=None, description="Computed city key COUNTRY#STATE#CITY")
+    country: str | None = Field(default=None, description="Country the property is in")
+    state: str | None = Field(default=None, description="State the property is in")
+    city: str | None = Field(default=None, description="City the property is in")
+    latitude: Decimal | None = Field(default=None, description="Latitude of the property")
+    longitude: Decimal | None = Field(default=None, description="Longitude of the property")
+    stars: int | None = Field(default=None, description="Star rating of the property")
+    min_price_per_night: float | None = Field(default=None, description="Lowest price per night of its rooms")
+    max_price_per_night: float | None = Field(default=None, description="Highest price per night of its rooms")
+    max_capacity: int | None = Field(default=None, description="Capacity of its largest room")
+    room_count: int = Field(default=0, description="Number of rooms")
+    amenities: list[str] = Field(default=[], description="Normalized amenities offered by any of its rooms")
+    room_types: list[RoomType] = Field(default=[], description="Room types the property offers")
+    rating_count: int = Field(default=0, description="Number of reviews")
+    rating_average: float | None = Field(default=None, description="Average review rating")
+
+
+class CleanupKind(str, Enum):
+    PROPERTY_DELETE = "property_delete"
+    ORPHAN_SWEEP = "orphan_sweep"
+
+
+class CleanupStatus(str, Enum):
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class CleanupJob(BaseModel):
+    job_uuid: UUID = Field(description="UUID of the job, the property UUID for property deletes")
+    kind: CleanupKind = Field(description="What the job cleans up")
+    status: CleanupStatus = Field(description="Job status", default=CleanupStatus.RUNNING)
+    property_uuid: UUID | None = Field(default=None, description="UUID of the deleted property")
+    rooms_deleted: int = Field(default=0, description="Number of rooms deleted so far")
+    assets_deleted: int = Field(default=0, description="Number of S3 objects deleted so far")
+    attempts: int = Field(default=0, description="Number of times the cleanup worker picked the job up")
+    error: str | None = Field(default=None, description="Why the job failed")
+    created_at: datetime | None = Field(default=None, description="Job started at")
+    updated_at: datetime | None = Field(default=None, description="Last progress update")
+
+
+class RoomImport(Room):
+    uuid: UUID | None = Field(description="Ignored, the server assigns a new UUID", default=None)
+    property_uuid: UUID | None = Field(description="Ignored, rooms belong to the enclosing property", default=None)
+
+
+class PropertyImport(Property):
+    uuid: UUID | None = Field(description="Ignored, the server assigns a new UUID", default=None)
+    rooms: list[RoomImport] = Field(description="Rooms of the property", default=[])
+
+
+class ImportStatus(str, Enum):
+    IMPORTED = "imported"
+    PARTIAL = "partial"
+    FAILED = "failed"
+
+
+class ImportItemResult(BaseModel):
+    index: int = Field(description="Position of the property in the import payload")
+    property_uuid: UUID | None = Field(default=None, description="UUID of the imported property")
+    status: ImportStatus = Field(description="Outcome for the property and its rooms")
+    error: str | None = Field(default=None, description="Why the property was not imported")
+    room_uuids: list[UUID] = Field(default=[], description="UUIDs of the imported rooms")
+    room_errors: dict[int, str] = Field(default={}, description="Errors of rooms that were not imported, by position")
+
+
+class ImportReport(BaseModel):
+    imported_properties: int = Field(description="Number of imported properties")
+    imported_rooms: int = Field(description="Number of imported rooms")
+    failed: int = Field(description="Number of properties that were not imported")
+    results: list[ImportItemResult] = Field(description="Per-property results in payload order")
@@ -0,0 +1,249 @@
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from typing import Any, Iterable
+from uuid import UUID
+
+import boto3
+from amenity_index import item_amenity_names, normalize_amenity
+from codec import codec_for
+from pagination import decode_cursor, encode_cursor
+from schemas import Property, SearchDocument, SearchSort
+
+SEARCH_CITY_PRICE_INDEX_NAME = "city_price_index"
+SEARCH_QUERY_PAGE_SIZE = 100
+
+SEARCH_DOCUMENT_CODEC = codec_for(SearchDocument)
+
+PROPERTY_ATTRIBUTES = ("name", "city_key", "country", "state", "city", "latitude", "longitude", "stars")
+ROOM_SUMMARY_ATTRIBUTES = (
+    "min_price_per_night",
+    "max_price_per_night",
+    "max_capacity",
+    "room_count",
+    "amenities",
+    "room_types",
+)
+ROOM_SUMMARY_PROJECTION = "#uuid, property_uuid, price_per_night, #capacity, amenities, room_type"
+ROOM_SUMMARY_NAMES = {"#uuid": "uuid", "#capacity": "capacity"}
+
+
+def room_summary(room_items: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    prices: list[float] = []
+    capacities: list[int] = []
+    amenities: set[str] = set()
+    room_types: set[str] = set()
+    for item in room_items:
+        if "price_per_night" in item:
+            prices.append(float(item["price_per_night"]["N"]))
+        if "capacity" in item:
+            capacities.append(int(item["capacity"]["N"]))
+        if "room_type" in item:
+            room_types.add(item["room_type"]["S"])
+        amenities |= item_amenity_names(item)
+    if not prices:
+        return {}
+    return {
+        "min_price_per_night": min(prices),
+        "max_price_per_night": max(prices),
+        "max_capacity": max(capacities, default=None),
+        "room_count": len(prices),
+        "amenities": sorted(amenities),
+        "room_types": sorted(room_types),
+    }
+
+
+def search_document_from_item(item: dict[str, Any]) -> SearchDocument:
+    document = SEARCH_DOCUMENT_CODEC.decode_model(item)
+    if document.rating_count:
+        document.rating_average = round(float(item["rating_sum"]["N"]) / document.rating_count, 2)
+    return document
+
+
+def _document_key(item: dict[str, Any]) -> dict[str, Any]:
+    return {name: item[name] for name in ("property_uuid", "city_key", "min_price_per_night")}
+
+
+class SearchDocumentTable:
+    def __init__(self, search_table_name: str | None, max_workers: int = 8) -> None:
+        if not search_table_name:
+            raise ValueError("Search table name must be provided.")
+        self.search_table_name = search_table_name
+        self.db_client = boto3.client("dynamodb")
+        self.max_workers = max(1, max_workers)
+
+    def _set(self, property_uuid: str, values: dict[str, Any], attributes: tuple[str, ...]) -> None:
+        encoded = SEARCH_DOCUMENT_CODEC.encode(values)
+        names = {f"#a{i}": name for i, name in enumerate(attributes)}
+        set_clauses = [f"#a{i} = :a{i}" for i, name in enumerate(attributes) if name in encoded]
+        removed = [f"#a{i}" for i, name in enumerate(attributes) if name not in encoded]
+        expression = ""
+        if set_clauses:
+            expression = "SET " + ", ".join(set_clauses)
+        if removed:
+            expression += " REMOVE " + ", ".join(removed)
+        params: dict[str, Any] = {
+            "TableName": self.search_table_name,
+            "Key": {"property_uuid": {"S": property_uuid}},
+            "UpdateExpression": expression.strip(),
+            "ExpressionAttributeNames": names,
+        }
+        values_by_placeholder = {f":a{i}": encoded[name] for i, name in enumerate(attributes) if name in encoded}
+        if values_by_placeholder:
+            params["ExpressionAttributeValues"] = values_by_placeholder
+        self.db_client.update_item(**params)
+
+    def put_property(self, property: Property) -> None:
+        values = property.model_dump(include=set(PROPERTY_ATTRIBUTES), exclude_none=True)
+        self._set(str(property.uuid), values, PROPERTY_ATTRIBUTES)
+
+    def put_properties(self, properties: list[Property]) -> None:
+        if not properties:
+            return
+        with ThreadPoolExecutor(max_workers=min(len(properties), self.max_workers)) as executor:
+            list(executor.map(self.put_property, properties))
+
+    def update_rooms(self, property_uuid: str, room_items: Iterable[dict[str, Any]]) -> None:
+        self._set(property_uuid, room_summary(room_items), ROOM_SUMMARY_ATTRIBUTES)
+
+    def set_rating(self, property_uuid: UUID | str, rating_sum: Decimal, rating_count: int) -> bool:
+        # The review service keeps these current from its table's stream, this is used by backfills.
+        try:
+            self.db_client.update_item(
+                TableName=self.search_table_name,
+                Key={"property_uuid": {"S": str(property_uuid)}},
+                UpdateExpression="SET rating_sum = :sum, rating_count = :count",
+                ConditionExpression="attribute_exists(property_uuid)",
+                ExpressionAttributeValues={":sum": {"N": str(rating_sum)}, ":count": {"N": str(rating_count)}},
+            )
+        except self.db_client.exceptions.ConditionalCheckFailedException:
+            return False
+        return True
+
+    def backfill_ratings(self, review_table_name: str) -> int:
+        totals: dict[str, tuple[Decimal, int]] = {}
+        params: dict[str, Any] = {"TableName": review_table_name, "ProjectionExpression": "property_uuid, rating"}
+        while True:
+            resp = self.db_client.scan(**params)
+            for item in resp.get("Items", []):
+                if "property_uuid" not in item or "rating" not in item:
+                    continue
+                rating_sum, rating_count = totals.get(item["property_uuid"]["S"], (Decimal(0), 0))
+                totals[item["property_uuid"]["S"]] = (rating_sum + Decimal(item["rating"]["N"]), rating_count + 1)
+            lek = resp.get("LastEvaluatedKey")
+            if not lek:
+                break
+            params["ExclusiveStartKey"] = lek
+
+        # Documents rated before but without reviews now are reset.
+        params = {
+            "TableName": self.search_table_name,
+            "ProjectionExpression": "property_uuid",
+            "FilterExpression": "attribute_exists(rating_count)",
+        }
+        while True:
+            resp = self.db_client.scan(**params)
+            for item in resp.get("Items", []):
+                totals.setdefault(item["property_uuid"]["S"], (Decimal(0), 0))
+            lek = resp.get("LastEvaluatedKey")
+            if not lek:
+                break
+            params["ExclusiveStartKey"] = lek
+
+        return sum(self.set_rating(property_uuid, *total) for property_uuid, total in totals.items())
+
+    def delete_property(self, property_uuid: UUID) -> None:
+        self.db_client.delete_item(
+            TableName=self.search_table_name,
+            Key={"property_uuid": {"S": str(property_uuid)}},
+        )
+
+    def search(
+        self,
+        city_key: str,
+        min_price_per_night: float | None = None,
+        max_price_per_night: float | None = None,
+        capacity: int | None = None,
+        amenities: list[str] | None = None,
+        room_types: list[str] | None = None,
+        min_stars: int | None = None,
+        min_rating: float | None = None,
+        sort: SearchSort = SearchSort.PRICE,
+        limit: int | None = None,
+        cursor: str | None = None,
+    ) -> tuple[list[SearchDocument], str | None]:
+        key_condition = "city_key = :ck"
+        filters: list[str] = []
+        eav: dict[str, Any] = {":ck": {"S": city_key}}
+        if max_price_per_night is not None:
+            key_condition += " AND min_price_per_night <= :maxp"
+            eav[":maxp"] = {"N": str(max_price_per_night)}
+        if min_price_per_night is not None:
+            filters.append("max_price_per_night >= :minp")
+            eav[":minp"] = {"N": str(min_price_per_night)}
+        if capacity is not None:
+            filters.append("max_capacity >= :cap")
+            eav[":cap"] = {"N": str(capacity)}
+        if min_stars is not None:
+            filters.append("stars >= :stars")
+            eav[":stars"] = {"N": str(min_stars)}
+        for i, amenity in enumerate(sorted({normalize_amenity(name) for name in amenities or []} - {""})):
+            filters.append(f"contains(amenities, :am{i})")
+            eav[f":am{i}"] = {"S": amenity}
+        if room_types:
+            type_filters = []
+            for i, room_type in enumerate(room_types):
+                type_filters.append(f"contains(room_types, :rt{i})")
+                eav[f":rt{i}"] = {"S": room_type}
+            filters.append("(" + " OR ".join(type_filters) + ")")
+
+        params: dict[str, Any] = {
+            "TableName": self.search_table_name,
+            "IndexName": SEARCH_CITY_PRICE_INDEX_NAME,
+            "KeyConditionExpression": key_condition,
+            "ExpressionAttributeValues": eav,
+            "ScanIndexForward": sort != SearchSort.PRICE_DESC,
+        }
+        if filters:
+            params["FilterExpression"] = " AND ".join(filters)
+
+        ordered_by_index = sort in (SearchSort.PRICE, SearchSort.PRICE_DESC)
+        start_key = decode_cursor(cursor)
+        # Rating and stars sorts page by offset into the sorted city, index sorts resume from the last key.
+        if start_key and ordered_by_index == ("offset" in start_key):
+            raise ValueError("Invalid cursor")
+        if ordered_by_index:
+            if start_key:
+                params["ExclusiveStartKey"] = start_key
+            if limit is not None:
+                params["Limit"] = max(limit, SEARCH_QUERY_PAGE_SIZE)
+
+        documents: list[SearchDocument] = []
+        while True:
+            resp = self.db_client.query(**params)
+            for item in resp.get("Items", []):
+                document = search_document_from_item(item)
+                if min_rating is not None and (document.rating_average or 0) < min_rating:
+                    continue
+                documents.append(document)
+                if ordered_by_index and limit is not None and len(documents) >= limit:
+                    # The cursor resumes after the last returned document, not the end of the page.
+                    return documents, encode_cursor(_document_key(item))
+            lek = resp.get("LastEvaluatedKey")
+            if not lek:
+                break
+            params["ExclusiveStartKey"] = lek
+
+        if ordered_by_index:
+            return documents, None
+        if sort == SearchSort.RATING:
+            documents.sort(key=lambda document: (
+                -(document.rating_average or 0), -document.rating_count, str(document.property_uuid),
+            ))
+        else:
+            documents.sort(key=lambda document: (-(document.stars or 0), str(document.property_uuid)))
+        offset = int(start_key["offset"]["N"]) if start_key else 0
+        if limit is None:
+            return documents[offset:], None
+        next_offset = offset + limit
+        next_cursor = encode_cursor({"offset": {"N": str(next_offset)}}) if next_offset < len(documents) else None
+        return documents[offset:next_offset], next_cursor
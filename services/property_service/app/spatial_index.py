@@ -0,0 +1,285 @@
+from array import array
+import logging
+import math
+import sys
+import threading
+import time
+from typing import Any, NamedTuple, Protocol
+from uuid import UUID
+
+import numpy as np
+
+from geometry import bbox_deltas, bbox_mask, radius_filter
+
+logger = logging.getLogger()
+
+
+class PropertyLocation(NamedTuple):
+    uuid: str
+    latitude: float | None
+    longitude: float | None
+    city_key: str | None
+    updated_at: str | None = None
+    deleted: bool = False
+
+
+class ChangeFeed(Protocol):
+    def changes_since(self, cursor: Any) -> tuple[list[PropertyLocation], Any]:
+        ...
+
+
+class InMemoryChangeFeed:
+    def __init__(self) -> None:
+        self._log: list[PropertyLocation] = []
+
+    def publish(self, change: PropertyLocation) -> None:
+        self._log.append(change)
+
+    def changes_since(self, cursor: int | None) -> tuple[list[PropertyLocation], int]:
+        start = cursor or 0
+        return self._log[start:], len(self._log)
+
+
+def _matches_location(city_key: str, country: str | None, state: str | None, city: str | None) -> bool:
+    parts = city_key.split("#")
+    if len(parts) != 3:
+        return False
+    if country and parts[0] != country.strip().upper():
+        return False
+    if state and parts[1] != state.strip().upper():
+        return False
+    if city and parts[2] != city.strip().upper():
+        return False
+    return True
+
+
+class SpatialIndex:
+    def __init__(
+        self,
+        change_feed: ChangeFeed,
+        cell_degrees: float = 0.05,
+        refresh_seconds: int = 60,
+        full_refresh_seconds: int = 3600,
+    ) -> None:
+        self.change_feed = change_feed
+        self.cell_degrees = cell_degrees
+        self.refresh_seconds = refresh_seconds
+        self.full_refresh_seconds = full_refresh_seconds
+
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread: threading.Thread | None = None
+        self._cursor: Any = None
+        self._refreshed_at: float | None = None
+        self._full_refreshed_at: float | None = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self._uuids = bytearray()
+        self._latitudes = array("d")
+        self._longitudes = array("d")
+        self._city_ids = array("I")
+        self._city_keys: list[str] = []
+        self._city_key_ids: dict[str, int] = {}
+        self._slots: dict[str, int] = {}
+        self._free_slots: list[int] = []
+        self._grid: dict[tuple[int, int], array] = {}
+
+    def _cell(self, latitude: float, longitude: float) -> tuple[int, int]:
+        return math.floor(latitude / self.cell_degrees), math.floor(longitude / self.cell_degrees)
+
+    def _city_id(self, city_key: str | None) -> int:
+        key = city_key or ""
+        city_id = self._city_key_ids.get(key)
+        if city_id is None:
+            city_id = len(self._city_keys)
+            self._city_keys.append(key)
+            self._city_key_ids[key] = city_id
+        return city_id
+
+    def _remove_locked(self, uuid: str) -> None:
+        slot = self._slots.pop(uuid, None)
+        if slot is None:
+            return
+        cell = self._cell(self._latitudes[slot], self._longitudes[slot])
+        bucket = self._grid.get(cell)
+        if bucket is not None:
+            bucket.remove(slot)
+            if not bucket:
+                del self._grid[cell]
+        self._latitudes[slot] = math.nan
+        self._longitudes[slot] = math.nan
+        self._free_slots.append(slot)
+
+    def _upsert_locked(self, location: PropertyLocation) -> None:
+        self._remove_locked(location.uuid)
+        if location.deleted or location.latitude is None or location.longitude is None:
+            return
+        raw_uuid = UUID(location.uuid).bytes
+        city_id = self._city_id(location.city_key)
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._uuids[slot * 16:(slot + 1) * 16] = raw_uuid
+            self._latitudes[slot] = location.latitude
+            self._longitudes[slot] = location.longitude
+            self._city_ids[slot] = city_id
+        else:
+            slot = len(self._latitudes)
+            self._uuids.extend(raw_uuid)
+            self._latitudes.append(location.latitude)
+            self._longitudes.append(location.longitude)
+            self._city_ids.append(city_id)
+        self._slots[location.uuid] = slot
+        self._grid.setdefault(self._cell(location.latitude, location.longitude), array("I")).append(slot)
+
+    def upsert(self, location: PropertyLocation) -> None:
+        with self._lock:
+            self._upsert_locked(location)
+
+    def remove(self, uuid: UUID | str) -> None:
+        with self._lock:
+            self._remove_locked(str(uuid))
+
+    def refresh(self, force_full: bool = False) -> int:
+        now = time.monotonic()
+        full = (
+            force_full
+            or self._full_refreshed_at is None
+            or now - self._full_refreshed_at >= self.full_refresh_seconds
+        )
+        cursor = None if full else self._cursor
+        changes, next_cursor = self.change_feed.changes_since(cursor)
+        with self._lock:
+            if full:
+                self._reset()
+                self._full_refreshed_at = now
+            for change in changes:
+                self._upsert_locked(change)
+            self._cursor = next_cursor
+            self._refreshed_at = now
+        return len(changes)
+
+    def _refresh_in_background(self) -> None:
+        try:
+            applied = self.refresh()
+            logger.info("Spatial index refreshed with %s changes", applied)
+        except Exception as exc:
+            logger.error("Spatial index refresh failed, serving stale data", exc_info=exc)
+        finally:
+            self._refresh_lock.release()
+
+    def ensure_fresh(self) -> None:
+        if self._refreshed_at is None:
+            # Nothing to serve yet, the first load blocks the request.
+            with self._refresh_lock:
+                if self._refreshed_at is None:
+                    applied = self.refresh()
+                    logger.info("Spatial index loaded with %s locations", applied)
+            return
+        if time.monotonic() - self._refreshed_at < self.refresh_seconds:
+            return
+        # Later refreshes run beside the request, which is served from the current index.
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        self._refresh_thread = threading.Thread(target=self._refresh_in_background, daemon=True)
+        self._refresh_thread.start()
+
+    def _candidate_slots(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> np.ndarray:
+        min_cell = self._cell(min_lat, min_lon)
+        max_cell = self._cell(max_lat, max_lon)
+        cell_count = (max_cell[0] - min_cell[0] + 1) * (max_cell[1] - min_cell[1] + 1)
+        if cell_count > len(self._grid):
+            buckets = list(self._grid.values())
+        else:
+            buckets = []
+            for lat_cell in range(min_cell[0], max_cell[0] + 1):
+                for lon_cell in range(min_cell[1], max_cell[1] + 1):
+                    bucket = self._grid.get((lat_cell, lon_cell))
+                    if bucket:
+                        buckets.append(bucket)
+        if not buckets:
+            return np.empty(0, dtype=np.intp)
+        return np.concatenate([np.frombuffer(bucket, dtype=np.uint32) for bucket in buckets]).astype(np.intp)
+
+    def _uuid_at(self, slot: int) -> UUID:
+        return UUID(bytes=bytes(self._uuids[slot * 16:(slot + 1) * 16]))
+
+    def _coordinates(self, slots: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        latitudes = np.frombuffer(self._latitudes, dtype=np.float64)
+        longitudes = np.frombuffer(self._longitudes, dtype=np.float64)
+        return latitudes[slots], longitudes[slots]
+
+    def _location_matches(self, slot: int, country: str | None, state: str | None, city: str | None) -> bool:
+        if not (country or state or city):
+            return True
+        return _matches_location(self._city_keys[self._city_ids[slot]], country, state, city)
+
+    def query_bbox(
+        self,
+        min_lat: float,
+        min_lon: float,
+        max_lat: float,
+        max_lon: float,
+        country: str | None = None,
+        state: str | None = None,
+        city: str | None = None,
+    ) -> list[UUID]:
+        with self._lock:
+            slots = self._candidate_slots(min_lat, min_lon, max_lat, max_lon)
+            if not len(slots):
+                return []
+            latitudes, longitudes = self._coordinates(slots)
+            inside = slots[bbox_mask(latitudes, longitudes, min_lat, min_lon, max_lat, max_lon)]
+            return [
+                self._uuid_at(int(slot))
+                for slot in inside
+                if self._location_matches(int(slot), country, state, city)
+            ]
+
+    def query_radius(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        country: str | None = None,
+        state: str | None = None,
+        city: str | None = None,
+    ) -> list[tuple[UUID, float]]:
+        delta_lat, delta_lon = bbox_deltas(latitude, radius_km)
+        with self._lock:
+            slots = self._candidate_slots(
+                latitude - delta_lat, longitude - delta_lon, latitude + delta_lat, longitude + delta_lon
+            )
+            if not len(slots):
+                return []
+            latitudes, longitudes = self._coordinates(slots)
+            positions, distances = radius_filter(latitudes, longitudes, latitude, longitude, radius_km)
+            return [
+                (self._uuid_at(int(slot)), float(distance))
+                for slot, distance in zip(slots[positions], distances)
+                if self._location_matches(int(slot), country, state, city)
+            ]
+
+    def memory_bytes(self) -> int:
+        size = (
+            sys.getsizeof(self._uuids)
+            + sys.getsizeof(self._latitudes)
+            + sys.getsizeof(self._longitudes)
+            + sys.getsizeof(self._city_ids)
+            + sys.getsizeof(self._city_keys)
+            + sys.getsizeof(self._city_key_ids)
+            + sys.getsizeof(self._slots)
+            + sys.getsizeof(self._grid)
+        )
+        size += sum(sys.getsizeof(key) for key in self._city_keys)
+        size += sum(sys.getsizeof(key) for key in self._slots)
+        size += sum(sys.getsizeof(bucket) for bucket in self._grid.values())
+        return size
+
+    def stats(self) -> dict[str, Any]:
+        staleness = None if self._refreshed_at is None else time.monotonic() - self._refreshed_at
+        return {
+            "entries": len(self._slots),
+            "memory_bytes": self.memory_bytes(),
+            "staleness_seconds": staleness,
+        }
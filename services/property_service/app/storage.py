@@ -1,23 +1,117 @@
 from __future__ import annotations
 
+from collections import OrderedDict
 import logging
-from typing import Any
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterator
 from uuid import uuid4
 
 import boto3
+from botocore import UNSIGNED
+from botocore.auth import SIGV4_TIMESTAMP, S3SigV4QueryAuth
+from botocore.awsrequest import AWSRequest
+from botocore.config import Config
+from botocore.exceptions import NoCredentialsError
 
 
 logger = logging.getLogger()
 
+MAX_PRESIGN_SECONDS = 7 * 24 * 3600
+DELETE_OBJECTS_CHUNK_SIZE = 1000
+MAX_BATCH_UPLOADS = 50
+MAX_UPLOAD_BYTES = 25 * 1024 * 1024
+MAX_MULTIPART_UPLOAD_BYTES = 5 * 1024 * 1024 * 1024
+MULTIPART_MIN_PART_BYTES = 8 * 1024 * 1024
+MULTIPART_MAX_PARTS = 10000
+MAX_PART_URLS_PER_REQUEST = 100
+DEFAULT_SIGNING_WINDOW_SECONDS = 300
+
+
+class WindowStartQueryAuth(S3SigV4QueryAuth):
+    # SigV4 presigning with a given X-Amz-Date instead of the current time, so every process signing
+    # the same key in the same window produces the same URL.
+    def __init__(self, credentials: Any, region_name: str, expires: int, signed_at: datetime) -> None:
+        super().__init__(credentials, "s3", region_name, expires=expires)
+        self.signed_at = signed_at
+
+    def _modify_request_before_signing(self, request: AWSRequest) -> None:
+        request.context["timestamp"] = self.signed_at.strftime(SIGV4_TIMESTAMP)
+        super()._modify_request_before_signing(request)
+
+
+class SignedUrlCache:
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        window_seconds: int = 300,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.max_entries = max_entries
+        self.window_seconds = max(1, window_seconds)
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, tuple[int, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def window(self) -> int:
+        return int(self.clock() // self.window_seconds)
+
+    def get_or_sign(self, key: str, sign: Callable[[datetime, int], str], ttl_seconds: int) -> str:
+        window = self.window()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == window:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        # URLs are signed as of the window start, so the cache only saves the signing work and any process
+        # hands out the same URL. One handed out at the end of the window must still live for the full TTL.
+        signed_at = datetime.fromtimestamp(window * self.window_seconds, tz=timezone.utc)
+        url = sign(signed_at, min(MAX_PRESIGN_SECONDS, self.window_seconds + ttl_seconds))
+
+        with self._lock:
+            self._entries[key] = (window, url)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return url
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
 
 class S3AssetStorage:
-    def __init__(self, bucket_name: str | None, presign_ttl_seconds: int = 3600, region_name: str | None = None) -> None:
+    def __init__(
+        self,
+        bucket_name: str | None,
+        presign_ttl_seconds: int = 3600,
+        region_name: str | None = None,
+        url_cache: SignedUrlCache | None = None,
+    ) -> None:
         if not bucket_name:
             raise ValueError("Asset bucket name must be provided.")
         self.bucket_name = bucket_name
         self.presign_ttl_seconds = presign_ttl_seconds
         self.region_name = region_name
         self.s3_client = boto3.client("s3", region_name=region_name)
+        # Resolves object URLs without signing them, read URLs cached per window are signed by WindowStartQueryAuth.
+        self._url_client = boto3.client("s3", region_name=region_name, config=Config(signature_version=UNSIGNED))
+        self._session = boto3.session.Session()
+        self.url_cache = url_cache
 
     @staticmethod
     def _normalize_prefix(prefix: str) -> str:
@@ -48,7 +142,7 @@ class S3AssetStorage:
             Bucket=self.bucket_name,
             Key=key,
             Fields={"Content-Type": content_type},
-            Conditions=[{"Content-Type": content_type}],
+            Conditions=[{"Content-Type": content_type}, ["content-length-range", 1, MAX_UPLOAD_BYTES]],
             ExpiresIn=self.presign_ttl_seconds,
         )
 
@@ -62,13 +156,147 @@ class S3AssetStorage:
         payload["key"] = key
         return payload
 
-    def create_read_url(self, key: str) -> str:
+    def create_uploads(self, uploads: list[tuple[str, str, str | None]]) -> list[dict[str, Any]]:
+        if len(uploads) > MAX_BATCH_UPLOADS:
+            raise ValueError(f"At most {MAX_BATCH_UPLOADS} uploads can be requested at once.")
+        return [self.create_upload(prefix, content_type, extension) for prefix, content_type, extension in uploads]
+
+    @staticmethod
+    def plan_parts(size_bytes: int) -> tuple[int, int]:
+        if size_bytes <= 0 or size_bytes > MAX_MULTIPART_UPLOAD_BYTES:
+            raise ValueError(f"size_bytes must be between 1 and {MAX_MULTIPART_UPLOAD_BYTES}.")
+        mib = 1024 * 1024
+        part_size = max(MULTIPART_MIN_PART_BYTES, -(-size_bytes // MULTIPART_MAX_PARTS))
+        part_size = -(-part_size // mib) * mib
+        return part_size, -(-size_bytes // part_size)
+
+    def create_multipart_upload(
+        self,
+        prefix: str,
+        content_type: str,
+        size_bytes: int,
+        extension: str | None = None,
+    ) -> dict[str, Any]:
+        if not content_type:
+            raise ValueError("content_type is required to start a multipart upload.")
+        part_size, part_count = self.plan_parts(size_bytes)
+        key = self.generate_key(prefix, extension)
+        resp = self.s3_client.create_multipart_upload(Bucket=self.bucket_name, Key=key, ContentType=content_type)
+        upload_id = resp["UploadId"]
+        first_parts = list(range(1, min(part_count, MAX_PART_URLS_PER_REQUEST) + 1))
+        return {
+            "key": key,
+            "upload_id": upload_id,
+            "part_size": part_size,
+            "part_count": part_count,
+            "parts": self.create_part_urls(key, upload_id, first_parts),
+        }
+
+    def create_part_urls(self, key: str, upload_id: str, part_numbers: list[int]) -> list[dict[str, Any]]:
+        if len(part_numbers) > MAX_PART_URLS_PER_REQUEST:
+            raise ValueError(f"At most {MAX_PART_URLS_PER_REQUEST} part URLs can be requested at once.")
+        if any(number < 1 or number > MULTIPART_MAX_PARTS for number in part_numbers):
+            raise ValueError(f"Part numbers must be between 1 and {MULTIPART_MAX_PARTS}.")
+        return [
+            {
+                "part_number": number,
+                "url": self.s3_client.generate_presigned_url(
+                    "upload_part",
+                    Params={"Bucket": self.bucket_name, "Key": key, "UploadId": upload_id, "PartNumber": number},
+                    ExpiresIn=self.presign_ttl_seconds,
+                ),
+            }
+            for number in part_numbers
+        ]
+
+    def complete_multipart_upload(self, key: str, upload_id: str, parts: list[tuple[int, str]]) -> None:
+        if not parts:
+            raise ValueError("At least one uploaded part is required.")
+        numbers = [number for number, _ in parts]
+        if len(set(numbers)) != len(numbers):
+            raise ValueError("Part numbers must be unique.")
+        self.s3_client.complete_multipart_upload(
+            Bucket=self.bucket_name,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": [{"PartNumber": number, "ETag": etag} for number, etag in sorted(parts)]},
+        )
+
+    def abort_multipart_upload(self, key: str, upload_id: str) -> None:
+        self.s3_client.abort_multipart_upload(Bucket=self.bucket_name, Key=key, UploadId=upload_id)
+
+    def _sign_read_url(self, key: str, expires_in: int, signed_at: datetime | None = None) -> str:
         try:
-            return self.s3_client.generate_presigned_url(
-                "get_object",
-                Params={"Bucket": self.bucket_name, "Key": key},
-                ExpiresIn=self.presign_ttl_seconds,
+            if signed_at is None:
+                return self.s3_client.generate_presigned_url(
+                    "get_object",
+                    Params={"Bucket": self.bucket_name, "Key": key},
+                    ExpiresIn=expires_in,
+                )
+            credentials = self._session.get_credentials()
+            if credentials is None:
+                raise NoCredentialsError()
+            request = AWSRequest(method="GET", url=self._url_client.generate_presigned_url(
+                "get_object", Params={"Bucket": self.bucket_name, "Key": key}
+            ))
+            auth = WindowStartQueryAuth(
+                credentials.get_frozen_credentials(), self.s3_client.meta.region_name, expires_in, signed_at
             )
+            auth.add_auth(request)
+            return request.url
         except Exception as exc:
             logger.error("Failed to generate pre-signed GET for key %s", key, exc_info=exc)
             raise
+
+    def create_read_url(self, key: str) -> str:
+        if self.url_cache is None:
+            return self._sign_read_url(key, self.presign_ttl_seconds)
+        return self.url_cache.get_or_sign(
+            key,
+            lambda signed_at, expires_in: self._sign_read_url(key, expires_in, signed_at),
+            self.presign_ttl_seconds,
+        )
+
+    def signing_window(self) -> int:
+        # Read URLs are good for the TTL past the end of this window, so tags that change with it
+        # never answer 304 for a body whose URLs have expired.
+        if self.url_cache is not None:
+            return self.url_cache.window()
+        return int(time.time() // DEFAULT_SIGNING_WINDOW_SECONDS)
+
+    def get_object_bytes(self, key: str) -> bytes:
+        resp = self.s3_client.get_object(Bucket=self.bucket_name, Key=key)
+        return resp["Body"].read()
+
+    def put_object_bytes(self, key: str, body: bytes, content_type: str, cache_control: str | None = None) -> None:
+        params: dict[str, Any] = {"Bucket": self.bucket_name, "Key": key, "Body": body, "ContentType": content_type}
+        if cache_control:
+            params["CacheControl"] = cache_control
+        self.s3_client.put_object(**params)
+
+    def delete_objects(self, keys: list[str], on_progress: Callable[[int], None] | None = None) -> int:
+        unique_keys = list(dict.fromkeys(keys))
+        deleted = 0
+        for start in range(0, len(unique_keys), DELETE_OBJECTS_CHUNK_SIZE):
+            chunk = unique_keys[start:start + DELETE_OBJECTS_CHUNK_SIZE]
+            resp = self.s3_client.delete_objects(
+                Bucket=self.bucket_name,
+                Delete={"Objects": [{"Key": key} for key in chunk], "Quiet": True},
+            )
+            errors = resp.get("Errors", [])
+            if errors:
+                raise RuntimeError(f"Failed to delete {len(errors)} objects: {errors[0].get('Message')}")
+            deleted += len(chunk)
+            if on_progress:
+                on_progress(len(chunk))
+        return deleted
+
+    def iter_keys(self, modified_before: datetime | None = None) -> Iterator[str]:
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket_name):
+            for obj in page.get("Contents", []):
+                if modified_before is None or obj["LastModified"] < modified_before:
+                    yield obj["Key"]
+
+    def url_cache_stats(self) -> dict[str, Any] | None:
+        return self.url_cache.stats() if self.url_cache else None
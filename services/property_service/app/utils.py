@@ -12,28 +12,46 @@ def strip_image_urls(images: list[Image] | None) -> None:
     for image in images:
         if hasattr(image, "url"):
             image.url = None
+        if hasattr(image, "original_url"):
+            image.original_url = None
 
 
-def create_image_url(images: Iterable[Image] | None, storage) -> None:
+def image_url_keys(image: Image, variant: str | None = None) -> tuple[str | None, str | None]:
+    # The key url is signed for, and the original to fall back to when that is a variant.
+    key = getattr(image, "key", None)
+    variants = getattr(image, "variants", None)
+    if key and variant and variants and variant in variants:
+        # Variants are written by the derivatives Lambda shortly after the upload, clients fall back
+        # to the original while the variant is not there yet.
+        return variants[variant], key
+    return key, None
+
+
+def resolved_image_keys(models: Iterable[Any], variant: str | None = None) -> list[list[tuple[str | None, str | None]]]:
+    return [[image_url_keys(image, variant) for image in getattr(model, "images", None) or []] for model in models]
+
+
+def create_image_url(images: Iterable[Image] | None, storage, variant: str | None = None) -> None:
     if not storage or not images:
         return
     for image in images:
-        key = getattr(image, "key", None)
+        key, original_key = image_url_keys(image, variant)
         if key:
             image.url = storage.create_read_url(key)
+        if original_key:
+            image.original_url = storage.create_read_url(original_key)
 
 
-def add_image_url(model: Any, storage) -> Any:
+def add_image_url(model: Any, storage, variant: str | None = None) -> Any:
     images = getattr(model, "images", None)
-    create_image_url(images, storage)
+    create_image_url(images, storage, variant)
     return model
 
 
-def add_image_urls(models: Iterable[Any] | None, storage) -> Iterable[Any]:
+def add_image_urls(models: Iterable[Any] | None, storage, variant: str | None = None) -> Iterable[Any]:
     if not models or not storage:
         return models or []
-    for model in models:
-        add_image_url(model, storage)
+    create_image_url([image for model in models for image in getattr(model, "images", None) or []], storage, variant)
     return models
 
 
@@ -1,9 +1,21 @@
 from aws_cdk import Duration, RemovalPolicy, Stack
 from aws_cdk.aws_apigateway import EndpointType, LambdaIntegration, RestApi
-from aws_cdk.aws_dynamodb import Attribute, AttributeType, BillingMode, Table, TableEncryption
+from aws_cdk.aws_dynamodb import Attribute, AttributeType, BillingMode, StreamViewType, Table, TableEncryption
 from aws_cdk.aws_iam import ManagedPolicy, Role, ServicePrincipal
-from aws_cdk.aws_lambda import Code, Function, Runtime
-from aws_cdk.aws_s3 import BlockPublicAccess, Bucket, BucketEncryption, CorsRule, HttpMethods
+from aws_cdk.aws_lambda import Code, Function, Runtime, StartingPosition
+from aws_cdk.aws_lambda_event_sources import DynamoEventSource, SqsEventSource
+from aws_cdk.aws_s3 import (
+    BlockPublicAccess,
+    Bucket,
+    BucketEncryption,
+    CorsRule,
+    EventType,
+    HttpMethods,
+    LifecycleRule,
+    NotificationKeyFilter,
+)
+from aws_cdk.aws_s3_notifications import LambdaDestination
+from aws_cdk.aws_sqs import DeadLetterQueue, Queue
 from constructs import Construct
 
 
@@ -29,6 +41,7 @@ class PropertyServiceStack(Stack):
             partition_key=Attribute(name="uuid", type=AttributeType.STRING),
             encryption=TableEncryption.AWS_MANAGED,
             billing_mode=BillingMode.PAY_PER_REQUEST,
+            stream=StreamViewType.NEW_AND_OLD_IMAGES,
         )
 
         property_table.add_global_secondary_index(
@@ -43,6 +56,12 @@ class PropertyServiceStack(Stack):
             sort_key=Attribute(name="created_at", type=AttributeType.STRING),
         )
 
+        property_table.add_global_secondary_index(
+            index_name="geohash_index",
+            partition_key=Attribute(name="geohash_cell", type=AttributeType.STRING),
+            sort_key=Attribute(name="geohash", type=AttributeType.STRING),
+        )
+
         room_table = Table(
             self,
             "room_table",
@@ -57,6 +76,80 @@ class PropertyServiceStack(Stack):
             partition_key=Attribute(name="property_uuid", type=AttributeType.STRING),
         )
 
+        room_table.add_global_secondary_index(
+            index_name="property_price_index",
+            partition_key=Attribute(name="property_uuid", type=AttributeType.STRING),
+            sort_key=Attribute(name="price_per_night", type=AttributeType.NUMBER),
+        )
+
+        room_table.add_global_secondary_index(
+            index_name="price_bucket_index",
+            partition_key=Attribute(name="price_bucket", type=AttributeType.STRING),
+            sort_key=Attribute(name="price_per_night", type=AttributeType.NUMBER),
+        )
+
+        room_amenity_table = Table(
+            self,
+            "room_amenity_table",
+            table_name=f"room_amenity_table_{env_name}{suffix}",
+            partition_key=Attribute(name="amenity", type=AttributeType.STRING),
+            sort_key=Attribute(name="room_uuid", type=AttributeType.STRING),
+            encryption=TableEncryption.AWS_MANAGED,
+            billing_mode=BillingMode.PAY_PER_REQUEST,
+        )
+
+        search_table = Table(
+            self,
+            "property_search_table",
+            table_name=f"property_search_table_{env_name}{suffix}",
+            partition_key=Attribute(name="property_uuid", type=AttributeType.STRING),
+            encryption=TableEncryption.AWS_MANAGED,
+            billing_mode=BillingMode.PAY_PER_REQUEST,
+        )
+
+        search_table.add_global_secondary_index(
+            index_name="city_price_index",
+            partition_key=Attribute(name="city_key", type=AttributeType.STRING),
+            sort_key=Attribute(name="min_price_per_night", type=AttributeType.NUMBER),
+        )
+
+        cleanup_job_table = Table(
+            self,
+            "cleanup_job_table",
+            table_name=f"cleanup_job_table_{env_name}{suffix}",
+            partition_key=Attribute(name="job_uuid", type=AttributeType.STRING),
+            encryption=TableEncryption.AWS_MANAGED,
+            billing_mode=BillingMode.PAY_PER_REQUEST,
+            time_to_live_attribute="expires_at",
+        )
+
+        location_change_table = Table(
+            self,
+            "property_location_change_table",
+            table_name=f"property_location_change_table_{env_name}{suffix}",
+            partition_key=Attribute(name="bucket", type=AttributeType.STRING),
+            sort_key=Attribute(name="change_key", type=AttributeType.STRING),
+            encryption=TableEncryption.AWS_MANAGED,
+            billing_mode=BillingMode.PAY_PER_REQUEST,
+            time_to_live_attribute="expires_at",
+        )
+
+        cleanup_dead_letter_queue = Queue(
+            self,
+            "cleanup_dead_letter_queue",
+            queue_name=f"property-cleanup-dlq-{env_name}{suffix}",
+            retention_period=Duration.days(14),
+        )
+
+        # Visibility is six times the worker timeout, as recommended for Lambda event sources.
+        cleanup_queue = Queue(
+            self,
+            "cleanup_queue",
+            queue_name=f"property-cleanup-{env_name}{suffix}",
+            visibility_timeout=Duration.minutes(90),
+            dead_letter_queue=DeadLetterQueue(max_receive_count=3, queue=cleanup_dead_letter_queue),
+        )
+
         assets_bucket = Bucket(
             self,
             "property_assets_bucket",
@@ -72,6 +165,7 @@ class PropertyServiceStack(Stack):
                     max_age=3000,
                 )
             ],
+            lifecycle_rules=[LifecycleRule(abort_incomplete_multipart_upload_after=Duration.days(1))],
             removal_policy=RemovalPolicy.RETAIN if env_name == "prod" else RemovalPolicy.DESTROY,
             auto_delete_objects=env_name != "prod",
         )
@@ -89,13 +183,97 @@ class PropertyServiceStack(Stack):
                 "PROPERTY_SERVICE_ENV": self.env_name,
                 "PROPERTY_TABLE_NAME": property_table.table_name,
                 "ROOM_TABLE_NAME": room_table.table_name,
+                "ROOM_AMENITY_TABLE_NAME": room_amenity_table.table_name,
+                "SEARCH_TABLE_NAME": search_table.table_name,
+                "CLEANUP_JOB_TABLE_NAME": cleanup_job_table.table_name,
+                "CLEANUP_QUEUE_URL": cleanup_queue.queue_url,
+                "LOCATION_CHANGE_TABLE_NAME": location_change_table.table_name,
                 "ASSET_BUCKET_NAME": assets_bucket.bucket_name,
             },
         )
 
+        cleanup_function = Function(
+            self,
+            f"PropertyCleanupFunction-{env_name}{suffix}",
+            runtime=Runtime.PYTHON_3_11,
+            handler="cleanup.handler",
+            code=Code.from_asset("services/property_service/app"),
+            role=lambda_role,
+            timeout=Duration.minutes(15),
+            memory_size=1024,
+            environment={
+                "PROPERTY_SERVICE_ENV": self.env_name,
+                "PROPERTY_TABLE_NAME": property_table.table_name,
+                "ROOM_TABLE_NAME": room_table.table_name,
+                "ROOM_AMENITY_TABLE_NAME": room_amenity_table.table_name,
+                "CLEANUP_JOB_TABLE_NAME": cleanup_job_table.table_name,
+                "ASSET_BUCKET_NAME": assets_bucket.bucket_name,
+            },
+        )
+        cleanup_function.add_event_source(SqsEventSource(cleanup_queue, batch_size=1, report_batch_item_failures=True))
+
+        location_change_function = Function(
+            self,
+            f"PropertyLocationChangeFunction-{env_name}{suffix}",
+            runtime=Runtime.PYTHON_3_11,
+            handler="location_changes.handler",
+            code=Code.from_asset("services/property_service/app"),
+            role=lambda_role,
+            timeout=Duration.seconds(60),
+            memory_size=256,
+            environment={
+                "PROPERTY_SERVICE_ENV": self.env_name,
+                "LOCATION_CHANGE_TABLE_NAME": location_change_table.table_name,
+            },
+        )
+        location_change_function.add_event_source(
+            DynamoEventSource(
+                property_table,
+                starting_position=StartingPosition.LATEST,
+                batch_size=100,
+                bisect_batch_on_error=True,
+                retry_attempts=10,
+            )
+        )
+
+        derivatives_function = Function(
+            self,
+            f"PropertyImageDerivativesFunction-{env_name}{suffix}",
+            runtime=Runtime.PYTHON_3_11,
+            handler="derivatives.handler",
+            code=Code.from_asset("services/property_service/app"),
+            role=lambda_role,
+            timeout=Duration.seconds(60),
+            memory_size=1024,
+        )
+        assets_bucket.grant_read_write(derivatives_function)
+        # Matches DERIVATIVE_SOURCE_PREFIXES and DERIVABLE_EXTENSIONS in app/derivatives.py, so derived/ outputs
+        # and other uploads never invoke the function.
+        for prefix in ("properties/", "rooms/"):
+            for extension in ("jpg", "jpeg", "png", "webp", "gif", "bmp", "tif", "tiff"):
+                for suffix in (f".{extension}", f".{extension.upper()}"):
+                    assets_bucket.add_event_notification(
+                        EventType.OBJECT_CREATED,
+                        LambdaDestination(derivatives_function),
+                        NotificationKeyFilter(prefix=prefix, suffix=suffix),
+                    )
+
         property_table.grant_read_write_data(lambda_function)
         room_table.grant_read_write_data(lambda_function)
+        room_amenity_table.grant_read_write_data(lambda_function)
+        search_table.grant_read_write_data(lambda_function)
+        cleanup_job_table.grant_read_write_data(lambda_function)
+        location_change_table.grant_read_data(lambda_function)
         assets_bucket.grant_read_write(lambda_function)
+        cleanup_queue.grant_send_messages(lambda_function)
+
+        location_change_table.grant_write_data(location_change_function)
+
+        property_table.grant_read_data(cleanup_function)
+        room_table.grant_read_write_data(cleanup_function)
+        room_amenity_table.grant_read_write_data(cleanup_function)
+        cleanup_job_table.grant_read_write_data(cleanup_function)
+        assets_bucket.grant_read_write(cleanup_function)
 
         api = RestApi(
             self,
@@ -110,6 +288,14 @@ class PropertyServiceStack(Stack):
         resource_assets_upload = resource_assets.add_resource("upload-url")
         resource_assets_upload.add_method("POST", integration)
 
+        resource_assets_uploads = resource_assets.add_resource("upload-urls")
+        resource_assets_uploads.add_method("POST", integration)
+
+        resource_assets_multipart = resource_assets.add_resource("multipart-upload")
+        resource_assets_multipart.add_method("POST", integration)
+        for action in ("part-urls", "complete", "abort"):
+            resource_assets_multipart.add_resource(action).add_method("POST", integration)
+
         resource_property = api.root.add_resource("property")
         resource_property.add_method("POST", integration)
 
@@ -129,6 +315,7 @@ class PropertyServiceStack(Stack):
 
         resource_room_id = resource_room.add_resource("{room_uuid}")
         resource_room_id.add_method("GET", integration)
+        resource_room_id.add_method("PUT", integration)
         resource_room_id.add_method("DELETE", integration)
 
         resource_rooms = api.root.add_resource("rooms")
@@ -137,9 +324,31 @@ class PropertyServiceStack(Stack):
         resource_rooms_property = resource_rooms.add_resource("{property_uuid}")
         resource_rooms_property.add_method("GET", integration)
 
+        resource_rooms_batch = resource_rooms.add_resource("batch")
+        resource_rooms_batch.add_method("POST", integration)
+
+        resource_rooms_by_properties = resource_rooms.add_resource("by-properties")
+        resource_rooms_by_properties.add_method("POST", integration)
+
         resource_properties = api.root.add_resource("properties")
         resource_properties_city = resource_properties.add_resource("city")
         resource_properties_city.add_method("GET", integration)
 
         resource_properties_near = resource_properties.add_resource("near")
         resource_properties_near.add_method("GET", integration)
+
+        resource_properties_batch = resource_properties.add_resource("batch")
+        resource_properties_batch.add_method("POST", integration)
+
+        resource_properties_import = resource_properties.add_resource("import")
+        resource_properties_import.add_method("POST", integration)
+
+        resource_properties_search = resource_properties.add_resource("search")
+        resource_properties_search.add_method("GET", integration)
+
+        resource_cleanup_jobs = api.root.add_resource("cleanup-jobs")
+        resource_cleanup_jobs_sweep = resource_cleanup_jobs.add_resource("orphan-sweep")
+        resource_cleanup_jobs_sweep.add_method("POST", integration)
+
+        resource_cleanup_job_id = resource_cleanup_jobs.add_resource("{job_uuid}")
+        resource_cleanup_job_id.add_method("GET", integration)
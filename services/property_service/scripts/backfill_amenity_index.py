@@ -0,0 +1,23 @@
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "app"))
+
+from db_clients import RoomTableClient  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the room amenity index from existing rooms")
+    parser.add_argument("--table", required=True, help="Room table name")
+    parser.add_argument("--amenity-table", required=True, help="Room amenity index table name")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    indexed = RoomTableClient(args.table, amenity_table_name=args.amenity_table).backfill_amenity_index()
+    print(f"Indexed {indexed} rooms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "app"))
+
+from db_clients import PropertyTableClient  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backfill geohash attributes on existing properties")
+    parser.add_argument("--table", required=True, help="Property table name")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    updated = PropertyTableClient(args.table).backfill_geohash()
+    print(f"Updated {updated} properties")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "app"))
+
+from db_clients import RoomTableClient  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backfill price buckets on existing rooms")
+    parser.add_argument("--table", required=True, help="Room table name")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    updated = RoomTableClient(args.table).backfill_price_buckets()
+    print(f"Updated {updated} rooms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "app"))
+
+from db_clients import PropertyTableClient, RoomTableClient  # noqa: E402
+from search_documents import SearchDocumentTable  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build property search documents from existing properties and rooms")
+    parser.add_argument("--property-table", required=True, help="Property table name")
+    parser.add_argument("--room-table", required=True, help="Room table name")
+    parser.add_argument("--search-table", required=True, help="Property search document table name")
+    parser.add_argument("--review-table", default=None, help="Review table name, recomputes rating totals when set")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    search_documents = SearchDocumentTable(args.search_table)
+    properties = PropertyTableClient(args.property_table, search_documents=search_documents).backfill_search_documents()
+    summarized = RoomTableClient(args.room_table, search_documents=search_documents).backfill_search_documents()
+    print(f"Wrote {properties} property documents and {summarized} room summaries")
+    if args.review_table:
+        rated = search_documents.backfill_ratings(args.review_table)
+        print(f"Wrote rating totals of {rated} property documents")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import argparse
+import logging
+import sys
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "app"))
+
+from cleanup import ORPHAN_ASSET_GRACE_SECONDS, CleanupJobTable, sweep_orphans  # noqa: E402
+from db_clients import PropertyTableClient, RoomTableClient  # noqa: E402
+from schemas import CleanupKind  # noqa: E402
+from storage import S3AssetStorage  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Remove rooms of deleted properties and unreferenced assets")
+    parser.add_argument("--property-table", required=True, help="Property table name")
+    parser.add_argument("--room-table", required=True, help="Room table name")
+    parser.add_argument("--amenity-table", help="Room amenity index table name")
+    parser.add_argument("--cleanup-job-table", required=True, help="Cleanup job table name")
+    parser.add_argument("--asset-bucket", help="Asset bucket name, assets are kept when omitted")
+    parser.add_argument(
+        "--asset-grace-seconds",
+        type=int,
+        default=ORPHAN_ASSET_GRACE_SECONDS,
+        help="Keep unreferenced assets newer than this, uploads are referenced only after the upload finishes",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    jobs = CleanupJobTable(args.cleanup_job_table)
+    job = jobs.start(uuid4(), CleanupKind.ORPHAN_SWEEP)
+    sweep_orphans(
+        jobs,
+        job.job_uuid,
+        PropertyTableClient(args.property_table),
+        RoomTableClient(args.room_table, amenity_table_name=args.amenity_table),
+        S3AssetStorage(args.asset_bucket) if args.asset_bucket else None,
+        asset_grace_seconds=args.asset_grace_seconds,
+    )
+    job = jobs.get(job.job_uuid)
+    print(f"Sweep {job.job_uuid} {job.status.value}: {job.rooms_deleted} rooms and {job.assets_deleted} assets deleted")
+    if job.error:
+        print(job.error)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,17 @@
 import os
 from pydantic_settings import BaseSettings
 
+
+def _get_int_env(var_name: str, default: int) -> int:
+    raw_value = os.environ.get(var_name)
+    if raw_value is None:
+        return default
+    try:
+        return int(raw_value)
+    except ValueError:
+        return default
+
+
 class AppMetadata(BaseSettings):
     review_service_env: str = "local"
     app_version: str = "local"
@@ -9,11 +20,17 @@ class AppMetadata(BaseSettings):
 
 class AppConfiguration(BaseSettings):
     review_table_name: str | None = None
+    property_search_table_name: str | None = None
+    data_access_max_workers: int = 16
 
 review_service_prod_configuration = AppConfiguration(
     review_table_name=os.environ.get("REVIEW_TABLE_NAME", None),
+    property_search_table_name=os.environ.get("PROPERTY_SEARCH_TABLE_NAME", None),
+    data_access_max_workers=_get_int_env("DATA_ACCESS_MAX_WORKERS", 16),
 )
 
 review_service_int_configuration = AppConfiguration(
     review_table_name=os.environ.get("REVIEW_TABLE_NAME", None),
-)
\ No newline at end of file
+    property_search_table_name=os.environ.get("PROPERTY_SEARCH_TABLE_NAME", None),
+    data_access_max_workers=_get_int_env("DATA_ACCESS_MAX_WORKERS", 16),
+)
@@ -3,8 +3,10 @@ from uuid import UUID, uuid4
 
 import boto3
 
+from codec import codec_for
 from schemas import Review
-from utils import from_dynamodb_item, to_dynamodb_item
+
+REVIEW_CODEC = codec_for(Review)
 
 
 class ReviewDBClient:
@@ -23,11 +25,11 @@ class ReviewDBClient:
         review_dict = review.model_dump(exclude_none=True)
         review_uuid = uuid4()
         review_dict["uuid"] = review_uuid
-        if not review_dict["timestamp"]:
-            review_dict["timestamp"] = datetime.now()
+        if not review_dict.get("timestamp"):
+            review_dict["timestamp"] = datetime.now().isoformat()
         self.review_table_client.put_item(
             TableName=self.review_table_name,
-            Item=to_dynamodb_item(review_dict)
+            Item=REVIEW_CODEC.encode(review_dict)
         )
         return review_uuid
         
@@ -43,7 +45,7 @@ class ReviewDBClient:
         
         items = response.get("Items", [])
 
-        return [Review(**from_dynamodb_item(item)) for item in items]
+        return [REVIEW_CODEC.decode_model(item) for item in items]
     
 
     def get_property_reviews(self, property_uuid: UUID) -> list[Review]:
@@ -57,4 +59,4 @@ class ReviewDBClient:
         
         items = response.get("Items", [])
 
-        return [Review(**from_dynamodb_item(item)) for item in items]
\ No newline at end of file
+        return [REVIEW_CODEC.decode_model(item) for item in items]
\ No newline at end of file
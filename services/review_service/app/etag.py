@@ -0,0 +1,41 @@
+from datetime import datetime
+import hashlib
+import json
+from typing import Any, Iterable
+
+from fastapi import Request, Response
+from pydantic_core import to_jsonable_python
+
+ETAG_CACHE_CONTROL = "private, no-cache"
+
+
+def compute_etag(content: Any, updated_at: datetime | None = None) -> str:
+    body = json.dumps(to_jsonable_python(content), sort_keys=True, separators=(",", ":"))
+    digest = hashlib.sha256(body.encode()).hexdigest()[:32]
+    if updated_at is None:
+        return f'"{digest}"'
+    return f'"{int(updated_at.timestamp() * 1000):x}-{digest}"'
+
+
+def latest_updated_at(models: Iterable[Any]) -> datetime | None:
+    return max((model.updated_at for model in models if getattr(model, "updated_at", None)), default=None)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def set_etag_headers(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = ETAG_CACHE_CONTROL
+
+
+def not_modified(request: Request, etag: str) -> Response | None:
+    if not etag_matches(request.headers.get("if-none-match"), etag):
+        return None
+    response = Response(status_code=304)
+    set_etag_headers(response, etag)
+    return response
@@ -1,16 +1,47 @@
 from uuid import UUID
-from fastapi import Depends, Request
+from fastapi import Depends, Request, Response
 from db_client import ReviewDBClient
+from etag import compute_etag, not_modified, set_etag_headers
+from offload import BlockingExecutor
 from schemas import Review
 
 def get_review_db_client(request: Request) -> ReviewDBClient:
     return request.app.state.review_db_client
 
-async def add_review(review: Review, review_db_client: ReviewDBClient = Depends(get_review_db_client)) -> UUID:
-    return review_db_client.add_review(review)
+def get_blocking_executor(request: Request) -> BlockingExecutor:
+    return request.app.state.blocking_executor
 
-async def get_property_reviews(property_uuid: UUID, review_db_client: ReviewDBClient = Depends(get_review_db_client)) -> list[Review]:
-    return review_db_client.get_property_reviews(property_uuid=property_uuid)
+async def add_review(
+    review: Review,
+    review_db_client: ReviewDBClient = Depends(get_review_db_client),
+    blocking: BlockingExecutor = Depends(get_blocking_executor),
+) -> UUID:
+    return await blocking.run(review_db_client.add_review, review)
 
-async def get_user_reviews(user_uuid: UUID, review_db_client: ReviewDBClient = Depends(get_review_db_client)) -> list[Review]:
-    return review_db_client.get_user_reviews(user_uuid=user_uuid)
+def conditional_reviews(request: Request, response: Response, reviews: list[Review]) -> list[Review] | Response:
+    etag = compute_etag(reviews)
+    unchanged = not_modified(request, etag)
+    if unchanged:
+        return unchanged
+    set_etag_headers(response, etag)
+    return reviews
+
+async def get_property_reviews(
+    property_uuid: UUID,
+    request: Request,
+    response: Response,
+    review_db_client: ReviewDBClient = Depends(get_review_db_client),
+    blocking: BlockingExecutor = Depends(get_blocking_executor),
+) -> list[Review]:
+    reviews = await blocking.run(review_db_client.get_property_reviews, property_uuid=property_uuid)
+    return conditional_reviews(request, response, reviews) # type: ignore
+
+async def get_user_reviews(
+    user_uuid: UUID,
+    request: Request,
+    response: Response,
+    review_db_client: ReviewDBClient = Depends(get_review_db_client),
+    blocking: BlockingExecutor = Depends(get_blocking_executor),
+) -> list[Review]:
+    reviews = await blocking.run(review_db_client.get_user_reviews, user_uuid=user_uuid)
+    return conditional_reviews(request, response, reviews) # type: ignore
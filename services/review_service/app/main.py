@@ -2,6 +2,7 @@ import logging
 from fastapi import FastAPI
 from routes import router
 from db_client import ReviewDBClient
+from offload import BlockingExecutor
 from config import AppMetadata, review_service_int_configuration, review_service_prod_configuration
 from mangum import Mangum
 
@@ -24,6 +25,7 @@ def create_app() -> FastAPI:
     )
     app.state.app_metadata = app_metadata
     app.state.review_db_client = ReviewDBClient(app_config.review_table_name)
+    app.state.blocking_executor = BlockingExecutor(app_config.data_access_max_workers)
 
     app.include_router(router)
 
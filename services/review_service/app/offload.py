@@ -0,0 +1,21 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class BlockingExecutor:
+    def __init__(self, max_workers: int) -> None:
+        self._executor = (
+            ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="data-access")
+            if max_workers > 0
+            else None
+        )
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        if self._executor is None:
+            return func(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
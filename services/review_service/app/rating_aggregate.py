@@ -0,0 +1,96 @@
+from decimal import Decimal
+import logging
+from typing import Any
+
+import boto3
+
+from config import AppMetadata, review_service_int_configuration, review_service_prod_configuration
+
+logger = logging.getLogger()
+
+
+class PropertyRatingAggregate:
+    def __init__(self, review_table_name: str | None, property_search_table_name: str | None) -> None:
+        if not review_table_name:
+            raise ValueError("Review table name must be provided.")
+        if not property_search_table_name:
+            raise ValueError("Property search table name must be provided.")
+        self.review_table_name = review_table_name
+        self.property_search_table_name = property_search_table_name
+        self.db_client = boto3.client("dynamodb")
+
+    def property_ratings(self, property_uuid: str) -> dict[str, Decimal]:
+        params: dict[str, Any] = {
+            "TableName": self.review_table_name,
+            "IndexName": "property_index",
+            "KeyConditionExpression": "property_uuid = :p",
+            "ProjectionExpression": "#uuid, rating",
+            "ExpressionAttributeNames": {"#uuid": "uuid"},
+            "ExpressionAttributeValues": {":p": {"S": property_uuid}},
+        }
+        ratings: dict[str, Decimal] = {}
+        while True:
+            resp = self.db_client.query(**params)
+            for item in resp.get("Items", []):
+                if "rating" in item:
+                    ratings[item["uuid"]["S"]] = Decimal(item["rating"]["N"])
+            lek = resp.get("LastEvaluatedKey")
+            if not lek:
+                return ratings
+            params["ExclusiveStartKey"] = lek
+
+    def write(self, property_uuid: str, ratings: dict[str, Decimal]) -> bool:
+        # Only existing search documents are updated, reviews of unknown or deleted properties are skipped.
+        try:
+            self.db_client.update_item(
+                TableName=self.property_search_table_name,
+                Key={"property_uuid": {"S": property_uuid}},
+                UpdateExpression="SET rating_sum = :sum, rating_count = :count",
+                ConditionExpression="attribute_exists(property_uuid)",
+                ExpressionAttributeValues={
+                    ":sum": {"N": str(sum(ratings.values(), Decimal(0)))},
+                    ":count": {"N": str(len(ratings))},
+                },
+            )
+        except self.db_client.exceptions.ConditionalCheckFailedException:
+            logger.info("No search document for property %s, rating aggregate skipped", property_uuid)
+            return False
+        return True
+
+    def apply(self, records: list[dict[str, Any]]) -> int:
+        # Totals are recomputed rather than incremented, so redelivered stream batches are harmless.
+        changes: dict[str, dict[str, Decimal | None]] = {}
+        for record in records:
+            images = record.get("dynamodb", {})
+            old, new = images.get("OldImage"), images.get("NewImage")
+            if old and "property_uuid" in old:
+                changes.setdefault(old["property_uuid"]["S"], {})[old["uuid"]["S"]] = None
+            if new and "property_uuid" in new and "rating" in new:
+                changes.setdefault(new["property_uuid"]["S"], {})[new["uuid"]["S"]] = Decimal(new["rating"]["N"])
+
+        updated = 0
+        for property_uuid, known_reviews in changes.items():
+            ratings = self.property_ratings(property_uuid)
+            # The index is eventually consistent, so the reviews in this batch override what it returned.
+            for review_uuid, rating in known_reviews.items():
+                if rating is None:
+                    ratings.pop(review_uuid, None)
+                else:
+                    ratings[review_uuid] = rating
+            updated += self.write(property_uuid, ratings)
+        return updated
+
+
+_aggregate: PropertyRatingAggregate | None = None
+
+
+def handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
+    global _aggregate
+    if _aggregate is None:
+        app_config = (
+            review_service_prod_configuration
+            if AppMetadata().review_service_env == "prod"
+            else review_service_int_configuration
+        )
+        _aggregate = PropertyRatingAggregate(app_config.review_table_name, app_config.property_search_table_name)
+    return {"updated": _aggregate.apply(event.get("Records", []))}
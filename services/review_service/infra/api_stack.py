@@ -3,10 +3,11 @@ from aws_cdk import (
     Duration,
     RemovalPolicy
 )
-from aws_cdk.aws_lambda import Function, Runtime, Code
+from aws_cdk.aws_lambda import Function, Runtime, Code, StartingPosition
+from aws_cdk.aws_lambda_event_sources import DynamoEventSource
 from aws_cdk.aws_apigateway import RestApi, LambdaIntegration, EndpointType
 from aws_cdk.aws_iam import Role, ServicePrincipal, ManagedPolicy
-from aws_cdk.aws_dynamodb import Attribute, AttributeType, BillingMode, Table, TableEncryption
+from aws_cdk.aws_dynamodb import Attribute, AttributeType, BillingMode, StreamViewType, Table, TableEncryption
 from constructs import Construct
 
 class ReviewServiceStack(Stack):
@@ -32,7 +33,8 @@ class ReviewServiceStack(Stack):
             table_name=f"review_table_{env_name}{suffix}",
             partition_key=Attribute(name="uuid", type=AttributeType.STRING),
             encryption=TableEncryption.AWS_MANAGED,
-            billing_mode=BillingMode.PAY_PER_REQUEST
+            billing_mode=BillingMode.PAY_PER_REQUEST,
+            stream=StreamViewType.NEW_AND_OLD_IMAGES,
         )
 
         self.review_table.add_global_secondary_index(
@@ -63,6 +65,35 @@ class ReviewServiceStack(Stack):
 
         self.review_table.grant_read_write_data(self.lambda_function)
 
+        # Owned by the property service stack, review writes keep its rating aggregate current.
+        self.property_search_table = Table.from_table_name(
+            self, "property_search_table", f"property_search_table_{env_name}{suffix}"
+        )
+
+        self.rating_aggregate_function = Function(
+            self, f"ReviewRatingAggregateFunction-{env_name}{suffix}",
+            runtime=Runtime.PYTHON_3_11,
+            handler="rating_aggregate.handler",
+            code=Code.from_asset("services/review_service/app"),
+            role=self.lambda_role, # type: ignore
+            timeout=Duration.seconds(60),
+            memory_size=256,
+            environment={
+                "REVIEW_SERVICE_ENV": self.env_name,
+                "REVIEW_TABLE_NAME": self.review_table.table_name,
+                "PROPERTY_SEARCH_TABLE_NAME": self.property_search_table.table_name,
+            }
+        )
+        self.rating_aggregate_function.add_event_source(DynamoEventSource(
+            self.review_table,
+            starting_position=StartingPosition.TRIM_HORIZON,
+            batch_size=100,
+            bisect_batch_on_error=True,
+            retry_attempts=10,
+        ))
+        self.review_table.grant_read_data(self.rating_aggregate_function)
+        self.property_search_table.grant_write_data(self.rating_aggregate_function)
+
         self.api = RestApi(
             self, f"ReviewServiceApi-{env_name}{suffix}",
             rest_api_name=f"review-service-api-{env_name}{suffix}",
@@ -15,6 +15,10 @@ class AppConfiguration(BaseSettings):
     audience: str | None = None
     jwks_url: str | None = None
     db_proxy_endpoint: str | None = None
+    db_pool_strategy: str | None = None
+    db_pool_size: int = 1
+    secret_ttl_seconds: int = 300
+    warm_database_connection: bool = False
 
 user_service_prod_configuration = AppConfiguration(
     user_table_name=os.environ.get("USER_SERVICE_ENV", None),
@@ -22,7 +26,11 @@ user_service_prod_configuration = AppConfiguration(
     audience=os.environ.get("AUDIENCE", None),
     jwks_url=os.environ.get("JWKS_URL", None),
     app_client_id=os.environ.get("APP_CLIENT_ID", None),
-    db_proxy_endpoint=os.environ.get("DB_PROXY_ENDPOINT", None)
+    db_proxy_endpoint=os.environ.get("DB_PROXY_ENDPOINT", None),
+    db_pool_strategy=os.environ.get("DB_POOL_STRATEGY", None),
+    db_pool_size=int(os.environ.get("DB_POOL_SIZE", 1)),
+    secret_ttl_seconds=int(os.environ.get("SECRET_TTL_SECONDS", 300)),
+    warm_database_connection="AWS_LAMBDA_FUNCTION_NAME" in os.environ
 )
 
 user_service_int_configuration = AppConfiguration(
@@ -31,5 +39,9 @@ user_service_int_configuration = AppConfiguration(
     audience=os.environ.get("AUDIENCE", None),
     jwks_url=os.environ.get("JWKS_URL", None),
     app_client_id=os.environ.get("APP_CLIENT_ID", None),
-    db_proxy_endpoint=os.environ.get("DB_PROXY_ENDPOINT", None)
+    db_proxy_endpoint=os.environ.get("DB_PROXY_ENDPOINT", None),
+    db_pool_strategy=os.environ.get("DB_POOL_STRATEGY", None),
+    db_pool_size=int(os.environ.get("DB_POOL_SIZE", 1)),
+    secret_ttl_seconds=int(os.environ.get("SECRET_TTL_SECONDS", 300)),
+    warm_database_connection="AWS_LAMBDA_FUNCTION_NAME" in os.environ
 )
\ No newline at end of file
@@ -1,30 +1,34 @@
 import os
-import json
 import logging
 import socket
 import ssl
-import time
 from pathlib import Path
 from typing import Optional
 from enum import Enum
 from uuid import UUID
 
-import boto3
 from fastapi import HTTPException
-from sqlalchemy import create_engine
-from sqlalchemy.engine import URL
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, sessionmaker
 
 from schemas import UserCreate, UserResponse, UserUpdate, UserType
 from models import User, UserType as ModelUserType
+from db_lifecycle import DEFAULT_POOL_SIZE, DEFAULT_SECRET_TTL_SECONDS, DatabaseLifecycle, PoolStrategy
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 
 class HotelManagementDBClient:
-    def __init__(self, hotel_management_database_secret_name: str | None, region: str, proxy_endpoint: str | None) -> None:
+    def __init__(
+        self,
+        hotel_management_database_secret_name: str | None,
+        region: str,
+        proxy_endpoint: str | None,
+        pool_strategy: PoolStrategy | str | None = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        secret_ttl_seconds: int = DEFAULT_SECRET_TTL_SECONDS,
+    ) -> None:
         if not hotel_management_database_secret_name:
             raise ValueError("Secret name must be provided or set in environment variables.")
 
@@ -42,6 +46,17 @@ class HotelManagementDBClient:
         else:
             logger.info(f"Using RDS trust store")
 
+        self.lifecycle = DatabaseLifecycle(
+            drivername="postgresql+psycopg2",
+            region=region,
+            secret_name=hotel_management_database_secret_name,
+            proxy_endpoint=proxy_endpoint,
+            pool_strategy=pool_strategy,
+            pool_size=pool_size,
+            secret_ttl_seconds=secret_ttl_seconds,
+            connect_args={"sslmode": "require"},
+        )
+
     def _discover_cert_bundle(self) -> Optional[str]:
         candidates = [
             os.getenv("SSL_CERT_PATH"),
@@ -54,11 +69,6 @@ class HotelManagementDBClient:
                 return path
         return None
 
-    def _get_secret(self) -> dict:
-        client = boto3.client("secretsmanager", region_name=self.region)
-        response = client.get_secret_value(SecretId=self.secret_name)
-        return json.loads(response["SecretString"])
-
     def _verify_proxy_certificate(self, host: str, port: int) -> None:
         try:
             context = ssl.create_default_context(cafile=self.ssl_cert_path)
@@ -70,49 +80,18 @@ class HotelManagementDBClient:
             logger.exception(f"Failed to verify SSL certificate for {host}:{port}")
             raise
 
-    def _build_db_config(self) -> tuple[URL, str, int]:
-        secret = self._get_secret()
-        host = (self.proxy_endpoint or secret["host"]).strip()
-        port = int(secret.get("port", 5432))
-        url = URL.create(
-            drivername="postgresql+psycopg2",
-            username=secret["username"].strip(),
-            password=secret["password"].strip(),
-            host=host,
-            port=port,
-            database=secret["dbname"].strip(),
-        )
-        return url, host, port
-
     def _init_engine(self):
         if self._engine:
             return
 
-        for attempt in range(1, 4):
-            try:
-                url, host, port = self._build_db_config()
-                logger.info(f"Attempting DB connection to {host}:{port})")
-
-                connect_args = {
-                    "sslmode": "require",
-                }
-
-                self._engine = create_engine(
-                    url,
-                    connect_args=connect_args,
-                    pool_pre_ping=True,
-                )
-                self._SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self._engine)
+        self._engine = self.lifecycle.create_engine()
+        self._SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self._engine)
+        logger.info(f"DB engine created with {self.lifecycle.pool_strategy.value} pool")
 
-                with self._engine.connect() as _:
-                    logger.info("DB connection established.")
-                return
-
-            except Exception as e:
-                logger.exception(f"DB connection failed")
-                time.sleep(2)
-
-        raise RuntimeError("All attempts to connect to the DB failed.")
+    def warm(self) -> None:
+        self._init_engine()
+        self.lifecycle.warm(self._engine)
+        logger.info("DB connection established.")
 
     def get_session(self) -> Session:
         self._init_engine()
@@ -5,6 +5,7 @@ from mangum import Mangum
 
 from routes import router
 from db_client import HotelManagementDBClient
+from db_lifecycle import COLD_START
 from config import (
     AppMetadata,
     user_service_int_configuration,
@@ -56,7 +57,18 @@ def create_app() -> FastAPI:
         hotel_management_database_secret_name=app_config.hotel_management_database_secret_name,
         region=app_config.region,
         proxy_endpoint=app_config.db_proxy_endpoint,
+        pool_strategy=app_config.db_pool_strategy,
+        pool_size=app_config.db_pool_size,
+        secret_ttl_seconds=app_config.secret_ttl_seconds,
     )
+    if app_config.warm_database_connection:
+        # Fetches the secret before the first request. With a sized pool it also opens the connection
+        # warm invocations reuse, under NullPool every checkout opens its own so none is opened here.
+        try:
+            app.state.user_table_client.warm()
+        except Exception:
+            logger.exception("Could not warm the database connection, it will be opened on first use")
+        COLD_START.report("user_service")
 
     app.state.audience = app_config.audience
     app.state.jwks_url = app_config.jwks_url
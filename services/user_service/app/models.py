@@ -14,7 +14,7 @@ class UserType(str, Enum):
 class User(Base):
     __tablename__ = "users"
     
-    uuid = Column(UUID(as_uuid=True), primary_key=True, index=True, default=uuid4)
+    uuid = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     name = Column(String, nullable=False)
     last_name = Column(String, nullable=False)
     email = Column(String, unique=True, nullable=False)
@@ -114,6 +114,7 @@ class UserServiceStack(Stack):
                 "JWKS_URL": jwks_url,
                 "APP_CLIENT_ID": app_client_id,
                 "DB_PROXY_ENDPOINT": proxy_endpoint,
+                "DB_POOL_STRATEGY": "null",
                 "COGNITO_REGION": "us-east-1",
                 "USER_POOL_ID": user_pool_id,
                 "JWKS_SECRET_NAME": jwks_secret_name,
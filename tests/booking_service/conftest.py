@@ -18,3 +18,11 @@ def booking_env(aws_resources, monkeypatch):
 @pytest.fixture
 def booking_client(booking_env):
     return TestClient(app)
+
+
+@pytest.fixture
+def booking_database_url(postgres_database_url):
+    from services.db_migrations.runner import upgrade
+
+    upgrade(postgres_database_url)
+    return postgres_database_url
@@ -1,6 +1,9 @@
+import asyncio
 import uuid
 from datetime import datetime, timedelta
 
+import pytest
+
 def test_create_and_cancel_booking(booking_client):
     cid = datetime.utcnow().date()
     cod = (datetime.utcnow() + timedelta(days=2)).date()
@@ -34,3 +37,311 @@ def test_availability_batch(booking_client):
     assert r.status_code == 200
     data = r.json()
     assert set(data.keys()) == set(body["room_uuids"])
+
+
+def _db_client(url):
+    from db_client import HotelManagementDBClient  # type: ignore
+
+    return HotelManagementDBClient(None, "us-east-1", None, database_url=url)
+
+
+def _plan_nodes(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+def test_overlapping_bookings_are_rejected(booking_database_url):
+    from db_client import BookingConflictError  # type: ignore
+    from schemas import Booking, BookingStatus, BookingUpdateRequest  # type: ignore
+
+    room_uuid = uuid.uuid4()
+    other_room = uuid.uuid4()
+    now = datetime(2025, 1, 1)
+
+    def booking(check_in, check_out, status=BookingStatus.CONFIRMED):
+        return Booking(
+            uuid=uuid.uuid4(), user_uuid=uuid.uuid4(), room_uuid=room_uuid,
+            check_in=check_in, check_out=check_out, total_price=100.0,
+            status=status, created_at=now, updated_at=now,
+        )
+
+    async def run():
+        client = _db_client(booking_database_url)
+        first = await client.add_booking(booking(datetime(2025, 3, 1), datetime(2025, 3, 4)))
+        with pytest.raises(BookingConflictError):
+            await client.add_booking(booking(datetime(2025, 3, 3), datetime(2025, 3, 5)))
+        # Stays are half open, checking in on the previous check out day is not an overlap.
+        second = await client.add_booking(booking(datetime(2025, 3, 4), datetime(2025, 3, 6)))
+
+        assert await client.check_availability(room_uuid, datetime(2025, 3, 2), datetime(2025, 3, 3)) is False
+        assert await client.check_availability(room_uuid, datetime(2025, 3, 6), datetime(2025, 3, 8)) is True
+        assert await client.check_availability_bulk(
+            [room_uuid, other_room], datetime(2025, 3, 5), datetime(2025, 3, 7)
+        ) == {room_uuid: False, other_room: True}
+
+        with pytest.raises(BookingConflictError):
+            await client.update_booking(BookingUpdateRequest(booking_uuid=second, check_in=datetime(2025, 3, 2)))
+        await client.cancel_booking(first)
+        await client.update_booking(BookingUpdateRequest(booking_uuid=second, check_in=datetime(2025, 3, 2)))
+        assert await client.check_availability(room_uuid, datetime(2025, 3, 1), datetime(2025, 3, 2)) is True
+        await client.dispose()
+
+    asyncio.run(run())
+
+
+def _load_bookings(conn):
+    from sqlalchemy import text
+
+    # 2,000 rooms with 25 back to back stays each, one guest per room.
+    conn.execute(text(
+        "INSERT INTO bookings (uuid, user_uuid, room_uuid, check_in, check_out, total_price, status, created_at, updated_at) "
+        "SELECT gen_random_uuid(), rooms.user_uuid, rooms.room_uuid, day, day + interval '3 days', 100, "
+        "'CONFIRMED', now(), now() "
+        "FROM (SELECT gen_random_uuid() AS room_uuid, gen_random_uuid() AS user_uuid FROM generate_series(1, 2000)) rooms, "
+        "generate_series(timestamp '2025-01-01', timestamp '2025-03-14', interval '3 days') day"
+    ))
+    conn.execute(text("ANALYZE bookings"))
+    return conn.execute(text("SELECT DISTINCT room_uuid, user_uuid FROM bookings LIMIT 50")).all()
+
+
+def _explain(conn, query):
+    from sqlalchemy.dialects import postgresql
+
+    sql = query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar()[0]["Plan"]
+    return plan, list(_plan_nodes(plan))
+
+
+def test_availability_queries_use_stay_index(booking_database_url):
+    from sqlalchemy import create_engine
+    from db_client import overlapping_rooms_query  # type: ignore
+    from models import BOOKING_NO_OVERLAP_CONSTRAINT_NAME  # type: ignore
+
+    engine = create_engine(booking_database_url)
+    with engine.begin() as conn:
+        room_uuids = [row.room_uuid for row in _load_bookings(conn)]
+        for rooms in (room_uuids[:1], room_uuids):
+            plan, nodes = _explain(conn, overlapping_rooms_query(rooms, datetime(2025, 2, 1), datetime(2025, 2, 4)))
+            assert not [n for n in nodes if n["Node Type"] == "Seq Scan"], plan
+            assert any(n.get("Index Name") == BOOKING_NO_OVERLAP_CONSTRAINT_NAME for n in nodes), plan
+    engine.dispose()
+
+
+def test_filtered_booking_queries_use_composite_indexes(booking_database_url):
+    from sqlalchemy import create_engine
+    from db_client import filtered_bookings_query  # type: ignore
+    from schemas import BookingStatus  # type: ignore
+
+    engine = create_engine(booking_database_url)
+    with engine.begin() as conn:
+        row = _load_bookings(conn)[0]
+        cases = [
+            (filtered_bookings_query(user_uuid=row.user_uuid), "ix_bookings_user_uuid_check_in"),
+            (
+                filtered_bookings_query(room_uuid=row.room_uuid, status=BookingStatus.CONFIRMED),
+                "ix_bookings_room_uuid_status_check_in",
+            ),
+            # Hosts list a room's bookings in a date window, the stay index is just as good a plan.
+            (
+                filtered_bookings_query(
+                    room_uuid=row.room_uuid,
+                    check_in=datetime(2025, 2, 1),
+                    check_out=datetime(2025, 2, 10),
+                ),
+                None,
+            ),
+        ]
+        for query, index_name in cases:
+            plan, nodes = _explain(conn, query)
+            assert not [n for n in nodes if n["Node Type"] == "Seq Scan"], plan
+            if index_name:
+                assert any(n.get("Index Name") == index_name for n in nodes), plan
+        # The user index already returns the newest stays first.
+        plan, nodes = _explain(conn, filtered_bookings_query(user_uuid=row.user_uuid))
+        assert not [n for n in nodes if n["Node Type"] == "Sort"], plan
+    engine.dispose()
+
+
+def test_availability_ranges_share_one_session_and_statement():
+    rooms = [uuid.uuid4() for _ in range(3)]
+    statements = []
+
+    class Session:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def execute(self, query):
+            statements.append(query)
+            return [(1, rooms[0]), (2, rooms[2])]
+
+    client = _db_client("postgresql://localhost/db")
+    sessions = []
+
+    async def get_session():
+        sessions.append(Session())
+        return sessions[-1]
+
+    client.get_session = get_session
+    ranges = [(datetime(2025, 3, day), datetime(2025, 3, day + 2)) for day in (1, 5, 9)]
+    results = asyncio.run(client.check_availability_ranges(rooms, ranges))
+    assert len(sessions) == 1 and len(statements) == 1
+    assert results == [
+        {rooms[0]: True, rooms[1]: True, rooms[2]: True},
+        {rooms[0]: False, rooms[1]: True, rooms[2]: True},
+        {rooms[0]: True, rooms[1]: True, rooms[2]: False},
+    ]
+
+
+def test_stay_nights_split_by_month():
+    from occupancy import stay_nights  # type: ignore
+
+    assert stay_nights(datetime(2025, 1, 30), datetime(2025, 2, 2)) == {
+        datetime(2025, 1, 1).date(): 1 << 29 | 1 << 30,
+        datetime(2025, 2, 1).date(): 1 << 0,
+    }
+    # Late check in and early check out still take the one night in between.
+    assert stay_nights(datetime(2025, 3, 5, 23, 0), datetime(2025, 3, 6, 1, 0)) == {datetime(2025, 3, 1).date(): 1 << 4}
+    assert stay_nights(datetime(2025, 3, 5, 8, 0), datetime(2025, 3, 5, 18, 0)) == {}
+
+
+def test_room_night_calendar_follows_bookings(booking_database_url):
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.orm import Session
+    from occupancy import diff_calendar, rebuild_calendar  # type: ignore
+    from schemas import Booking, BookingStatus, BookingUpdateRequest  # type: ignore
+
+    engine = create_engine(booking_database_url)
+    rooms = [uuid.uuid4() for _ in range(3)]
+    now = datetime(2025, 1, 1)
+
+    def assert_consistent():
+        with Session(engine) as session:
+            assert diff_calendar(session) == []
+
+    async def run():
+        client = _db_client(booking_database_url)
+
+        async def add(room_uuid, check_in, check_out):
+            return await client.add_booking(Booking(
+                uuid=uuid.uuid4(), user_uuid=uuid.uuid4(), room_uuid=room_uuid,
+                check_in=check_in, check_out=check_out, total_price=100.0,
+                status=BookingStatus.CONFIRMED, created_at=now, updated_at=now,
+            ))
+
+        spanning = await add(rooms[0], datetime(2025, 4, 29), datetime(2025, 5, 3))
+        await add(rooms[1], datetime(2025, 5, 10), datetime(2025, 5, 12))
+        assert_consistent()
+        assert await client.check_availability_ranges(rooms, [
+            (datetime(2025, 4, 30), datetime(2025, 5, 11)),
+            (datetime(2025, 5, 3), datetime(2025, 5, 10)),
+        ]) == [
+            {rooms[0]: False, rooms[1]: False, rooms[2]: True},
+            {rooms[0]: True, rooms[1]: True, rooms[2]: True},
+        ]
+
+        await client.update_booking(BookingUpdateRequest(booking_uuid=spanning, check_out=datetime(2025, 5, 1)))
+        assert_consistent()
+        assert await client.check_availability(rooms[0], datetime(2025, 5, 1), datetime(2025, 5, 3)) is True
+        await client.update_booking(BookingUpdateRequest(booking_uuid=spanning, status=BookingStatus.CANCELLED))
+        await client.update_booking(BookingUpdateRequest(booking_uuid=spanning, status=BookingStatus.CONFIRMED))
+        await client.cancel_booking(spanning)
+        assert_consistent()
+        assert await client.check_availability(rooms[0], datetime(2025, 4, 29), datetime(2025, 5, 1)) is True
+
+        # Stays overlapping only on a check in or check out day share no night with each other.
+        early_check_out = await add(rooms[2], datetime(2025, 3, 1, 15, 0), datetime(2025, 3, 4, 11, 0))
+        await add(rooms[2], datetime(2025, 3, 10, 10, 0), datetime(2025, 3, 10, 14, 0))
+        assert await client.check_availability_ranges([rooms[2]], [
+            (datetime(2025, 3, 4, 10, 0), datetime(2025, 3, 6)),
+            (datetime(2025, 3, 4, 11, 0), datetime(2025, 3, 6)),
+            (datetime(2025, 2, 27), datetime(2025, 3, 1, 16, 0)),
+            (datetime(2025, 3, 9), datetime(2025, 3, 12)),
+        ]) == [{rooms[2]: False}, {rooms[2]: True}, {rooms[2]: False}, {rooms[2]: False}]
+        await client.cancel_booking(early_check_out)
+        assert_consistent()
+        await client.dispose()
+
+    asyncio.run(run())
+
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE room_nights SET nights = 0"))
+    with Session(engine) as session:
+        assert [m.room_uuid for m in diff_calendar(session)] == [rooms[1]]
+        rebuild_calendar(session)
+        session.commit()
+    assert_consistent()
+    engine.dispose()
+
+
+def test_secret_cache_expires_and_refreshes(moto_aws):
+    import json
+
+    import boto3
+    from db_lifecycle import SecretCache  # type: ignore
+
+    secrets = boto3.client("secretsmanager", region_name="us-east-1")
+    secrets.create_secret(Name="db", SecretString=json.dumps({"password": "first"}))
+    cache = SecretCache("us-east-1", ttl_seconds=300)
+    assert cache.get("db")["password"] == "first"
+
+    secrets.put_secret_value(SecretId="db", SecretString=json.dumps({"password": "rotated"}))
+    assert cache.get("db")["password"] == "first"
+    assert cache.get("db", refresh=True)["password"] == "rotated"
+
+    cache.ttl_seconds = 0
+    secrets.put_secret_value(SecretId="db", SecretString=json.dumps({"password": "again"}))
+    assert cache.get("db")["password"] == "again"
+
+
+def test_connect_hook_never_waits_for_an_expired_secret(moto_aws):
+    import json
+    import time
+
+    import boto3
+    from sqlalchemy.pool import NullPool
+    from db_lifecycle import DatabaseLifecycle  # type: ignore
+
+    secrets = boto3.client("secretsmanager", region_name="us-east-1")
+    secrets.create_secret(Name="db", SecretString=json.dumps({"password": "first"}))
+    lifecycle = DatabaseLifecycle("postgresql+psycopg2", "us-east-1", secret_name="db", proxy_endpoint="proxy")
+    sync_dialect = type("Dialect", (), {"is_async": False})()
+    assert lifecycle._current_secret(sync_dialect)["password"] == "first"
+
+    secrets.put_secret_value(SecretId="db", SecretString=json.dumps({"password": "rotated"}))
+    lifecycle.secrets.ttl_seconds = 0
+    # The stale value is used while a thread refreshes the cache.
+    assert lifecycle._current_secret(sync_dialect)["password"] == "first"
+    deadline = time.monotonic() + 5
+    while lifecycle.secrets.cached("db")["password"] != "rotated" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert lifecycle.secrets.cached("db")["password"] == "rotated"
+
+    # Warming a NullPool engine would open and drop a connection, it is skipped.
+    class Engine:
+        def connect(self):
+            raise AssertionError("NullPool engines are not connected during warm-up")
+
+    assert lifecycle.engine_options()["poolclass"] is NullPool
+    lifecycle.warm(Engine())
+
+
+def test_pool_strategy_follows_the_connection_target():
+    from sqlalchemy.pool import NullPool
+    from db_lifecycle import DatabaseLifecycle, PoolStrategy  # type: ignore
+
+    proxied = DatabaseLifecycle("postgresql+asyncpg", "us-east-1", secret_name="db", proxy_endpoint="proxy")
+    assert proxied.pool_strategy == PoolStrategy.NULL
+    assert proxied.engine_options()["poolclass"] is NullPool
+
+    direct = DatabaseLifecycle("postgresql+asyncpg", "us-east-1", secret_name="db", pool_size=2)
+    assert direct.pool_strategy == PoolStrategy.SMALL
+    assert direct.engine_options()["pool_size"] == 2
+    assert direct.engine_options()["max_overflow"] == 0
+
+    local = DatabaseLifecycle("postgresql+asyncpg", "us-east-1", database_url="postgresql://localhost/db")
+    assert local.pool_strategy == PoolStrategy.DEFAULT
+    assert local.url().drivername == "postgresql+asyncpg"
@@ -0,0 +1,41 @@
+import io
+from contextlib import redirect_stdout
+
+from alembic import command
+from alembic.script import ScriptDirectory
+
+from services.db_migrations.runner import alembic_config, downgrade, upgrade
+
+
+def test_revisions_form_a_single_chain():
+    script = ScriptDirectory.from_config(alembic_config("postgresql+psycopg2://localhost/unused"))
+    assert len(script.get_heads()) == 1
+    revisions = list(script.walk_revisions())
+    assert revisions[-1].down_revision is None
+    assert all(len(revision.nextrev) <= 1 for revision in revisions)
+
+
+def test_offline_upgrade_renders_booking_indexes():
+    output = io.StringIO()
+    with redirect_stdout(output):
+        command.upgrade(alembic_config("postgresql+psycopg2://localhost/unused"), "head", sql=True)
+    sql = output.getvalue()
+    assert "EXCLUDE USING gist (room_uuid WITH =, stay WITH &&)" in sql
+    assert "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_bookings_user_uuid_check_in ON bookings (user_uuid, check_in DESC)" in sql
+    assert "ix_bookings_room_uuid_status_check_in ON bookings (room_uuid, status, check_in)" in sql
+
+
+def test_migrations_upgrade_and_downgrade(postgres_database_url):
+    from sqlalchemy import create_engine, inspect
+
+    upgrade(postgres_database_url)
+    engine = create_engine(postgres_database_url)
+    indexes = {index["name"] for index in inspect(engine).get_indexes("bookings")}
+    assert {"ix_bookings_user_uuid_check_in", "ix_bookings_room_uuid_status_check_in"} <= indexes
+    assert "ix_users_uuid" not in {index["name"] for index in inspect(engine).get_indexes("users")}
+
+    downgrade(postgres_database_url, "base")
+    assert not inspect(engine).has_table("bookings")
+    upgrade(postgres_database_url)
+    assert inspect(engine).has_table("bookings")
+    engine.dispose()
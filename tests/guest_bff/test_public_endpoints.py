@@ -9,3 +9,59 @@ def test_places_search_requires_params(bff_client, monkeypatch):
 
     r = bff_client.get("/places/search-text", params={"text": "Belgrade"})
     assert r.status_code in (200, 500)
+
+
+def test_property_detail_and_reviews_honor_if_none_match(bff_client, monkeypatch):
+    import httpx
+    from uuid import uuid4
+
+    property_uuid = str(uuid4())
+    seen_if_none_match = []
+
+    def property_service(request):
+        if request.url.path.startswith("/property/"):
+            body = {"uuid": property_uuid, "user_uuid": str(uuid4()), "name": "Hotel", "country": "RS",
+                    "city": "Novi Sad", "address": "Dunavska 1", "images": [{"key": "k.jpg", "url": f"https://signed/{uuid4()}"}]}
+            return httpx.Response(200, json=body, headers={"ETag": '"p1"'})
+        return httpx.Response(200, json=[], headers={"ETag": '"r1"'})
+
+    def review_service(request):
+        seen_if_none_match.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(200, json=[], headers={"ETag": '"v1"'})
+
+    state = bff_client.app.state
+    state.property_service_client = httpx.AsyncClient(transport=httpx.MockTransport(property_service), base_url="http://property/")
+    state.review_service_client = httpx.AsyncClient(transport=httpx.MockTransport(review_service), base_url="http://review/")
+
+    first = bff_client.get(f"/property/{property_uuid}")
+    etag = first.headers["ETag"]
+    # Signed image URLs differ on every call, the tag only follows the services' tags.
+    cached = bff_client.get(f"/property/{property_uuid}", headers={"If-None-Match": etag})
+    assert cached.status_code == 304 and cached.headers["ETag"] == etag
+    dated = bff_client.get(f"/property/{property_uuid}", params={"check_in_date": "2026-07-01"}, headers={"If-None-Match": etag})
+    assert dated.status_code == 200 and dated.headers["ETag"] != etag
+
+    from datetime import date
+
+    import handlers
+
+    dated_etag = dated.headers["ETag"]
+
+    class Tomorrow(date):
+        @classmethod
+        def today(cls):
+            return date.fromordinal(date.today().toordinal() + 1)
+
+    monkeypatch.setattr(handlers, "date", Tomorrow)
+    # The nightly price tier depends on how far away check-in is, so the tag changes every day.
+    repriced = bff_client.get(
+        f"/property/{property_uuid}", params={"check_in_date": "2026-07-01"}, headers={"If-None-Match": dated_etag},
+    )
+    assert repriced.status_code == 200 and repriced.headers["ETag"] != dated_etag
+
+    assert bff_client.get(f"/reviews/{property_uuid}").headers["ETag"] == '"v1"'
+    cached = bff_client.get(f"/reviews/{property_uuid}", headers={"If-None-Match": '"v1"'})
+    assert cached.status_code == 304 and cached.headers["ETag"] == '"v1"'
+    assert seen_if_none_match == [None, '"v1"']
@@ -13,6 +13,9 @@ def property_env(aws_resources, monkeypatch):
 
     PROPERTY_TABLE = "property_table_test"
     ROOM_TABLE = "room_table_test"
+    ROOM_AMENITY_TABLE = "room_amenity_table_test"
+    SEARCH_TABLE = "property_search_table_test"
+    CLEANUP_JOB_TABLE = "cleanup_job_table_test"
     BUCKET = "property-assets-test"
 
     from tests.conftest import _create_ddb_table
@@ -23,19 +26,35 @@ def property_env(aws_resources, monkeypatch):
         gsi_defs=[
             {"name": "user_index", "partition": "user_uuid", "sort": "created_at"},
             {"name": "city_index", "partition": "city_key", "sort": "created_at"},
+            {"name": "geohash_index", "partition": "geohash_cell", "sort": "geohash"},
         ],
     )
     _create_ddb_table(
         dynamodb,
         ROOM_TABLE,
         partition_key="uuid",
-        gsi_defs=[{"name": "property_uuid_index", "partition": "property_uuid"}],
+        gsi_defs=[
+            {"name": "property_uuid_index", "partition": "property_uuid"},
+            {"name": "property_price_index", "partition": "property_uuid", "sort": "price_per_night", "sort_type": "N"},
+            {"name": "price_bucket_index", "partition": "price_bucket", "sort": "price_per_night", "sort_type": "N"},
+        ],
+    )
+    _create_ddb_table(dynamodb, ROOM_AMENITY_TABLE, partition_key="amenity", sort_key="room_uuid")
+    _create_ddb_table(
+        dynamodb,
+        SEARCH_TABLE,
+        partition_key="property_uuid",
+        gsi_defs=[{"name": "city_price_index", "partition": "city_key", "sort": "min_price_per_night", "sort_type": "N"}],
     )
+    _create_ddb_table(dynamodb, CLEANUP_JOB_TABLE, partition_key="job_uuid")
 
     s3.create_bucket(Bucket=BUCKET)
 
     monkeypatch.setenv("PROPERTY_TABLE_NAME", PROPERTY_TABLE)
     monkeypatch.setenv("ROOM_TABLE_NAME", ROOM_TABLE)
+    monkeypatch.setenv("ROOM_AMENITY_TABLE_NAME", ROOM_AMENITY_TABLE)
+    monkeypatch.setenv("SEARCH_TABLE_NAME", SEARCH_TABLE)
+    monkeypatch.setenv("CLEANUP_JOB_TABLE_NAME", CLEANUP_JOB_TABLE)
     monkeypatch.setenv("ASSET_BUCKET_NAME", BUCKET)
     monkeypatch.setenv("PROPERTY_SERVICE_ENV", "test")
 
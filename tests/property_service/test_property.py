@@ -1,5 +1,8 @@
+from datetime import timezone
 import uuid
 
+from hypothesis import given, settings, strategies as st
+
 
 def test_add_and_get_property(property_client):
     payload = {
@@ -66,3 +69,1070 @@ def test_rooms_crud(property_client):
 
     delete = property_client.delete(f"/room/{room['uuid']}")
     assert delete.status_code == 200
+
+
+def test_geohash_encode_known_value():
+    from services.property_service.app.geohash import encode
+
+    assert encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+
+
+def test_properties_near_uses_geohash_cells(property_client):
+    user_uuid = str(uuid.uuid4())
+    base = {
+        "user_uuid": user_uuid,
+        "name": "Near",
+        "country": "RS",
+        "city": "Beograd",
+        "address": "Knez Mihailova 1",
+    }
+    near_uuid = str(uuid.uuid4())
+    far_uuid = str(uuid.uuid4())
+    property_client.post("/property", json={**base, "uuid": near_uuid, "latitude": 44.8176, "longitude": 20.4569})
+    property_client.post("/property", json={**base, "uuid": far_uuid, "latitude": 45.2671, "longitude": 19.8335})
+
+    r = property_client.get("/properties/near", params={"latitude": 44.8125, "longitude": 20.4612, "radius_km": 5})
+    assert r.status_code == 200
+    uuids = {p["uuid"] for p in r.json()}
+    assert near_uuid in uuids
+    assert far_uuid not in uuids
+
+
+def test_spatial_index_applies_change_feed():
+    from services.property_service.app.spatial_index import InMemoryChangeFeed, PropertyLocation, SpatialIndex
+
+    feed = InMemoryChangeFeed()
+    index = SpatialIndex(feed, refresh_seconds=0)
+    belgrade = str(uuid.uuid4())
+    novi_sad = str(uuid.uuid4())
+    feed.publish(PropertyLocation(belgrade, 44.8176, 20.4569, "RS##BEOGRAD"))
+    feed.publish(PropertyLocation(novi_sad, 45.2671, 19.8335, "RS##NOVI SAD"))
+    index.ensure_fresh()
+
+    assert [str(u) for u, _ in index.query_radius(44.8125, 20.4612, 5)] == [belgrade]
+    assert [str(u) for u, _ in index.query_radius(44.8125, 20.4612, 100, city="Novi Sad")] == [novi_sad]
+
+    feed.publish(PropertyLocation(belgrade, None, None, None, deleted=True))
+    index.ensure_fresh()
+    # Refreshes after the first load run beside the request.
+    index._refresh_thread.join()
+    assert index.query_radius(44.8125, 20.4612, 5) == []
+    assert index.stats()["entries"] == 1
+
+
+def test_location_change_table_feeds_spatial_index_with_updates_and_deletes(property_client):
+    import boto3
+    from services.property_service.app.location_changes import LocationChangeTable
+    from services.property_service.app.spatial_index import SpatialIndex
+    from tests.conftest import _create_ddb_table
+
+    _create_ddb_table(
+        boto3.resource("dynamodb"), "property_location_change_table_test", partition_key="bucket", sort_key="change_key",
+    )
+    changes = LocationChangeTable("property_location_change_table_test", "property_table_test")
+    base = {"user_uuid": str(uuid.uuid4()), "name": "Geo", "country": "RS", "city": "Beograd", "address": "Knez Mihailova 1"}
+    kept = property_client.post("/property", json={**base, "latitude": 44.8176, "longitude": 20.4569}).json()
+    moved = property_client.post("/property", json={**base, "latitude": 44.8180, "longitude": 20.4570}).json()
+
+    index = SpatialIndex(changes, refresh_seconds=0)
+    index.ensure_fresh()
+    assert {str(u) for u, _ in index.query_radius(44.8125, 20.4612, 5)} == {kept, moved}
+
+    def image(property_uuid, latitude, longitude, name="Geo"):
+        return {
+            "uuid": {"S": property_uuid}, "name": {"S": name}, "city_key": {"S": "RS##BEOGRAD"},
+            "latitude": {"N": str(latitude)}, "longitude": {"N": str(longitude)},
+        }
+
+    records = [
+        {"eventName": "MODIFY", "dynamodb": {
+            "SequenceNumber": "100", "OldImage": image(kept, 44.8176, 20.4569), "NewImage": image(kept, 44.8176, 20.4569, "Renamed"),
+        }},
+        {"eventName": "MODIFY", "dynamodb": {
+            "SequenceNumber": "101", "OldImage": image(moved, 44.8180, 20.4570), "NewImage": image(moved, 45.2671, 19.8335),
+        }},
+        {"eventName": "REMOVE", "dynamodb": {"SequenceNumber": "102", "OldImage": image(kept, 44.8176, 20.4569)}},
+    ]
+    # A rename does not touch the location, only the move and the delete are logged.
+    assert changes.record(records) == 2
+    assert changes.record(records) == 2
+
+    index.ensure_fresh()
+    index._refresh_thread.join()
+    assert index.query_radius(44.8125, 20.4612, 5) == []
+    assert [str(u) for u, _ in index.query_radius(45.2671, 19.8335, 1)] == [moved]
+
+
+def test_filter_items_within_radius_returns_distances():
+    from services.property_service.app.geometry import filter_items_within_radius
+
+    items = [
+        {"uuid": {"S": "near"}, "latitude": {"N": "44.8176"}, "longitude": {"N": "20.4569"}},
+        {"uuid": {"S": "far"}, "latitude": {"N": "45.2671"}, "longitude": {"N": "19.8335"}},
+        {"uuid": {"S": "no-coordinates"}},
+    ]
+    matches = filter_items_within_radius(items, 44.8125, 20.4612, 5)
+    assert [it["uuid"]["S"] for it, _ in matches] == ["near"]
+    assert 0.5 < matches[0][1] < 0.8
+
+
+_datetimes = st.datetimes(timezones=st.none() | st.just(timezone.utc))
+_prices = st.floats(min_value=0, max_value=1e9, allow_nan=False, allow_infinity=False)
+_images = st.lists(st.fixed_dictionaries({"key": st.text(min_size=1)}), max_size=3)
+_text_or_uuid = st.text() | st.uuids().map(str)
+
+_property_payloads = st.fixed_dictionaries(
+    {
+        "uuid": st.uuids(),
+        "user_uuid": st.uuids(),
+        "name": _text_or_uuid,
+        "country": st.text(),
+        "city": st.text(),
+        "address": st.text(),
+        "stars": st.integers(min_value=1, max_value=5),
+        "images": _images,
+    },
+    optional={
+        "place_id": _text_or_uuid,
+        "description": st.text(),
+        "state": st.text(),
+        "city_key": st.text(),
+        "latitude": st.decimals(min_value=-90, max_value=90, places=6),
+        "longitude": st.decimals(min_value=-180, max_value=180, places=6),
+        "created_at": _datetimes,
+        "updated_at": _datetimes,
+        "distance_km": _prices,
+    },
+)
+
+_room_payloads = st.fixed_dictionaries(
+    {
+        "uuid": st.uuids(),
+        "property_uuid": st.uuids(),
+        "name": _text_or_uuid,
+        "capacity": st.integers(min_value=1, max_value=20),
+        "room_type": st.sampled_from(["single", "double", "suite", "family", "deluxe", "studio"]),
+        "price_per_night": _prices,
+        "min_price_per_night": _prices,
+        "max_price_per_night": _prices,
+        "amenities": st.lists(st.fixed_dictionaries({"name": st.text()}), max_size=5),
+        "images": _images,
+    },
+    optional={
+        "description": _text_or_uuid,
+        "created_at": _datetimes,
+        "updated_at": _datetimes,
+    },
+)
+
+
+@settings(max_examples=200, deadline=None)
+@given(_property_payloads)
+def test_property_codec_round_trip(payload):
+    from services.property_service.app.db_clients import PROPERTY_CODEC
+
+    prop = PROPERTY_CODEC.model.model_validate(payload)
+    item = PROPERTY_CODEC.encode(prop.model_dump(exclude_none=True))
+    assert PROPERTY_CODEC.decode_model(item) == prop
+
+
+@settings(max_examples=200, deadline=None)
+@given(_room_payloads)
+def test_room_codec_round_trip(payload):
+    from services.property_service.app.db_clients import ROOM_CODEC
+
+    room = ROOM_CODEC.model.model_validate(payload)
+    item = ROOM_CODEC.encode(room.model_dump(exclude_none=True))
+    assert ROOM_CODEC.decode_model(item) == room
+
+
+def test_property_codec_keeps_uuid_like_strings():
+    from services.property_service.app.db_clients import PROPERTY_CODEC
+
+    place_id = str(uuid.uuid4())
+    item = {
+        "uuid": {"S": str(uuid.uuid4())},
+        "user_uuid": {"S": str(uuid.uuid4())},
+        "name": {"S": "2024-01-01"},
+        "country": {"S": "RS"},
+        "city": {"S": "Beograd"},
+        "address": {"S": "Knez Mihailova 1"},
+        "place_id": {"S": place_id},
+        "latitude": {"N": "44.8176"},
+        "geohash": {"S": "srywc2n4y"},
+    }
+    prop = PROPERTY_CODEC.decode_model(item)
+    assert prop.name == "2024-01-01"
+    assert prop.place_id == place_id
+    assert isinstance(prop.uuid, uuid.UUID)
+    assert str(prop.latitude) == "44.8176"
+
+
+def test_segmented_room_scan_paginates_and_stops_at_limit(property_client):
+    property_uuid = str(uuid.uuid4())
+    for i in range(30):
+        r = property_client.post("/room", json={
+            "property_uuid": property_uuid,
+            "name": f"Room {i}",
+            "capacity": 2 if i % 2 else 4,
+            "room_type": "double",
+            "price_per_night": 50 + i,
+            "min_price_per_night": 50,
+            "max_price_per_night": 80,
+        })
+        assert r.status_code == 200
+
+    room_table_client = property_client.app.state.room_table_client
+    rooms = list(room_table_client.iter_filtered_rooms(capacity=3, segments=3))
+    assert len(rooms) == 15
+    assert len({room.uuid for room in rooms}) == 15
+    assert all(room.capacity == 4 for room in rooms)
+
+    assert len(list(room_table_client.iter_filtered_rooms(limit=7, segments=4))) == 7
+
+    r = property_client.get("/rooms", params={"max_price_per_night": 59, "limit": 5})
+    assert r.status_code == 200
+    assert len(r.json()) == 5
+
+
+def test_user_properties_cursor_pagination(property_client):
+    user_uuid = str(uuid.uuid4())
+    created = []
+    for i in range(5):
+        r = property_client.post("/property", json={
+            "user_uuid": user_uuid,
+            "name": f"Property {i}",
+            "country": "RS",
+            "city": "Beograd",
+            "address": f"Knez Mihailova {i}",
+            "created_at": f"2024-01-0{i + 1}T00:00:00",
+        })
+        assert r.status_code == 200
+        created.append(r.json())
+
+    seen = []
+    cursor = None
+    for _ in range(5):
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        r = property_client.get(f"/user/{user_uuid}/properties", params=params)
+        assert r.status_code == 200
+        assert len(r.json()) <= 2
+        seen.extend(p["uuid"] for p in r.json())
+        cursor = r.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert seen == created
+
+    r = property_client.get(f"/user/{user_uuid}/properties")
+    assert [p["uuid"] for p in r.json()] == created
+    assert "X-Next-Cursor" not in r.headers
+
+    r = property_client.get(f"/user/{user_uuid}/properties", params={"limit": 2, "cursor": "not-a-cursor"})
+    assert r.status_code == 400
+
+
+def test_properties_batch_keeps_request_order_and_projects_fields(property_client):
+    base = {"user_uuid": str(uuid.uuid4()), "country": "RS", "city": "Beograd", "address": "Knez Mihailova 1"}
+    created = [
+        property_client.post("/property", json={**base, "name": f"Property {i}"}).json()
+        for i in range(3)
+    ]
+    requested = [created[2], str(uuid.uuid4()), created[0], created[1], created[0]]
+
+    r = property_client.post("/properties/batch", json={"uuids": requested})
+    assert r.status_code == 200
+    assert [p["uuid"] for p in r.json()] == [created[2], created[0], created[1]]
+    assert r.json()[0]["name"] == "Property 2"
+
+    r = property_client.post("/properties/batch", json={"uuids": created, "fields": ["name"]})
+    assert r.status_code == 200
+    assert r.json() == [{"uuid": created[i], "name": f"Property {i}"} for i in range(3)]
+
+    r = property_client.post("/properties/batch", json={"uuids": created, "fields": ["password"]})
+    assert r.status_code == 400
+
+
+def test_list_endpoints_project_requested_fields(property_client):
+    base = {"user_uuid": str(uuid.uuid4()), "country": "RS", "city": "Novi Sad", "address": "Zmaj Jovina 1"}
+    property_uuid = property_client.post("/property", json={
+        **base,
+        "name": "Pin",
+        "description": "Long text",
+        "latitude": 45.2551,
+        "longitude": 19.8452,
+        "images": [{"key": "properties/pin.jpg"}],
+    }).json()
+
+    r = property_client.get(
+        "/properties/city", params={"country": "RS", "city": "Novi Sad", "fields": "name,latitude", "limit": 1},
+    )
+    assert r.status_code == 200
+    assert r.json() == [{"uuid": property_uuid, "name": "Pin", "latitude": "45.2551"}]
+
+    r = property_client.get("/properties/near", params={
+        "latitude": 45.2551, "longitude": 19.8452, "radius_km": 1, "fields": ["name", "distance_km"],
+    })
+    assert r.status_code == 200
+    assert r.json() == [{"uuid": property_uuid, "name": "Pin", "distance_km": 0.0}]
+
+    r = property_client.get("/properties/city", params={"country": "RS", "city": "Novi Sad", "fields": "description,images"})
+    assert r.json()[0]["images"][0]["url"]
+
+    property_client.post("/room", json={
+        "property_uuid": property_uuid,
+        "name": "Twin",
+        "capacity": 2,
+        "room_type": "double",
+        "price_per_night": 70,
+        "min_price_per_night": 50,
+        "max_price_per_night": 90,
+        "amenities": [{"name": "wifi"}],
+    })
+    r = property_client.get("/rooms", params={"amenities": "wifi", "fields": "price_per_night"})
+    assert r.status_code == 200
+    assert [set(room) for room in r.json()] == [{"uuid", "price_per_night"}]
+
+    r = property_client.get("/rooms", params={"fields": "password"})
+    assert r.status_code == 400
+
+
+def test_batch_get_items_retries_unprocessed_keys():
+    from services.property_service.app.db_clients import batch_get_items
+
+    class FlakyClient:
+        def __init__(self):
+            self.calls = []
+
+        def batch_get_item(self, RequestItems):
+            keys = RequestItems["t"]["Keys"]
+            self.calls.append(len(keys))
+            served, unprocessed = keys[:60], keys[60:]
+            return {
+                "Responses": {"t": [{"uuid": key["uuid"], "name": {"S": "x"}} for key in served]},
+                "UnprocessedKeys": {"t": {**RequestItems["t"], "Keys": unprocessed}} if unprocessed else {},
+            }
+
+    client = FlakyClient()
+    uuids = [str(uuid.uuid4()) for _ in range(250)]
+    items = batch_get_items(client, "t", uuids)
+    assert [it["uuid"]["S"] for it in items] == uuids
+    assert client.calls == [100, 40, 100, 40, 50]
+
+
+def test_rooms_by_properties_groups_in_request_order(property_client):
+    property_uuids = [str(uuid.uuid4()) for _ in range(3)]
+    for index, property_uuid in enumerate(property_uuids):
+        for capacity in (2, 4):
+            r = property_client.post("/room", json={
+                "property_uuid": property_uuid,
+                "name": f"Room {index}-{capacity}",
+                "capacity": capacity,
+                "room_type": "double",
+                "price_per_night": 100,
+                "min_price_per_night": 80,
+                "max_price_per_night": 120,
+            })
+            assert r.status_code == 200
+
+    empty_property = str(uuid.uuid4())
+    requested = [property_uuids[2], empty_property, property_uuids[0]]
+    r = property_client.post("/rooms/by-properties", json={"property_uuids": requested, "capacity": 3})
+    assert r.status_code == 200
+    groups = r.json()
+    assert [group["property_uuid"] for group in groups] == requested
+    assert [room["name"] for room in groups[0]["rooms"]] == ["Room 2-4"]
+    assert groups[1]["rooms"] == []
+    assert [room["name"] for room in groups[2]["rooms"]] == ["Room 0-4"]
+
+
+def test_signed_url_cache_reuses_urls_within_window():
+    from services.property_service.app.storage import S3AssetStorage, SignedUrlCache
+
+    now = [1_000_000.0]
+    cache = SignedUrlCache(max_entries=2, window_seconds=300, clock=lambda: now[0])
+    storage = S3AssetStorage("property-assets-test", presign_ttl_seconds=3600, url_cache=cache)
+
+    first = storage.create_read_url("properties/a.jpg")
+    now[0] += 100
+    assert storage.create_read_url("properties/a.jpg") == first
+
+    now[0] += 300
+    assert storage.create_read_url("properties/a.jpg") != first
+
+    storage.create_read_url("properties/b.jpg")
+    storage.create_read_url("properties/c.jpg")
+    stats = storage.url_cache_stats()
+    assert stats == {"entries": 2, "hits": 1, "misses": 4, "evictions": 1, "hit_rate": 0.2}
+
+    now[0] = 1_000_000.0
+    url = cache.get_or_sign("properties/d.jpg", lambda signed_at, expires_in: f"{signed_at:%H%M%S}-{expires_in}", 3600)
+    assert url == "134500-3900"
+
+
+def test_signed_urls_match_across_processes_within_window():
+    from services.property_service.app.storage import S3AssetStorage, SignedUrlCache
+
+    now = [1_000_000.0]
+    storages = [
+        S3AssetStorage(
+            "property-assets-test", presign_ttl_seconds=3600,
+            url_cache=SignedUrlCache(window_seconds=300, clock=lambda: now[0]),
+        )
+        for _ in range(2)
+    ]
+    first = storages[0].create_read_url("properties/a b.jpg")
+    now[0] += 150
+    assert storages[1].create_read_url("properties/a b.jpg") == first
+    assert "X-Amz-Date=19700112T134500Z" in first and "X-Amz-Expires=3900" in first
+
+    now[0] += 100
+    assert storages[1].create_read_url("properties/a b.jpg") != first
+
+
+def test_amenity_index_tracks_room_writes_and_intersects(property_client):
+    from services.property_service.app.schemas import Amenity
+
+    property_uuid = str(uuid.uuid4())
+    other_property_uuid = str(uuid.uuid4())
+
+    def room(name, amenities, property_uuid=property_uuid, **extra):
+        payload = {
+            "property_uuid": property_uuid,
+            "name": name,
+            "capacity": 2,
+            "room_type": "double",
+            "price_per_night": 100,
+            "min_price_per_night": 80,
+            "max_price_per_night": 120,
+            "amenities": [{"name": amenity} for amenity in amenities],
+            **extra,
+        }
+        r = property_client.post("/room", json=payload)
+        assert r.status_code == 200
+        return {**payload, "uuid": r.json()}
+
+    both = room("Both", ["WiFi", "Parking"])
+    room("WiFi only", ["wifi"])
+    other = room("Other property", ["wifi", "parking"], property_uuid=other_property_uuid, capacity=4)
+
+    room_table_client = property_client.app.state.room_table_client
+    amenities = [Amenity(name="wifi"), Amenity(name="parking")]
+    assert {r.name for r in room_table_client.get_filtered_rooms(amenities=amenities)} == {"Both", "Other property"}
+    assert [r.name for r in room_table_client.get_filtered_rooms(capacity=3, amenities=amenities)] == ["Other property"]
+    assert [r.name for r in room_table_client.get_filtered_property_rooms(uuid.UUID(property_uuid), amenities=amenities)] == ["Both"]
+
+    r = property_client.put("/room", json={**both, "amenities": [{"name": "wifi"}]})
+    assert r.status_code == 200
+    assert [r.name for r in room_table_client.get_filtered_rooms(amenities=amenities)] == ["Other property"]
+    assert room_table_client.get_filtered_property_rooms(uuid.UUID(property_uuid), amenities=amenities) == []
+
+    index = room_table_client.amenity_index
+    assert len(index.posting_list("wifi")) == 3
+    assert property_client.delete(f"/room/{both['uuid']}").status_code == 200
+    assert len(index.posting_list("wifi")) == 2
+    assert index.matching_rooms(["WiFi ", "parking"]) == {other["uuid"]}
+    assert index.posting_list("wifi", max_size=1) is None
+    assert index.matching_rooms(["wifi", "parking"], max_candidates=1) == {other["uuid"]}
+
+
+def test_price_indexes_push_price_range_into_key_condition(property_client):
+    property_uuid = str(uuid.uuid4())
+    for price in (120, 45, 80, 310, 60):
+        r = property_client.post("/room", json={
+            "property_uuid": property_uuid,
+            "name": f"Room {price}",
+            "capacity": 4 if price != 60 else 1,
+            "room_type": "double",
+            "price_per_night": price,
+            "min_price_per_night": 40,
+            "max_price_per_night": 400,
+        })
+        assert r.status_code == 200
+
+    room_table_client = property_client.app.state.room_table_client
+    rooms = room_table_client.get_filtered_property_rooms(
+        uuid.UUID(property_uuid), capacity=2, min_price_per_night=50, max_price_per_night=150,
+    )
+    assert [room.price_per_night for room in rooms] == [80, 120]
+
+    r = property_client.get("/rooms", params={"cheapest_first": True, "limit": 3})
+    assert r.status_code == 200
+    assert [room["price_per_night"] for room in r.json()] == [45, 60, 80]
+
+    rooms = room_table_client.get_filtered_rooms(min_price_per_night=100, max_price_per_night=400)
+    assert [room.price_per_night for room in rooms] == [120, 310]
+
+    r = property_client.post("/rooms/by-properties", json={"property_uuids": [property_uuid], "limit_per_property": 2})
+    assert [room["price_per_night"] for room in r.json()[0]["rooms"]] == [45, 60]
+
+
+def test_partial_update_guards_owner_and_returns_new_image(property_client):
+    owner = str(uuid.uuid4())
+    payload = {
+        "user_uuid": owner,
+        "name": "Old Town Rooms",
+        "country": "RS",
+        "city": "Beograd",
+        "address": "Knez Mihailova 1",
+        "latitude": 44.8176,
+        "longitude": 20.4569,
+        "images": [{"key": "properties/cover.jpg"}],
+    }
+    prop_uuid = property_client.post("/property", json=payload).json()
+    before = property_client.get(f"/property/{prop_uuid}").json()
+
+    update = {k: payload[k] for k in ("user_uuid", "name", "country", "city", "address")}
+    r = property_client.put(f"/property/{prop_uuid}", json={**update, "name": "New Town Rooms", "stars": 4})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["name"] == "New Town Rooms"
+    assert body["stars"] == 4
+    assert body["images"][0]["key"] == "properties/cover.jpg"
+    assert body["created_at"] == before["created_at"]
+
+    r = property_client.put(f"/property/{prop_uuid}", json={**update, "user_uuid": str(uuid.uuid4())})
+    assert r.status_code == 403
+    r = property_client.put(f"/property/{uuid.uuid4()}", json=update)
+    assert r.status_code == 404
+    r = property_client.put(f"/property/{prop_uuid}", json={**update, "latitude": 45.0})
+    assert r.status_code == 400
+
+    property_uuid = str(uuid.uuid4())
+    room = {
+        "property_uuid": property_uuid,
+        "name": "Double",
+        "capacity": 2,
+        "room_type": "double",
+        "price_per_night": 80,
+        "min_price_per_night": 60,
+        "max_price_per_night": 120,
+        "amenities": [{"name": "wifi"}],
+    }
+    room_uuid = property_client.post("/room", json=room).json()
+    r = property_client.put(f"/room/{room_uuid}", json={
+        **room, "price_per_night": 240, "amenities": [{"name": "parking"}],
+    })
+    assert r.status_code == 200
+    assert r.json()["price_per_night"] == 240
+    assert r.json()["name"] == "Double"
+
+    room_table_client = property_client.app.state.room_table_client
+    assert room_table_client.amenity_index.posting_list("wifi") == set()
+    assert room_table_client.amenity_index.posting_list("parking") == {room_uuid}
+    rooms = room_table_client.get_filtered_rooms(min_price_per_night=200, max_price_per_night=250)
+    assert [str(r.uuid) for r in rooms] == [room_uuid]
+
+    r = property_client.put(f"/room/{room_uuid}", json={**room, "property_uuid": str(uuid.uuid4())})
+    assert r.status_code == 403
+
+
+def test_partial_update_derives_address_keys_from_the_stored_property(property_client):
+    payload = {
+        "user_uuid": str(uuid.uuid4()),
+        "name": "Lakeside",
+        "country": "US",
+        "state": "CA",
+        "county": "El Dorado",
+        "city": "South Lake Tahoe",
+        "address": "1 Lakeshore Blvd",
+    }
+    prop_uuid = property_client.post("/property", json=payload).json()
+    update = {k: payload[k] for k in ("user_uuid", "name", "country", "city", "address")}
+
+    body = property_client.put(f"/property/{prop_uuid}", json={**update, "address": "2 Lakeshore Blvd"}).json()
+    assert body["city_key"] == "US#CA#SOUTH LAKE TAHOE"
+    assert body["full_address"] == "2 Lakeshore Blvd,El Dorado,South Lake Tahoe,CA,US"
+
+    body = property_client.put(f"/property/{prop_uuid}", json={**update, "state": "NV", "city_key": "XX#XX#XX"}).json()
+    assert body["city_key"] == "US#NV#SOUTH LAKE TAHOE"
+    assert property_client.get(f"/property/{prop_uuid}").json()["full_address"] == (
+        "1 Lakeshore Blvd,El Dorado,South Lake Tahoe,NV,US"
+    )
+
+def test_bulk_import_reports_per_item_results(property_client):
+    import json
+
+    def record(i, rooms):
+        return {
+            "user_uuid": str(uuid.uuid4()),
+            "name": f"Chain Hotel {i}",
+            "country": "RS",
+            "city": "Novi Sad",
+            "address": f"Bulevar {i}",
+            "rooms": [
+                {
+                    "name": f"Room {r}",
+                    "capacity": 2,
+                    "room_type": "double",
+                    "price_per_night": 70 + r,
+                    "min_price_per_night": 60,
+                    "max_price_per_night": 120,
+                    "amenities": [{"name": "sauna"}],
+                }
+                for r in range(rooms)
+            ],
+        }
+
+    lines = [json.dumps(record(i, 30)) for i in range(3)]
+    lines.insert(1, "{not json")
+    lines.append(json.dumps({"name": "Missing fields"}))
+    r = property_client.post(
+        "/properties/import",
+        content="\n".join(lines),
+        headers={"content-type": "application/x-ndjson"},
+    )
+    assert r.status_code == 200
+    report = r.json()
+    assert (report["imported_properties"], report["imported_rooms"], report["failed"]) == (3, 90, 2)
+    assert [result["status"] for result in report["results"]] == [
+        "imported", "failed", "imported", "imported", "failed",
+    ]
+    first = report["results"][0]
+    assert len(first["room_uuids"]) == 30
+
+    rooms = property_client.get(f"/rooms/{first['property_uuid']}").json()
+    assert sorted(room["uuid"] for room in rooms) == sorted(first["room_uuids"])
+    room_table_client = property_client.app.state.room_table_client
+    assert len(room_table_client.amenity_index.posting_list("sauna")) == 90
+
+    r = property_client.post("/properties/import", json=[record(9, 1)])
+    assert r.status_code == 200
+    assert r.json()["imported_rooms"] == 1
+
+    # Client supplied UUIDs are ignored, an import never replaces an existing property or room.
+    existing_room_uuid = first["room_uuids"][0]
+    hijack = {**record(10, 1), "uuid": first["property_uuid"]}
+    hijack["rooms"][0]["uuid"] = existing_room_uuid
+    result = property_client.post("/properties/import", json=[hijack]).json()["results"][0]
+    assert result["property_uuid"] != first["property_uuid"]
+    assert result["room_uuids"] != [existing_room_uuid]
+    assert property_client.get(f"/property/{first['property_uuid']}").json()["name"] == "Chain Hotel 0"
+    assert property_client.get(f"/room/{existing_room_uuid}").json()["property_uuid"] == first["property_uuid"]
+    assert property_client.post("/properties/import", json={"not": "a list"}).status_code == 400
+
+
+def test_write_batches_retries_unprocessed_and_isolates_invalid_items():
+    from botocore.exceptions import ClientError
+    from services.property_service.app import batch_write
+
+    class FlakyClient:
+        def __init__(self):
+            self.calls = []
+
+        def batch_write_item(self, RequestItems):
+            requests = RequestItems["t"]
+            self.calls.append(len(requests))
+            if any(r["PutRequest"]["Item"]["id"] == "bad" for r in requests):
+                raise ClientError({"Error": {"Code": "ValidationException", "Message": "too large"}}, "BatchWriteItem")
+            if len(self.calls) == 1:
+                return {"UnprocessedItems": {"t": requests[:5]}}
+            return {"UnprocessedItems": {}}
+
+    requests = [{"PutRequest": {"Item": {"id": str(i)}}} for i in range(25)]
+    requests[3] = {"PutRequest": {"Item": {"id": "bad"}}}
+    client = FlakyClient()
+    failures = batch_write.write_batches(client, "t", requests, max_workers=1)
+    assert failures == [(requests[3], "too large")]
+    assert client.calls[0] == 25
+
+
+def test_blocking_executor_overlaps_calls_off_the_event_loop():
+    import asyncio
+    import threading
+    import time
+    from services.property_service.app.offload import BlockingExecutor
+
+    def slow_call() -> str:
+        time.sleep(0.1)
+        return threading.current_thread().name
+
+    async def run_all(executor: BlockingExecutor) -> tuple[float, list[str]]:
+        start = time.perf_counter()
+        names = await asyncio.gather(*(executor.run(slow_call) for _ in range(4)))
+        return time.perf_counter() - start, names
+
+    elapsed, names = asyncio.run(run_all(BlockingExecutor(4)))
+    assert elapsed < 0.3
+    assert all(name.startswith("data-access") for name in names)
+
+    elapsed, names = asyncio.run(run_all(BlockingExecutor(0)))
+    assert elapsed >= 0.4
+    assert set(names) == {threading.current_thread().name}
+
+
+def test_search_documents_follow_room_property_and_rating_writes(property_client):
+    base = {"user_uuid": str(uuid.uuid4()), "country": "RS", "city": "Nis", "address": "Obrenoviceva 1"}
+    cheap = property_client.post("/property", json={**base, "name": "Hostel", "stars": 2}).json()
+    grand = property_client.post("/property", json={**base, "name": "Grand", "stars": 5}).json()
+    property_client.post("/property", json={**base, "name": "No rooms yet"})
+
+    def add_room(property_uuid, price, capacity, room_type, amenities):
+        r = property_client.post("/room", json={
+            "property_uuid": property_uuid,
+            "name": f"Room {price}",
+            "capacity": capacity,
+            "room_type": room_type,
+            "price_per_night": price,
+            "min_price_per_night": price,
+            "max_price_per_night": price,
+            "amenities": [{"name": name} for name in amenities],
+        })
+        return r.json()
+
+    add_room(cheap, 30, 1, "single", ["WiFi"])
+    add_room(grand, 150, 2, "double", ["wifi", "spa"])
+    suite = add_room(grand, 400, 4, "suite", ["minibar"])
+
+    r = property_client.get("/properties/search", params={"country": "RS", "city": "Nis"})
+    assert r.status_code == 200
+    assert [d["name"] for d in r.json()] == ["Hostel", "Grand"]
+    grand_document = r.json()[1]
+    assert (grand_document["min_price_per_night"], grand_document["max_price_per_night"]) == (150, 400)
+    assert grand_document["max_capacity"] == 4
+    assert grand_document["amenities"] == ["minibar", "spa", "wifi"]
+    assert grand_document["room_types"] == ["double", "suite"]
+
+    r = property_client.get("/properties/search", params={
+        "country": "RS", "city": "Nis", "capacity": 3, "amenities": ["Spa"], "max_price_per_night": 200,
+    })
+    assert [d["property_uuid"] for d in r.json()] == [grand]
+
+    property_client.delete(f"/room/{suite}")
+    r = property_client.get("/properties/search", params={"country": "RS", "city": "Nis", "capacity": 3})
+    assert r.json() == []
+
+    import boto3
+    from tests.conftest import _create_ddb_table
+
+    search_documents = property_client.app.state.search_documents
+    reviews = _create_ddb_table(
+        boto3.resource("dynamodb"), "review_table_backfill_test", partition_key="uuid",
+    )
+    for property_uuid, rating in ((grand, 5), (grand, 4), (cheap, 3)):
+        reviews.put_item(Item={"uuid": str(uuid.uuid4()), "property_uuid": property_uuid, "rating": rating})
+    assert search_documents.backfill_ratings("review_table_backfill_test") == 2
+    assert property_client.post(f"/property/{grand}/rating", json={"rating": 1}).status_code in (404, 405)
+    assert search_documents.set_rating(uuid.uuid4(), 5, 1) is False
+
+    r = property_client.get("/properties/search", params={"country": "RS", "city": "Nis", "sort": "rating"})
+    assert [(d["name"], d["rating_average"]) for d in r.json()] == [("Grand", 4.5), ("Hostel", 3.0)]
+    r = property_client.get("/properties/search", params={"country": "RS", "city": "Nis", "sort": "rating", "limit": 1})
+    assert [d["name"] for d in r.json()] == ["Grand"]
+    rating_cursor = r.headers["X-Next-Cursor"]
+    r = property_client.get("/properties/search", params={
+        "country": "RS", "city": "Nis", "sort": "rating", "limit": 1, "cursor": rating_cursor,
+    })
+    assert [d["name"] for d in r.json()] == ["Hostel"]
+    assert "X-Next-Cursor" not in r.headers
+    r = property_client.get("/properties/search", params={"country": "RS", "city": "Nis", "cursor": rating_cursor})
+    assert r.status_code == 400
+
+    for item in reviews.scan()["Items"]:
+        reviews.delete_item(Key={"uuid": item["uuid"]})
+    assert search_documents.backfill_ratings("review_table_backfill_test") == 2
+    r = property_client.get("/properties/search", params={"country": "RS", "city": "Nis", "sort": "rating"})
+    assert all(d["rating_count"] == 0 for d in r.json())
+
+    r = property_client.get("/properties/search", params={"country": "RS", "city": "Nis", "limit": 1})
+    assert [d["name"] for d in r.json()] == ["Hostel"]
+    r = property_client.get("/properties/search", params={
+        "country": "RS", "city": "Nis", "limit": 1, "cursor": r.headers["X-Next-Cursor"],
+    })
+    assert [d["name"] for d in r.json()] == ["Grand"]
+
+
+def test_property_delete_cascades_and_sweeper_removes_orphans(property_client):
+    from services.property_service.app.cleanup import sweep_orphans
+    from services.property_service.app.derivatives import DERIVATIVES
+    from services.property_service.app.schemas import Amenity, CleanupKind, Room, RoomType
+
+    state = property_client.app.state
+    s3 = state.asset_storage.s3_client
+    bucket = state.asset_storage.bucket_name
+
+    def room(property_uuid, i):
+        key = f"rooms/{property_uuid}/{i}.jpg"
+        s3.put_object(Bucket=bucket, Key=key, Body=b"img")
+        return Room(
+            uuid=uuid.uuid4(),
+            property_uuid=property_uuid,
+            name=f"Room {i}",
+            capacity=2,
+            room_type=RoomType.DOUBLE,
+            price_per_night=100,
+            min_price_per_night=80,
+            max_price_per_night=120,
+            amenities=[Amenity(name="wifi")],
+            images=[{"key": key}],
+        )
+
+    s3.put_object(Bucket=bucket, Key="properties/front.jpg", Body=b"img")
+    property_uuid = property_client.post("/property", json={
+        "user_uuid": str(uuid.uuid4()),
+        "name": "Closing down",
+        "country": "RS",
+        "city": "Subotica",
+        "address": "Korzo 1",
+        "images": [{"key": "properties/front.jpg"}],
+    }).json()
+    kept = property_client.post("/property", json={
+        "user_uuid": str(uuid.uuid4()), "name": "Staying", "country": "RS", "city": "Subotica", "address": "Korzo 2",
+    }).json()
+    assert not state.room_table_client.put_rooms([room(uuid.UUID(property_uuid), i) for i in range(30)])
+    assert not state.room_table_client.put_rooms([room(uuid.UUID(kept), "kept")])
+
+    assert property_client.delete(f"/property/{property_uuid}").json() == property_uuid
+    job = property_client.get(f"/cleanup-jobs/{property_uuid}").json()
+    # Derivative keys of every image are deleted along with it, whether or not they were rendered yet.
+    assert (job["kind"], job["status"], job["rooms_deleted"]) == ("property_delete", "completed", 30)
+    assert job["assets_deleted"] == 31 * (1 + len(DERIVATIVES))
+    assert property_client.get(f"/rooms/{property_uuid}").json() == []
+    assert len(state.room_table_client.amenity_index.posting_list("wifi")) == 1
+    assert [o["Key"] for o in s3.list_objects_v2(Bucket=bucket)["Contents"]] == [f"rooms/{kept}/kept.jpg"]
+    assert property_client.get(f"/cleanup-jobs/{uuid.uuid4()}").status_code == 404
+
+    orphan_property = uuid.uuid4()
+    assert not state.room_table_client.put_rooms([room(orphan_property, i) for i in range(2)])
+    s3.put_object(Bucket=bucket, Key="uploads/abandoned.jpg", Body=b"img")
+    job = state.cleanup_jobs.start(uuid.uuid4(), CleanupKind.ORPHAN_SWEEP)
+    sweep_orphans(
+        state.cleanup_jobs,
+        job.job_uuid,
+        state.property_table_client,
+        state.room_table_client,
+        state.asset_storage,
+        asset_grace_seconds=-60,
+    )
+    job = state.cleanup_jobs.get(job.job_uuid)
+    assert (job.status.value, job.rooms_deleted, job.assets_deleted) == ("completed", 2, 3)
+    assert [r["name"] for r in property_client.get(f"/rooms/{kept}").json()] == ["Room kept"]
+    assert property_client.get(f"/rooms/{orphan_property}").json() == []
+    assert [o["Key"] for o in s3.list_objects_v2(Bucket=bucket)["Contents"]] == [f"rooms/{kept}/kept.jpg"]
+
+
+def test_cleanup_is_queued_for_the_worker_and_requires_a_job_table(property_client, monkeypatch):
+    import json
+
+    import boto3
+    from services.property_service.app.cleanup import CleanupQueue, handler
+
+    state = property_client.app.state
+    sqs = boto3.client("sqs", region_name="us-east-1")
+    queue_url = sqs.create_queue(QueueName="property-cleanup-test")["QueueUrl"]
+    monkeypatch.setattr(state, "cleanup_queue", CleanupQueue(queue_url))
+    monkeypatch.setattr(
+        "services.property_service.app.cleanup.worker_clients",
+        lambda: (state.cleanup_jobs, state.property_table_client, state.room_table_client, state.asset_storage),
+    )
+
+    def create_property():
+        return property_client.post("/property", json={
+            "user_uuid": str(uuid.uuid4()), "name": "Queued", "country": "RS", "city": "Vrsac", "address": "Trg 1",
+        }).json()
+
+    property_uuid = create_property()
+    assert property_client.delete(f"/property/{property_uuid}").status_code == 200
+    sweep = property_client.post("/cleanup-jobs/orphan-sweep").json()
+    assert property_client.get(f"/cleanup-jobs/{property_uuid}").json()["status"] == "running"
+
+    messages = sqs.receive_message(QueueUrl=queue_url, MaxNumberOfMessages=10, AttributeNames=["All"])["Messages"]
+    assert [json.loads(m["Body"])["kind"] for m in messages] == ["property_delete", "orphan_sweep"]
+    records = [
+        {"messageId": m["MessageId"], "body": m["Body"], "attributes": m["Attributes"]} for m in messages
+    ]
+    assert handler({"Records": records}, None) == {"batchItemFailures": []}
+    for job_uuid in (property_uuid, sweep["job_uuid"]):
+        job = property_client.get(f"/cleanup-jobs/{job_uuid}").json()
+        assert (job["status"], job["attempts"]) == ("completed", 1)
+
+    monkeypatch.setattr(state, "cleanup_jobs", None)
+    kept = create_property()
+    assert property_client.delete(f"/property/{kept}").status_code == 503
+    assert property_client.get(f"/property/{kept}").status_code == 200
+
+
+def test_uploaded_images_get_derivatives_and_lists_serve_thumbnails(property_client):
+    from io import BytesIO
+
+    from PIL import Image as PILImage
+
+    from services.property_service.app.derivatives import DERIVATIVES, handler
+
+    storage = property_client.app.state.asset_storage
+    key = "properties/lobby photo.png"
+    original = BytesIO()
+    PILImage.new("RGBA", (2000, 1000), (200, 30, 30, 128)).save(original, format="PNG")
+    storage.s3_client.put_object(Bucket=storage.bucket_name, Key=key, Body=original.getvalue())
+
+    event = {"Records": [
+        {"s3": {"bucket": {"name": storage.bucket_name}, "object": {"key": "properties/lobby+photo.png"}}},
+        {"s3": {"bucket": {"name": storage.bucket_name}, "object": {"key": "derived/properties/lobby+photo/thumbnail.jpg"}}},
+        {"s3": {"bucket": {"name": storage.bucket_name}, "object": {"key": "exports/report.png"}}},
+    ]}
+    assert handler(event, None) == {"processed": [key]}
+    for derivative in DERIVATIVES:
+        obj = storage.s3_client.get_object(
+            Bucket=storage.bucket_name, Key=f"derived/properties/lobby photo/{derivative.name}.{derivative.extension}",
+        )
+        assert obj["ContentType"] == derivative.content_type
+        with PILImage.open(BytesIO(obj["Body"].read())) as rendered:
+            assert rendered.format == derivative.format
+            assert rendered.size == (derivative.width, derivative.width // 2)
+
+    property_uuid = property_client.post("/property", json={
+        "user_uuid": str(uuid.uuid4()),
+        "name": "Pictured",
+        "country": "RS",
+        "city": "Sombor",
+        "address": "Glavna 1",
+        "images": [{"key": key, "variants": {"thumbnail": "somewhere/else.jpg"}}],
+    }).json()
+
+    listed = property_client.get("/properties/city", params={"country": "RS", "city": "Sombor"}).json()
+    image = listed[0]["images"][0]
+    assert image["variants"]["thumbnail"] == "derived/properties/lobby photo/thumbnail.jpg"
+    assert "derived/properties/lobby%20photo/thumbnail.jpg" in image["url"]
+    original_url = property_client.get(
+        "/properties/city", params={"country": "RS", "city": "Sombor", "image_variant": "original"},
+    ).json()[0]["images"][0]["url"]
+    assert "derived" not in original_url
+    assert "derived" not in property_client.get(f"/property/{property_uuid}").json()["images"][0]["url"]
+
+    # Images attached before their derivatives are written point at the variant, the original is the fallback.
+    pending_key = "properties/just uploaded.png"
+    property_client.post("/property", json={
+        "user_uuid": str(uuid.uuid4()), "name": "Pending", "country": "RS", "city": "Subotica", "address": "Korzo 1",
+        "images": [{"key": pending_key}],
+    })
+    storage.s3_client.head_object = None
+    image = property_client.get("/properties/city", params={"country": "RS", "city": "Subotica"}).json()[0]["images"][0]
+    assert image["variants"]["thumbnail"] == "derived/properties/just uploaded/thumbnail.jpg"
+    assert "derived/properties/just%20uploaded/thumbnail.jpg" in image["url"]
+    assert "derived" not in image["original_url"] and "just%20uploaded.png" in image["original_url"]
+    del storage.s3_client.head_object
+
+
+def test_batch_and_multipart_uploads(property_client):
+    from services.property_service.app.storage import MULTIPART_MIN_PART_BYTES
+
+    r = property_client.post("/assets/upload-urls", json={"uploads": [
+        {"prefix": "properties/gallery", "content_type": "image/jpeg", "extension": "jpg"} for _ in range(40)
+    ]})
+    assert r.status_code == 200
+    uploads = r.json()
+    assert len({upload["key"] for upload in uploads}) == 40
+    assert all(upload["key"].startswith("properties/gallery/") and upload["fields"] for upload in uploads)
+    too_many = [{"prefix": "p", "content_type": "image/jpeg"}] * 51
+    assert property_client.post("/assets/upload-urls", json={"uploads": too_many}).status_code == 422
+
+    size = 2 * MULTIPART_MIN_PART_BYTES + 10
+    r = property_client.post("/assets/multipart-upload", json={
+        "prefix": "properties/tours", "content_type": "video/mp4", "extension": "mp4", "size_bytes": size,
+    })
+    assert r.status_code == 200
+    upload = r.json()
+    assert (upload["part_size"], upload["part_count"]) == (MULTIPART_MIN_PART_BYTES, 3)
+    assert [part["part_number"] for part in upload["parts"]] == [1, 2, 3]
+    assert all(upload["upload_id"] in part["url"] for part in upload["parts"])
+
+    r = property_client.post("/assets/multipart-upload/part-urls", json={
+        "key": upload["key"], "upload_id": upload["upload_id"], "part_numbers": [10001],
+    })
+    assert r.status_code == 400
+
+    storage = property_client.app.state.asset_storage
+    parts = []
+    for number, length in ((3, 10), (1, MULTIPART_MIN_PART_BYTES), (2, MULTIPART_MIN_PART_BYTES)):
+        etag = storage.s3_client.upload_part(
+            Bucket=storage.bucket_name, Key=upload["key"], UploadId=upload["upload_id"],
+            PartNumber=number, Body=b"x" * length,
+        )["ETag"]
+        parts.append({"part_number": number, "etag": etag})
+    r = property_client.post("/assets/multipart-upload/complete", json={
+        "key": upload["key"], "upload_id": upload["upload_id"], "parts": parts,
+    })
+    assert r.status_code == 200 and r.json() == upload["key"]
+    head = storage.s3_client.head_object(Bucket=storage.bucket_name, Key=upload["key"])
+    assert (head["ContentLength"], head["ContentType"]) == (size, "video/mp4")
+
+    too_large = property_client.post("/assets/multipart-upload", json={
+        "prefix": "p", "content_type": "video/mp4", "size_bytes": 6 * 1024 ** 3,
+    })
+    assert too_large.status_code == 400
+
+
+def test_conditional_gets_return_304_and_ignore_url_signing(property_client):
+    property_uuid = property_client.post("/property", json={
+        "user_uuid": str(uuid.uuid4()),
+        "name": "Tagged",
+        "country": "RS",
+        "city": "Pancevo",
+        "address": "Njegoseva 1",
+        "images": [{"key": "properties/tagged.jpg"}],
+    }).json()
+    room_uuid = property_client.post("/room", json={
+        "property_uuid": property_uuid,
+        "name": "Tagged room",
+        "capacity": 2,
+        "room_type": "double",
+        "price_per_night": 90,
+        "min_price_per_night": 70,
+        "max_price_per_night": 110,
+        "images": [{"key": "rooms/tagged.jpg"}],
+    }).json()
+
+    storage = property_client.app.state.asset_storage
+    storage.url_cache = None
+    for path, params in (
+        (f"/property/{property_uuid}", None),
+        (f"/room/{room_uuid}", None),
+        ("/rooms", {"property_uuid": property_uuid}),
+        (f"/rooms/{property_uuid}", None),
+    ):
+        first = property_client.get(path, params=params)
+        etag = first.headers["ETag"]
+        assert first.status_code == 200 and etag.startswith('"') and first.headers["Cache-Control"] == "private, no-cache"
+
+        storage.presign_ttl_seconds += 1
+        again = property_client.get(path, params=params)
+        assert again.headers["ETag"] == etag
+
+        cached = property_client.get(path, params=params, headers={"If-None-Match": f'W/"stale", {etag}'})
+        assert cached.status_code == 304 and cached.content == b"" and cached.headers["ETag"] == etag
+
+    first_url = property_client.get(f"/property/{property_uuid}").json()["images"][0]["url"]
+    storage.presign_ttl_seconds += 1
+    assert property_client.get(f"/property/{property_uuid}").json()["images"][0]["url"] != first_url
+
+    from services.property_service.app.storage import SignedUrlCache
+
+    now = [0.0]
+    storage.url_cache = SignedUrlCache(window_seconds=300, clock=lambda: now[0])
+    for path, params in ((f"/property/{property_uuid}", None), ("/rooms", {"property_uuid": property_uuid})):
+        now[0] = 1_200_000.0
+        etag = property_client.get(path, params=params).headers["ETag"]
+        now[0] += 200
+        assert property_client.get(path, params=params, headers={"If-None-Match": etag}).status_code == 304
+        # Once the window the cached URLs were signed in is over, the body is sent again with fresh URLs.
+        now[0] += 200
+        assert property_client.get(path, params=params, headers={"If-None-Match": etag}).status_code == 200
+
+    etag = property_client.get(f"/room/{room_uuid}").headers["ETag"]
+    property_client.put(f"/room/{room_uuid}", json={
+        "property_uuid": property_uuid, "name": "Tagged room", "capacity": 2, "room_type": "double",
+        "price_per_night": 95, "min_price_per_night": 70, "max_price_per_night": 110,
+    })
+    changed = property_client.get(f"/room/{room_uuid}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["ETag"] != etag
+
+    # The tag covers which image key the URLs point at, not just the stored room.
+    thumbnails = property_client.get(f"/rooms/{property_uuid}")
+    assert "derived" in thumbnails.json()[0]["images"][0]["url"]
+    originals = property_client.get(
+        f"/rooms/{property_uuid}", params={"image_variant": "original"}, headers={"If-None-Match": thumbnails.headers["ETag"]},
+    )
+    assert originals.status_code == 200 and "derived" not in originals.json()[0]["images"][0]["url"]
+
+    missing = str(uuid.uuid4())
+    assert property_client.get(f"/room/{missing}").status_code == 404
+    assert property_client.get(f"/room/{missing}", headers={"If-None-Match": etag}).status_code == 404
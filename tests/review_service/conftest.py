@@ -9,7 +9,15 @@ from tests.conftest import _create_ddb_table
 def review_env(aws_resources, monkeypatch):
     dynamodb, _ = aws_resources
     REVIEW_TABLE = "review_table_test"
-    _create_ddb_table(dynamodb, REVIEW_TABLE, partition_key="uuid")
+    _create_ddb_table(
+        dynamodb,
+        REVIEW_TABLE,
+        partition_key="uuid",
+        gsi_defs=[
+            {"name": "property_index", "partition": "property_uuid", "sort": "timestamp"},
+            {"name": "user_index", "partition": "user_uuid", "sort": "timestamp"},
+        ],
+    )
     monkeypatch.setenv("REVIEW_TABLE_NAME", REVIEW_TABLE)
     monkeypatch.setenv("REVIEW_SERVICE_ENV", "test")
     yield
@@ -1,5 +1,7 @@
 import uuid
 
+from hypothesis import given, settings, strategies as st
+
 def test_add_and_list_reviews(review_client):
     property_uuid = str(uuid.uuid4())
     body = {
@@ -16,3 +18,89 @@ def test_add_and_list_reviews(review_client):
     assert lst.status_code == 200
     items = lst.json()
     assert items and items[0]["comment"] == "Great stay"
+
+
+
+@settings(max_examples=200, deadline=None)
+@given(st.fixed_dictionaries({
+    "uuid": st.uuids(),
+    "property_uuid": st.uuids(),
+    "user_uuid": st.uuids(),
+    "rating": st.floats(min_value=1, max_value=5),
+    "commet": st.text() | st.uuids().map(str),
+    "timestamp": st.text() | st.datetimes().map(lambda value: value.isoformat()),
+}))
+def test_review_codec_round_trip(payload):
+    from services.review_service.app.db_client import REVIEW_CODEC
+
+    review = REVIEW_CODEC.model.model_validate(payload)
+    item = REVIEW_CODEC.encode(review.model_dump(exclude_none=True))
+    decoded = REVIEW_CODEC.decode_model(item)
+    assert decoded == review
+    assert isinstance(decoded.timestamp, str)
+
+
+def test_property_reviews_support_conditional_get(review_client):
+    property_uuid = str(uuid.uuid4())
+
+    def add(rating):
+        r = review_client.post("/review", json={
+            "uuid": str(uuid.uuid4()),
+            "property_uuid": property_uuid,
+            "user_uuid": str(uuid.uuid4()),
+            "rating": rating,
+            "commet": "Fine",
+            "timestamp": "2026-05-01T10:00:00",
+        })
+        assert r.status_code == 200
+
+    add(4)
+    etag = review_client.get(f"/reviews/{property_uuid}").headers["ETag"]
+    cached = review_client.get(f"/reviews/{property_uuid}", headers={"If-None-Match": etag})
+    assert cached.status_code == 304 and cached.headers["ETag"] == etag
+
+    add(2)
+    changed = review_client.get(f"/reviews/{property_uuid}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and len(changed.json()) == 2 and changed.headers["ETag"] != etag
+
+
+def test_rating_aggregate_recomputes_totals_from_stream_records(review_client):
+    import boto3
+    from services.review_service.app.db_client import REVIEW_CODEC
+    from services.review_service.app.rating_aggregate import PropertyRatingAggregate
+    from tests.conftest import _create_ddb_table
+
+    search_table = _create_ddb_table(boto3.resource("dynamodb"), "property_search_table_test", partition_key="property_uuid")
+    property_uuid = str(uuid.uuid4())
+    search_table.put_item(Item={"property_uuid": property_uuid, "name": "Grand"})
+
+    def add(rating):
+        review = {
+            "uuid": str(uuid.uuid4()),
+            "property_uuid": property_uuid,
+            "user_uuid": str(uuid.uuid4()),
+            "rating": rating,
+            "commet": "Fine",
+            "timestamp": "2026-05-01T10:00:00",
+        }
+        r = review_client.post("/review", json=review)
+        assert r.status_code == 200
+        review["uuid"] = r.json()
+        return REVIEW_CODEC.encode(REVIEW_CODEC.model.model_validate(review).model_dump(exclude_none=True))
+
+    first, second = add(5), add(4)
+    aggregate = PropertyRatingAggregate("review_table_test", "property_search_table_test")
+    records = [{"eventName": "INSERT", "dynamodb": {"NewImage": first}}, {"eventName": "INSERT", "dynamodb": {"NewImage": second}}]
+    assert aggregate.apply(records) == 1
+    assert aggregate.apply(records) == 1
+    document = search_table.get_item(Key={"property_uuid": property_uuid})["Item"]
+    assert (document["rating_sum"], document["rating_count"]) == (9, 2)
+
+    aggregate.db_client.delete_item(TableName="review_table_test", Key={"uuid": first["uuid"]})
+    assert aggregate.apply([{"eventName": "REMOVE", "dynamodb": {"OldImage": first}}]) == 1
+    document = search_table.get_item(Key={"property_uuid": property_uuid})["Item"]
+    assert (document["rating_sum"], document["rating_count"]) == (4, 1)
+
+    unknown = {**second, "property_uuid": {"S": str(uuid.uuid4())}}
+    assert aggregate.apply([{"eventName": "INSERT", "dynamodb": {"NewImage": unknown}}]) == 0
+    assert search_table.get_item(Key={"property_uuid": unknown["property_uuid"]["S"]}).get("Item") is None